@@ -22,7 +22,7 @@ from fastmcp.utilities.types import Image
 from paperbanana.core.config import Settings
 from paperbanana.core.pipeline import PaperBananaPipeline
 from paperbanana.core.types import DiagramType, GenerationInput
-from paperbanana.evaluation.judge import VLMJudge
+from paperbanana.evaluation.judge import VLMJudge, open_judge_cache
 from paperbanana.providers.registry import ProviderRegistry
 
 mcp = FastMCP("PaperBanana")
@@ -114,7 +114,10 @@ async def evaluate_diagram(
     """
     settings = Settings()
     vlm = ProviderRegistry.create_vlm(settings)
-    judge = VLMJudge(vlm_provider=vlm)
+    judge = VLMJudge(
+        vlm_provider=vlm,
+        cache=open_judge_cache(settings),
+    )
 
     scores = await judge.evaluate(
         image_path=generated_path,
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 import structlog
 
@@ -35,16 +35,19 @@ class BaseAgent(ABC):
         """Execute the agent's task and return results."""
         ...
 
-    def load_prompt(self, diagram_type: str = "diagram") -> str:
+    def load_prompt(self, diagram_type: str = "diagram", variant: Optional[str] = None) -> str:
         """Load the prompt template for this agent.
 
         Args:
             diagram_type: 'diagram' or 'plot'
+            variant: Optional template variant, loaded from
+                '{agent_name}_{variant}.txt' (e.g. 'edit').
 
         Returns:
             Prompt template string with {placeholders}.
         """
-        path = self.prompt_dir / diagram_type / f"{self.agent_name}.txt"
+        name = f"{self.agent_name}_{variant}" if variant else self.agent_name
+        path = self.prompt_dir / diagram_type / f"{name}.txt"
         if not path.exists():
             raise FileNotFoundError(f"Prompt template not found: {path}")
         return path.read_text(encoding="utf-8")
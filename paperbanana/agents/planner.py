@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
+import io
 from pathlib import Path
+from typing import Optional
 
 import structlog
+from PIL import Image
 
 from paperbanana.agents.base import BaseAgent
 from paperbanana.core.types import DiagramType, ReferenceExample
 from paperbanana.core.utils import load_image
 from paperbanana.providers.base import VLMProvider
+from paperbanana.reference.image_pack import ImagePack
 
 logger = structlog.get_logger()
 
@@ -22,8 +26,14 @@ class PlannerAgent(BaseAgent):
     can render. Matches paper equation 4: P = VLM_plan(S, C, {(S_i, C_i, I_i)}).
     """
 
-    def __init__(self, vlm_provider: VLMProvider, prompt_dir: str = "prompts"):
+    def __init__(
+        self,
+        vlm_provider: VLMProvider,
+        prompt_dir: str = "prompts",
+        image_pack: Optional[ImagePack] = None,
+    ):
         super().__init__(vlm_provider, prompt_dir)
+        self.image_pack = image_pack
 
     @property
     def agent_name(self) -> str:
@@ -106,20 +116,33 @@ class PlannerAgent(BaseAgent):
         return "\n".join(lines)
 
     def _has_valid_image(self, example: ReferenceExample) -> bool:
-        """Check if a reference example has a valid image file."""
+        """Check if a reference example has a packed image or a valid image file."""
+        if self.image_pack is not None and example.id in self.image_pack:
+            return True
         if not example.image_path:
             return False
         return Path(example.image_path).exists()
 
     def _load_example_images(self, examples: list[ReferenceExample]) -> list:
-        """Load reference images from disk for in-context learning.
+        """Load reference images for in-context learning.
 
-        Returns a list of PIL Image objects for examples that have valid images.
+        Packed images are returned as pre-encoded bytes (EncodedImage) that
+        the provider uploads as-is, or decoded to PIL Images when the
+        provider does not accept encoded bytes; other images are loaded
+        from disk as PIL Images.
         """
+        supports = getattr(self.vlm, "supports_encoded_images", None)
+        encoded_ok = bool(supports and supports())
         images = []
         for ex in examples:
             if not self._has_valid_image(ex):
                 continue
+            packed = self.image_pack.get(ex.id) if self.image_pack is not None else None
+            if packed is not None:
+                images.append(
+                    packed if encoded_ok else Image.open(io.BytesIO(packed.data)).convert("RGB")
+                )
+                continue
             try:
                 img = load_image(ex.image_path)
                 images.append(img)
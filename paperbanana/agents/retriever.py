@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+from typing import Optional
 
 import structlog
 
 from paperbanana.agents.base import BaseAgent
+from paperbanana.core.cache import SQLiteCache, cache_key
 from paperbanana.core.types import DiagramType, ReferenceExample
 from paperbanana.providers.base import VLMProvider
 
@@ -18,10 +21,25 @@ class RetrieverAgent(BaseAgent):
 
     Given a source context and caption, uses the VLM to identify which
     reference examples are most useful for generating the target diagram.
+    Selections can be cached across runs and processes; see ``run``.
+
+    Candidate pools larger than ``batch_size`` are handled as a tournament:
+    batches are scored concurrently (at most ``max_concurrency`` VLM calls
+    in flight) and the batch winners are reranked in a final round.
     """
 
-    def __init__(self, vlm_provider: VLMProvider, prompt_dir: str = "prompts"):
+    def __init__(
+        self,
+        vlm_provider: VLMProvider,
+        prompt_dir: str = "prompts",
+        cache: Optional[SQLiteCache] = None,
+        batch_size: int = 100,
+        max_concurrency: int = 4,
+    ):
         super().__init__(vlm_provider, prompt_dir)
+        self.cache = cache
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
 
     @property
     def agent_name(self) -> str:
@@ -34,6 +52,7 @@ class RetrieverAgent(BaseAgent):
         candidates: list[ReferenceExample],
         num_examples: int = 10,
         diagram_type: DiagramType = DiagramType.METHODOLOGY,
+        reference_version: Optional[str] = None,
     ) -> list[ReferenceExample]:
         """Select the most relevant reference examples.
 
@@ -43,6 +62,9 @@ class RetrieverAgent(BaseAgent):
             candidates: All available reference examples.
             num_examples: Number of examples to retrieve.
             diagram_type: Type of diagram being generated.
+            reference_version: Reference store fingerprint. When given and a
+                cache is configured, selections are cached under a key that
+                includes it, so they are invalidated when the set changes.
 
         Returns:
             List of selected reference examples, ordered by relevance.
@@ -60,6 +82,50 @@ class RetrieverAgent(BaseAgent):
             )
             return candidates
 
+        key = None
+        if self.cache is not None and reference_version is not None:
+            key = cache_key(
+                source_context,
+                caption,
+                diagram_type.value,
+                num_examples,
+                reference_version,
+                getattr(self.vlm, "model_name", None),
+                [c.id for c in candidates],
+            )
+            cached = self._from_cache(key, candidates)
+            if cached is not None:
+                logger.info("Retriever cache hit", count=len(cached))
+                return cached
+
+        if len(candidates) > self.batch_size:
+            selected, parsed = await self._tournament(
+                source_context, caption, candidates, num_examples, diagram_type
+            )
+        else:
+            selected, parsed = await self._select_once(
+                source_context, caption, candidates, num_examples, diagram_type
+            )
+
+        logger.info("Retriever selected examples", count=len(selected))
+        if key is not None and parsed and selected:
+            self.cache.set(key, [e.id for e in selected])
+        return selected
+
+    async def _select_once(
+        self,
+        source_context: str,
+        caption: str,
+        candidates: list[ReferenceExample],
+        num_examples: int,
+        diagram_type: DiagramType,
+    ) -> tuple[list[ReferenceExample], bool]:
+        """Ask the VLM to pick num_examples from one prompt's worth of candidates.
+
+        Returns:
+            (selection, parsed). On an unparseable response the selection
+            falls back to the first num_examples candidates and parsed is False.
+        """
         # Format candidates for the prompt
         candidates_text = self._format_candidates(candidates)
 
@@ -87,9 +153,81 @@ class RetrieverAgent(BaseAgent):
         )
 
         # Parse response
-        selected = self._parse_response(response, candidates)
-        logger.info("Retriever selected examples", count=len(selected))
-        return selected[:num_examples]
+        selected_ids = self._parse_ids(response)
+        if selected_ids is None:
+            # Fallback: return first N candidates
+            return candidates[:num_examples], False
+        return self._select(selected_ids, candidates)[:num_examples], True
+
+    async def _tournament(
+        self,
+        source_context: str,
+        caption: str,
+        candidates: list[ReferenceExample],
+        num_examples: int,
+        diagram_type: DiagramType,
+    ) -> tuple[list[ReferenceExample], bool]:
+        """Select from a pool too large for one prompt.
+
+        Candidates are split into batches of ``batch_size``; each batch
+        advances its top num_examples, with at most ``max_concurrency``
+        batches scored at once. Rounds repeat until the winners fit in one
+        prompt, which is then reranked to produce the final selection. A
+        batch whose response cannot be parsed (or whose call fails)
+        advances its first num_examples candidates.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Each round must shrink the pool, so a batch holds at least twice
+        # the number of examples it advances
+        batch_size = max(self.batch_size, 2 * num_examples)
+        parsed_all = True
+
+        async def score(batch: list[ReferenceExample]) -> list[ReferenceExample]:
+            nonlocal parsed_all
+            async with semaphore:
+                try:
+                    winners, parsed = await self._select_once(
+                        source_context, caption, batch, num_examples, diagram_type
+                    )
+                except Exception as e:
+                    logger.warning("Retriever batch failed, advancing by order", error=str(e))
+                    winners, parsed = batch[:num_examples], False
+            parsed_all = parsed_all and parsed
+            return winners or batch[:num_examples]
+
+        pool = candidates
+        round_num = 0
+        while len(pool) > batch_size:
+            round_num += 1
+            batches = [pool[i : i + batch_size] for i in range(0, len(pool), batch_size)]
+            logger.info(
+                "Retriever tournament round",
+                round=round_num,
+                candidates=len(pool),
+                batches=len(batches),
+            )
+            results = await asyncio.gather(*(score(batch) for batch in batches))
+            pool = [example for winners in results for example in winners]
+
+        if len(pool) <= num_examples:
+            return pool, parsed_all
+        # Final rerank over the winners of every batch
+        selected, parsed = await self._select_once(
+            source_context, caption, pool, num_examples, diagram_type
+        )
+        return selected, parsed_all and parsed
+
+    def _from_cache(
+        self, key: str, candidates: list[ReferenceExample]
+    ) -> Optional[list[ReferenceExample]]:
+        """Cached selection for key, or None on a miss or if any ID is gone."""
+        ids = self.cache.get(key)
+        if not ids:
+            return None
+        id_to_example = {c.id: c for c in candidates}
+        if any(eid not in id_to_example for eid in ids):
+            return None
+        return [id_to_example[eid] for eid in ids]
 
     def _format_candidates(self, candidates: list[ReferenceExample]) -> str:
         """Format candidate examples for the prompt.
@@ -106,17 +244,16 @@ class RetrieverAgent(BaseAgent):
             )
         return "\n".join(lines)
 
-    def _parse_response(
-        self, response: str, candidates: list[ReferenceExample]
-    ) -> list[ReferenceExample]:
+    def _parse_ids(self, response: str) -> Optional[list[str]]:
         """Parse the VLM response to extract selected example IDs.
 
         Handles both 'selected_ids' (our format) and 'top_10_papers'/'top_10_plots'
-        (paper's format) JSON keys for robustness.
+        (paper's format) JSON keys for robustness. Returns None if the
+        response is not valid JSON.
         """
         try:
             data = json.loads(response)
-            selected_ids = (
+            return (
                 data.get("selected_ids")
                 or data.get("top_10_papers")
                 or data.get("top_10_plots")
@@ -124,10 +261,12 @@ class RetrieverAgent(BaseAgent):
             )
         except json.JSONDecodeError:
             logger.warning("Failed to parse retriever response as JSON, using fallback")
-            # Fallback: return first N candidates
-            return candidates
+            return None
 
-        # Map IDs back to ReferenceExample objects
+    def _select(
+        self, selected_ids: list[str], candidates: list[ReferenceExample]
+    ) -> list[ReferenceExample]:
+        """Map selected IDs back to ReferenceExample objects."""
         id_to_example = {c.id: c for c in candidates}
         selected = []
         for eid in selected_ids:
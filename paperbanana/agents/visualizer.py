@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import re
 import subprocess
 import sys
@@ -13,18 +14,68 @@ import structlog
 from PIL import Image
 
 from paperbanana.agents.base import BaseAgent
+from paperbanana.core.cache import SQLiteCache
 from paperbanana.core.types import DiagramType
-from paperbanana.core.utils import save_image
+from paperbanana.core.utils import load_image, save_image
 from paperbanana.providers.base import ImageGenProvider, VLMProvider
+from paperbanana.rendering import (
+    PlotData,
+    PlotRenderer,
+    PlotWorkerPool,
+    parse_diagram_spec,
+    parse_plot_spec,
+    render_diagram,
+)
+from paperbanana.rendering.export import plot_exports, save_figure_exports
+from paperbanana.rendering.plot_data import split_tables
+from paperbanana.rendering.plot_repair import PlotRepairer, classify_failure
 
 logger = structlog.get_logger()
 
+# Requested image sizes for each output_resolution setting (16:9 landscape).
+RESOLUTION_SIZES: dict[str, tuple[int, int]] = {
+    "1k": (1024, 576),
+    "2k": (1792, 1024),
+    "4k": (3584, 2048),
+}
+
+
+def resolution_to_size(resolution: str) -> tuple[int, int]:
+    """Map a resolution setting ("1k", "2k", "4k") to a (width, height) request."""
+    key = resolution.lower()
+    if key not in RESOLUTION_SIZES:
+        raise ValueError(
+            f"Unknown resolution: {resolution}. Available: {', '.join(RESOLUTION_SIZES)}"
+        )
+    return RESOLUTION_SIZES[key]
+
+
+# How a plot spec refers to the run's data, for the spec prompt.
+SPEC_DATA_USAGE = (
+    'Reference these tables by name in each layer\'s "data" field and their '
+    "columns by exact name in the encodings."
+)
+
+# Local rewrites tried per plot before only VLM repairs remain.
+_MAX_LOCAL_FIXES = 3
+
+# Raster DPI for code-rendered diagrams at each output_resolution setting.
+RESOLUTION_DPI: dict[str, int] = {"1k": 100, "2k": 200, "4k": 300}
+
 
 class VisualizerAgent(BaseAgent):
     """Generates images from descriptions.
 
-    For methodology diagrams: Uses an image generation model.
-    For statistical plots: Generates and executes matplotlib code.
+    For methodology diagrams: Uses an image generation model, or with the
+    "code" backend asks the VLM for a block-diagram spec rendered locally.
+    For statistical plots: Generates and executes matplotlib code, on a
+    warm worker pool when one is provided, or with the "spec" backend asks
+    the VLM for a declarative plot spec rendered in-process. Failing plot
+    code is repaired (local rewrites first, then the VLM with the
+    traceback) before falling back to a placeholder image. With
+    ``plot_preview_dpi`` set, the figure is also written at print DPI and in
+    ``plot_export_formats`` from the same execution; the returned path is
+    the preview.
     """
 
     def __init__(
@@ -33,10 +84,35 @@ class VisualizerAgent(BaseAgent):
         vlm_provider: VLMProvider,
         prompt_dir: str = "prompts",
         output_dir: str = "outputs",
+        resolution: str = "2k",
+        diagram_backend: str = "image",
+        plot_pool: Optional[PlotWorkerPool] = None,
+        plot_backend: str = "code",
+        plot_repair_attempts: int = 2,
+        repair_cache: Optional[SQLiteCache] = None,
+        plot_preview_dpi: int = 0,
+        plot_print_dpi: int = 300,
+        plot_export_formats: tuple[str, ...] = ("svg", "pdf"),
     ):
         super().__init__(vlm_provider, prompt_dir)
         self.image_gen = image_gen
         self.output_dir = Path(output_dir)
+        self.resolution = resolution
+        self.diagram_backend = diagram_backend
+        self.plot_pool = plot_pool
+        self.plot_backend = plot_backend
+        # One renderer per plot data directory, reused across iterations
+        self._plot_renderers: dict[str, PlotRenderer] = {}
+        self.plot_repair_attempts = plot_repair_attempts
+        self.plot_repairer = PlotRepairer(repair_cache)
+        # Repairs made while generating the most recent plot
+        self.last_plot_repairs: list[dict] = []
+        self.plot_preview_dpi = plot_preview_dpi
+        self.plot_print_dpi = plot_print_dpi
+        self.plot_export_formats = tuple(plot_export_formats)
+        # Files written for the most recent plot, by export name
+        # ("preview", "png", "svg", "pdf"); empty without exports
+        self.last_exports: dict[str, str] = {}
 
     @property
     def agent_name(self) -> str:
@@ -50,6 +126,10 @@ class VisualizerAgent(BaseAgent):
         output_path: Optional[str] = None,
         iteration: int = 0,
         seed: Optional[int] = None,
+        resolution: Optional[str] = None,
+        edit_from: Optional[str] = None,
+        edit_instructions: Optional[list[str]] = None,
+        plot_data: Optional[PlotData] = None,
     ) -> str:
         """Generate an image from a description.
 
@@ -60,14 +140,39 @@ class VisualizerAgent(BaseAgent):
             output_path: Where to save the generated image.
             iteration: Current iteration number (for naming).
             seed: Random seed for reproducibility.
+            resolution: Diagram resolution ("1k", "2k", "4k"); defaults to
+                the agent's configured resolution.
+            edit_from: Path to a previous diagram to edit instead of
+                redrawing from scratch (methodology diagrams only).
+            edit_instructions: Targeted changes to apply when editing.
+            plot_data: raw_data already written as columnar files. Plot code
+                reads the tables from disk and the prompt only describes
+                them; takes precedence over raw_data.
 
         Returns:
             Path to the generated image.
         """
         if diagram_type == DiagramType.STATISTICAL_PLOT:
-            return await self._generate_plot(description, raw_data, output_path, iteration)
-        else:
-            return await self._generate_diagram(description, output_path, iteration, seed)
+            return await self._generate_plot(
+                description, raw_data, output_path, iteration, plot_data
+            )
+        if self.diagram_backend == "code":
+            return await self._generate_diagram_code(
+                description, output_path, iteration, seed, resolution or self.resolution
+            )
+        if edit_from and edit_instructions:
+            return await self._edit_diagram(
+                description,
+                edit_from,
+                edit_instructions,
+                output_path,
+                iteration,
+                seed,
+                resolution or self.resolution,
+            )
+        return await self._generate_diagram(
+            description, output_path, iteration, seed, resolution or self.resolution
+        )
 
     async def _generate_diagram(
         self,
@@ -75,17 +180,19 @@ class VisualizerAgent(BaseAgent):
         output_path: Optional[str],
         iteration: int,
         seed: Optional[int],
+        resolution: str,
     ) -> str:
         """Generate a methodology diagram using the image generation model."""
         template = self.load_prompt("diagram")
         prompt = self.format_prompt(template, description=description)
+        width, height = resolution_to_size(resolution)
 
-        logger.info("Generating diagram image", iteration=iteration)
+        logger.info("Generating diagram image", iteration=iteration, resolution=resolution)
 
         image = await self.image_gen.generate(
             prompt=prompt,
-            width=1792,
-            height=1024,
+            width=width,
+            height=height,
             seed=seed,
         )
 
@@ -96,19 +203,127 @@ class VisualizerAgent(BaseAgent):
         logger.info("Diagram saved", path=output_path)
         return output_path
 
+    async def _generate_diagram_code(
+        self,
+        description: str,
+        output_path: Optional[str],
+        iteration: int,
+        seed: Optional[int],
+        resolution: str,
+    ) -> str:
+        """Generate a methodology diagram from a VLM-written spec rendered locally.
+
+        Writes PNG and SVG next to each other (plus the spec as JSON). Falls
+        back to the image generation model if the spec cannot be parsed or
+        rendered.
+        """
+        template = self.load_prompt("diagram", variant="code")
+        prompt = self.format_prompt(template, description=description)
+
+        logger.info("Generating diagram spec", iteration=iteration)
+
+        response = await self.vlm.generate(
+            prompt=prompt,
+            temperature=0.3,
+            max_tokens=4096,
+            response_format="json",
+        )
+
+        if output_path is None:
+            output_path = str(self.output_dir / f"diagram_iter_{iteration}.png")
+
+        try:
+            spec = parse_diagram_spec(response)
+        except ValueError as e:
+            logger.warning("Invalid diagram spec, falling back to image model", error=str(e))
+            return await self._generate_diagram(
+                description, output_path, iteration, seed, resolution
+            )
+
+        try:
+            written = render_diagram(
+                spec,
+                output_path,
+                formats=("png", "svg"),
+                dpi=RESOLUTION_DPI.get(resolution.lower(), 200),
+            )
+        except Exception as e:
+            # A valid spec can still fail to draw, e.g. a label with bad mathtext
+            logger.warning(
+                "Diagram spec failed to render, falling back to image model", error=str(e)
+            )
+            Path(output_path).with_suffix(".svg").unlink(missing_ok=True)
+            return await self._generate_diagram(
+                description, output_path, iteration, seed, resolution
+            )
+        Path(output_path).with_suffix(".json").write_text(
+            spec.model_dump_json(indent=2), encoding="utf-8"
+        )
+        logger.info("Diagram rendered from spec", path=written["png"], svg=written["svg"])
+        return written["png"]
+
+    async def _edit_diagram(
+        self,
+        description: str,
+        edit_from: str,
+        edit_instructions: list[str],
+        output_path: Optional[str],
+        iteration: int,
+        seed: Optional[int],
+        resolution: str,
+    ) -> str:
+        """Apply targeted critic suggestions to a previous diagram image."""
+        template = self.load_prompt("diagram", variant="edit")
+        prompt = self.format_prompt(
+            template,
+            description=description,
+            suggestions="\n".join(f"- {s}" for s in edit_instructions),
+        )
+        width, height = resolution_to_size(resolution)
+
+        logger.info(
+            "Editing diagram image",
+            iteration=iteration,
+            source=edit_from,
+            num_changes=len(edit_instructions),
+        )
+
+        image = await self.image_gen.edit(
+            image=load_image(edit_from),
+            prompt=prompt,
+            width=width,
+            height=height,
+            seed=seed,
+        )
+
+        if output_path is None:
+            output_path = str(self.output_dir / f"diagram_iter_{iteration}.png")
+
+        save_image(image, output_path)
+        logger.info("Edited diagram saved", path=output_path)
+        return output_path
+
     async def _generate_plot(
         self,
         description: str,
         raw_data: Optional[dict],
         output_path: Optional[str],
         iteration: int,
+        plot_data: Optional[PlotData] = None,
+        backend: Optional[str] = None,
     ) -> str:
         """Generate a statistical plot by generating and executing matplotlib code."""
-        # Build the description with raw data appended
-        full_description = description
-        if raw_data:
-            import json
+        self.last_plot_repairs = []
+        self.last_exports = {}
+        if (backend or self.plot_backend) == "spec" and plot_data is not None:
+            return await self._generate_plot_spec(description, plot_data, output_path, iteration)
 
+        # Build the description with the data (or its summary) appended
+        full_description = description
+        if plot_data is not None:
+            full_description += f"\n\n{plot_data.describe()}"
+            raw_data = plot_data.rest or None
+        elif raw_data:
             full_description += f"\n\n## Raw Data\n```json\n{json.dumps(raw_data, indent=2)}\n```"
 
         # Load and format the plot visualizer prompt template
@@ -129,9 +344,18 @@ class VisualizerAgent(BaseAgent):
         if output_path is None:
             output_path = str(self.output_dir / f"plot_iter_{iteration}.png")
 
-        # Execute the code
-        success = self._execute_plot_code(code, output_path)
-        if not success:
+        # Execute the code, repairing it if it fails
+        data_dir = str(plot_data.directory) if plot_data is not None else None
+        error = await self._run_plot_code(code, raw_data, output_path, data_dir)
+        if error is not None and self.plot_repair_attempts > 0:
+            if plot_data is not None:
+                columns = [c["name"] for t in plot_data.tables.values() for c in t["columns"]]
+            else:
+                columns = [c for t in split_tables(raw_data or {})[0].values() for c in t]
+            error = await self._repair_plot(
+                code, error, full_description, columns, raw_data, output_path, data_dir
+            )
+        if error is not None:
             logger.error("Plot code execution failed, using placeholder")
             # Create a placeholder image
             placeholder = Image.new("RGB", (1024, 768), color=(255, 255, 255))
@@ -139,6 +363,163 @@ class VisualizerAgent(BaseAgent):
 
         return output_path
 
+    async def _repair_plot(
+        self,
+        code: str,
+        error: str,
+        description: str,
+        columns: list[str],
+        raw_data: Optional[dict],
+        output_path: str,
+        data_dir: Optional[str],
+    ) -> Optional[str]:
+        """Fix failing plot code until it runs or the repair budget is spent.
+
+        Each failure class gets one local rewrite; otherwise (or if that
+        does not help) the code and traceback go back to the VLM, at most
+        ``plot_repair_attempts`` times. Successful VLM fixes are learned by
+        the repairer.
+
+        Returns:
+            The last error, or None once the code ran successfully.
+        """
+        tried: set[str] = set()
+        local_fixes = vlm_fixes = 0
+        while error is not None:
+            failure = classify_failure(error)
+            fix = None
+            if failure.signature not in tried and local_fixes < _MAX_LOCAL_FIXES:
+                tried.add(failure.signature)
+                fix = self.plot_repairer.local_fix(code, failure, columns)
+            if fix is not None:
+                fixed, how = fix
+                local_fixes += 1
+            elif vlm_fixes < self.plot_repair_attempts:
+                fixed, how = await self._repair_plot_code_vlm(code, error, description), "vlm"
+                vlm_fixes += 1
+            else:
+                break
+
+            error = await self._run_plot_code(fixed, raw_data, output_path, data_dir)
+            self.last_plot_repairs.append(
+                {"failure": failure.kind, "detail": failure.detail, "fix": how, "ok": error is None}
+            )
+            logger.info("Plot code repair", failure=failure.kind, fix=how, ok=error is None)
+            if error is None and how == "vlm":
+                self.plot_repairer.learn(failure, code, fixed)
+            code = fixed
+        return error
+
+    async def _repair_plot_code_vlm(self, code: str, error: str, description: str) -> str:
+        """Ask the VLM to fix failing plot code given its traceback."""
+        template = self.load_prompt("plot", variant="repair")
+        prompt = self.format_prompt(
+            template, description=description, code=code, error=error[-2000:]
+        )
+        response = await self.vlm.generate(prompt=prompt, temperature=0.2, max_tokens=4096)
+        return self._extract_code(response)
+
+    async def _run_plot_code(
+        self,
+        code: str,
+        raw_data: Optional[dict],
+        output_path: str,
+        data_dir: Optional[str],
+    ) -> Optional[str]:
+        """Execute plot code on the pool or in a subprocess; return the error, if any.
+
+        If the pool cannot start a worker (e.g. a script without a
+        ``__main__`` guard), it is dropped and plots run in subprocesses.
+        """
+        exports = self._plot_exports(output_path)
+        if self.plot_pool is not None:
+            try:
+                return await self._execute_plot_code_pooled(
+                    code, raw_data, output_path, data_dir, exports
+                )
+            except RuntimeError as e:
+                logger.warning("Plot worker pool unavailable, using subprocesses", error=str(e))
+                self.plot_pool = None
+        return self._execute_plot_code(code, output_path, raw_data, data_dir, exports)
+
+    def _plot_exports(self, output_path: str) -> Optional[dict[str, dict]]:
+        """Export targets for a plot previewed at output_path (None if disabled).
+
+        Target paths are absolute: pool workers run in their own scratch
+        directory, where a relative output_dir would resolve elsewhere.
+        """
+        if self.plot_preview_dpi <= 0:
+            return None
+        return plot_exports(
+            Path(output_path).resolve(),
+            self.plot_export_formats,
+            self.plot_preview_dpi,
+            self.plot_print_dpi,
+        )
+
+    async def _generate_plot_spec(
+        self,
+        description: str,
+        plot_data: PlotData,
+        output_path: Optional[str],
+        iteration: int,
+    ) -> str:
+        """Generate a statistical plot from a VLM-written spec rendered in-process.
+
+        Writes the PNG and the spec as JSON next to it. Falls back to plot
+        code if the spec cannot be parsed or references unknown columns.
+        """
+        template = self.load_prompt("plot", variant="spec")
+        prompt = self.format_prompt(
+            template,
+            description=f"{description}\n\n{plot_data.describe(SPEC_DATA_USAGE)}",
+        )
+
+        logger.info("Generating plot spec", iteration=iteration)
+
+        response = await self.vlm.generate(
+            prompt=prompt,
+            temperature=0.3,
+            max_tokens=4096,
+            response_format="json",
+        )
+
+        if output_path is None:
+            output_path = str(self.output_dir / f"plot_iter_{iteration}.png")
+
+        key = str(plot_data.directory)
+        renderer = self._plot_renderers.get(key)
+        if renderer is None:
+            renderer = self._plot_renderers[key] = PlotRenderer(plot_data.load())
+        exports = self._plot_exports(output_path)
+        try:
+            spec = parse_plot_spec(response)
+            if exports is None:
+                written = renderer.render(spec, output_path, formats=("png",), dpi=300)
+            else:
+                spec.check_columns(renderer.tables)
+                self.last_exports = save_figure_exports(
+                    renderer.figure(spec), exports, facecolor="white", bbox_inches="tight"
+                )
+                written = {"png": self.last_exports["preview"]}
+        except (ValueError, TypeError) as e:
+            # TypeError: a valid spec over columns of the wrong dtype (e.g. string error bars)
+            logger.warning("Invalid plot spec, falling back to plot code", error=str(e))
+            return await self._generate_plot(
+                description, None, output_path, iteration, plot_data, backend="code"
+            )
+
+        Path(output_path).with_suffix(".json").write_text(
+            spec.model_dump_json(indent=2), encoding="utf-8"
+        )
+        logger.info(
+            "Plot rendered from spec",
+            path=written["png"],
+            cached_layers=renderer.hits,
+            prepared_layers=renderer.misses,
+        )
+        return written["png"]
+
     def _extract_code(self, response: str) -> str:
         """Extract Python code from a VLM response."""
         # Look for code blocks
@@ -152,18 +533,85 @@ class VisualizerAgent(BaseAgent):
             return response[start:end].strip()
         return response.strip()
 
-    def _execute_plot_code(self, code: str, output_path: str) -> bool:
-        """Execute matplotlib code in a subprocess to generate a plot."""
-        # Strip any OUTPUT_PATH assignments from VLM-generated code so the
-        # injected value below is authoritative (the VLM is prompted to set
-        # OUTPUT_PATH itself, which would override the injected line).
-        code = re.sub(r'^OUTPUT_PATH\s*=\s*["\'].*["\']\s*$', "", code, flags=re.MULTILINE)
+    @staticmethod
+    def _strip_output_path(code: str) -> str:
+        """Remove OUTPUT_PATH assignments so the injected value is authoritative.
 
-        # Inject the output path
-        full_code = f'OUTPUT_PATH = "{output_path}"\n{code}'
+        The VLM is prompted to set OUTPUT_PATH itself, which would override
+        the value provided by the executor.
+        """
+        return re.sub(r'^OUTPUT_PATH\s*=\s*["\'].*["\']\s*$', "", code, flags=re.MULTILINE)
+
+    async def _execute_plot_code_pooled(
+        self,
+        code: str,
+        raw_data: Optional[dict],
+        output_path: str,
+        data_dir: Optional[str] = None,
+        exports: Optional[dict[str, dict]] = None,
+    ) -> Optional[str]:
+        """Execute matplotlib code on a warm pool worker and save the returned PNG.
+
+        With exports, the worker writes every export (the preview at
+        output_path included) itself.
+
+        Returns:
+            None on success, otherwise the error (traceback) text.
+        """
+        result = await self.plot_pool.run(
+            self._strip_output_path(code), raw_data, data_dir=data_dir, exports=exports
+        )
+        if not result.ok:
+            error = result.error or "Plot code failed"
+            logger.error("Plot code error", stderr=error[-500:])
+            return error
+        if result.exports:
+            self.last_exports = result.exports
+        else:
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            Path(output_path).write_bytes(result.image)
+        logger.info("Plot executed on worker pool", seconds=round(result.seconds, 3))
+        return None
+
+    def _execute_plot_code(
+        self,
+        code: str,
+        output_path: str,
+        raw_data: Optional[dict] = None,
+        data_dir: Optional[str] = None,
+        exports: Optional[dict[str, dict]] = None,
+    ) -> Optional[str]:
+        """Execute matplotlib code in a subprocess to generate a plot.
+
+        With exports, the saved figure is captured and written to every
+        export target before the subprocess exits.
+
+        Returns:
+            None on success, otherwise the error (stderr) text.
+        """
+        code = self._strip_output_path(code)
+
+        # Inject the output path and, for columnar data, the same variables
+        # a pool worker provides
+        preamble = f"OUTPUT_PATH = {output_path!r}\n"
+        if data_dir is not None:
+            preamble += (
+                "from paperbanana.rendering.plot_data import load_plot_data\n"
+                f"DATA = load_plot_data({data_dir!r})\n"
+                f"RAW_DATA = __import__('json').loads({json.dumps(raw_data)!r})\n"
+            )
+        epilogue = ""
+        if exports:
+            preamble += (
+                "from paperbanana.rendering.export import SavefigCapture\n"
+                "_PLOT_CAPTURE = SavefigCapture(OUTPUT_PATH)\n"
+            )
+            epilogue = f"\n_PLOT_CAPTURE.export({exports!r})\n"
+        full_code = preamble + code + epilogue
 
-        # Ensure output directory exists
+        # Ensure output directory exists, without a figure from an earlier attempt
         Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        Path(output_path).unlink(missing_ok=True)
 
         with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
             f.write(full_code)
@@ -177,11 +625,19 @@ class VisualizerAgent(BaseAgent):
                 timeout=60,
             )
             if result.returncode != 0:
-                logger.error("Plot code error", stderr=result.stderr[:500])
-                return False
-            return Path(output_path).exists()
+                logger.error("Plot code error", stderr=result.stderr[-500:])
+                return result.stderr[-2000:] or f"Plot code exited with {result.returncode}"
+            if not Path(output_path).exists():
+                return "Plot code did not save a figure to OUTPUT_PATH"
+            if exports:
+                self.last_exports = {
+                    name: target["path"]
+                    for name, target in exports.items()
+                    if Path(target["path"]).exists()
+                }
+            return None
         except subprocess.TimeoutExpired:
             logger.error("Plot code timed out")
-            return False
+            return "Plot code timed out"
         finally:
             Path(temp_path).unlink(missing_ok=True)
@@ -41,6 +41,11 @@ def generate(
     iterations: Optional[int] = typer.Option(
         None, "--iterations", "-n", help="Refinement iterations"
     ),
+    diagram_backend: Optional[str] = typer.Option(
+        None,
+        "--diagram-backend",
+        help="Diagram renderer: image (image model) or code (rendered spec, PNG + SVG)",
+    ),
     config: Optional[str] = typer.Option(None, "--config", help="Path to config YAML file"),
 ):
     """Generate a methodology diagram from a text description."""
@@ -64,6 +69,11 @@ def generate(
         overrides["image_model"] = image_model
     if iterations is not None:
         overrides["refinement_iterations"] = iterations
+    if diagram_backend:
+        if diagram_backend not in ("image", "code"):
+            console.print(f"[red]Error: Unknown diagram backend: {diagram_backend}[/red]")
+            raise typer.Exit(1)
+        overrides["diagram_backend"] = diagram_backend
     if output:
         overrides["output_dir"] = str(Path(output).parent)
 
@@ -87,6 +97,7 @@ def generate(
             f"[bold]PaperBanana[/bold] - Generating Methodology Diagram\n\n"
             f"VLM: {settings.vlm_provider} / {settings.vlm_model}\n"
             f"Image: {settings.image_provider} / {settings.image_model}\n"
+            f"Backend: {settings.diagram_backend}\n"
             f"Iterations: {settings.refinement_iterations}",
             border_style="blue",
         )
@@ -228,9 +239,14 @@ def evaluate(
     vlm_provider: str = typer.Option(
         "gemini", "--vlm-provider", help="VLM provider for evaluation"
     ),
+    judge_mode: str = typer.Option(
+        "parallel",
+        "--judge-mode",
+        help="parallel (one call per dimension, concurrently) or single (one call for all)",
+    ),
 ):
     """Evaluate a generated diagram vs human reference (comparative)."""
-    from paperbanana.evaluation.judge import VLMJudge
+    from paperbanana.evaluation.judge import VLMJudge, open_judge_cache
 
     generated_path = Path(generated)
     if not generated_path.exists():
@@ -253,7 +269,11 @@ def evaluate(
 
     vlm = ProviderRegistry.create_vlm(settings)
 
-    judge = VLMJudge(vlm)
+    judge = VLMJudge(
+        vlm,
+        mode=judge_mode,
+        cache=open_judge_cache(settings),
+    )
 
     async def _run():
         return await judge.evaluate(
@@ -0,0 +1,138 @@
+"""Persistent key-value cache shared across processes, backed by SQLite.
+
+Used to skip repeated VLM calls whose inputs have not changed. Values are
+stored as JSON under a namespace (e.g. "retrieval"), so one database file
+can back several caches. SQLite's locking makes the file safe to share
+between concurrent pipeline processes. A cache can be bounded, evicting
+its least recently used entries as new ones are stored.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS cache_lru ON cache (namespace, accessed_at)
+"""
+
+
+def cache_key(*parts: Any) -> str:
+    """Stable SHA-256 key for a sequence of JSON-serializable parts."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SQLiteCache:
+    """JSON value cache in a single SQLite file.
+
+    Args:
+        path: Database file; parent directories are created.
+        namespace: Partition of the database used by this cache.
+        max_entries: Bound on entries in the namespace; storing beyond it
+            evicts the least recently read or written entries. None keeps
+            everything.
+    """
+
+    def __init__(self, path: str | Path, namespace: str, max_entries: Optional[int] = None):
+        self.path = Path(path)
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (time.time(), self.namespace, key),
+            )
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under key."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), now, now),
+            )
+            if self.max_entries is not None:
+                self._evict(self.max_entries)
+            self._conn.commit()
+
+    def evict(self, max_entries: int) -> int:
+        """Keep only the max_entries most recently used entries; return how many were removed."""
+        with self._lock:
+            removed = self._evict(max_entries)
+            self._conn.commit()
+        return removed
+
+    def _evict(self, max_entries: int) -> int:
+        cursor = self._conn.execute(
+            "DELETE FROM cache WHERE namespace = ? AND key IN ("
+            "SELECT key FROM cache WHERE namespace = ? "
+            "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.namespace, self.namespace, max(0, max_entries)),
+        )
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        """Remove every entry in this cache's namespace."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+            ).fetchone()
+        return row[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def open_cache(
+    cache_dir: str | Path, namespace: str, max_entries: Optional[int] = None
+) -> Optional[SQLiteCache]:
+    """Open the shared cache database, or return None if it is unavailable."""
+    try:
+        return SQLiteCache(Path(cache_dir) / "cache.sqlite", namespace, max_entries=max_entries)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(
+            "Cache unavailable, continuing without it", path=str(cache_dir), error=str(e)
+        )
+        return None
@@ -28,9 +28,29 @@ class PipelineConfig(BaseSettings):
     """Pipeline execution configuration."""
 
     num_retrieval_examples: int = 10
+    retrieval_prefilter_k: int = 50
+    retrieval_batch_size: int = 100
+    retrieval_concurrency: int = 4
+    retrieval_shortcut: bool = False
+    retrieval_shortcut_confidence: float = 0.75
     refinement_iterations: int = 3
     output_resolution: str = "2k"
     diagram_type: str = "methodology"
+    quality_gate: bool = True
+    progressive_resolution: bool = False
+    draft_resolution: str = "1k"
+    refinement_mode: str = "regenerate"
+    diagram_backend: str = "image"
+    plot_workers: int = 0
+    plot_worker_max_jobs: int = 50
+    plot_worker_max_memory_mb: int = 512
+    plot_backend: str = "code"
+    plot_repair_attempts: int = 2
+    plot_downsample: str = "off"
+    plot_downsample_max_points: int = 5000
+    plot_preview_dpi: int = 100
+    plot_print_dpi: int = 300
+    plot_export_formats: str = "svg,pdf"
 
 
 class ReferenceConfig(BaseSettings):
@@ -38,6 +58,7 @@ class ReferenceConfig(BaseSettings):
 
     path: str = "data/reference_sets"
     guidelines_path: str = "data/guidelines"
+    hot_reload: bool = True
 
 
 class OutputConfig(BaseSettings):
@@ -49,6 +70,15 @@ class OutputConfig(BaseSettings):
     save_metadata: bool = True
 
 
+class CacheConfig(BaseSettings):
+    """Cross-run cache configuration."""
+
+    dir: str = ".cache/paperbanana"
+    retrieval: bool = True
+    judge: bool = True
+    judge_max_entries: int = 100000
+
+
 class Settings(BaseSettings):
     """Main PaperBanana settings, loaded from env vars and config files."""
 
@@ -60,17 +90,44 @@ class Settings(BaseSettings):
 
     # Pipeline settings
     num_retrieval_examples: int = 10
+    retrieval_prefilter_k: int = 50
+    retrieval_batch_size: int = 100
+    retrieval_concurrency: int = 4
+    retrieval_shortcut: bool = False
+    retrieval_shortcut_confidence: float = 0.75
     refinement_iterations: int = 3
     output_resolution: str = "2k"
+    quality_gate: bool = True
+    progressive_resolution: bool = False
+    draft_resolution: str = "1k"
+    refinement_mode: str = "regenerate"
+    diagram_backend: str = "image"
+    plot_workers: int = 0
+    plot_worker_max_jobs: int = 50
+    plot_worker_max_memory_mb: int = 512
+    plot_backend: str = "code"
+    plot_repair_attempts: int = 2
+    plot_downsample: str = "off"
+    plot_downsample_max_points: int = 5000
+    plot_preview_dpi: int = 100
+    plot_print_dpi: int = 300
+    plot_export_formats: str = "svg,pdf"
 
     # Reference settings
     reference_set_path: str = "data/reference_sets"
     guidelines_path: str = "data/guidelines"
+    reference_hot_reload: bool = True
 
     # Output settings
     output_dir: str = "outputs"
     save_iterations: bool = True
 
+    # Cache settings
+    cache_dir: str = ".cache/paperbanana"
+    retrieval_cache: bool = True
+    judge_cache: bool = True
+    judge_cache_max_entries: int = 100000
+
     # API Keys (loaded from environment)
     google_api_key: Optional[str] = Field(default=None, alias="GOOGLE_API_KEY")
     openrouter_api_key: Optional[str] = Field(default=None, alias="OPENROUTER_API_KEY")
@@ -104,12 +161,37 @@ def _flatten_yaml(config: dict, prefix: str = "") -> dict:
         "image.provider": "image_provider",
         "image.model": "image_model",
         "pipeline.num_retrieval_examples": "num_retrieval_examples",
+        "pipeline.retrieval_prefilter_k": "retrieval_prefilter_k",
+        "pipeline.retrieval_batch_size": "retrieval_batch_size",
+        "pipeline.retrieval_concurrency": "retrieval_concurrency",
+        "pipeline.retrieval_shortcut": "retrieval_shortcut",
+        "pipeline.retrieval_shortcut_confidence": "retrieval_shortcut_confidence",
         "pipeline.refinement_iterations": "refinement_iterations",
         "pipeline.output_resolution": "output_resolution",
+        "pipeline.quality_gate": "quality_gate",
+        "pipeline.progressive_resolution": "progressive_resolution",
+        "pipeline.draft_resolution": "draft_resolution",
+        "pipeline.refinement_mode": "refinement_mode",
+        "pipeline.diagram_backend": "diagram_backend",
+        "pipeline.plot_workers": "plot_workers",
+        "pipeline.plot_worker_max_jobs": "plot_worker_max_jobs",
+        "pipeline.plot_worker_max_memory_mb": "plot_worker_max_memory_mb",
+        "pipeline.plot_backend": "plot_backend",
+        "pipeline.plot_repair_attempts": "plot_repair_attempts",
+        "pipeline.plot_downsample": "plot_downsample",
+        "pipeline.plot_downsample_max_points": "plot_downsample_max_points",
+        "pipeline.plot_preview_dpi": "plot_preview_dpi",
+        "pipeline.plot_print_dpi": "plot_print_dpi",
+        "pipeline.plot_export_formats": "plot_export_formats",
         "reference.path": "reference_set_path",
         "reference.guidelines_path": "guidelines_path",
+        "reference.hot_reload": "reference_hot_reload",
         "output.dir": "output_dir",
         "output.save_iterations": "save_iterations",
+        "cache.dir": "cache_dir",
+        "cache.retrieval": "retrieval_cache",
+        "cache.judge": "judge_cache",
+        "cache.judge_max_entries": "judge_cache_max_entries",
     }
 
     def _recurse(d: dict, prefix: str = "") -> None:
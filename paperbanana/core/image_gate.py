@@ -0,0 +1,89 @@
+"""Local image quality gate run before the VLM critic.
+
+Catches images that are not worth a critic call: the blank placeholder
+written when plot code fails, near-blank or truncated image model outputs,
+and images too small to be legible.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import structlog
+from PIL import Image
+
+from paperbanana.core.types import QualityGateResult
+
+logger = structlog.get_logger()
+
+# Smallest acceptable side, in pixels.
+MIN_DIMENSION = 256
+
+# Grayscale standard deviation below which an image is considered blank.
+MIN_STD = 2.0
+
+# Grayscale histogram entropy (bits) below which an image is considered
+# near-blank. A diagram with a few percent of ink on a white page scores
+# around 0.2; a stray speck on a white page scores close to 0.
+MIN_ENTROPY = 0.08
+
+# Images are downsampled to at most this side before computing statistics.
+_ANALYSIS_SIZE = 512
+
+
+def check_image_quality(
+    image_path: str | Path,
+    min_dimension: int = MIN_DIMENSION,
+    min_std: float = MIN_STD,
+    min_entropy: float = MIN_ENTROPY,
+) -> QualityGateResult:
+    """Run cheap pixel statistics on an image and decide if it is worth critiquing.
+
+    Args:
+        image_path: Path to the generated image.
+        min_dimension: Minimum width and height in pixels.
+        min_std: Minimum grayscale standard deviation.
+        min_entropy: Minimum grayscale histogram entropy in bits.
+
+    Returns:
+        QualityGateResult; ``passed`` is False with a ``reason`` of
+        "unreadable", "undersized", "blank" or "low_entropy" on rejection.
+    """
+    try:
+        with Image.open(image_path) as image:
+            # Decoding the full image surfaces truncated files as OSError
+            image.load()
+            width, height = image.size
+            gray = image.convert("L")
+            gray.thumbnail((_ANALYSIS_SIZE, _ANALYSIS_SIZE))
+            pixels = np.asarray(gray, dtype=np.uint8)
+    except (OSError, ValueError) as e:
+        logger.warning("Quality gate could not read image", path=str(image_path), error=str(e))
+        return QualityGateResult(passed=False, reason="unreadable")
+
+    std = float(pixels.std())
+    entropy = _entropy(pixels)
+    result = QualityGateResult(
+        passed=True,
+        width=width,
+        height=height,
+        std=round(std, 3),
+        entropy=round(entropy, 4),
+    )
+
+    if min(width, height) < min_dimension:
+        result.passed, result.reason = False, "undersized"
+    elif std < min_std:
+        result.passed, result.reason = False, "blank"
+    elif entropy < min_entropy:
+        result.passed, result.reason = False, "low_entropy"
+
+    return result
+
+
+def _entropy(pixels: np.ndarray) -> float:
+    """Shannon entropy (bits) of an 8-bit grayscale histogram."""
+    hist = np.bincount(pixels.ravel(), minlength=256).astype(np.float64)
+    p = hist[hist > 0] / hist.sum()
+    return float(-(p * np.log2(p)).sum())
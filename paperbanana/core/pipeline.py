@@ -14,8 +14,11 @@ from paperbanana.agents.planner import PlannerAgent
 from paperbanana.agents.retriever import RetrieverAgent
 from paperbanana.agents.stylist import StylistAgent
 from paperbanana.agents.visualizer import VisualizerAgent
+from paperbanana.core.cache import open_cache
 from paperbanana.core.config import Settings
+from paperbanana.core.image_gate import check_image_quality
 from paperbanana.core.types import (
+    CritiqueResult,
     DiagramType,
     GenerationInput,
     GenerationOutput,
@@ -26,7 +29,9 @@ from paperbanana.core.utils import ensure_dir, generate_run_id, save_json
 from paperbanana.guidelines.methodology import load_methodology_guidelines
 from paperbanana.guidelines.plots import load_plot_guidelines
 from paperbanana.providers.registry import ProviderRegistry
+from paperbanana.reference.categories import classify
 from paperbanana.reference.store import ReferenceStore
+from paperbanana.rendering import PlotData, PlotWorkerPool, get_plot_pool
 
 logger = structlog.get_logger()
 
@@ -114,8 +119,13 @@ class PaperBananaPipeline:
             self._image_gen = ProviderRegistry.create_image_gen(self.settings)
             self._demo_mode = False
 
-        # Load reference store
-        self.reference_store = ReferenceStore(self.settings.reference_set_path)
+        # Shared per process, so long-running servers load the set once. A new
+        # pipeline always picks up edits made since it was loaded, as when
+        # every pipeline loaded its own store; reference_hot_reload only
+        # controls the extra check at the start of each run.
+        self.reference_store = ReferenceStore.shared(self.settings.reference_set_path)
+        if self.reference_store.changed():
+            self.reference_store.reload()
 
         # Load guidelines
         guidelines_path = self.settings.guidelines_path
@@ -124,8 +134,20 @@ class PaperBananaPipeline:
 
         # Initialize agents
         prompt_dir = self._find_prompt_dir()
-        self.retriever = RetrieverAgent(self._vlm, prompt_dir=prompt_dir)
-        self.planner = PlannerAgent(self._vlm, prompt_dir=prompt_dir)
+        self.retriever = RetrieverAgent(
+            self._vlm,
+            prompt_dir=prompt_dir,
+            cache=(
+                open_cache(self.settings.cache_dir, "retrieval")
+                if self.settings.retrieval_cache
+                else None
+            ),
+            batch_size=self.settings.retrieval_batch_size,
+            max_concurrency=self.settings.retrieval_concurrency,
+        )
+        self.planner = PlannerAgent(
+            self._vlm, prompt_dir=prompt_dir, image_pack=self.reference_store.image_pack()
+        )
         self.stylist = StylistAgent(
             self._vlm, guidelines=self._methodology_guidelines, prompt_dir=prompt_dir
         )
@@ -134,6 +156,21 @@ class PaperBananaPipeline:
             self._vlm,
             prompt_dir=prompt_dir,
             output_dir=str(self._run_dir),
+            resolution=self.settings.output_resolution,
+            diagram_backend=self.settings.diagram_backend,
+            plot_backend=self.settings.plot_backend,
+            plot_repair_attempts=self.settings.plot_repair_attempts,
+            repair_cache=(
+                open_cache(self.settings.cache_dir, "plot_repair")
+                if self.settings.plot_repair_attempts > 0
+                else None
+            ),
+            plot_pool=self._plot_pool(),
+            plot_preview_dpi=self.settings.plot_preview_dpi,
+            plot_print_dpi=self.settings.plot_print_dpi,
+            plot_export_formats=tuple(
+                fmt.strip() for fmt in self.settings.plot_export_formats.split(",") if fmt.strip()
+            ),
         )
         self.critic = CriticAgent(self._vlm, prompt_dir=prompt_dir)
 
@@ -149,6 +186,11 @@ class PaperBananaPipeline:
         """Directory for this run's outputs."""
         return ensure_dir(Path(self.settings.output_dir) / self.run_id)
 
+    def _image_gen_supports_editing(self) -> bool:
+        """Check if the image provider implements image editing."""
+        supports_editing = getattr(self._image_gen, "supports_editing", None)
+        return bool(supports_editing and supports_editing())
+
     def _find_prompt_dir(self) -> str:
         """Find the prompts directory relative to the package."""
         # Check common locations
@@ -162,6 +204,16 @@ class PaperBananaPipeline:
         # Default
         return "prompts"
 
+    def _plot_pool(self) -> Optional[PlotWorkerPool]:
+        """Shared warm worker pool for plot code, or None to spawn per plot."""
+        if self.settings.plot_workers <= 0:
+            return None
+        return get_plot_pool(
+            size=self.settings.plot_workers,
+            max_jobs=self.settings.plot_worker_max_jobs,
+            max_memory_growth_mb=self.settings.plot_worker_max_memory_mb,
+        )
+
     async def generate(self, input: GenerationInput) -> GenerationOutput:
         """Run the full generation pipeline.
 
@@ -191,15 +243,48 @@ class PaperBananaPipeline:
 
         # Step 1: Retriever — find relevant examples
         logger.info("Phase 1: Retrieval")
-        candidates = self.reference_store.get_all()
         retrieval_start = time.perf_counter()
-        examples = await self.retriever.run(
-            source_context=input.source_context,
-            caption=input.communicative_intent,
-            candidates=candidates,
-            num_examples=self.settings.num_retrieval_examples,
-            diagram_type=input.diagram_type,
-        )
+        if self.settings.reference_hot_reload:
+            await self.reference_store.refresh()
+        # One snapshot for the whole retrieval, even if the store reloads meanwhile
+        references = self.reference_store.snapshot()
+        num_examples = self.settings.num_retrieval_examples
+        retrieval_info: dict = {"mode": "vlm"}
+        examples = None
+        if self.settings.retrieval_shortcut and input.diagram_type == DiagramType.METHODOLOGY:
+            # Clear-cut domain: use the category's precomputed exemplars
+            guess = classify(f"{input.communicative_intent}\n{input.source_context}")
+            retrieval_info.update(category=guess.category, confidence=round(guess.confidence, 3))
+            if guess.confidence >= self.settings.retrieval_shortcut_confidence:
+                exemplars = references.exemplars(guess.category, num_examples)
+                if len(exemplars) >= num_examples:
+                    examples = exemplars
+                    retrieval_info["mode"] = "shortcut"
+                    logger.info(
+                        "Retrieval shortcut",
+                        category=guess.category,
+                        confidence=round(guess.confidence, 3),
+                        examples=len(examples),
+                    )
+
+        if examples is None:
+            prefilter_k = self.settings.retrieval_prefilter_k
+            if 0 < prefilter_k < references.count:
+                # Shortlist locally so the VLM only reranks the top-K candidates
+                candidates = references.shortlist(
+                    f"{input.communicative_intent}\n{input.source_context}", prefilter_k
+                )
+                logger.info("Prefiltered reference candidates", shortlist=len(candidates))
+            else:
+                candidates = references.get_all()
+            examples = await self.retriever.run(
+                source_context=input.source_context,
+                caption=input.communicative_intent,
+                candidates=candidates,
+                num_examples=num_examples,
+                diagram_type=input.diagram_type,
+                reference_version=references.fingerprint,
+            )
         retrieval_seconds = time.perf_counter() - retrieval_start
 
         # Step 2: Planner — generate textual description
@@ -242,9 +327,70 @@ class PaperBananaPipeline:
         iterations: list[IterationRecord] = []
         iteration_timings = []
 
+        # Code-rendered diagrams are cheap to redraw, so draft resolution and
+        # image editing only apply to the image model backend.
+        code_backend = (
+            input.diagram_type == DiagramType.METHODOLOGY
+            and self.settings.diagram_backend == "code"
+        )
+        image_backend = input.diagram_type == DiagramType.METHODOLOGY and not code_backend
+
+        # Progressive resolution: refine at draft resolution, render the
+        # accepted description once at the final resolution afterwards.
+        progressive = (
+            self.settings.progressive_resolution
+            and image_backend
+            and self.settings.draft_resolution.lower() != self.settings.output_resolution.lower()
+        )
+        iteration_resolution = (
+            self.settings.draft_resolution if progressive else self.settings.output_resolution
+        )
+
+        # Edit mode: apply critic suggestions to the previous image instead
+        # of redrawing from the revised description.
+        edit_mode = self.settings.refinement_mode == "edit" and image_backend
+        if edit_mode and not self._image_gen_supports_editing():
+            logger.warning(
+                "Image provider does not support editing, using full regeneration",
+                image_gen=getattr(self._image_gen, "name", "custom"),
+            )
+            edit_mode = False
+        converged = False
+
+        # Write tabular plot data once; every iteration reads the same files
+        plot_data = None
+        if input.diagram_type == DiagramType.STATISTICAL_PLOT and input.raw_data:
+            downsample = self.settings.plot_downsample
+            plot_data = PlotData.write(
+                input.raw_data,
+                self._run_dir / "data",
+                max_points=self.settings.plot_downsample_max_points if downsample != "off" else 0,
+                downsample=downsample,
+            )
+            if plot_data is not None:
+                logger.info(
+                    "Wrote columnar plot data",
+                    tables=len(plot_data.tables),
+                    rows=plot_data.rows,
+                    reduced=list(plot_data.reductions),
+                )
+
         for i in range(self.settings.refinement_iterations):
             logger.info(f"Phase 2: Iteration {i + 1}/{self.settings.refinement_iterations}")
 
+            # Edit the previous image when it passed the gate and got suggestions
+            previous = iterations[-1] if iterations else None
+            edit_from = None
+            edit_instructions = None
+            if (
+                edit_mode
+                and previous is not None
+                and previous.critique is not None
+                and (previous.quality_gate is None or previous.quality_gate.passed)
+            ):
+                edit_from = previous.image_path
+                edit_instructions = previous.critique.critic_suggestions
+
             # Step 4: Visualizer — generate image
             visualizer_start = time.perf_counter()
             image_path = await self.visualizer.run(
@@ -252,18 +398,44 @@ class PaperBananaPipeline:
                 diagram_type=input.diagram_type,
                 raw_data=input.raw_data,
                 iteration=i + 1,
+                resolution=iteration_resolution,
+                edit_from=edit_from,
+                edit_instructions=edit_instructions,
+                plot_data=plot_data,
             )
             visualizer_seconds = time.perf_counter() - visualizer_start
 
+            # Local quality gate — skip the critic call on unusable images.
+            # Plots are gated on the print PNG: the low-DPI preview of an
+            # ordinary single-column figure is below the gate's minimum size.
+            gate_path = image_path
+            if input.diagram_type == DiagramType.STATISTICAL_PLOT:
+                gate_path = self.visualizer.last_exports.get("png", image_path)
+            gate = check_image_quality(gate_path) if self.settings.quality_gate else None
+
             # Step 5: Critic — evaluate and provide feedback
             critic_start = time.perf_counter()
-            critique = await self.critic.run(
-                image_path=image_path,
-                description=current_description,
-                source_context=input.source_context,
-                caption=input.communicative_intent,
-                diagram_type=input.diagram_type,
-            )
+            if gate is not None and not gate.passed:
+                logger.warning(
+                    "Image rejected by quality gate, regenerating",
+                    iteration=i + 1,
+                    reason=gate.reason,
+                )
+                critique = CritiqueResult(
+                    critic_suggestions=[
+                        f"Generated image was rejected by the local quality gate "
+                        f"({gate.reason}); regenerate it from the same description."
+                    ],
+                    revised_description=current_description,
+                )
+            else:
+                critique = await self.critic.run(
+                    image_path=image_path,
+                    description=current_description,
+                    source_context=input.source_context,
+                    caption=input.communicative_intent,
+                    diagram_type=input.diagram_type,
+                )
             critic_seconds = time.perf_counter() - critic_start
 
             iteration_record = IterationRecord(
@@ -271,14 +443,30 @@ class PaperBananaPipeline:
                 description=current_description,
                 image_path=image_path,
                 critique=critique,
+                quality_gate=gate,
+                exports=(
+                    self.visualizer.last_exports
+                    if input.diagram_type == DiagramType.STATISTICAL_PLOT
+                    else {}
+                ),
             )
             iteration_timings.append(
                 {
                     "iteration": i + 1,
+                    "resolution": iteration_resolution,
+                    "render_mode": "edit" if edit_from else "code" if code_backend else "generate",
                     "visualizer_seconds": visualizer_seconds,
                     "critic_seconds": critic_seconds,
+                    "quality_gate": gate.model_dump() if gate is not None else None,
                 }
             )
+            if plot_data is not None and plot_data.reductions:
+                iteration_timings[-1]["data_reduction"] = plot_data.reductions
+            if (
+                input.diagram_type == DiagramType.STATISTICAL_PLOT
+                and self.visualizer.last_plot_repairs
+            ):
+                iteration_timings[-1]["plot_repairs"] = self.visualizer.last_plot_repairs
             iterations.append(iteration_record)
 
             # Save iteration artifacts
@@ -288,6 +476,7 @@ class PaperBananaPipeline:
                     {
                         "description": current_description,
                         "critique": critique.model_dump(),
+                        "quality_gate": gate.model_dump() if gate is not None else None,
                     },
                     iter_dir / "details.json",
                 )
@@ -306,16 +495,59 @@ class PaperBananaPipeline:
                     iteration=i + 1,
                     summary=critique.summary,
                 )
+                converged = True
                 break
 
-        # Final output
-        final_image = iterations[-1].image_path
+        # Final output — prefer the latest image that passed the quality gate
+        final_record = next(
+            (r for r in reversed(iterations) if r.quality_gate is None or r.quality_gate.passed),
+            iterations[-1],
+        )
+        final_image = final_record.image_path
         final_output_path = str(self._run_dir / "final_output.png")
 
+        final_render_seconds = 0.0
+        if progressive:
+            logger.info(
+                "Rendering accepted description at final resolution",
+                resolution=self.settings.output_resolution,
+            )
+            final_render_start = time.perf_counter()
+            final_render = await self.visualizer.run(
+                description=final_record.description,
+                diagram_type=input.diagram_type,
+                output_path=str(self._run_dir / "diagram_final.png"),
+                resolution=self.settings.output_resolution,
+            )
+            final_render_seconds = time.perf_counter() - final_render_start
+
+            if self.settings.quality_gate and not check_image_quality(final_render).passed:
+                logger.warning("Final render rejected by quality gate, keeping draft image")
+            else:
+                final_image = final_render
+
         # Copy final image to output location
         import shutil
 
         shutil.copy2(final_image, final_output_path)
+        exports = {"png": final_output_path}
+
+        if final_image == final_record.image_path and final_record.exports:
+            # Plots: the critic saw the preview; ship the print PNG and vectors
+            targets = {
+                "png": final_output_path,
+                "preview": str(self._run_dir / "final_output_preview.png"),
+            }
+            for name, path in final_record.exports.items():
+                target = targets.get(name, str(self._run_dir / f"final_output.{name}"))
+                shutil.copy2(path, target)
+                exports[name] = target
+        else:
+            # Code-rendered diagrams also ship a vector version
+            final_svg = Path(final_image).with_suffix(".svg")
+            if final_svg.exists():
+                exports["svg"] = str(self._run_dir / "final_output.svg")
+                shutil.copy2(final_svg, exports["svg"])
 
         total_seconds = time.perf_counter() - total_start
         logger.info(
@@ -337,6 +569,9 @@ class PaperBananaPipeline:
         )
 
         metadata_dict = metadata.model_dump()
+        metadata_dict["diagram_type"] = input.diagram_type.value
+        metadata_dict["converged"] = converged
+        metadata_dict["retrieval"] = retrieval_info
 
         metadata_dict["timing"] = {
             "total_seconds": total_seconds,
@@ -344,6 +579,8 @@ class PaperBananaPipeline:
             "planning_seconds": planning_seconds,
             "styling_seconds": styling_seconds,
             "iterations": iteration_timings,
+            "final_resolution": self.settings.output_resolution,
+            "final_render_seconds": final_render_seconds,
         }
 
         if self.settings.save_iterations:
@@ -354,6 +591,7 @@ class PaperBananaPipeline:
             description=current_description,
             iterations=iterations,
             metadata=metadata_dict,
+            exports=exports,
         )
 
         logger.info(
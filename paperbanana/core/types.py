@@ -36,6 +36,16 @@ class ReferenceExample(BaseModel):
     category: Optional[str] = None
 
 
+class EncodedImage(BaseModel):
+    """An image already encoded in an upload format (e.g. from a reference image pack).
+
+    VLM providers send the bytes as-is instead of re-encoding a PIL image.
+    """
+
+    data: bytes
+    mime_type: str = "image/png"
+
+
 class CritiqueResult(BaseModel):
     """Output from the Critic agent."""
 
@@ -55,6 +65,19 @@ class CritiqueResult(BaseModel):
         return "; ".join(self.critic_suggestions[:3])
 
 
+class QualityGateResult(BaseModel):
+    """Outcome of the local pre-critic image quality gate."""
+
+    passed: bool
+    reason: Optional[str] = Field(
+        default=None, description="unreadable | undersized | blank | low_entropy"
+    )
+    width: int = 0
+    height: int = 0
+    std: float = Field(default=0.0, description="Grayscale pixel standard deviation")
+    entropy: float = Field(default=0.0, description="Grayscale histogram entropy in bits")
+
+
 class IterationRecord(BaseModel):
     """Record of a single refinement iteration."""
 
@@ -62,6 +85,10 @@ class IterationRecord(BaseModel):
     description: str
     image_path: str
     critique: Optional[CritiqueResult] = None
+    quality_gate: Optional[QualityGateResult] = None
+    exports: dict[str, str] = Field(
+        default_factory=dict, description="Plot exports of this iteration by name"
+    )
 
 
 class GenerationOutput(BaseModel):
@@ -72,6 +99,10 @@ class GenerationOutput(BaseModel):
     iterations: list[IterationRecord] = Field(
         default_factory=list, description="History of refinement iterations"
     )
+    exports: dict[str, str] = Field(
+        default_factory=dict,
+        description="Final output files by format (png, svg, pdf; preview for plots)",
+    )
     metadata: dict[str, Any] = Field(default_factory=dict)
 
 
@@ -14,6 +14,8 @@ from typing import Any
 import structlog
 from PIL import Image
 
+from paperbanana.core.types import EncodedImage
+
 logger = structlog.get_logger()
 
 
@@ -37,6 +39,15 @@ def image_to_base64(image: Image.Image, format: str = "PNG") -> str:
     return base64.b64encode(buffer.getvalue()).decode("utf-8")
 
 
+def image_to_bytes(image: Image.Image | EncodedImage) -> tuple[bytes, str]:
+    """Return upload bytes and MIME type; pre-encoded images pass through unchanged."""
+    if isinstance(image, EncodedImage):
+        return image.data, image.mime_type
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue(), "image/png"
+
+
 def base64_to_image(b64_string: str) -> Image.Image:
     """Convert a base64-encoded string to a PIL Image."""
     data = base64.b64decode(b64_string)
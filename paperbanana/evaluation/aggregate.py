@@ -0,0 +1,204 @@
+"""Columnar aggregation of evaluation results.
+
+Loads judged records (the JSONL written by
+:class:`~paperbanana.evaluation.batch.BatchEvaluator` and
+:class:`~paperbanana.evaluation.benchmark.BenchmarkRunner`) into a
+DataFrame with one row per judgment: every verdict coded as a side
+(+1 Model, 0 tie, -1 Human) plus the record's scalar fields (category,
+model, config, ...) to group by. Win/tie/loss rates, scores and bootstrap
+confidence intervals are then computed for all groups and dimensions at
+once with NumPy, so 100k judgments aggregate in well under a second.
+
+The overall verdict is recomputed from the dimension verdicts with the
+same hierarchy as :class:`~paperbanana.evaluation.judge.VLMJudge`: the
+primary pair (faithfulness, readability) decides unless it is tied, then
+the secondary pair (conciseness, aesthetics), else a tie. A pair is
+decisive when its sides sum to nonzero, so the whole hierarchy is two
+``np.sign`` calls and a ``np.where``.
+
+Bootstrap intervals resample each group's verdicts. Verdicts are
+categorical, so resampling n of them with replacement is exactly a
+multinomial draw from the group's observed win/tie/loss proportions; the
+replicates are drawn in one call for every group instead of by resampling
+rows.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from paperbanana.core.cache import cache_key
+from paperbanana.evaluation.judge import DIMENSIONS, PRIMARY_DIMENSIONS, SECONDARY_DIMENSIONS
+
+METRICS = ["overall", *DIMENSIONS]
+
+# Record fields that are per-judgment values, not grouping keys
+_VALUE_FIELDS = {"scores", "usage", "latency", "error", "seconds", "generated", "reference"}
+
+# Settings that differ between runs without changing what is generated
+_RUN_LOCAL_SETTINGS = {"output_dir", "cache_dir", "google_api_key"}
+
+
+def config_id(config_snapshot: dict[str, Any]) -> str:
+    """Short stable id of a settings snapshot, for grouping results by config.
+
+    Paths that differ between otherwise identical runs (output and cache
+    directories) are ignored.
+    """
+    settings = {k: v for k, v in config_snapshot.items() if k not in _RUN_LOCAL_SETTINGS}
+    return cache_key(json.dumps(settings, sort_keys=True, default=str))[:12]
+
+
+def _sides(winners: Sequence[str]) -> np.ndarray:
+    values = np.asarray(winners, dtype=object)
+    return (values == "Model").astype(np.int8) - (values == "Human").astype(np.int8)
+
+
+def hierarchical_sides(sides: dict[str, np.ndarray]) -> np.ndarray:
+    """Overall side per row from per-dimension sides (+1 Model, 0 tie, -1 Human)."""
+    primary = np.sign(sides[PRIMARY_DIMENSIONS[0]] + sides[PRIMARY_DIMENSIONS[1]])
+    secondary = np.sign(sides[SECONDARY_DIMENSIONS[0]] + sides[SECONDARY_DIMENSIONS[1]])
+    return np.where(primary != 0, primary, secondary).astype(np.int8)
+
+
+def from_records(records: Iterable[dict]) -> pd.DataFrame:
+    """One row per judged record: a side column per metric plus grouping fields.
+
+    Records without ``scores`` (failed tasks) are skipped. Scalar top-level
+    fields become columns; missing values are filled with "".
+    """
+    winners: dict[str, list[str]] = {dim: [] for dim in DIMENSIONS}
+    fields: list[dict[str, Any]] = []
+    for record in records:
+        scores = record.get("scores")
+        if not scores:
+            continue
+        for dim in DIMENSIONS:
+            winners[dim].append(scores[dim]["winner"])
+        fields.append(
+            {
+                k: v
+                for k, v in record.items()
+                if k not in _VALUE_FIELDS and isinstance(v, (str, int, float, bool))
+            }
+        )
+
+    frame = pd.DataFrame.from_records(fields) if fields else pd.DataFrame(index=range(0))
+    frame = frame.fillna("")
+    sides = {dim: _sides(winners[dim]) for dim in DIMENSIONS}
+    frame["overall"] = hierarchical_sides(sides) if fields else np.array([], dtype=np.int8)
+    for dim in DIMENSIONS:
+        frame[dim] = sides[dim]
+    return frame
+
+
+def load_results(paths: Sequence[str | Path]) -> pd.DataFrame:
+    """Load judged records from one or more results JSONL files.
+
+    Each row gets a ``source`` column with its file's name, so results of
+    separate runs can be grouped apart. Unparseable lines (e.g. a line cut
+    short by a crash) are skipped.
+    """
+
+    def records():
+        for path in paths:
+            path = Path(path)
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    record.setdefault("source", path.name)
+                    yield record
+
+    return from_records(records())
+
+
+def win_rates(
+    frame: pd.DataFrame,
+    by: Optional[Sequence[str]] = None,
+    n_boot: int = 1000,
+    confidence: float = 0.95,
+    seed: Optional[int] = 0,
+) -> pd.DataFrame:
+    """Win/tie/loss rates, scores and bootstrap intervals per group and metric.
+
+    Args:
+        frame: Rows from :func:`from_records` or :func:`load_results`.
+        by: Columns to group by (e.g. ``["category", "model"]``); None
+            aggregates all rows together.
+        n_boot: Bootstrap replicates; 0 skips the intervals.
+        confidence: Two-sided interval level.
+        seed: Random seed for the bootstrap.
+
+    Returns:
+        One row per (group, metric) with ``n``, ``win``, ``tie``, ``loss``,
+        ``score`` (0-100, a tie counting 50, as in the judge) and, when
+        bootstrapped, ``win_low``/``win_high`` and ``score_low``/``score_high``.
+
+    Raises:
+        KeyError: If a ``by`` column is not in the frame.
+    """
+    by = list(by or [])
+    missing = [column for column in by if column not in frame.columns]
+    if missing:
+        raise KeyError(f"Unknown group column(s): {', '.join(missing)}")
+
+    if by:
+        codes, keys = pd.factorize(pd.MultiIndex.from_frame(frame[by].astype(str)), sort=True)
+    else:
+        codes, keys = np.zeros(len(frame), dtype=np.intp), [()]
+    n_groups = len(keys)
+
+    # counts[g, m] = (losses, ties, wins) of metric m in group g
+    sides = frame[METRICS].to_numpy(dtype=np.intp) + 1
+    flat = (codes[:, None] * len(METRICS) + np.arange(len(METRICS))) * 3 + sides
+    counts = np.bincount(flat.ravel(), minlength=n_groups * len(METRICS) * 3)
+    counts = counts.reshape(n_groups, len(METRICS), 3)
+    n = counts.sum(axis=2)
+    rates = counts / np.maximum(n, 1)[..., None]
+
+    result = {
+        "n": n,
+        "win": rates[..., 2],
+        "tie": rates[..., 1],
+        "loss": rates[..., 0],
+        "score": 100.0 * (rates[..., 2] + 0.5 * rates[..., 1]),
+    }
+
+    if n_boot > 0 and len(frame):
+        rng = np.random.default_rng(seed)
+        draws = rng.multinomial(n, rates, size=(n_boot, *n.shape)) / np.maximum(n, 1)[..., None]
+        tail = (1.0 - confidence) / 2
+        for name, replicates in (
+            ("win", draws[..., 2]),
+            ("score", 100.0 * (draws[..., 2] + 0.5 * draws[..., 1])),
+        ):
+            low, high = np.quantile(replicates, [tail, 1.0 - tail], axis=0)
+            result[f"{name}_low"], result[f"{name}_high"] = low, high
+
+    if by:
+        index = pd.MultiIndex.from_tuples(
+            [(*key, metric) for key in keys for metric in METRICS], names=[*by, "metric"]
+        )
+    else:
+        index = pd.Index(METRICS, name="metric")
+    return pd.DataFrame({name: values.ravel() for name, values in result.items()}, index=index)
+
+
+def format_table(table: pd.DataFrame) -> str:
+    """Plain-text rendering of a :func:`win_rates` table."""
+    shown = table.copy()
+    for column in ("win", "tie", "loss", "win_low", "win_high"):
+        if column in shown:
+            shown[column] = shown[column].map("{:.0%}".format)
+    for column in ("score", "score_low", "score_high"):
+        if column in shown:
+            shown[column] = shown[column].map("{:.1f}".format)
+    return shown.to_string()
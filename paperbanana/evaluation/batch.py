@@ -0,0 +1,225 @@
+"""Concurrent, resumable evaluation of many generated images.
+
+A manifest lists (generated, reference, context, caption) tasks. All tasks
+share one judge (and so one provider); at most ``max_concurrency`` are
+judged at once. Each finished task is appended to a JSONL file as soon as
+it completes, so a crashed or interrupted batch resumes where it stopped:
+tasks whose id already has a successful record are skipped, failed ones
+are retried.
+
+Manifest format (JSON Lines, or a JSON list), paths relative to the
+manifest::
+
+    {"id": "paper1", "generated": "out/p1.png", "reference": "refs/p1.jpg",
+     "context": "We propose ...", "caption": "Overview of ..."}
+
+``context_file`` may be given instead of ``context``. Any other fields are
+copied into the result record (e.g. ``category`` or ``model`` for grouping).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import structlog
+from pydantic import BaseModel, Field
+
+from paperbanana.evaluation.judge import VLMJudge
+
+logger = structlog.get_logger()
+
+_TASK_FIELDS = {"id", "generated", "reference", "context", "context_file", "caption"}
+
+
+class EvaluationTask(BaseModel):
+    """One generated image to judge against its reference."""
+
+    id: str
+    generated: str
+    reference: str
+    context: str
+    caption: str
+    metadata: dict[str, Any] = Field(default_factory=dict)
+
+
+class BatchStats(BaseModel):
+    """Outcome and throughput of a batch evaluation run."""
+
+    total: int
+    skipped: int = 0
+    completed: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+    latencies: list[float] = Field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        """Evaluations finished per minute in this run."""
+        return 60.0 * self.completed / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        """Human-readable summary lines."""
+        lines = [
+            f"Tasks:       {self.total} ({self.skipped} already done)",
+            f"Completed:   {self.completed}",
+            f"Failed:      {self.failed}",
+            f"Wall time:   {self.seconds:.1f}s",
+            f"Throughput:  {self.throughput:.1f} evaluations/min",
+        ]
+        if self.latencies:
+            ordered = sorted(self.latencies)
+            p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+            lines.append(
+                f"Latency:     mean {statistics.mean(ordered):.2f}s, "
+                f"p50 {statistics.median(ordered):.2f}s, p95 {p95:.2f}s"
+            )
+        return "\n".join(lines)
+
+
+def load_manifest(path: str | Path) -> list[EvaluationTask]:
+    """Read evaluation tasks from a JSONL or JSON-list manifest.
+
+    Raises:
+        ValueError: If a task lacks a required field or ids repeat.
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        entries = json.loads(text)
+    else:
+        entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    base = path.parent
+    tasks = []
+    for n, entry in enumerate(entries, start=1):
+        missing = {"generated", "reference", "caption"} - set(entry)
+        if "context" not in entry and "context_file" not in entry:
+            missing.add("context")
+        if missing:
+            raise ValueError(f"Manifest entry {n} is missing: {', '.join(sorted(missing))}")
+        context = entry.get("context")
+        if context is None:
+            context = (base / entry["context_file"]).read_text(encoding="utf-8")
+        tasks.append(
+            EvaluationTask(
+                id=str(entry.get("id", entry["generated"])),
+                generated=str(base / entry["generated"]),
+                reference=str(base / entry["reference"]),
+                context=context,
+                caption=entry["caption"],
+                metadata={k: v for k, v in entry.items() if k not in _TASK_FIELDS},
+            )
+        )
+    ids = [task.id for task in tasks]
+    if len(set(ids)) != len(ids):
+        raise ValueError("Manifest task ids must be unique")
+    return tasks
+
+
+def read_results(path: str | Path) -> dict[str, dict]:
+    """Successful result records in a JSONL output file, by task id.
+
+    A line cut short by a crash is ignored (and dropped from the file, so
+    that appending resumes on a clean line).
+    """
+    path = Path(path)
+    if not path.exists():
+        return {}
+    data = path.read_bytes()
+    if data and not data.endswith(b"\n"):
+        data = data[: data.rfind(b"\n") + 1]
+        path.write_bytes(data)
+    results = {}
+    for line in data.decode("utf-8").splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(record, dict) and "scores" in record:
+            results[record["id"]] = record
+    return results
+
+
+class BatchEvaluator:
+    """Judges many tasks concurrently with one shared judge.
+
+    Args:
+        judge: The judge (and, through it, the provider) all tasks share.
+        max_concurrency: Tasks judged at once. Each task makes up to four
+            VLM calls of its own, bounded by the judge's own concurrency.
+    """
+
+    def __init__(self, judge: VLMJudge, max_concurrency: int = 4):
+        self.judge = judge
+        self.max_concurrency = max(1, max_concurrency)
+
+    async def run(
+        self,
+        tasks: list[EvaluationTask],
+        output_path: str | Path,
+        resume: bool = True,
+        on_result: Optional[Callable[[dict], None]] = None,
+    ) -> BatchStats:
+        """Judge every task not yet in output_path, appending results as they finish.
+
+        Args:
+            tasks: Tasks to judge.
+            output_path: JSONL file receiving one record per finished task.
+            resume: Skip tasks that already have a successful record; with
+                False the file is overwritten.
+            on_result: Called with each record as it is written.
+
+        Returns:
+            Counts, wall time and per-task latencies of this run.
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        done = read_results(output_path) if resume else {}
+        pending = [task for task in tasks if task.id not in done]
+        stats = BatchStats(total=len(tasks), skipped=len(tasks) - len(pending))
+        logger.info("Batch evaluation", pending=len(pending), skipped=stats.skipped)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        start = time.perf_counter()
+        with open(output_path, "a" if resume else "w", encoding="utf-8") as out:
+
+            async def evaluate(task: EvaluationTask) -> None:
+                async with semaphore:
+                    task_start = time.perf_counter()
+                    try:
+                        scores = await self.judge.evaluate(
+                            image_path=task.generated,
+                            source_context=task.context,
+                            caption=task.caption,
+                            reference_path=task.reference,
+                        )
+                    except Exception as e:
+                        logger.warning("Evaluation failed", id=task.id, error=str(e))
+                        record = {"id": task.id, "error": f"{type(e).__name__}: {e}"}
+                        stats.failed += 1
+                    else:
+                        seconds = time.perf_counter() - task_start
+                        record = {
+                            "id": task.id,
+                            "generated": task.generated,
+                            "reference": task.reference,
+                            **task.metadata,
+                            "scores": scores.model_dump(),
+                            "seconds": round(seconds, 3),
+                        }
+                        stats.completed += 1
+                        stats.latencies.append(seconds)
+                # One line per write on the event loop thread: lines never interleave
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                if on_result is not None:
+                    on_result(record)
+
+            await asyncio.gather(*(evaluate(task) for task in pending))
+        stats.seconds = time.perf_counter() - start
+        return stats
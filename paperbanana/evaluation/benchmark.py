@@ -0,0 +1,328 @@
+"""End-to-end benchmark: generate a diagram for each reference example and judge it.
+
+For every :class:`~paperbanana.core.types.ReferenceExample`, the pipeline
+generates a methodology diagram from the example's ``source_context`` and
+``caption``, and :class:`~paperbanana.evaluation.judge.VLMJudge` compares
+it with the example's human-drawn ``image_path``. Each example records
+per-stage latency (from the run's timing metadata), VLM calls and token
+estimates per agent, image-model calls, and the judge's verdicts; the
+report aggregates them into latency percentiles, token totals and win rates.
+
+Providers are passed in, so the same benchmark runs against live models,
+against :mod:`paperbanana.providers.offline` recordings, or against fakes
+for performance regression tracking without network access.
+
+Retrieval draws from ``settings.reference_set_path``. When that is the
+benchmarked store, an example may retrieve itself; point it at a separate
+store for a leakage-free measurement.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import structlog
+
+from paperbanana.core.cache import SQLiteCache
+from paperbanana.core.config import Settings
+from paperbanana.core.types import GenerationInput, ReferenceExample
+from paperbanana.evaluation.aggregate import config_id
+from paperbanana.evaluation.judge import DIMENSIONS, VLMJudge
+from paperbanana.providers.base import ImageGenProvider, VLMProvider
+
+logger = structlog.get_logger()
+
+# Agents whose VLM calls are metered separately.
+AGENT_STAGES = ("retriever", "planner", "stylist", "visualizer", "critic")
+
+# Token estimates: providers do not report usage uniformly, so text is
+# counted at ~4 characters per token and each image at a flat rate
+# (Gemini's charge for one image tile).
+_CHARS_PER_TOKEN = 4
+_IMAGE_TOKENS = 258
+
+
+class _Meter:
+    """Calls, seconds and estimated tokens of one stage."""
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "seconds": round(self.seconds, 3),
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+        }
+
+
+class MeteredVLM:
+    """Delegates to a VLM provider, metering every call."""
+
+    def __init__(self, vlm: VLMProvider, meter: _Meter):
+        self.vlm = vlm
+        self.meter = meter
+        self.name = vlm.name
+        self.model_name = vlm.model_name
+
+    def supports_encoded_images(self) -> bool:
+        supports = getattr(self.vlm, "supports_encoded_images", None)
+        return bool(supports and supports())
+
+    async def generate(self, prompt: str, images=None, **kwargs) -> str:
+        start = time.perf_counter()
+        response = await self.vlm.generate(prompt, images=images, **kwargs)
+        self.meter.calls += 1
+        self.meter.seconds += time.perf_counter() - start
+        self.meter.input_tokens += len(prompt) // _CHARS_PER_TOKEN + _IMAGE_TOKENS * len(
+            images or []
+        )
+        self.meter.output_tokens += len(response) // _CHARS_PER_TOKEN
+        return response
+
+
+class MeteredImageGen:
+    """Delegates to an image provider, metering generate and edit calls."""
+
+    def __init__(self, image_gen: ImageGenProvider, meter: _Meter):
+        self.image_gen = image_gen
+        self.meter = meter
+        self.name = image_gen.name
+        self.model_name = image_gen.model_name
+
+    def supports_editing(self) -> bool:
+        supports = getattr(self.image_gen, "supports_editing", None)
+        return bool(supports and supports())
+
+    async def generate(self, *args, **kwargs):
+        return await self._timed(self.image_gen.generate(*args, **kwargs))
+
+    async def edit(self, *args, **kwargs):
+        return await self._timed(self.image_gen.edit(*args, **kwargs))
+
+    async def _timed(self, call):
+        start = time.perf_counter()
+        try:
+            return await call
+        finally:
+            self.meter.calls += 1
+            self.meter.seconds += time.perf_counter() - start
+
+
+def stage_latency(timing: dict) -> dict[str, float]:
+    """Seconds per pipeline stage from a run's ``metadata["timing"]``."""
+    iterations = timing.get("iterations", [])
+    return {
+        "retrieval": timing.get("retrieval_seconds", 0.0),
+        "planning": timing.get("planning_seconds", 0.0),
+        "styling": timing.get("styling_seconds", 0.0),
+        "visualizer": sum(it.get("visualizer_seconds", 0.0) for it in iterations)
+        + timing.get("final_render_seconds", 0.0),
+        "critic": sum(it.get("critic_seconds", 0.0) for it in iterations),
+        "total": timing.get("total_seconds", 0.0),
+    }
+
+
+class BenchmarkRunner:
+    """Runs generate-then-judge over reference examples with bounded parallelism.
+
+    Args:
+        settings: Pipeline settings for every run (``output_dir`` is
+            replaced by the benchmark's own run directory).
+        vlm: Provider for the pipeline agents.
+        image_gen: Provider for diagram images.
+        judge_vlm: Provider for the judge (defaults to ``vlm``).
+        parallelism: Examples in flight at once.
+        judge_mode: ``VLMJudge`` mode.
+        judge_cache: Verdict cache shared by the judges, so repeated
+            benchmarks only judge new image pairs; None judges everything.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        vlm: VLMProvider,
+        image_gen: ImageGenProvider,
+        judge_vlm: Optional[VLMProvider] = None,
+        parallelism: int = 2,
+        judge_mode: str = "parallel",
+        judge_cache: Optional[SQLiteCache] = None,
+    ):
+        self.settings = settings
+        self.vlm = vlm
+        self.image_gen = image_gen
+        self.judge_vlm = judge_vlm or vlm
+        self.parallelism = max(1, parallelism)
+        self.judge_mode = judge_mode
+        self.judge_cache = judge_cache
+
+    async def run(
+        self,
+        examples: list[ReferenceExample],
+        output_dir: str | Path,
+        on_result: Optional[Callable[[dict], None]] = None,
+    ) -> dict[str, Any]:
+        """Benchmark every example; write results.jsonl and report.json to output_dir.
+
+        Returns:
+            The report (also written as report.json).
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        settings = self.settings.model_copy(update={"output_dir": str(output_dir / "runs")})
+        semaphore = asyncio.Semaphore(self.parallelism)
+        records: list[dict] = []
+
+        start = time.perf_counter()
+        with open(output_dir / "results.jsonl", "w", encoding="utf-8") as out:
+
+            async def bench(example: ReferenceExample) -> None:
+                async with semaphore:
+                    record = await self._run_example(example, settings)
+                records.append(record)
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                if on_result is not None:
+                    on_result(record)
+
+            await asyncio.gather(*(bench(example) for example in examples))
+        wall_seconds = time.perf_counter() - start
+
+        report = summarize(records, wall_seconds)
+        report["settings"] = {
+            "parallelism": self.parallelism,
+            "judge_mode": self.judge_mode,
+            "vlm": f"{self.vlm.name}/{self.vlm.model_name}",
+            "image": f"{self.image_gen.name}/{self.image_gen.model_name}",
+            "judge": f"{self.judge_vlm.name}/{self.judge_vlm.model_name}",
+        }
+        (output_dir / "report.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+        return report
+
+    async def _run_example(self, example: ReferenceExample, settings: Settings) -> dict:
+        from paperbanana.core.pipeline import PaperBananaPipeline
+
+        meters = {stage: _Meter() for stage in (*AGENT_STAGES, "image", "judge")}
+        record: dict[str, Any] = {"id": example.id, "category": example.category}
+        try:
+            pipeline = PaperBananaPipeline(
+                settings=settings,
+                vlm_client=self.vlm,
+                image_gen_fn=MeteredImageGen(self.image_gen, meters["image"]),
+            )
+            for stage in AGENT_STAGES:
+                getattr(pipeline, stage).vlm = MeteredVLM(self.vlm, meters[stage])
+            output = await pipeline.generate(
+                GenerationInput(
+                    source_context=example.source_context,
+                    communicative_intent=example.caption,
+                )
+            )
+            record["run_id"] = pipeline.run_id
+            record["model"] = f"{self.vlm.name}/{self.vlm.model_name}"
+            record["config"] = config_id(output.metadata.get("config_snapshot", {}))
+            record["iterations"] = len(output.iterations)
+            record["latency"] = stage_latency(output.metadata.get("timing", {}))
+
+            judge = VLMJudge(
+                MeteredVLM(self.judge_vlm, meters["judge"]),
+                prompt_dir=str(pipeline.critic.prompt_dir),
+                mode=self.judge_mode,
+                cache=self.judge_cache,
+            )
+            judge_start = time.perf_counter()
+            scores = await judge.evaluate(
+                image_path=output.image_path,
+                source_context=example.source_context,
+                caption=example.caption,
+                reference_path=example.image_path,
+            )
+            record["latency"]["judge"] = time.perf_counter() - judge_start
+            record["scores"] = scores.model_dump()
+        except Exception as e:
+            logger.warning("Benchmark example failed", id=example.id, error=str(e))
+            record["error"] = f"{type(e).__name__}: {e}"
+        record["usage"] = {stage: meter.as_dict() for stage, meter in meters.items()}
+        return record
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0}
+    ordered = sorted(values)
+    return {
+        "mean": round(statistics.mean(ordered), 3),
+        "p50": round(statistics.median(ordered), 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 3),
+    }
+
+
+def summarize(records: list[dict], wall_seconds: float = 0.0) -> dict[str, Any]:
+    """Aggregate benchmark records into latency, usage and win-rate figures."""
+    ok = [r for r in records if "scores" in r]
+    report: dict[str, Any] = {
+        "examples": len(records),
+        "succeeded": len(ok),
+        "failed": len(records) - len(ok),
+        "wall_seconds": round(wall_seconds, 3),
+        "examples_per_minute": round(60.0 * len(ok) / wall_seconds, 2) if wall_seconds else 0.0,
+    }
+
+    # Pipeline order, judge last
+    stages = list(dict.fromkeys(stage for r in ok for stage in r["latency"]))
+    report["latency"] = {
+        stage: _percentiles([r["latency"][stage] for r in ok if stage in r["latency"]])
+        for stage in stages
+    }
+
+    usage: dict[str, dict[str, int]] = {}
+    for r in records:
+        for stage, meter in r.get("usage", {}).items():
+            total = usage.setdefault(stage, {"calls": 0, "input_tokens": 0, "output_tokens": 0})
+            for field in total:
+                total[field] += meter[field]
+    report["usage"] = usage
+
+    def rates(winners: list[str]) -> dict[str, float]:
+        n = len(winners) or 1
+        model, human = winners.count("Model"), winners.count("Human")
+        return {
+            "win": round(model / n, 4),
+            "loss": round(human / n, 4),
+            "tie": round((len(winners) - model - human) / n, 4),
+        }
+
+    report["win_rate"] = {
+        "overall": rates([r["scores"]["overall_winner"] for r in ok]),
+        **{dim: rates([r["scores"][dim]["winner"] for r in ok]) for dim in DIMENSIONS},
+    }
+    return report
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """Plain-text rendering of a benchmark report."""
+    lines = [
+        f"Examples:    {report['examples']} ({report['failed']} failed)",
+        f"Wall time:   {report['wall_seconds']:.1f}s "
+        f"({report['examples_per_minute']:.1f} examples/min)",
+        "",
+        f"{'stage':<12}{'mean s':>9}{'p50 s':>9}{'p95 s':>9}",
+    ]
+    for stage, p in report["latency"].items():
+        lines.append(f"{stage:<12}{p['mean']:>9.2f}{p['p50']:>9.2f}{p['p95']:>9.2f}")
+    lines += ["", f"{'usage':<12}{'calls':>7}{'in tok':>10}{'out tok':>10}"]
+    for stage, u in report["usage"].items():
+        lines.append(f"{stage:<12}{u['calls']:>7}{u['input_tokens']:>10}{u['output_tokens']:>10}")
+    lines += ["", f"{'win rate':<14}{'win':>7}{'tie':>7}{'loss':>7}"]
+    for name, r in report["win_rate"].items():
+        lines.append(f"{name:<14}{r['win']:>7.0%}{r['tie']:>7.0%}{r['loss']:>7.0%}")
+    return "\n".join(lines)
@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
+import re
 from pathlib import Path
 from typing import Optional
 
 import structlog
 
+from paperbanana.core.cache import SQLiteCache, cache_key, open_cache
+from paperbanana.core.config import Settings
 from paperbanana.core.types import (
     VALID_WINNERS,
     WINNER_SCORE_MAP,
@@ -25,6 +30,29 @@ DIMENSIONS = ["faithfulness", "conciseness", "readability", "aesthetics"]
 PRIMARY_DIMENSIONS = ["faithfulness", "readability"]
 SECONDARY_DIMENSIONS = ["conciseness", "aesthetics"]
 
+# "parallel": one call per dimension, run concurrently; "single": one call
+# judging every dimension, with per-dimension calls for any it fails to answer
+JUDGE_MODES = ("parallel", "single")
+
+# The dimension-specific part of each evaluation prompt (definition, veto
+# rules, decision criteria), reused by the single-call prompt
+_CRITERIA = re.compile(r"^## Core Definition.*?(?=^## Output Format)", re.S | re.M)
+
+# Reasoning of the tie recorded when a response cannot be parsed; such
+# results are never cached
+_UNPARSED_REASONING = "Could not parse evaluation response."
+
+
+def _file_digest(path: str | Path) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def open_judge_cache(settings: Settings) -> Optional[SQLiteCache]:
+    """The verdict cache configured in settings, or None if it is disabled or unavailable."""
+    if not settings.judge_cache:
+        return None
+    return open_cache(settings.cache_dir, "judge", settings.judge_cache_max_entries)
+
 
 class VLMJudge:
     """Evaluates generated illustrations using a VLM as judge.
@@ -34,11 +62,41 @@ class VLMJudge:
     - Four dimensions: Faithfulness, Conciseness, Readability, Aesthetics
     - Hierarchical aggregation: Primary (Faithfulness + Readability) then
       Secondary (Conciseness + Aesthetics)
+
+    Dimensions are judged concurrently, one call each, or with
+    ``mode="single"`` in one call whose unanswered dimensions are then
+    judged separately.
+
+    With a cache, each dimension's result is stored under the content
+    hashes of both images, the dimension, the source context and caption,
+    a hash of the prompt template(s) that produced it and the judge model,
+    so re-evaluating an unchanged image pair costs no VLM calls, while
+    editing a prompt or switching models does.
+
+    Args:
+        vlm_provider: VLM used as the judge.
+        prompt_dir: Directory holding the ``evaluation`` prompts.
+        mode: One of ``JUDGE_MODES``.
+        max_concurrency: Dimension calls in flight at once (1 evaluates
+            them sequentially).
+        cache: Persistent store for dimension results; None disables caching.
     """
 
-    def __init__(self, vlm_provider: VLMProvider, prompt_dir: str = "prompts"):
+    def __init__(
+        self,
+        vlm_provider: VLMProvider,
+        prompt_dir: str = "prompts",
+        mode: str = "parallel",
+        max_concurrency: int = 4,
+        cache: Optional[SQLiteCache] = None,
+    ):
+        if mode not in JUDGE_MODES:
+            raise ValueError(f"Unknown judge mode: {mode}. Available: {', '.join(JUDGE_MODES)}")
         self.vlm = vlm_provider
         self.prompt_dir = Path(prompt_dir)
+        self.mode = mode
+        self.max_concurrency = max(1, max_concurrency)
+        self.cache = cache
 
     async def evaluate(
         self,
@@ -58,28 +116,30 @@ class VLMJudge:
         Returns:
             EvaluationScore with comparative results and hierarchical overall.
         """
-        model_image = load_image(image_path)
-        reference_image = load_image(reference_path)
-
-        # Both images: [Human reference, Model generated]
-        images = [reference_image, model_image]
-
+        inputs = None
         results: dict[str, DimensionResult] = {}
-
-        for dim in DIMENSIONS:
-            logger.info("Evaluating dimension", dimension=dim)
-
-            prompt = self._load_eval_prompt(dim, source_context, caption)
-
-            response = await self.vlm.generate(
-                prompt=prompt,
-                images=images,
-                temperature=0.1,
-                max_tokens=1024,
-                response_format="json",
+        if self.cache is not None:
+            inputs = (
+                _file_digest(image_path),
+                _file_digest(reference_path),
+                cache_key(source_context, caption),
             )
-
-            results[dim] = self._parse_result(response, dim)
+            results = self._cached_results(inputs)
+
+        missing = [dim for dim in DIMENSIONS if dim not in results]
+        if missing:
+            # Both images: [Human reference, Model generated]
+            images = [load_image(reference_path), load_image(image_path)]
+            judged: dict[str, DimensionResult] = {}
+            if self.mode == "single":
+                judged = await self._evaluate_combined(images, source_context, caption)
+                self._store(inputs, judged, "all_dimensions")
+            rest = [dim for dim in missing if dim not in judged]
+            if rest:
+                separate = await self._evaluate_dimensions(rest, images, source_context, caption)
+                self._store(inputs, separate)
+                judged.update(separate)
+            results.update({dim: judged[dim] for dim in missing})
 
         # Hierarchical aggregation
         overall_winner = self._hierarchical_aggregate(results)
@@ -94,14 +154,128 @@ class VLMJudge:
             overall_score=overall_score,
         )
 
+    def _prompt_hash(self, dimension: str, *wrappers: str) -> str:
+        """Hash of the templates a dimension's verdict is produced from."""
+        return cache_key(*(self._read_prompt(name) for name in (*wrappers, dimension)))
+
+    def _result_key(self, inputs: tuple[str, str, str], dimension: str, prompt_hash: str) -> str:
+        model = f"{getattr(self.vlm, 'name', '')}/{getattr(self.vlm, 'model_name', '')}"
+        return cache_key("judge", *inputs, dimension, prompt_hash, model)
+
+    def _cached_results(self, inputs: tuple[str, str, str]) -> dict[str, DimensionResult]:
+        """Cached results for these inputs, from the mode's own prompt first."""
+        wrappers = [("all_dimensions",), ()] if self.mode == "single" else [()]
+        results = {}
+        for dim in DIMENSIONS:
+            for wrapper in wrappers:
+                cached = self.cache.get(
+                    self._result_key(inputs, dim, self._prompt_hash(dim, *wrapper))
+                )
+                if cached is not None:
+                    results[dim] = DimensionResult.model_validate(cached)
+                    break
+        if results:
+            logger.info("Judge cache hit", dimensions=sorted(results))
+        return results
+
+    def _store(
+        self,
+        inputs: Optional[tuple[str, str, str]],
+        results: dict[str, DimensionResult],
+        *wrappers: str,
+    ) -> None:
+        if inputs is None:
+            return
+        for dim, result in results.items():
+            if result.reasoning != _UNPARSED_REASONING:
+                key = self._result_key(inputs, dim, self._prompt_hash(dim, *wrappers))
+                self.cache.set(key, result.model_dump())
+
+    async def _evaluate_dimensions(
+        self, dimensions: list[str], images: list, source_context: str, caption: str
+    ) -> dict[str, DimensionResult]:
+        """Judge each dimension with its own call, at most max_concurrency at once."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def judge(dim: str) -> DimensionResult:
+            prompt = self._load_eval_prompt(dim, source_context, caption)
+            async with semaphore:
+                logger.info("Evaluating dimension", dimension=dim)
+                response = await self.vlm.generate(
+                    prompt=prompt,
+                    images=images,
+                    temperature=0.1,
+                    max_tokens=1024,
+                    response_format="json",
+                )
+            return self._parse_result(response, dim)
+
+        results = await asyncio.gather(*(judge(dim) for dim in dimensions))
+        return dict(zip(dimensions, results))
+
+    async def _evaluate_combined(
+        self, images: list, source_context: str, caption: str
+    ) -> dict[str, DimensionResult]:
+        """Judge every dimension in one call.
+
+        Returns:
+            Results for the dimensions the response answered validly; the
+            caller evaluates the rest separately.
+        """
+        criteria = "\n\n".join(
+            f"## Dimension: {dim.capitalize()}\n\n{self._load_criteria(dim)}" for dim in DIMENSIONS
+        )
+        template = self._read_prompt("all_dimensions")
+        prompt = template.format(source_context=source_context, caption=caption, criteria=criteria)
+
+        logger.info("Evaluating all dimensions in one call")
+        response = await self.vlm.generate(
+            prompt=prompt,
+            images=images,
+            temperature=0.1,
+            max_tokens=4096,
+            response_format="json",
+        )
+        results = self._parse_combined(response)
+        if len(results) < len(DIMENSIONS):
+            logger.warning(
+                "Combined evaluation incomplete, judging remaining dimensions separately",
+                missing=[dim for dim in DIMENSIONS if dim not in results],
+            )
+        return results
+
+    def _parse_combined(self, response: str) -> dict[str, DimensionResult]:
+        """Parse a combined response; dimensions without a valid winner are left out."""
+        try:
+            data = json.loads(response)
+        except (json.JSONDecodeError, TypeError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        results = {}
+        for dim in DIMENSIONS:
+            entry = data.get(dim)
+            if isinstance(entry, dict) and entry.get("winner") in VALID_WINNERS:
+                results[dim] = self._parse_result(json.dumps(entry), dim)
+        return results
+
     def _load_eval_prompt(self, dimension: str, source_context: str, caption: str) -> str:
         """Load evaluation prompt for a specific dimension."""
-        prompt_path = self.prompt_dir / "evaluation" / f"{dimension}.txt"
+        template = self._read_prompt(dimension)
+        return template.format(source_context=source_context, caption=caption)
+
+    def _load_criteria(self, dimension: str) -> str:
+        """A dimension's definition and decision rules, headings demoted a level."""
+        template = self._read_prompt(dimension)
+        match = _CRITERIA.search(template)
+        section = match.group(0) if match else template
+        return re.sub(r"^## ", "### ", section.strip(), flags=re.M)
+
+    def _read_prompt(self, name: str) -> str:
+        prompt_path = self.prompt_dir / "evaluation" / f"{name}.txt"
         if not prompt_path.exists():
             raise FileNotFoundError(f"Evaluation prompt not found: {prompt_path}")
-
-        template = prompt_path.read_text(encoding="utf-8")
-        return template.format(source_context=source_context, caption=caption)
+        return prompt_path.read_text(encoding="utf-8")
 
     def _parse_result(self, response: str, dimension: str) -> DimensionResult:
         """Parse a comparative result from VLM response."""
@@ -130,7 +304,7 @@ class VLMJudge:
             return DimensionResult(
                 winner="Both are good",
                 score=50.0,
-                reasoning="Could not parse evaluation response.",
+                reasoning=_UNPARSED_REASONING,
             )
 
     def _hierarchical_aggregate(self, results: dict[str, DimensionResult]) -> str:
@@ -7,6 +7,8 @@ from typing import Optional
 
 from PIL import Image
 
+from paperbanana.core.types import EncodedImage
+
 
 class VLMProvider(ABC):
     """Abstract interface for Vision-Language Model providers.
@@ -31,7 +33,7 @@ class VLMProvider(ABC):
     async def generate(
         self,
         prompt: str,
-        images: Optional[list[Image.Image]] = None,
+        images: Optional[list[Image.Image | EncodedImage]] = None,
         system_prompt: Optional[str] = None,
         temperature: float = 1.0,
         max_tokens: int = 4096,
@@ -41,7 +43,10 @@ class VLMProvider(ABC):
 
         Args:
             prompt: The user prompt text.
-            images: Optional list of images for vision tasks.
+            images: Optional list of images for vision tasks. EncodedImage
+                entries are only passed to providers whose
+                ``supports_encoded_images`` is True, and are uploaded
+                without re-encoding.
             system_prompt: Optional system-level instructions.
             temperature: Sampling temperature (0.0 to 2.0).
             max_tokens: Maximum tokens in the response.
@@ -52,6 +57,10 @@ class VLMProvider(ABC):
         """
         ...
 
+    def supports_encoded_images(self) -> bool:
+        """Check if ``generate`` accepts EncodedImage entries in ``images``."""
+        return False
+
     def is_available(self) -> bool:
         """Check if this provider is configured and available."""
         return True
@@ -99,6 +108,36 @@ class ImageGenProvider(ABC):
         """
         ...
 
+    async def edit(
+        self,
+        image: Image.Image,
+        prompt: str,
+        width: int = 1024,
+        height: int = 1024,
+        seed: Optional[int] = None,
+    ) -> Image.Image:
+        """Edit an existing image according to a text instruction.
+
+        Providers that support image editing override this together with
+        ``supports_editing``; the default raises NotImplementedError so
+        callers can fall back to full regeneration.
+
+        Args:
+            image: The image to edit.
+            prompt: Instructions describing the changes to make.
+            width: Output image width in pixels.
+            height: Output image height in pixels.
+            seed: Random seed for reproducibility.
+
+        Returns:
+            Edited PIL Image.
+        """
+        raise NotImplementedError(f"{self.name} does not support image editing")
+
+    def supports_editing(self) -> bool:
+        """Check if this provider implements ``edit``."""
+        return False
+
     def is_available(self) -> bool:
         """Check if this provider is configured and available."""
         return True
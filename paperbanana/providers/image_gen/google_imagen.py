@@ -75,6 +75,17 @@ class GoogleImagenGen(ImageGenProvider):
             return "2K"
         return "4K"
 
+    def _config(self, width: int, height: int):
+        from google.genai import types
+
+        return types.GenerateContentConfig(
+            response_modalities=["IMAGE"],
+            image_config=types.ImageConfig(
+                aspect_ratio=self._aspect_ratio(width, height),
+                image_size=self._image_size(width, height),
+            ),
+        )
+
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=10))
     async def generate(
         self,
@@ -84,27 +95,50 @@ class GoogleImagenGen(ImageGenProvider):
         height: int = 1024,
         seed: Optional[int] = None,
     ) -> Image.Image:
-        from google.genai import types
-
         self._get_client()
 
         if negative_prompt:
             prompt = f"{prompt}\n\nAvoid: {negative_prompt}"
 
-        config = types.GenerateContentConfig(
-            response_modalities=["IMAGE"],
-            image_config=types.ImageConfig(
-                aspect_ratio=self._aspect_ratio(width, height),
-                image_size=self._image_size(width, height),
-            ),
+        response = self._client.models.generate_content(
+            model=self._model,
+            contents=prompt,
+            config=self._config(width, height),
         )
+        return self._extract_image(response)
+
+    def supports_editing(self) -> bool:
+        return True
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=10))
+    async def edit(
+        self,
+        image: Image.Image,
+        prompt: str,
+        width: int = 1024,
+        height: int = 1024,
+        seed: Optional[int] = None,
+    ) -> Image.Image:
+        from google.genai import types
+
+        self._get_client()
+
+        buffer = BytesIO()
+        image.save(buffer, format="PNG")
+        contents = [
+            types.Part.from_bytes(data=buffer.getvalue(), mime_type="image/png"),
+            prompt,
+        ]
 
         response = self._client.models.generate_content(
             model=self._model,
-            contents=prompt,
-            config=config,
+            contents=contents,
+            config=self._config(width, height),
         )
+        return self._extract_image(response)
 
+    def _extract_image(self, response) -> Image.Image:
+        """Pull the first image out of a Gemini generate_content response."""
         parts = None
         if getattr(response, "candidates", None):
             parts = response.candidates[0].content.parts
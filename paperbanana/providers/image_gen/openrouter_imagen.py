@@ -11,6 +11,7 @@ import structlog
 from PIL import Image
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from paperbanana.core.utils import image_to_base64
 from paperbanana.providers.base import ImageGenProvider
 
 logger = structlog.get_logger()
@@ -85,8 +86,6 @@ class OpenRouterImageGen(ImageGenProvider):
         height: int = 1024,
         seed: Optional[int] = None,
     ) -> Image.Image:
-        client = self._get_client()
-
         # OpenRouter doesn't have native aspect-ratio params like the Google SDK,
         # so we bake the desired format into the prompt itself.
         aspect_hint = self._aspect_ratio_hint(width, height)
@@ -106,6 +105,52 @@ class OpenRouterImageGen(ImageGenProvider):
         if seed is not None:
             payload["seed"] = seed
 
+        return await self._request(payload)
+
+    def supports_editing(self) -> bool:
+        return True
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=30))
+    async def edit(
+        self,
+        image: Image.Image,
+        prompt: str,
+        width: int = 1024,
+        height: int = 1024,
+        seed: Optional[int] = None,
+    ) -> Image.Image:
+        aspect_hint = self._aspect_ratio_hint(width, height)
+        b64 = image_to_base64(image)
+
+        payload = {
+            "model": self._model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "image_url",
+                            "image_url": {"url": f"data:image/png;base64,{b64}"},
+                        },
+                        {
+                            "type": "text",
+                            "text": f"{prompt}\n\nKeep the {aspect_hint} of the original image.",
+                        },
+                    ],
+                },
+            ],
+            "modalities": ["image", "text"],
+        }
+
+        if seed is not None:
+            payload["seed"] = seed
+
+        return await self._request(payload)
+
+    async def _request(self, payload: dict) -> Image.Image:
+        """POST a chat completion and decode the image from the reply."""
+        client = self._get_client()
+
         response = await client.post("/chat/completions", json=payload)
         response.raise_for_status()
         data = response.json()
@@ -0,0 +1,267 @@
+"""Providers that run without network access, for tests and benchmarks.
+
+- :class:`FakeVLM` / :class:`FakeImageGen` answer instantly (or after a
+  fixed simulated latency) with deterministic, well-formed responses:
+  every JSON response satisfies the retriever, critic and judge parsers,
+  and images are simple block diagrams that pass the quality gate.
+- :class:`RecordedVLM` / :class:`RecordedImageGen` replay responses stored
+  in a :class:`~paperbanana.core.cache.SQLiteCache`, keyed by a hash of the
+  request. With a ``live`` provider, misses are forwarded to it and
+  recorded, so one run against real models records a cassette that later
+  runs replay offline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import io
+import json
+import re
+from typing import Optional
+
+from PIL import Image, ImageDraw
+
+from paperbanana.core.cache import SQLiteCache, cache_key
+from paperbanana.core.types import EncodedImage
+from paperbanana.providers.base import ImageGenProvider, VLMProvider
+
+_WINNERS = ["Model", "Human", "Both are good", "Both are bad"]
+_DIMENSIONS = ["faithfulness", "conciseness", "readability", "aesthetics"]
+_DESCRIPTION = (
+    "A left-to-right pipeline: an input encoder box feeds a transformer block, "
+    "whose output passes through a decoder box to the prediction."
+)
+
+
+def _image_digest(image: Image.Image | EncodedImage) -> str:
+    if isinstance(image, EncodedImage):
+        return hashlib.sha256(image.data).hexdigest()
+    digest = hashlib.sha256(f"{image.mode}{image.size}".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def _vlm_key(
+    prompt: str,
+    images: Optional[list],
+    system_prompt: Optional[str],
+    response_format: Optional[str],
+) -> str:
+    return cache_key(
+        "vlm",
+        prompt,
+        [_image_digest(image) for image in images or []],
+        system_prompt,
+        response_format,
+    )
+
+
+class FakeVLM(VLMProvider):
+    """Deterministic offline VLM.
+
+    Args:
+        latency: Seconds each call sleeps, to simulate a remote model.
+        revision_rate: Fraction of critiques that request a revision.
+    """
+
+    def __init__(self, latency: float = 0.0, revision_rate: float = 0.0):
+        self.latency = latency
+        self.revision_rate = revision_rate
+
+    @property
+    def name(self) -> str:
+        return "fake"
+
+    @property
+    def model_name(self) -> str:
+        return "fake-vlm"
+
+    def supports_encoded_images(self) -> bool:
+        return True
+
+    async def generate(
+        self,
+        prompt: str,
+        images: Optional[list[Image.Image | EncodedImage]] = None,
+        system_prompt: Optional[str] = None,
+        temperature: float = 1.0,
+        max_tokens: int = 4096,
+        response_format: Optional[str] = None,
+    ) -> str:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        seed = hashlib.sha256(_vlm_key(prompt, images, system_prompt, None).encode()).digest()
+        if response_format != "json":
+            return _DESCRIPTION
+        revise = seed[1] / 255 < self.revision_rate
+        return json.dumps(
+            {
+                # Retriever: the first candidates offered
+                "selected_ids": re.findall(r"\*\*Paper ID:\*\* (\S+)", prompt)[:10],
+                # Critic
+                "critic_suggestions": ["Increase label font size."] if revise else [],
+                "revised_description": f"{_DESCRIPTION} Labels are larger." if revise else None,
+                # Judge, per-dimension and single-call
+                "comparison_reasoning": "Offline verdict.",
+                "winner": _WINNERS[seed[0] % len(_WINNERS)],
+                **{
+                    dim: {
+                        "comparison_reasoning": "Offline verdict.",
+                        "winner": _WINNERS[seed[2 + i] % len(_WINNERS)],
+                    }
+                    for i, dim in enumerate(_DIMENSIONS)
+                },
+            }
+        )
+
+
+class FakeImageGen(ImageGenProvider):
+    """Deterministic offline image generator drawing a small block diagram.
+
+    Args:
+        latency: Seconds each call sleeps, to simulate a remote model.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    @property
+    def name(self) -> str:
+        return "fake"
+
+    @property
+    def model_name(self) -> str:
+        return "fake-image"
+
+    async def generate(
+        self,
+        prompt: str,
+        negative_prompt: Optional[str] = None,
+        width: int = 1024,
+        height: int = 1024,
+        seed: Optional[int] = None,
+    ) -> Image.Image:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        shade = hashlib.sha256(prompt.encode()).digest()
+        image = Image.new("RGB", (width, height), color=(255, 255, 255))
+        draw = ImageDraw.Draw(image)
+        boxes = 3
+        for i in range(boxes):
+            left = width * (1 + 3 * i) // (3 * boxes + 1)
+            right = left + width * 2 // (3 * boxes + 1)
+            color = (shade[3 * i] // 2 + 64, shade[3 * i + 1] // 2 + 64, 200)
+            draw.rectangle([left, height // 3, right, 2 * height // 3], fill=color)
+            draw.text((left + 8, height // 2), f"Block {i + 1}", fill=(0, 0, 0))
+        return image
+
+
+class RecordedVLM(VLMProvider):
+    """Replays recorded VLM responses; records misses when given a live provider.
+
+    Args:
+        cache: Where responses are stored (namespace it, e.g. "vlm").
+        live: Provider for requests without a recording; None makes a
+            miss an error.
+
+    Raises:
+        KeyError: From ``generate`` on a miss without a live provider.
+    """
+
+    def __init__(self, cache: SQLiteCache, live: Optional[VLMProvider] = None):
+        self.cache = cache
+        self.live = live
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def name(self) -> str:
+        return self.live.name if self.live is not None else "recorded"
+
+    @property
+    def model_name(self) -> str:
+        return self.live.model_name if self.live is not None else "recorded"
+
+    def supports_encoded_images(self) -> bool:
+        return self.live.supports_encoded_images() if self.live is not None else True
+
+    async def generate(
+        self,
+        prompt: str,
+        images: Optional[list[Image.Image | EncodedImage]] = None,
+        system_prompt: Optional[str] = None,
+        temperature: float = 1.0,
+        max_tokens: int = 4096,
+        response_format: Optional[str] = None,
+    ) -> str:
+        key = _vlm_key(prompt, images, system_prompt, response_format)
+        recorded = self.cache.get(key)
+        if recorded is not None:
+            self.hits += 1
+            return recorded
+        self.misses += 1
+        if self.live is None:
+            raise KeyError(f"No recorded VLM response for request {key[:12]}")
+        response = await self.live.generate(
+            prompt,
+            images=images,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_format,
+        )
+        self.cache.set(key, response)
+        return response
+
+
+class RecordedImageGen(ImageGenProvider):
+    """Replays recorded generated images; records misses when given a live provider.
+
+    Args:
+        cache: Where images are stored (as base64 PNG).
+        live: Provider for requests without a recording; None makes a
+            miss an error.
+
+    Raises:
+        KeyError: From ``generate`` on a miss without a live provider.
+    """
+
+    def __init__(self, cache: SQLiteCache, live: Optional[ImageGenProvider] = None):
+        self.cache = cache
+        self.live = live
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def name(self) -> str:
+        return self.live.name if self.live is not None else "recorded"
+
+    @property
+    def model_name(self) -> str:
+        return self.live.model_name if self.live is not None else "recorded"
+
+    async def generate(
+        self,
+        prompt: str,
+        negative_prompt: Optional[str] = None,
+        width: int = 1024,
+        height: int = 1024,
+        seed: Optional[int] = None,
+    ) -> Image.Image:
+        key = cache_key("image", prompt, negative_prompt, width, height, seed)
+        recorded = self.cache.get(key)
+        if recorded is not None:
+            self.hits += 1
+            return Image.open(io.BytesIO(base64.b64decode(recorded))).convert("RGB")
+        self.misses += 1
+        if self.live is None:
+            raise KeyError(f"No recorded image for request {key[:12]}")
+        image = await self.live.generate(
+            prompt, negative_prompt=negative_prompt, width=width, height=height, seed=seed
+        )
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        self.cache.set(key, base64.b64encode(buffer.getvalue()).decode("ascii"))
+        return image
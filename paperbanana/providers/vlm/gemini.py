@@ -8,7 +8,8 @@ import structlog
 from PIL import Image
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from paperbanana.core.utils import image_to_base64
+from paperbanana.core.types import EncodedImage
+from paperbanana.core.utils import image_to_bytes
 from paperbanana.providers.base import VLMProvider
 
 logger = structlog.get_logger()
@@ -49,11 +50,14 @@ class GeminiVLM(VLMProvider):
     def is_available(self) -> bool:
         return self._api_key is not None
 
+    def supports_encoded_images(self) -> bool:
+        return True
+
     @retry(stop=stop_after_attempt(8), wait=wait_exponential(min=2, max=120))
     async def generate(
         self,
         prompt: str,
-        images: Optional[list[Image.Image]] = None,
+        images: Optional[list[Image.Image | EncodedImage]] = None,
         system_prompt: Optional[str] = None,
         temperature: float = 1.0,
         max_tokens: int = 4096,
@@ -66,13 +70,8 @@ class GeminiVLM(VLMProvider):
         contents = []
         if images:
             for img in images:
-                b64 = image_to_base64(img)
-                contents.append(
-                    types.Part.from_bytes(
-                        data=__import__("base64").b64decode(b64),
-                        mime_type="image/png",
-                    )
-                )
+                data, mime_type = image_to_bytes(img)
+                contents.append(types.Part.from_bytes(data=data, mime_type=mime_type))
         contents.append(prompt)
 
         config = types.GenerateContentConfig(
@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
+import base64
 from typing import Optional
 
 import structlog
 from PIL import Image
 from tenacity import retry, stop_after_attempt, wait_exponential
 
-from paperbanana.core.utils import image_to_base64
+from paperbanana.core.types import EncodedImage
+from paperbanana.core.utils import image_to_bytes
 from paperbanana.providers.base import VLMProvider
 
 logger = structlog.get_logger()
@@ -57,11 +59,14 @@ class OpenRouterVLM(VLMProvider):
     def is_available(self) -> bool:
         return self._api_key is not None
 
+    def supports_encoded_images(self) -> bool:
+        return True
+
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=2, max=30))
     async def generate(
         self,
         prompt: str,
-        images: Optional[list[Image.Image]] = None,
+        images: Optional[list[Image.Image | EncodedImage]] = None,
         system_prompt: Optional[str] = None,
         temperature: float = 1.0,
         max_tokens: int = 4096,
@@ -77,11 +82,12 @@ class OpenRouterVLM(VLMProvider):
         content = []
         if images:
             for img in images:
-                b64 = image_to_base64(img)
+                data, mime_type = image_to_bytes(img)
+                b64 = base64.b64encode(data).decode("utf-8")
                 content.append(
                     {
                         "type": "image_url",
-                        "image_url": {"url": f"data:image/png;base64,{b64}"},
+                        "image_url": {"url": f"data:{mime_type};base64,{b64}"},
                     }
                 )
         content.append({"type": "text", "text": prompt})
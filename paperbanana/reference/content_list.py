@@ -0,0 +1,382 @@
+"""Single-pass, streaming extraction from MinerU ``content_list.json`` files.
+
+A content list is a flat JSON array of items (text with an optional
+``text_level`` for headings, images with captions, equations, lists,
+tables, ...). Papers with long appendices produce very large lists, so
+instead of ``json.load``-ing the whole array and walking it once per
+field, :func:`iter_json_array` decodes one item at a time from a fixed-size
+read buffer and :class:`ContentListExtractor` folds each item into the
+title, headings, methodology text and figure candidates as it arrives.
+Peak memory is one item plus the text kept for numbered sections, not the
+whole parsed array.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from pydantic import BaseModel
+
+# Section title patterns that indicate methodology content
+METHOD_PATTERNS = [
+    r"^\d*\.?\s*method(ology)?",
+    r"^\d*\.?\s*approach",
+    r"^\d*\.?\s*proposed\s+(method|framework|approach|model|system)",
+    r"^\d*\.?\s*our\s+(method|framework|approach|model)",
+    r"^\d*\.?\s*framework",
+    r"^\d*\.?\s*model(\s+architecture)?$",
+    r"^\d*\.?\s*architecture",
+    r"^\d*\.?\s*technical\s+(approach|details|design)",
+    r"^\d*\.?\s*system\s+(overview|design)",
+]
+
+# Patterns for sections to stop collecting (after methodology ends)
+STOP_PATTERNS = [
+    r"^\d*\.?\s*experiment",
+    r"^\d*\.?\s*evaluation",
+    r"^\d*\.?\s*result",
+    r"^\d*\.?\s*conclusion",
+    r"^\d*\.?\s*discussion",
+    r"^\d*\.?\s*related\s+work",
+    r"^\d*\.?\s*acknowledgment",
+    r"^\d*\.?\s*reference",
+    r"^\d*\.?\s*appendix",
+    r"^\d*\.?\s*limitation",
+    r"^\d*\.?\s*broader\s+impact",
+]
+
+# Patterns for sections that come before the method
+PRE_PATTERNS = [
+    r"^\d*\.?\s*introduction",
+    r"^\d*\.?\s*preliminar",
+    r"^\d*\.?\s*background",
+    r"^\d*\.?\s*problem\s+(statement|formulation|setup|definition)",
+    r"^\d*\.?\s*notation",
+    r"^\d*\.?\s*setup",
+]
+
+# Level-1 headings that are never the paper title
+SKIP_TITLES = (
+    "abstract",
+    "contents",
+    "table of contents",
+    "references",
+    "acknowledgment",
+    "acknowledgments",
+    "acknowledgement",
+    "appendix",
+    "supplementary material",
+    "supplementary",
+    "introduction",
+    "conclusion",
+    "conclusions",
+    "related work",
+    "limitations",
+    "broader impact",
+)
+
+_SECTION_RE = re.compile(r"^(\d+)")
+_NUMBERED_TITLE_RE = re.compile(r"^(\d+|[A-Z]\.?\d*)[\.\s]")
+_WHITESPACE = " \t\n\r"
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+def is_method_heading(text: str) -> bool:
+    """Check if heading text indicates a methodology section."""
+    lower = text.lower().strip()
+    return any(re.match(p, lower) for p in METHOD_PATTERNS)
+
+
+def is_stop_heading(text: str) -> bool:
+    """Check if heading text indicates the method section has ended."""
+    lower = text.lower().strip()
+    return any(re.match(p, lower) for p in STOP_PATTERNS)
+
+
+def section_number(text: str) -> Optional[int]:
+    """Extract top-level section number from heading (e.g., 3 from '3.1 Method')."""
+    match = _SECTION_RE.match(text.strip())
+    return int(match.group(1)) if match else None
+
+
+def compute_aspect_ratio(bbox: list[float]) -> float:
+    """Compute width/height aspect ratio from [x0, y0, x1, y1] bbox."""
+    if len(bbox) < 4:
+        return 0.0
+    width = bbox[2] - bbox[0]
+    height = bbox[3] - bbox[1]
+    if height <= 0:
+        return 0.0
+    return width / height
+
+
+def iter_json_array(path: str | Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array one at a time.
+
+    Reads ``chunk_size`` characters at a time and decodes each element with
+    the stdlib's C scanner (``JSONDecoder.raw_decode``), so only the current
+    element and the unread tail of the buffer are held in memory.
+
+    Raises:
+        ValueError: If the file is not a well-formed JSON array
+            (``json.JSONDecodeError`` is a subclass).
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buf = f.read(chunk_size)
+        pos = 0
+        eof = not buf
+        expect = "["  # next structural character: "[", "item" or ","
+
+        def refill(size: int) -> bool:
+            nonlocal buf, pos, eof
+            more = f.read(size)
+            buf = buf[pos:] + more
+            pos = 0
+            eof = not more
+            return not eof
+
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buf):
+                if not refill(chunk_size):
+                    raise ValueError(f"Unexpected end of JSON array in {path}")
+                continue
+
+            char = buf[pos]
+            if expect == "[":
+                if char != "[":
+                    raise ValueError(f"Expected a JSON array in {path}")
+                pos += 1
+                expect = "first"
+                continue
+            if expect in ("first", ",") and char == "]":
+                return
+            if expect == ",":
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']' at offset {pos} in {path}")
+                pos += 1
+                expect = "item"
+                continue
+
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Element continues past the buffer; grow geometrically so
+                # huge elements are re-scanned O(log n) times, not O(n)
+                if not refill(max(chunk_size, len(buf))):
+                    raise
+                continue
+            if end == len(buf) and not eof:
+                # A scalar at the buffer edge may be truncated ("12" of "123")
+                refill(chunk_size)
+                continue
+            pos = end
+            expect = ","
+            yield item
+
+
+class Heading(BaseModel):
+    """A heading from the content list."""
+
+    text: str
+    number: Optional[int] = None
+
+
+class Figure(BaseModel):
+    """An image item whose file exists next to the content list."""
+
+    caption: str
+    local_path: Path
+    img_path: str
+    aspect_ratio: float
+    bbox: list[float]
+
+
+class _Section:
+    """Text under one numbered heading, up to the first unnumbered stop heading."""
+
+    __slots__ = ("number", "heading", "parts", "stopped")
+
+    def __init__(self, number: int, heading: str):
+        self.number = number
+        self.heading = heading
+        self.parts: list[str] = []
+        self.stopped = False
+
+
+class ContentListSummary:
+    """Everything extracted from one content list.
+
+    Attributes:
+        title: Paper title, or "" if none was found.
+        headings: All non-empty headings, in document order.
+        figures: Image items with an existing file, in document order.
+    """
+
+    def __init__(
+        self,
+        title: str,
+        headings: list[Heading],
+        figures: list[Figure],
+        sections: list[_Section],
+    ):
+        self.title = title
+        self.headings = headings
+        self.figures = figures
+        self._sections = sections
+
+    def method_sections(self) -> set[int]:
+        """Section numbers that hold the methodology.
+
+        Numbered headings matching ``METHOD_PATTERNS`` win; otherwise the
+        top-level sections between the last introduction-like section and
+        the first experiments-like section are used. Many papers name their
+        method sections after their system (e.g. "3 HERMES").
+        """
+        explicit = {
+            h.number for h in self.headings if h.number is not None and is_method_heading(h.text)
+        }
+        if explicit:
+            return explicit
+
+        last_pre = None
+        first_post = None
+        for h in self.headings:
+            if h.number is None:
+                continue
+            lower = h.text.lower().strip()
+            if any(re.match(p, lower) for p in PRE_PATTERNS):
+                if last_pre is None or h.number > last_pre:
+                    last_pre = h.number
+            if is_stop_heading(h.text):
+                if first_post is None or h.number < first_post:
+                    first_post = h.number
+        if last_pre is None or first_post is None:
+            return set()
+        return set(range(last_pre + 1, first_post))
+
+    def methodology_text(self, sections: Optional[Iterable[int]] = None) -> str:
+        """Text of the methodology sections, paragraphs joined by blank lines.
+
+        Args:
+            sections: Section numbers to extract; detected with
+                ``method_sections`` when omitted.
+        """
+        wanted = set(self.method_sections() if sections is None else sections)
+        prefixes = [str(s) for s in wanted]
+        parts: list[str] = []
+        in_method = False
+        for section in self._sections:
+            continues = in_method and any(str(section.number).startswith(p) for p in prefixes)
+            if section.number in wanted or continues:
+                parts.append(section.heading)
+                parts.extend(section.parts)
+                in_method = not section.stopped
+            else:
+                in_method = False
+        return "\n\n".join(parts)
+
+
+class ContentListExtractor:
+    """Folds content list items into a :class:`ContentListSummary` in one pass.
+
+    Args:
+        base_dir: Directory image paths are relative to (the directory
+            holding the content list).
+    """
+
+    def __init__(self, base_dir: str | Path):
+        self.base_dir = Path(base_dir)
+        self._title = ""
+        self._header_title = ""
+        self._headings: list[Heading] = []
+        self._figures: list[Figure] = []
+        self._sections: list[_Section] = []
+        self._current: Optional[_Section] = None
+
+    def feed(self, item: dict) -> None:
+        """Process the next item of the content list."""
+        item_type = item.get("type", "")
+        text = item.get("text", "").strip()
+        text_level = item.get("text_level")
+
+        if item_type == "text" and text_level == 1 and not self._title:
+            lower = text.lower()
+            if not _NUMBERED_TITLE_RE.match(text) and not lower.startswith(SKIP_TITLES):
+                self._title = text
+        elif item_type == "header" and not self._header_title:
+            # Some parsers put the title in a page header
+            if len(text) > 20 and not re.match(r"^\d+\.", text):
+                self._header_title = text
+        elif item_type == "image":
+            self._add_figure(item)
+
+        current = self._current
+        if text_level and text:
+            number = section_number(text)
+            self._headings.append(Heading(text=text, number=number))
+            if number is not None:
+                self._current = _Section(number, text)
+                self._sections.append(self._current)
+            elif current is not None and not current.stopped:
+                if is_stop_heading(text):
+                    current.stopped = True
+                else:
+                    current.parts.append(text)
+            return
+
+        if current is None or current.stopped:
+            return
+        if item_type == "text" and text:
+            current.parts.append(text)
+        elif item_type == "equation" and text:
+            current.parts.append(f"[Equation: {text}]")
+        elif item_type == "list":
+            for li in item.get("list_items", []):
+                if isinstance(li, str):
+                    current.parts.append(f"- {li.strip()}")
+
+    def _add_figure(self, item: dict) -> None:
+        img_path = item.get("img_path", "")
+        if not img_path:
+            return
+        local_path = self.base_dir / img_path
+        if not local_path.exists():
+            return
+        captions = item.get("image_caption", [])
+        bbox = item.get("bbox", [])
+        self._figures.append(
+            Figure(
+                caption=captions[0].strip() if captions else "",
+                local_path=local_path,
+                img_path=img_path,
+                aspect_ratio=compute_aspect_ratio(bbox),
+                bbox=bbox,
+            )
+        )
+
+    def finish(self) -> ContentListSummary:
+        """Summary of every item fed so far."""
+        return ContentListSummary(
+            title=self._title or self._header_title,
+            headings=self._headings,
+            figures=self._figures,
+            sections=self._sections,
+        )
+
+
+def extract_content_list(
+    path: str | Path, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> ContentListSummary:
+    """Stream a content_list.json and extract title, headings, methodology and figures."""
+    path = Path(path)
+    extractor = ContentListExtractor(path.parent)
+    for item in iter_json_array(path, chunk_size=chunk_size):
+        extractor.feed(item)
+    return extractor.finish()
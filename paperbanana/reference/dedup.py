@@ -0,0 +1,263 @@
+"""Perceptual-hash near-duplicate detection for reference images.
+
+The same diagram often reaches the reference set more than once (arXiv v1
+and v2, a workshop and a conference version), which wastes retrieval slots
+and planner image budget. Each image is reduced to a 64-bit DCT perceptual
+hash (pHash): similar-looking images have hashes a small Hamming distance
+apart. Hashes are computed in batches with NumPy, cached per store in
+``images.phash.json``, and looked up through a multi-index hash table, so
+checking a new figure against a large set only visits a small part of it.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+import structlog
+from PIL import Image
+
+logger = structlog.get_logger()
+
+HASH_FILE = "images.phash.json"
+
+# Images are shrunk to SIZE x SIZE before the DCT; the top-left
+# HASH_SIZE x HASH_SIZE low-frequency block gives the 64 hash bits.
+_SIZE = 32
+_HASH_SIZE = 8
+_BATCH = 256
+
+# Hamming distance (out of 64 bits) at or below which two images count as
+# near-duplicates. Re-renders and re-compressions of one figure are
+# typically within 4; unrelated diagrams are rarely below 12.
+DEFAULT_MAX_DISTANCE = 6
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """Orthonormal DCT-II matrix."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix.astype(np.float32)
+
+
+_DCT = _dct_matrix(_SIZE)
+
+
+def _load_pixels(path: str | Path) -> np.ndarray:
+    with Image.open(path) as image:
+        # Let JPEG decode at reduced scale; far cheaper than a full decode
+        image.draft("L", (_SIZE * 2, _SIZE * 2))
+        image = image.convert("L").resize((_SIZE, _SIZE), Image.LANCZOS)
+        return np.asarray(image, dtype=np.float32)
+
+
+def phash_pixels(pixels: np.ndarray) -> np.ndarray:
+    """Perceptual hashes for a batch of SIZE x SIZE grayscale images.
+
+    Args:
+        pixels: Array of shape (n, 32, 32).
+
+    Returns:
+        uint64 array of n hashes.
+    """
+    coefficients = _DCT @ pixels @ _DCT.T
+    low = coefficients[:, :_HASH_SIZE, :_HASH_SIZE].reshape(len(pixels), -1)
+    # Median without the DC term, which only encodes mean brightness
+    median = np.median(low[:, 1:], axis=1, keepdims=True)
+    bits = np.packbits(low > median, axis=1)
+    return bits.view(">u8").ravel().astype(np.uint64)
+
+
+def phash_files(paths: Sequence[str | Path]) -> list[Optional[int]]:
+    """Perceptual hash of each image file, or None for unreadable files."""
+    hashes: list[Optional[int]] = [None] * len(paths)
+    for start in range(0, len(paths), _BATCH):
+        rows, pixels = [], []
+        for row in range(start, min(start + _BATCH, len(paths))):
+            try:
+                pixels.append(_load_pixels(paths[row]))
+                rows.append(row)
+            except OSError as e:
+                logger.warning("Cannot hash image", path=str(paths[row]), error=str(e))
+        if pixels:
+            for row, value in zip(rows, phash_pixels(np.stack(pixels))):
+                hashes[row] = int(value)
+    return hashes
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return bin(a ^ b).count("1")
+
+
+class MultiIndexHash:
+    """Near-neighbour index over 64-bit hashes under Hamming distance.
+
+    Multi-index hashing: each hash is split into ``max_distance + 1``
+    disjoint bit ranges, each with its own exact-match table. Two hashes
+    within ``max_distance`` bits must agree exactly on at least one range
+    (pigeonhole), so a query only verifies the entries that share a range
+    with it instead of scanning the whole set.
+
+    Args:
+        max_distance: Largest search radius supported.
+    """
+
+    def __init__(self, max_distance: int = DEFAULT_MAX_DISTANCE):
+        self.max_distance = max_distance
+        n = min(max_distance + 1, 64)
+        bounds = [round(64 * i / n) for i in range(n + 1)]
+        self._ranges = [(bounds[i], (1 << (bounds[i + 1] - bounds[i])) - 1) for i in range(n)]
+        self._tables: list[dict[int, list[int]]] = [{} for _ in range(n)]
+        self._values: list[int] = []
+        self._keys: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def add(self, value: int, key: str) -> None:
+        """Insert a hash under key."""
+        row = len(self._values)
+        self._values.append(value)
+        self._keys.append(key)
+        for table, (shift, mask) in zip(self._tables, self._ranges):
+            table.setdefault((value >> shift) & mask, []).append(row)
+
+    def search(self, value: int, max_distance: Optional[int] = None) -> list[tuple[str, int]]:
+        """All (key, distance) pairs within max_distance, nearest first.
+
+        Raises:
+            ValueError: If max_distance exceeds the index's ``max_distance``.
+        """
+        if max_distance is None:
+            max_distance = self.max_distance
+        elif max_distance > self.max_distance:
+            raise ValueError(
+                f"Search radius {max_distance} exceeds index radius {self.max_distance}"
+            )
+        seen: set[int] = set()
+        matches = []
+        for table, (shift, mask) in zip(self._tables, self._ranges):
+            for row in table.get((value >> shift) & mask, ()):
+                if row in seen:
+                    continue
+                seen.add(row)
+                distance = hamming_distance(value, self._values[row])
+                if distance <= max_distance:
+                    matches.append((self._keys[row], distance))
+        matches.sort(key=lambda m: m[1])
+        return matches
+
+
+class ImageHashCache:
+    """Perceptual hashes of a reference store's images, cached on disk.
+
+    Entries are keyed by image path relative to the store and invalidated
+    when the file's size or mtime changes.
+    """
+
+    def __init__(self, store_path: str | Path):
+        self.store_path = Path(store_path)
+        self._entries: dict[str, list] = {}
+        self._dirty = False
+        cache_file = self.store_path / HASH_FILE
+        if cache_file.exists():
+            try:
+                with open(cache_file, encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable hash cache", path=str(cache_file), error=str(e))
+
+    def hashes(self, image_paths: Iterable[str]) -> dict[str, int]:
+        """Hash of each readable image, computing only new or changed files.
+
+        Args:
+            image_paths: Paths relative to the store (as in ``image_path``)
+                or absolute.
+        """
+        result: dict[str, int] = {}
+        todo: list[tuple[str, str]] = []
+        for image_path in image_paths:
+            full = self.store_path / image_path
+            try:
+                stat = full.stat()
+            except OSError:
+                continue
+            fingerprint = f"{stat.st_size}:{stat.st_mtime_ns}"
+            entry = self._entries.get(image_path)
+            if entry is not None and entry[0] == fingerprint:
+                result[image_path] = int(entry[1], 16)
+            else:
+                todo.append((image_path, fingerprint))
+
+        computed = phash_files([self.store_path / p for p, _ in todo])
+        for (image_path, fingerprint), value in zip(todo, computed):
+            if value is None:
+                continue
+            self._entries[image_path] = [fingerprint, f"{value:016x}"]
+            result[image_path] = value
+            self._dirty = True
+        if todo:
+            logger.info("Hashed reference images", computed=len(todo))
+        return result
+
+    def save(self) -> None:
+        """Write the cache back if anything was computed."""
+        if not self._dirty:
+            return
+        path = self.store_path / HASH_FILE
+        tmp = path.with_name(f"{HASH_FILE}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp, path)
+        self._dirty = False
+
+
+def find_near_duplicates(
+    store_path: str | Path,
+    existing: Sequence[dict],
+    candidates: Sequence[dict],
+    max_distance: int = DEFAULT_MAX_DISTANCE,
+) -> dict[str, tuple[str, int]]:
+    """Find candidate examples whose image nearly duplicates an earlier one.
+
+    Candidates are checked in order against the existing examples and the
+    candidates before them, so of two near-identical new figures the first
+    is kept.
+
+    Args:
+        store_path: Reference store directory image paths are relative to.
+        existing: Example dicts already in the set.
+        candidates: Example dicts being ingested.
+        max_distance: Largest Hamming distance counted as a duplicate.
+
+    Returns:
+        Mapping of duplicate candidate ID to (ID it duplicates, distance).
+    """
+    cache = ImageHashCache(store_path)
+    paths = [e["image_path"] for e in [*existing, *candidates] if e.get("image_path")]
+    hashes = cache.hashes(paths)
+    cache.save()
+
+    index = MultiIndexHash(max_distance)
+    for example in existing:
+        value = hashes.get(example.get("image_path", ""))
+        if value is not None:
+            index.add(value, example["id"])
+
+    duplicates: dict[str, tuple[str, int]] = {}
+    for example in candidates:
+        value = hashes.get(example.get("image_path", ""))
+        if value is None:
+            continue
+        matches = index.search(value)
+        if matches:
+            duplicates[example["id"]] = matches[0]
+        else:
+            index.add(value, example["id"])
+    return duplicates
@@ -0,0 +1,172 @@
+"""Packed reference images, pre-resized and pre-encoded for VLM upload.
+
+The planner sends up to ``num_retrieval_examples`` reference images with
+every call. Loading each from its own file means a decode, an RGB
+conversion and a PNG re-encode per image per run. The pack stores every
+reference image once, already downscaled and encoded, in a single file
+(``images.pack``) with a JSON offset table (``images.pack.json``) giving
+each image's offset, length and MIME type. At run
+time the pack is memory-mapped and images are handed to providers as raw
+bytes.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from io import BytesIO
+from pathlib import Path
+from typing import Optional, Sequence
+
+import structlog
+from PIL import Image
+
+from paperbanana.core.types import EncodedImage, ReferenceExample
+
+logger = structlog.get_logger()
+
+PACK_FILE = "images.pack"
+TABLE_FILE = "images.pack.json"
+
+# Longest side of packed images. VLM providers downscale larger uploads anyway.
+DEFAULT_MAX_SIDE = 1024
+
+_MIME_TYPES = {"PNG": "image/png", "JPEG": "image/jpeg", "WEBP": "image/webp"}
+
+
+def encode_reference_image(
+    path: str | Path,
+    max_side: int = DEFAULT_MAX_SIDE,
+    format: str = "auto",
+    quality: int = 90,
+) -> tuple[bytes, str, int, int]:
+    """Downscale an image to fit max_side and encode it for upload.
+
+    With ``format="auto"``, files already in an upload format that fit
+    within max_side are stored byte-for-byte, and larger ones are
+    re-encoded in their own format family (JPEG stays JPEG, anything else
+    becomes PNG).
+
+    Returns:
+        (encoded bytes, MIME type, width, height).
+    """
+    with Image.open(path) as image:
+        source_format = image.format or ""
+        fits = max(image.size) <= max_side and image.mode in ("RGB", "L")
+        if format == "auto":
+            if fits and source_format in _MIME_TYPES:
+                return Path(path).read_bytes(), _MIME_TYPES[source_format], *image.size
+            format = "JPEG" if source_format == "JPEG" else "PNG"
+
+        image = image.convert("RGB")
+        image.thumbnail((max_side, max_side), Image.LANCZOS)
+        buffer = BytesIO()
+        if format == "PNG":
+            image.save(buffer, format=format, optimize=True)
+        else:
+            image.save(buffer, format=format, quality=quality)
+        return buffer.getvalue(), _MIME_TYPES[format], image.width, image.height
+
+
+def build_image_pack(
+    store_path: str | Path,
+    examples: Sequence[ReferenceExample],
+    max_side: int = DEFAULT_MAX_SIDE,
+    format: str = "auto",
+    quality: int = 90,
+) -> int:
+    """Write the image pack for a reference store.
+
+    Args:
+        store_path: Reference store directory; the pack is written there.
+        examples: Examples whose images to pack (missing files are skipped).
+        max_side: Longest side of packed images in pixels.
+        format: Upload encoding: auto (keep the source encoding where
+            possible), PNG, JPEG or WEBP.
+        quality: Encoder quality for lossy formats.
+
+    Returns:
+        Number of images packed.
+    """
+    if format != "auto":
+        format = format.upper()
+        if format not in _MIME_TYPES:
+            raise ValueError(
+                f"Unsupported pack format: {format}. Use auto or one of {', '.join(_MIME_TYPES)}"
+            )
+
+    store_path = Path(store_path)
+    entries: dict[str, list] = {}
+    offset = 0
+    pack_tmp = store_path / f"{PACK_FILE}.tmp"
+    with open(pack_tmp, "wb") as f:
+        for ex in examples:
+            if not ex.image_path or not Path(ex.image_path).exists():
+                continue
+            try:
+                data, mime_type, width, height = encode_reference_image(
+                    ex.image_path, max_side=max_side, format=format, quality=quality
+                )
+            except OSError as e:
+                logger.warning(
+                    "Skipping unreadable reference image", path=ex.image_path, error=str(e)
+                )
+                continue
+            f.write(data)
+            entries[ex.id] = [offset, len(data), mime_type, width, height]
+            offset += len(data)
+
+    table = {
+        "max_side": max_side,
+        "images": entries,
+    }
+    table_tmp = store_path / f"{TABLE_FILE}.tmp"
+    with open(table_tmp, "w", encoding="utf-8") as f:
+        json.dump(table, f)
+    # Swap in atomically; readers holding the old mmap keep the old file
+    os.replace(pack_tmp, store_path / PACK_FILE)
+    os.replace(table_tmp, store_path / TABLE_FILE)
+
+    logger.info("Built reference image pack", images=len(entries), bytes=offset)
+    return len(entries)
+
+
+class ImagePack:
+    """Read-only, memory-mapped view of a reference image pack."""
+
+    def __init__(self, store_path: str | Path):
+        store_path = Path(store_path)
+        with open(store_path / TABLE_FILE, encoding="utf-8") as f:
+            table = json.load(f)
+        self._entries: dict[str, list] = table["images"]
+        self._mmap: Optional[mmap.mmap] = None
+        with open(store_path / PACK_FILE, "rb") as f:
+            if self._entries:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @classmethod
+    def open(cls, store_path: str | Path) -> Optional[ImagePack]:
+        """Open the pack in a store directory, or return None if there is none."""
+        store_path = Path(store_path)
+        if not (store_path / TABLE_FILE).exists() or not (store_path / PACK_FILE).exists():
+            return None
+        try:
+            return cls(store_path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable image pack", path=str(store_path), error=str(e))
+            return None
+
+    def __contains__(self, example_id: str) -> bool:
+        return example_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, example_id: str) -> Optional[EncodedImage]:
+        """Encoded image for a reference example, or None if it is not packed."""
+        entry = self._entries.get(example_id)
+        if entry is None or self._mmap is None:
+            return None
+        offset, length, mime_type = entry[0], entry[1], entry[2]
+        return EncodedImage(data=self._mmap[offset : offset + length], mime_type=mime_type)
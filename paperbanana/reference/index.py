@@ -0,0 +1,193 @@
+"""Local BM25 index used to shortlist reference candidates before the VLM retriever.
+
+The retriever prompt lists every candidate, so its size grows linearly with
+the reference set. The index scores all examples against the source context
+and caption in a few milliseconds and hands only the top-K to the VLM,
+which then reranks that shortlist.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import structlog
+
+from paperbanana.core.types import ReferenceExample
+
+logger = structlog.get_logger()
+
+# Okapi BM25 parameters.
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Caption terms are repeated this many times so they outweigh body text.
+CAPTION_WEIGHT = 2
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to "
+    "was we were which with our their these those using used use can also into via than "
+    "such each both between while where when".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens, minus stopwords and single characters."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+class ReferenceIndex:
+    """BM25 index over reference captions and methodology text.
+
+    Term weights are precomputed into a term-major sparse layout (postings
+    per term stored in flat NumPy arrays), so a query is a handful of
+    vectorized scatter-adds followed by ``argpartition``.
+    """
+
+    def __init__(
+        self,
+        ids: list[str],
+        categories: list[Optional[str]],
+        vocabulary: dict[str, int],
+        term_ptr: np.ndarray,
+        doc_ids: np.ndarray,
+        weights: np.ndarray,
+    ):
+        self.ids = ids
+        self.categories = categories
+        self.vocabulary = vocabulary
+        self._term_ptr = term_ptr
+        self._doc_ids = doc_ids
+        self._weights = weights
+        self._category_masks: dict[str, np.ndarray] = {}
+
+    @classmethod
+    def build(cls, examples: Sequence[ReferenceExample]) -> ReferenceIndex:
+        """Build an index from reference examples."""
+        vocabulary: dict[str, int] = {}
+        rows: list[int] = []
+        cols: list[int] = []
+        tfs: list[int] = []
+        lengths = np.zeros(len(examples), dtype=np.float32)
+
+        for doc, example in enumerate(examples):
+            tokens = tokenize(example.caption) * CAPTION_WEIGHT + tokenize(example.source_context)
+            lengths[doc] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                rows.append(vocabulary.setdefault(term, len(vocabulary)))
+                cols.append(doc)
+                tfs.append(tf)
+
+        terms = np.asarray(rows, dtype=np.int32)
+        docs = np.asarray(cols, dtype=np.int32)
+        tf = np.asarray(tfs, dtype=np.float32)
+
+        # Sort postings by term so each term's documents are contiguous
+        order = np.argsort(terms, kind="stable")
+        terms, docs, tf = terms[order], docs[order], tf[order]
+        df = np.bincount(terms, minlength=len(vocabulary))
+        term_ptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(df, out=term_ptr[1:])
+
+        n = max(len(examples), 1)
+        idf = np.log1p((n - df + 0.5) / (df + 0.5)).astype(np.float32)
+        avg_len = float(lengths.mean()) if len(examples) else 1.0
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[docs] / max(avg_len, 1.0))
+        weights = idf[terms] * tf * (BM25_K1 + 1) / (tf + norm)
+
+        logger.info("Built reference index", examples=len(examples), terms=len(vocabulary))
+        return cls(
+            ids=[e.id for e in examples],
+            categories=[e.category for e in examples],
+            vocabulary=vocabulary,
+            term_ptr=term_ptr,
+            doc_ids=docs,
+            weights=weights.astype(np.float32),
+        )
+
+    def save(self, path: str | Path, fingerprint: str = "") -> None:
+        """Write the index to an .npz file, tagged with a source fingerprint."""
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                ids=np.array(self.ids, dtype=str),
+                categories=np.array([c or "" for c in self.categories], dtype=str),
+                terms=np.array(terms, dtype=str),
+                term_ptr=self._term_ptr,
+                doc_ids=self._doc_ids,
+                weights=self._weights,
+                fingerprint=np.array(fingerprint),
+            )
+
+    @classmethod
+    def load(cls, path: str | Path, fingerprint: Optional[str] = None) -> ReferenceIndex:
+        """Load an index written by ``save``.
+
+        Raises:
+            ValueError: If ``fingerprint`` is given and does not match the
+                fingerprint the index was saved with.
+        """
+        with np.load(path) as data:
+            if fingerprint is not None and str(data["fingerprint"]) != fingerprint:
+                raise ValueError("BM25 index is stale")
+            return cls(
+                ids=data["ids"].tolist(),
+                categories=[c or None for c in data["categories"].tolist()],
+                vocabulary={t: i for i, t in enumerate(data["terms"].tolist())},
+                term_ptr=data["term_ptr"],
+                doc_ids=data["doc_ids"],
+                weights=data["weights"],
+            )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every indexed example for a free-text query."""
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        for term, count in Counter(tokenize(query)).items():
+            t = self.vocabulary.get(term)
+            if t is None:
+                continue
+            start, end = self._term_ptr[t], self._term_ptr[t + 1]
+            # Each document appears once per term, so fancy-index add is safe
+            scores[self._doc_ids[start:end]] += count * self._weights[start:end]
+        return scores
+
+    def search(
+        self,
+        query: str,
+        k: int,
+        category: Optional[str] = None,
+    ) -> list[tuple[str, float]]:
+        """Return up to k (id, score) pairs, best first.
+
+        Args:
+            query: Free text, typically source context plus caption.
+            k: Number of results.
+            category: Restrict results to examples in this category.
+        """
+        scores = self.scores(query)
+        if category is not None:
+            scores = np.where(self._category_mask(category), scores, -np.inf)
+            k = min(k, int(np.isfinite(scores).sum()))
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        # Stable order: score descending, then original position
+        top = top[np.lexsort((top, -scores[top]))]
+        return [(self.ids[i], float(scores[i])) for i in top]
+
+    def _category_mask(self, category: str) -> np.ndarray:
+        mask = self._category_masks.get(category)
+        if mask is None:
+            mask = np.array([c == category for c in self.categories], dtype=bool)
+            self._category_masks[category] = mask
+        return mask
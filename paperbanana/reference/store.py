@@ -2,90 +2,443 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
+import mmap
+import os
+import threading
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import structlog
 
 from paperbanana.core.types import ReferenceExample
+from paperbanana.reference.categories import rank_exemplars
+from paperbanana.reference.image_pack import TABLE_FILE, ImagePack
+from paperbanana.reference.index import ReferenceIndex
 
 logger = structlog.get_logger()
 
+# Indexed layout: one example per line plus a small sidecar with ids, byte
+# offsets and categories, so opening a store never parses example bodies.
+EXAMPLES_FILE = "examples.jsonl"
+SIDECAR_FILE = "examples.idx.json"
+BM25_FILE = "examples.bm25.npz"
+
+# Materialized examples kept in memory for the indexed layout.
+_EXAMPLE_CACHE_SIZE = 4096
+
+# Stores shared by every pipeline in the process, keyed by resolved path.
+_shared_stores: dict[Path, ReferenceStore] = {}
+_shared_lock = threading.Lock()
 
-class ReferenceStore:
-    """Manages curated reference sets of academic illustrations.
 
-    Reference sets are stored as JSON files with associated images.
+class ReferenceSnapshot:
+    """Immutable view of a reference set as it was when loaded.
+
+    Holds the examples (or the memory-mapped indexed layout), the id and
+    category lookups, and the BM25 index built over them. A snapshot never
+    changes after loading, so a retrieval that holds one sees a consistent
+    set even if the store is reloaded underneath it.
     """
 
-    def __init__(self, path: str | Path):
-        self.path = Path(path)
+    def __init__(self, path: Path, version: int = 0):
+        self.path = path
+        self.version = version
+        self.fingerprint = "empty"
         self._examples: list[ReferenceExample] = []
-        self._loaded = False
+        self._ids: list[str] = []
+        self._id_to_row: dict[str, int] = {}
+        self._postings: dict[str, list[int]] = {}
+        self._index: Optional[ReferenceIndex] = None
+        self._index_lock = threading.Lock()
+        self._exemplars: dict[tuple[str, int], list[int]] = {}
+        # Indexed layout only
+        self._offsets: Optional[np.ndarray] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._read_row = functools.lru_cache(maxsize=_EXAMPLE_CACHE_SIZE)(self._parse_row)
 
-    def _load(self) -> None:
-        """Load reference examples from the store directory."""
-        if self._loaded:
-            return
+    @classmethod
+    def load(cls, path: Path, version: int = 0) -> ReferenceSnapshot:
+        """Load the current contents of a store directory.
 
-        index_file = self.path / "index.json"
-        if not index_file.exists():
-            logger.warning("No reference index found", path=str(self.path))
-            self._loaded = True
-            return
+        Raises:
+            OSError, ValueError, KeyError: If the files are unreadable or
+                mid-rewrite (e.g. the sidecar does not match the examples).
+        """
+        snapshot = cls(path, version)
+        source = _source_file(path)
+        if source is None:
+            logger.warning("No reference index found", path=str(path))
+        elif source.name == SIDECAR_FILE:
+            snapshot.fingerprint = _file_fingerprint(source)
+            snapshot._load_indexed(source)
+        else:
+            if (path / SIDECAR_FILE).exists():
+                logger.warning(
+                    "index.json is newer than the indexed reference store, using index.json",
+                    path=str(path),
+                )
+            snapshot.fingerprint = _file_fingerprint(source)
+            snapshot._load_index_json(source)
+        return snapshot
+
+    @classmethod
+    def from_examples(
+        cls, path: Path, examples: list[ReferenceExample], fingerprint: str, version: int = 0
+    ) -> ReferenceSnapshot:
+        """Snapshot over examples already in memory."""
+        snapshot = cls(path, version)
+        snapshot.fingerprint = fingerprint
+        snapshot._examples = examples
+        snapshot._build_lookup([e.id for e in examples], [e.category for e in examples])
+        return snapshot
 
+    def _load_index_json(self, index_file: Path) -> None:
         with open(index_file, encoding="utf-8") as f:
             data = json.load(f)
 
         for item in data.get("examples", []):
-            # Resolve image path relative to store directory
-            image_path = item.get("image_path", "")
-            if image_path and not Path(image_path).is_absolute():
-                image_path = str(self.path / image_path)
-
-            self._examples.append(
-                ReferenceExample(
-                    id=item["id"],
-                    source_context=item["source_context"],
-                    caption=item["caption"],
-                    image_path=image_path,
-                    category=item.get("category"),
-                )
-            )
+            self._examples.append(self._to_example(item))
 
+        self._build_lookup([e.id for e in self._examples], [e.category for e in self._examples])
         logger.info("Loaded reference examples", count=len(self._examples))
-        self._loaded = True
+
+    def _load_indexed(self, sidecar: Path) -> None:
+        """Open the indexed layout: read the sidecar and memory-map the examples."""
+        with open(sidecar, encoding="utf-8") as f:
+            data = json.load(f)
+
+        self._offsets = np.asarray(data["offsets"], dtype=np.int64)
+        self._build_lookup(data["ids"], data["categories"])
+        with open(self.path / EXAMPLES_FILE, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size != self._offsets[-1]:
+                raise ValueError(
+                    f"{EXAMPLES_FILE} is {size} bytes but the sidecar expects "
+                    f"{self._offsets[-1]}; the store is being rewritten"
+                )
+            if size > 0:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        logger.info("Opened indexed reference store", count=len(self._ids))
+
+    def _build_lookup(self, ids: list[str], categories: list[Optional[str]]) -> None:
+        self._ids = ids
+        self._id_to_row = {eid: row for row, eid in enumerate(ids)}
+        self._postings = {}
+        for row, category in enumerate(categories):
+            if category is not None:
+                self._postings.setdefault(category, []).append(row)
+
+    def _to_example(self, item: dict) -> ReferenceExample:
+        # Resolve image path relative to store directory
+        image_path = item.get("image_path", "")
+        if image_path and not Path(image_path).is_absolute():
+            image_path = str(self.path / image_path)
+
+        return ReferenceExample(
+            id=item["id"],
+            source_context=item["source_context"],
+            caption=item["caption"],
+            image_path=image_path,
+            category=item.get("category"),
+        )
+
+    def _parse_row(self, row: int) -> ReferenceExample:
+        start, end = self._offsets[row], self._offsets[row + 1]
+        return self._to_example(json.loads(self._mmap[start:end]))
+
+    def _example(self, row: int) -> ReferenceExample:
+        if self._offsets is None:
+            return self._examples[row]
+        return self._read_row(row)
 
     def get_all(self) -> list[ReferenceExample]:
         """Get all reference examples."""
-        self._load()
-        return self._examples
+        if self._offsets is None:
+            return self._examples
+        return [self._example(row) for row in range(len(self._ids))]
 
     def get_by_category(self, category: str) -> list[ReferenceExample]:
         """Get reference examples filtered by category."""
-        self._load()
-        return [e for e in self._examples if e.category == category]
+        return [self._example(row) for row in self._postings.get(category, [])]
 
     def get_by_id(self, example_id: str) -> Optional[ReferenceExample]:
         """Get a specific reference example by ID."""
-        self._load()
-        for e in self._examples:
-            if e.id == example_id:
-                return e
-        return None
+        row = self._id_to_row.get(example_id)
+        return self._example(row) if row is not None else None
+
+    @property
+    def count(self) -> int:
+        """Number of reference examples in the snapshot."""
+        return len(self._ids)
+
+    @property
+    def has_index(self) -> bool:
+        """Whether the BM25 index has been built or loaded."""
+        return self._index is not None
+
+    def index(self) -> ReferenceIndex:
+        """BM25 index over all examples, built on first use.
+
+        For the indexed layout the index is cached next to the examples and
+        reused while the examples file is unchanged.
+        """
+        with self._index_lock:
+            if self._index is None:
+                self._index = self._load_or_build_index()
+        return self._index
+
+    def _load_or_build_index(self) -> ReferenceIndex:
+        cache_path = self.path / BM25_FILE
+        fingerprint = self._examples_fingerprint()
+        if fingerprint is not None and cache_path.exists():
+            try:
+                return ReferenceIndex.load(cache_path, fingerprint=fingerprint)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(
+                    "Ignoring stale or unreadable BM25 cache", path=str(cache_path), error=str(e)
+                )
+
+        index = ReferenceIndex.build(self.get_all())
+        if fingerprint is not None:
+            try:
+                tmp = cache_path.with_name(f"{BM25_FILE}.{os.getpid()}.tmp")
+                index.save(tmp, fingerprint=fingerprint)
+                os.replace(tmp, cache_path)
+            except OSError as e:
+                logger.warning("Could not write BM25 cache", error=str(e))
+        return index
+
+    def shortlist(
+        self, query: str, k: int, category: Optional[str] = None
+    ) -> list[ReferenceExample]:
+        """Return the k examples that best match a query, best first.
+
+        Args:
+            query: Free text, typically source context plus caption.
+            k: Number of examples to return.
+            category: Restrict results to examples in this category.
+        """
+        hits = self.index().search(query, k, category=category)
+        return [ex for ex in (self.get_by_id(eid) for eid, _ in hits) if ex is not None]
+
+    def exemplars(self, category: str, k: int) -> list[ReferenceExample]:
+        """Up to k representative, mutually diverse examples of a category.
+
+        Ranked by maximal marginal relevance once per snapshot and
+        (category, k); see :func:`paperbanana.reference.categories.rank_exemplars`.
+        """
+        rows = self._exemplars.get((category, k))
+        if rows is None:
+            members = self._postings.get(category, [])
+            ranked = rank_exemplars([self._example(row) for row in members], k)
+            rows = self._exemplars[(category, k)] = [members[i] for i in ranked]
+        return [self._example(row) for row in rows]
+
+    def _examples_fingerprint(self) -> Optional[str]:
+        """Size and mtime of the examples file, or None for index.json stores."""
+        if self._offsets is None:
+            return None
+        return _file_fingerprint(self.path / EXAMPLES_FILE)
+
+
+class ReferenceStore:
+    """Manages curated reference sets of academic illustrations.
+
+    Reference sets are stored either as a single ``index.json`` file or in
+    the indexed layout (``examples.jsonl`` plus ``examples.idx.json``),
+    with associated images. The indexed layout is memory-mapped and
+    examples are only parsed when accessed, so large sets open quickly
+    with a small resident footprint. Both layouts offer O(1) ``get_by_id``
+    and precomputed category postings.
+
+    The loaded set is held as a :class:`ReferenceSnapshot`. ``reload``
+    (or ``refresh``/``watch`` from async code) picks up a rewritten index,
+    rebuilds the BM25 index off the event loop and swaps the new snapshot
+    in; callers that took a ``snapshot()`` keep reading the old one.
+    ``version`` counts the swaps.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._snapshot: Optional[ReferenceSnapshot] = None
+        self._reload_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, path: str | Path) -> ReferenceStore:
+        """Process-wide store for a path, so pipelines share one loaded set."""
+        key = Path(path).resolve()
+        with _shared_lock:
+            store = _shared_stores.get(key)
+            if store is None:
+                store = _shared_stores[key] = cls(path)
+        return store
+
+    def snapshot(self) -> ReferenceSnapshot:
+        """The current snapshot, loading the store on first use.
+
+        Hold on to the result for the duration of an operation that must
+        see one consistent reference set.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._reload_lock:
+                if self._snapshot is None:
+                    self._snapshot = ReferenceSnapshot.load(self.path, version=1)
+                snapshot = self._snapshot
+        return snapshot
+
+    @property
+    def version(self) -> int:
+        """Incremented every time a reloaded snapshot is swapped in."""
+        return self.snapshot().version
+
+    def changed(self) -> bool:
+        """Whether the index files on disk differ from the loaded snapshot.
+
+        Only stats files, so it is cheap enough to poll.
+        """
+        if self._snapshot is None:
+            return False
+        try:
+            source = _source_file(self.path)
+            current = _file_fingerprint(source) if source is not None else "empty"
+        except OSError:
+            return False
+        return current != self._snapshot.fingerprint
+
+    def reload(self, force: bool = False) -> bool:
+        """Load the store again if it changed on disk and swap the result in.
+
+        The BM25 index and any category exemplars are rebuilt before the
+        swap when the previous snapshot had them, so queries never pay for
+        the rebuild. A store that fails to
+        load (e.g. mid-rewrite) keeps serving the previous snapshot.
+
+        Args:
+            force: Reload even if the files look unchanged.
+
+        Returns:
+            True if a new snapshot was swapped in.
+        """
+        with self._reload_lock:
+            old = self._snapshot
+            if old is not None and not force and not self.changed():
+                return False
+            version = old.version + 1 if old is not None else 1
+            try:
+                new = ReferenceSnapshot.load(self.path, version=version)
+                if old is not None and old.has_index:
+                    new.index()
+                for category, k in list(old._exemplars if old is not None else ()):
+                    new.exemplars(category, k)
+            except (OSError, ValueError, KeyError) as e:
+                if old is None:
+                    raise
+                logger.warning(
+                    "Reference store reload failed, keeping previous version",
+                    path=str(self.path),
+                    version=old.version,
+                    error=str(e),
+                )
+                return False
+            self._snapshot = new
+
+        logger.info(
+            "Reloaded reference store",
+            path=str(self.path),
+            version=new.version,
+            count=new.count,
+        )
+        return True
+
+    async def refresh(self) -> bool:
+        """Reload in a worker thread if the store changed on disk."""
+        if not self.changed():
+            return False
+        return await asyncio.to_thread(self.reload)
+
+    async def watch(self, interval: float = 5.0) -> None:
+        """Poll the index files and reload on change until cancelled."""
+        self.snapshot()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning("Reference store watch failed", path=str(self.path), error=str(e))
+
+    def get_all(self) -> list[ReferenceExample]:
+        """Get all reference examples."""
+        return self.snapshot().get_all()
+
+    def get_by_category(self, category: str) -> list[ReferenceExample]:
+        """Get reference examples filtered by category."""
+        return self.snapshot().get_by_category(category)
+
+    def get_by_id(self, example_id: str) -> Optional[ReferenceExample]:
+        """Get a specific reference example by ID."""
+        return self.snapshot().get_by_id(example_id)
+
+    def index(self) -> ReferenceIndex:
+        """BM25 index over all examples in the current snapshot."""
+        return self.snapshot().index()
+
+    def shortlist(
+        self, query: str, k: int, category: Optional[str] = None
+    ) -> list[ReferenceExample]:
+        """Return the k examples that best match a query, best first.
+
+        See :meth:`ReferenceSnapshot.shortlist`.
+        """
+        return self.snapshot().shortlist(query, k, category=category)
+
+    def exemplars(self, category: str, k: int) -> list[ReferenceExample]:
+        """Diversity-ranked exemplars of a category in the current snapshot.
+
+        See :meth:`ReferenceSnapshot.exemplars`.
+        """
+        return self.snapshot().exemplars(category, k)
+
+    def image_pack(self) -> Optional[ImagePack]:
+        """Packed, pre-encoded reference images, or None if absent or stale.
+
+        A pack older than the store's index is ignored so rebuilt reference
+        sets never pair examples with outdated images.
+        """
+        table = self.path / TABLE_FILE
+        if not table.exists():
+            return None
+        sources = [self.path / "index.json", self.path / SIDECAR_FILE]
+        newest = max((p.stat().st_mtime for p in sources if p.exists()), default=0.0)
+        if table.stat().st_mtime < newest:
+            logger.warning("Reference image pack is older than the index, ignoring it")
+            return None
+        return ImagePack.open(self.path)
+
+    @property
+    def fingerprint(self) -> str:
+        """Version of the loaded reference set, for keying caches.
+
+        Derived from the name, size and mtime of the index file the store
+        was loaded from, so it changes whenever that file is rewritten.
+        """
+        return self.snapshot().fingerprint
 
     @property
     def count(self) -> int:
         """Number of reference examples in the store."""
-        self._load()
-        return len(self._examples)
+        return self.snapshot().count
 
     @staticmethod
     def create(
         path: str | Path,
         examples: list[ReferenceExample],
         metadata: Optional[dict] = None,
+        indexed: bool = False,
     ) -> ReferenceStore:
         """Create a new reference store from examples.
 
@@ -93,6 +446,8 @@ class ReferenceStore:
             path: Directory to create the store in.
             examples: List of reference examples to include.
             metadata: Optional metadata about the set.
+            indexed: Write the indexed layout (examples.jsonl + sidecar)
+                instead of index.json.
 
         Returns:
             The created ReferenceStore.
@@ -100,16 +455,86 @@ class ReferenceStore:
         path = Path(path)
         path.mkdir(parents=True, exist_ok=True)
 
-        data = {
-            "metadata": metadata or {},
-            "examples": [e.model_dump() for e in examples],
-        }
-
-        with open(path / "index.json", "w") as f:
-            json.dump(data, f, indent=2)
+        items = [e.model_dump() for e in examples]
+        if indexed:
+            write_indexed(path, items, metadata)
+        else:
+            data = {
+                "metadata": metadata or {},
+                "examples": items,
+            }
+            _write_json(path / "index.json", data, indent=2)
 
         logger.info("Created reference store", path=str(path), count=len(examples))
         store = ReferenceStore(path)
-        store._examples = examples
-        store._loaded = True
+        if not indexed:
+            store._snapshot = ReferenceSnapshot.from_examples(
+                path, examples, _file_fingerprint(path / "index.json"), version=1
+            )
         return store
+
+    @staticmethod
+    def convert(path: str | Path) -> int:
+        """Convert a store's index.json into the indexed layout in place.
+
+        index.json is left untouched so older versions can still read the set.
+
+        Returns:
+            Number of examples written.
+        """
+        path = Path(path)
+        with open(path / "index.json", encoding="utf-8") as f:
+            data = json.load(f)
+        items = data.get("examples", [])
+        write_indexed(path, items, data.get("metadata"))
+        logger.info("Converted reference store", path=str(path), count=len(items))
+        return len(items)
+
+
+def _file_fingerprint(path: Path) -> str:
+    stat = path.stat()
+    return f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _source_file(path: Path) -> Optional[Path]:
+    """The index file a store directory would be loaded from, or None."""
+    index_file = path / "index.json"
+    sidecar = path / SIDECAR_FILE
+    if sidecar.exists() and (path / EXAMPLES_FILE).exists():
+        if not index_file.exists() or index_file.stat().st_mtime <= sidecar.stat().st_mtime:
+            return sidecar
+    return index_file if index_file.exists() else None
+
+
+def _write_json(path: Path, data: dict, **kwargs) -> None:
+    """Write JSON through a temp file so readers never see a partial file."""
+    tmp = path.with_name(f"{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, **kwargs)
+    os.replace(tmp, path)
+
+
+def write_indexed(path: Path, items: list[dict], metadata: Optional[dict] = None) -> None:
+    """Write raw example dicts in the indexed layout (examples.jsonl + sidecar).
+
+    Both files are swapped in with ``os.replace``, so open memory maps of
+    the previous examples file stay valid.
+    """
+    offsets = [0]
+    tmp = path / f"{EXAMPLES_FILE}.tmp"
+    with open(tmp, "wb") as f:
+        for item in items:
+            line = json.dumps(item, ensure_ascii=False).encode("utf-8") + b"\n"
+            f.write(line)
+            offsets.append(offsets[-1] + len(line))
+    os.replace(tmp, path / EXAMPLES_FILE)
+
+    sidecar = {
+        "metadata": metadata or {},
+        "ids": [item["id"] for item in items],
+        "categories": [item.get("category") for item in items],
+        "offsets": offsets,
+    }
+    # Written last: its mtime marks the indexed layout as current
+    _write_json(path / SIDECAR_FILE, sidecar)
+    (path / BM25_FILE).unlink(missing_ok=True)
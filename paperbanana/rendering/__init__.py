@@ -0,0 +1,20 @@
+"""Local renderers for diagrams and plots."""
+
+from paperbanana.rendering.diagram import DiagramSpec, parse_diagram_spec, render_diagram
+from paperbanana.rendering.plot_data import PlotData, load_plot_data
+from paperbanana.rendering.plot_pool import PlotResult, PlotWorkerPool, get_plot_pool
+from paperbanana.rendering.plot_spec import PlotRenderer, PlotSpec, parse_plot_spec
+
+__all__ = [
+    "DiagramSpec",
+    "PlotData",
+    "PlotRenderer",
+    "PlotResult",
+    "PlotSpec",
+    "PlotWorkerPool",
+    "get_plot_pool",
+    "load_plot_data",
+    "parse_diagram_spec",
+    "parse_plot_spec",
+    "render_diagram",
+]
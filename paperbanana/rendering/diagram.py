@@ -0,0 +1,349 @@
+"""Declarative block-diagram specs rendered locally with matplotlib.
+
+The VLM describes a methodology diagram as a small JSON graph (nodes, edges
+and optional groups). The graph is laid out in layers along the flow
+direction and drawn with matplotlib patches, producing PNG and SVG output
+in milliseconds without an image-model call.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import textwrap
+from pathlib import Path
+from typing import Optional
+
+from matplotlib import colors as mcolors
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import FancyArrowPatch, FancyBboxPatch
+from pydantic import BaseModel, Field, model_validator
+
+# Soft pastel fills, cycled across groups (ungrouped nodes use the first).
+PALETTE = ["#dbe9f6", "#fde2c8", "#d9f0d3", "#e8dcf2", "#fbe3e8", "#fff4c2"]
+EDGE_COLOR = "#4a4a4a"
+TEXT_COLOR = "#222222"
+
+# Layout units (inches at scale 1).
+_NODE_WIDTH = 2.2
+_RANK_GAP = {"LR": 3.0, "TB": 1.8}
+_SLOT_GAP = {"LR": 1.5, "TB": _NODE_WIDTH + 0.6}
+_LINE_HEIGHT = 0.28
+_WRAP_CHARS = 20
+_BACK_EDGE_BULGE = 1.1
+
+
+class DiagramNode(BaseModel):
+    """A labeled block in the diagram."""
+
+    id: str
+    label: str
+    group: Optional[str] = None
+    color: Optional[str] = Field(default=None, description="Fill color name or hex")
+    shape: str = Field(default="box", description="box | round | ellipse")
+
+
+class DiagramEdge(BaseModel):
+    """A directed connection between two nodes."""
+
+    source: str
+    target: str
+    label: Optional[str] = None
+    style: str = Field(default="solid", description="solid | dashed")
+
+
+class DiagramGroup(BaseModel):
+    """A shaded region enclosing related nodes."""
+
+    id: str
+    label: str = ""
+    color: Optional[str] = None
+
+
+class DiagramSpec(BaseModel):
+    """Declarative description of a block diagram."""
+
+    direction: str = Field(default="LR", description="LR (left-to-right) | TB (top-to-bottom)")
+    nodes: list[DiagramNode]
+    edges: list[DiagramEdge] = Field(default_factory=list)
+    groups: list[DiagramGroup] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def _check_references(self) -> DiagramSpec:
+        if not self.nodes:
+            raise ValueError("Diagram spec has no nodes")
+        if self.direction not in ("LR", "TB"):
+            raise ValueError(f"Unknown direction: {self.direction}. Use LR or TB")
+        node_ids = {n.id for n in self.nodes}
+        if len(node_ids) != len(self.nodes):
+            raise ValueError("Diagram spec has duplicate node ids")
+        for edge in self.edges:
+            for end in (edge.source, edge.target):
+                if end not in node_ids:
+                    raise ValueError(f"Edge references unknown node: {end}")
+        return self
+
+
+def parse_diagram_spec(response: str) -> DiagramSpec:
+    """Parse a VLM response (raw JSON or a fenced JSON block) into a DiagramSpec.
+
+    Raises:
+        ValueError: If the response is not valid JSON or fails validation.
+    """
+    match = re.search(r"```(?:json)?\s*(.*?)```", response, flags=re.DOTALL)
+    text = match.group(1) if match else response
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Diagram spec is not valid JSON: {e}") from e
+    return DiagramSpec.model_validate(data)
+
+
+def layout_diagram(spec: DiagramSpec) -> dict[str, tuple[int, int]]:
+    """Assign each node a (rank, slot) position.
+
+    Ranks follow the longest path from source nodes, ignoring edges that
+    close a cycle. Within a rank, nodes are kept together by group and
+    ordered by the mean slot of their predecessors to limit crossings.
+    """
+    order = {n.id: i for i, n in enumerate(spec.nodes)}
+    successors: dict[str, list[str]] = {n.id: [] for n in spec.nodes}
+    for edge in spec.edges:
+        if edge.source != edge.target:
+            successors[edge.source].append(edge.target)
+
+    # Drop back edges found by DFS so the remaining graph is acyclic
+    forward: dict[str, list[str]] = {n: [] for n in successors}
+    state: dict[str, int] = {}
+
+    def visit(node: str) -> None:
+        state[node] = 1
+        for nxt in successors[node]:
+            if state.get(nxt) == 1:
+                continue
+            forward[node].append(nxt)
+            if nxt not in state:
+                visit(nxt)
+        state[node] = 2
+
+    for node in successors:
+        if node not in state:
+            visit(node)
+
+    # Longest-path layering in topological order
+    indegree = {n: 0 for n in forward}
+    for targets in forward.values():
+        for t in targets:
+            indegree[t] += 1
+    rank = {n: 0 for n in forward}
+    queue = sorted((n for n, d in indegree.items() if d == 0), key=order.get)
+    while queue:
+        node = queue.pop(0)
+        for t in forward[node]:
+            rank[t] = max(rank[t], rank[node] + 1)
+            indegree[t] -= 1
+            if indegree[t] == 0:
+                queue.append(t)
+
+    group_order = {g.id: i for i, g in enumerate(spec.groups)}
+    predecessors: dict[str, list[str]] = {n: [] for n in forward}
+    for node, targets in forward.items():
+        for t in targets:
+            predecessors[t].append(node)
+
+    positions: dict[str, tuple[int, int]] = {}
+    node_group = {n.id: n.group for n in spec.nodes}
+    for r in range(max(rank.values()) + 1):
+        members = [n for n in forward if rank[n] == r]
+
+        def sort_key(node: str) -> tuple:
+            preds = [positions[p][1] for p in predecessors[node] if p in positions]
+            barycenter = sum(preds) / len(preds) if preds else order[node]
+            return (group_order.get(node_group[node] or "", -1), barycenter, order[node])
+
+        for slot, node in enumerate(sorted(members, key=sort_key)):
+            positions[node] = (r, slot)
+    return positions
+
+
+def render_diagram(
+    spec: DiagramSpec,
+    output_path: str | Path,
+    formats: tuple[str, ...] = ("png", "svg"),
+    dpi: int = 200,
+) -> dict[str, str]:
+    """Render a diagram spec to image files.
+
+    Args:
+        spec: Validated diagram spec.
+        output_path: Target path; each format is written with its own suffix.
+        formats: File formats to write (any matplotlib savefig format).
+        dpi: Resolution for raster formats.
+
+    Returns:
+        Mapping of format to written file path.
+    """
+    positions = layout_diagram(spec)
+    num_ranks = max(r for r, _ in positions.values()) + 1
+    num_slots = max(s for _, s in positions.values()) + 1
+    slots_per_rank = [0] * num_ranks
+    for r, s in positions.values():
+        slots_per_rank[r] = max(slots_per_rank[r], s + 1)
+
+    horizontal = spec.direction == "LR"
+    centers: dict[str, tuple[float, float]] = {}
+    for node_id, (r, s) in positions.items():
+        # Center each rank's nodes along the cross axis
+        offset = (num_slots - slots_per_rank[r]) / 2
+        main = r * _RANK_GAP[spec.direction]
+        cross = (s + offset) * _SLOT_GAP[spec.direction]
+        centers[node_id] = (main, -cross) if horizontal else (cross, -main)
+
+    # Back edges curve around the main flow; keep the bulge a fixed height
+    # so long loops stay on the canvas. The arc apex is where labels go.
+    bends: dict[int, tuple[float, tuple[float, float]]] = {}
+    for i, edge in enumerate(spec.edges):
+        if edge.source == edge.target:
+            continue
+        (x0, y0), (x1, y1) = centers[edge.source], centers[edge.target]
+        dx, dy = x1 - x0, y1 - y0
+        rad = 0.0
+        if positions[edge.target][0] <= positions[edge.source][0]:
+            rad = _BACK_EDGE_BULGE * 2 / max((dx * dx + dy * dy) ** 0.5, 1e-6)
+        apex = ((x0 + x1) / 2 + rad * dy / 2, (y0 + y1) / 2 - rad * dx / 2)
+        bends[i] = (rad, apex)
+
+    xs = [c[0] for c in centers.values()] + [a[0] for _, a in bends.values()]
+    ys = [c[1] for c in centers.values()] + [a[1] for _, a in bends.values()]
+    margin = 1.6
+    x_min, x_max = min(xs) - margin, max(xs) + margin
+    y_min, y_max = min(ys) - margin, max(ys) + margin
+
+    fig = Figure(figsize=(x_max - x_min, y_max - y_min))
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes((0, 0, 1, 1))
+    ax.set_xlim(x_min, x_max)
+    ax.set_ylim(y_min, y_max)
+    ax.set_aspect("equal")
+    ax.axis("off")
+
+    group_colors = {
+        g.id: _color(g.color, PALETTE[(i + 1) % len(PALETTE)]) for i, g in enumerate(spec.groups)
+    }
+
+    patches = {}
+    sizes = {}
+    for node in spec.nodes:
+        label = "\n".join(textwrap.wrap(node.label, _WRAP_CHARS)) or node.label
+        height = max(0.7, 0.3 + _LINE_HEIGHT * (label.count("\n") + 1))
+        sizes[node.id] = (_NODE_WIDTH, height)
+        fill = _color(node.color, group_colors.get(node.group or "", PALETTE[0]))
+        x, y = centers[node.id]
+        boxstyle = {
+            "box": "square,pad=0",
+            "ellipse": "round,pad=0,rounding_size=0.35",
+        }.get(node.shape, "round,pad=0,rounding_size=0.15")
+        patch = FancyBboxPatch(
+            (x - _NODE_WIDTH / 2, y - height / 2),
+            _NODE_WIDTH,
+            height,
+            boxstyle=boxstyle,
+            facecolor=fill,
+            edgecolor=_darken(fill),
+            linewidth=1.4,
+            zorder=3,
+        )
+        ax.add_patch(patch)
+        ax.text(x, y, label, ha="center", va="center", fontsize=10, color=TEXT_COLOR, zorder=4)
+        patches[node.id] = patch
+
+    for group in spec.groups:
+        members = [n.id for n in spec.nodes if n.group == group.id]
+        if not members:
+            continue
+        pad = 0.35
+        left = min(centers[m][0] - sizes[m][0] / 2 for m in members) - pad
+        right = max(centers[m][0] + sizes[m][0] / 2 for m in members) + pad
+        bottom = min(centers[m][1] - sizes[m][1] / 2 for m in members) - pad
+        top = max(centers[m][1] + sizes[m][1] / 2 for m in members) + pad + 0.3
+        fill = group_colors[group.id]
+        ax.add_patch(
+            FancyBboxPatch(
+                (left, bottom),
+                right - left,
+                top - bottom,
+                boxstyle="round,pad=0,rounding_size=0.2",
+                facecolor=mcolors.to_rgba(fill, 0.35),
+                edgecolor=_darken(fill),
+                linewidth=1.0,
+                linestyle="--",
+                zorder=1,
+            )
+        )
+        if group.label:
+            ax.text(
+                left + 0.15,
+                top - 0.18,
+                group.label,
+                ha="left",
+                va="center",
+                fontsize=10,
+                fontweight="bold",
+                color=TEXT_COLOR,
+                zorder=2,
+            )
+
+    for i, edge in enumerate(spec.edges):
+        if i not in bends:
+            continue
+        rad, (label_x, label_y) = bends[i]
+        arrow = FancyArrowPatch(
+            centers[edge.source],
+            centers[edge.target],
+            patchA=patches[edge.source],
+            patchB=patches[edge.target],
+            arrowstyle="-|>,head_length=6,head_width=3.5",
+            connectionstyle=f"arc3,rad={rad:.4f}",
+            color=EDGE_COLOR,
+            linewidth=1.4,
+            linestyle="--" if edge.style == "dashed" else "-",
+            shrinkA=2,
+            shrinkB=2,
+            zorder=2,
+        )
+        ax.add_patch(arrow)
+        if edge.label:
+            ax.text(
+                label_x,
+                label_y + 0.15,
+                edge.label,
+                ha="center",
+                va="bottom",
+                fontsize=8,
+                color=TEXT_COLOR,
+                bbox={"facecolor": "white", "edgecolor": "none", "pad": 1.0},
+                zorder=5,
+            )
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    written = {}
+    for fmt in formats:
+        path = output_path.with_suffix(f".{fmt}")
+        fig.savefig(path, format=fmt, dpi=dpi, facecolor="white")
+        written[fmt] = str(path)
+    return written
+
+
+def _color(value: Optional[str], default: str) -> str:
+    """Return a valid matplotlib color, falling back to the default."""
+    if value and mcolors.is_color_like(value):
+        return value
+    return default
+
+
+def _darken(color: str, factor: float = 0.6) -> tuple[float, float, float]:
+    """Darker shade of the same hue, used for borders."""
+    r, g, b = mcolors.to_rgb(color)
+    return (r * factor, g * factor, b * factor)
@@ -0,0 +1,265 @@
+"""Reduce large plot tables before the plot code draws them.
+
+Drawing millions of points makes matplotlib slow, bloats the PNG and gives
+the critic an unreadable blob. Each table of plot data can be reduced to
+roughly ``max_points`` rows with a method suited to the chart it feeds:
+
+- ``lttb``: Largest-Triangle-Three-Buckets picks the rows that preserve a
+  line's visual shape (peaks and troughs survive, flat runs thin out).
+- ``bin``: scatter points are aggregated on a 2D grid; each occupied cell
+  becomes one row at the mean position of its points, with a ``count``
+  column for sizing or hexbin-style shading.
+- ``quantile``: a distribution is replaced by evenly spaced quantiles,
+  which keep the shape of histograms, box plots and ECDFs.
+
+``auto`` picks per table: ``lttb`` in row order when a text column is the
+x axis (e.g. dates), ``quantile`` for one numeric column, ``lttb`` when a
+numeric column is sorted (an x axis), otherwise ``bin``. A low-cardinality
+text column (e.g. a model name) is treated as a series key: each series is
+reduced separately with a share of the budget and the key is kept.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+METHODS = ("auto", "lttb", "bin", "quantile")
+
+# A text column with at most this many distinct values is a series key.
+_MAX_SERIES = 64
+
+
+class Reduction(BaseModel):
+    """How one table was reduced."""
+
+    method: str
+    source_rows: int
+    rows: int
+    x: Optional[str] = None
+    y: list[str] = []
+    series: Optional[str] = None
+    count: Optional[str] = None
+
+    @property
+    def ratio(self) -> float:
+        """Fraction of rows kept."""
+        return self.rows / self.source_rows if self.source_rows else 1.0
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the n_out points that best preserve the shape of y(x).
+
+    x must be sorted. The first and last points are always kept; the rest
+    are split into n_out - 2 buckets and from each the point forming the
+    largest triangle with the previous pick and the next bucket's mean is
+    chosen.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = x.astype(np.float64, copy=False)
+    y = y.astype(np.float64, copy=False)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    cx = np.concatenate([[0.0], np.cumsum(x)])
+    cy = np.concatenate([[0.0], np.cumsum(y)])
+    # Bucket i is rows [edges[i], edges[i + 1]). Its triangle's third vertex
+    # is the mean of bucket i + 1, or the final point for the last bucket.
+    starts, ends = edges[1:-1], edges[2:]
+    next_x = np.append((cx[ends] - cx[starts]) / (ends - starts), x[-1])
+    next_y = np.append((cy[ends] - cy[starts]) / (ends - starts), y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - next_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y[i] - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def _numeric(columns: dict[str, np.ndarray]) -> list[str]:
+    return [name for name, array in columns.items() if array.dtype.kind in "iuf"]
+
+
+def _series_key(columns: dict[str, np.ndarray]) -> Optional[str]:
+    for name, array in columns.items():
+        if array.dtype.kind in "UO" and len(np.unique(array)) <= _MAX_SERIES:
+            return name
+    return None
+
+
+def _groups(columns: dict[str, np.ndarray], key: Optional[str], rows: int) -> list[np.ndarray]:
+    """Row indices of each series (one group covering every row without a key)."""
+    if key is None:
+        return [np.arange(rows)]
+    _, inverse = np.unique(columns[key], return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.flatnonzero(np.diff(inverse[order])) + 1
+    return np.split(order, bounds)
+
+
+def _sorted_column(columns: dict[str, np.ndarray], names: list[str], groups) -> Optional[str]:
+    for name in names:
+        array = columns[name]
+        if all(np.all(np.diff(array[rows]) >= 0) for rows in groups):
+            return name
+    return None
+
+
+def _take(columns: dict[str, np.ndarray], rows: np.ndarray) -> dict[str, np.ndarray]:
+    return {name: np.asarray(array[rows]) for name, array in columns.items()}
+
+
+def _reduce_lttb(columns, groups, x: str, ys: list[str], budget: int) -> dict[str, np.ndarray]:
+    keep = []
+    per_line = max(budget // (len(groups) * max(len(ys), 1)), 3)
+    for rows in groups:
+        # The x range survives even where every y is a gap
+        keep.append(rows[[0, -1]])
+        for y in ys:
+            values = columns[y][rows]
+            # NaNs are gaps in the line; they cannot be scored, so drop them
+            finite = rows[np.isfinite(values)] if values.dtype.kind == "f" else rows
+            keep.append(finite[lttb(columns[x][finite], columns[y][finite], per_line)])
+    return _take(columns, np.unique(np.concatenate(keep)))
+
+
+def _reduce_bin(
+    columns,
+    groups,
+    key: Optional[str],
+    x: str,
+    y: str,
+    numeric: list[str],
+    budget: int,
+    count_name: str,
+) -> dict[str, np.ndarray]:
+    bins = max(int(np.sqrt(budget / len(groups))), 2)
+    parts: dict[str, list[np.ndarray]] = {name: [] for name in [*numeric, count_name]}
+    if key is not None:
+        parts[key] = []
+    for rows in groups:
+        xs = columns[x][rows].astype(np.float64)
+        ys = columns[y][rows].astype(np.float64)
+        ok = np.isfinite(xs) & np.isfinite(ys)
+        rows, xs, ys = rows[ok], xs[ok], ys[ok]
+        if len(rows) == 0:
+            continue
+        cells = _cell(xs, bins) * bins + _cell(ys, bins)
+        _, inverse, counts = np.unique(cells, return_inverse=True, return_counts=True)
+        for name in numeric:
+            values = columns[name][rows].astype(np.float64)
+            # Mean per cell, ignoring NaNs in columns other than x and y
+            valid = np.isfinite(values)
+            sums = np.bincount(inverse, weights=np.where(valid, values, 0.0))
+            n = np.bincount(inverse, weights=valid.astype(np.float64))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                parts[name].append(sums / n)
+        parts[count_name].append(counts)
+        if key is not None:
+            parts[key].append(np.full(len(counts), columns[key][rows[0]]))
+    return {name: np.concatenate(arrays) for name, arrays in parts.items() if arrays}
+
+
+def _cell(values: np.ndarray, bins: int) -> np.ndarray:
+    low, high = values.min(), values.max()
+    scale = bins / (high - low) if high > low else 0.0
+    return np.minimum(((values - low) * scale).astype(np.int64), bins - 1)
+
+
+def _reduce_quantile(columns, groups, key: Optional[str], numeric: list[str], budget: int):
+    per_group = max(budget // len(groups), 2)
+    probabilities = np.linspace(0.0, 1.0, per_group)
+    parts: dict[str, list[np.ndarray]] = {name: [] for name in numeric}
+    if key is not None:
+        parts[key] = []
+    for rows in groups:
+        for name in numeric:
+            values = columns[name][rows].astype(np.float64)
+            values = values[np.isfinite(values)]
+            parts[name].append(
+                np.quantile(values, probabilities) if len(values) else np.full(per_group, np.nan)
+            )
+        if key is not None:
+            parts[key].append(np.full(per_group, columns[key][rows[0]]))
+    return {name: np.concatenate(arrays) for name, arrays in parts.items()}
+
+
+def downsample_table(
+    columns: dict[str, np.ndarray], max_points: int, method: str = "auto"
+) -> tuple[dict[str, np.ndarray], Optional[Reduction]]:
+    """Reduce a table to about max_points rows.
+
+    Args:
+        columns: Column name -> array, all of one length.
+        max_points: Target row count; smaller tables are returned unchanged.
+        method: One of ``METHODS``.
+
+    Returns:
+        The (possibly) reduced columns and a description of the reduction,
+        or the input and None when the table is small enough or has no
+        numeric columns to reduce on.
+
+    Raises:
+        ValueError: If method is unknown.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown downsampling method: {method}. Available: {', '.join(METHODS)}")
+    rows = len(next(iter(columns.values()), ()))
+    numeric = _numeric(columns)
+    if rows <= max_points or not numeric:
+        return columns, None
+
+    key = _series_key(columns)
+    groups = _groups(columns, key, rows)
+    # Text columns other than the series key label each row (e.g. dates)
+    axis = [name for name in columns if name not in numeric and name != key]
+    x = _sorted_column(columns, numeric, groups) if method in ("auto", "lttb") else None
+    if method == "auto":
+        if axis:
+            # The text column is the x axis: trace every numeric column in row order
+            method, x = "lttb", None
+        else:
+            method = "quantile" if len(numeric) == 1 else "lttb" if x is not None else "bin"
+    if method == "lttb" and x is None:
+        # No sorted column to use as the line's x: order by row position
+        x = "__row__"
+        columns = {**columns, x: np.arange(rows)}
+    elif method == "bin" and len(numeric) < 2:
+        method = "quantile"
+    if method == "lttb" and not [name for name in numeric if name != x]:
+        # The only numeric column is the sorted x: there is no line to trace
+        method = "quantile"
+
+    count = None
+    if method == "lttb":
+        ys = [name for name in numeric if name != x]
+        reduced = _reduce_lttb(columns, groups, x, ys, max_points)
+        reduced.pop("__row__", None)
+        if x == "__row__":
+            x = axis[0] if axis else None
+    elif method == "bin":
+        x, ys = numeric[0], [numeric[1]]
+        count = "count" if "count" not in columns else "n_points"
+        reduced = _reduce_bin(columns, groups, key, x, ys[0], numeric, max_points, count)
+    else:
+        x, ys = None, numeric
+        reduced = _reduce_quantile(columns, groups, key, numeric, max_points)
+
+    reduction = Reduction(
+        method=method,
+        source_rows=rows,
+        rows=len(next(iter(reduced.values()))),
+        x=x,
+        y=ys,
+        series=key,
+        count=count,
+    )
+    return reduced, reduction
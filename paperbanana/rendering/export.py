@@ -0,0 +1,120 @@
+"""Write one plot figure in several formats and resolutions.
+
+Generated plot code saves a single PNG to ``OUTPUT_PATH``. Publication
+workflows also need vector files, and the critic only needs a cheap
+preview. Rather than re-running the code per format, the executor
+captures the figure the code saved and writes every requested export from
+that same figure object:
+
+- ``preview``: PNG at preview DPI (written to the iteration's image path,
+  which is what the critic sees),
+- ``png``: PNG at print DPI,
+- ``svg`` / ``pdf``: vector output.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+# savefig options from the generated code that carry over to the exports;
+# format and resolution are set per export.
+_KEPT_KWARGS = ("bbox_inches", "pad_inches", "facecolor", "edgecolor", "transparent")
+
+
+def plot_exports(
+    output_path: str | Path,
+    formats: tuple[str, ...] | list[str] = ("svg", "pdf"),
+    preview_dpi: int = 100,
+    print_dpi: int = 300,
+) -> dict[str, dict[str, Any]]:
+    """Export targets for a plot whose preview goes to output_path.
+
+    Returns:
+        Export name -> {"path", "format", "dpi"}.
+    """
+    output_path = Path(output_path)
+    exports: dict[str, dict[str, Any]] = {
+        "preview": {"path": str(output_path), "format": "png", "dpi": preview_dpi},
+        "png": {
+            "path": str(output_path.with_name(f"{output_path.stem}_print.png")),
+            "format": "png",
+            "dpi": print_dpi,
+        },
+    }
+    for fmt in formats:
+        if fmt != "png":
+            exports[fmt] = {
+                "path": str(output_path.with_suffix(f".{fmt}")),
+                "format": fmt,
+                "dpi": print_dpi,
+            }
+    return exports
+
+
+def save_figure_exports(
+    figure: Any, exports: dict[str, dict[str, Any]], **savefig_kwargs: Any
+) -> dict[str, str]:
+    """Save a matplotlib figure to every export target.
+
+    Returns:
+        Export name -> written path.
+    """
+    return _save_all(type(figure).savefig, figure, exports, savefig_kwargs)
+
+
+def _save_all(save, figure, exports: dict[str, dict[str, Any]], kwargs: dict) -> dict[str, str]:
+    kept = {k: v for k, v in kwargs.items() if k in _KEPT_KWARGS}
+    written = {}
+    for name, target in exports.items():
+        Path(target["path"]).parent.mkdir(parents=True, exist_ok=True)
+        save(figure, target["path"], format=target["format"], dpi=target["dpi"], **kept)
+        written[name] = target["path"]
+    return written
+
+
+class SavefigCapture:
+    """Records the figure (and savefig options) that code saves to a path.
+
+    While installed, ``Figure.savefig`` (and therefore ``plt.savefig``)
+    is wrapped so that a save to ``output_path`` remembers the figure.
+    """
+
+    def __init__(self, output_path: str):
+        from matplotlib.figure import Figure
+
+        self.output_path = os.path.abspath(output_path)
+        self.figure: Optional[Any] = None
+        self.kwargs: dict[str, Any] = {}
+        self._figure_cls = Figure
+        self._original = Figure.savefig
+        capture = self
+
+        def savefig(fig, fname, *args, **kwargs):
+            if isinstance(fname, (str, os.PathLike)) and (
+                os.path.abspath(fname) == capture.output_path
+            ):
+                capture.figure, capture.kwargs = fig, dict(kwargs)
+            return capture._original(fig, fname, *args, **kwargs)
+
+        Figure.savefig = savefig
+
+    def export(self, exports: dict[str, dict[str, Any]]) -> dict[str, str]:
+        """Write the captured figure to every export target.
+
+        Raises:
+            RuntimeError: If nothing was saved to ``output_path``.
+        """
+        if self.figure is None:
+            raise RuntimeError("Plot code did not save a figure to OUTPUT_PATH")
+        # Writing through the original method keeps exports out of the capture
+        return _save_all(self._original, self.figure, exports, self.kwargs)
+
+    def reset(self) -> None:
+        """Forget the captured figure (between jobs in one process)."""
+        self.figure, self.kwargs = None, {}
+
+    def uninstall(self) -> None:
+        """Restore the original ``Figure.savefig``."""
+        self._figure_cls.savefig = self._original
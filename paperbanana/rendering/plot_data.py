@@ -0,0 +1,293 @@
+"""Columnar transport of statistical plot data.
+
+Inlining ``raw_data`` as JSON in the plot prompt makes the prompt grow with
+the data: a 50k-row CSV is megabytes of tokens on every refinement
+iteration. Instead, tabular parts of ``raw_data`` are written once per run
+as one ``.npy`` file per column plus a ``schema.json``. Plot code receives
+them memory-mapped in a ``DATA`` variable (table name -> column name ->
+NumPy array), and the prompt only carries each table's schema, summary
+statistics and a few sample rows, so its size does not depend on the
+number of rows.
+
+Accepted ``raw_data`` shapes, per top-level key:
+
+- a list of row dicts (``df.to_dict(orient="records")``),
+- a dict of equal-length lists (``df.to_dict(orient="list")``).
+
+If every top-level value is an equal-length list of scalars, the whole
+``raw_data`` is one table named ``data``. Anything else stays inline.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+from paperbanana.rendering.downsample import downsample_table
+
+SCHEMA_FILE = "schema.json"
+
+# Prompt size bounds: tables and columns described, sample rows shown,
+# most frequent values listed for text columns, characters per value.
+_MAX_TABLES = 8
+_MAX_COLUMNS = 40
+_SAMPLE_ROWS = 5
+_TOP_VALUES = 3
+_MAX_VALUE_CHARS = 40
+
+DATA_VARIABLE_HELP = (
+    "The data is not inlined. Plot code receives it preloaded in a variable named "
+    "`DATA`: a dict mapping each table name below to a dict of column name -> "
+    'NumPy array (read-only). Use `pd.DataFrame(DATA["<table>"])` for a DataFrame. '
+    "Do not redefine DATA or read data from files."
+)
+
+
+def _is_scalar(value: Any) -> bool:
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def _column_array(values: list) -> np.ndarray:
+    """Convert a list of JSON scalars to a typed array (float with NaN for gaps)."""
+    present = [v for v in values if v is not None]
+    if present and all(isinstance(v, bool) for v in present):
+        if len(present) == len(values):
+            return np.asarray(values, dtype=bool)
+    elif present and all(isinstance(v, (int, float)) for v in present):
+        if len(present) == len(values) and all(isinstance(v, int) for v in present):
+            try:
+                return np.asarray(values, dtype=np.int64)
+            except OverflowError:
+                pass
+        return np.asarray([math.nan if v is None else v for v in values], dtype=np.float64)
+    return np.asarray(["" if v is None else str(v) for v in values], dtype=str)
+
+
+def _records_to_columns(records: list[dict]) -> Optional[dict[str, list]]:
+    if not records or not all(isinstance(r, dict) for r in records):
+        return None
+    names: dict[str, None] = {}
+    for record in records:
+        for name in record:
+            names.setdefault(name, None)
+    columns = {name: [record.get(name) for record in records] for name in names}
+    if not all(all(_is_scalar(v) for v in values) for values in columns.values()):
+        return None
+    return columns
+
+
+def _as_columns(value: Any) -> Optional[dict[str, list]]:
+    """Columns of a records list or a dict of equal-length scalar lists, else None."""
+    if isinstance(value, list):
+        return _records_to_columns(value)
+    if isinstance(value, dict) and value:
+        lists = list(value.values())
+        if all(isinstance(v, list) and v for v in lists) and len({len(v) for v in lists}) == 1:
+            if all(_is_scalar(x) for v in lists for x in v):
+                return {str(k): v for k, v in value.items()}
+    return None
+
+
+def split_tables(raw_data: dict) -> tuple[dict[str, dict[str, list]], dict]:
+    """Split raw_data into tables (name -> columns) and the non-tabular rest."""
+    whole = _as_columns(raw_data)
+    if whole is not None:
+        return {"data": whole}, {}
+    tables: dict[str, dict[str, list]] = {}
+    rest: dict = {}
+    for key, value in raw_data.items():
+        columns = _as_columns(value)
+        if columns is not None:
+            tables[str(key)] = columns
+        else:
+            rest[key] = value
+    return tables, rest
+
+
+def load_plot_data(directory: str | Path) -> dict[str, dict[str, np.ndarray]]:
+    """Memory-map the tables written by :meth:`PlotData.write`."""
+    directory = Path(directory)
+    with open(directory / SCHEMA_FILE, encoding="utf-8") as f:
+        schema = json.load(f)
+    return {
+        table: {
+            column["name"]: np.load(directory / column["file"], mmap_mode="r")
+            for column in info["columns"]
+        }
+        for table, info in schema["tables"].items()
+    }
+
+
+class PlotData:
+    """Tabular plot data stored as columnar ``.npy`` files.
+
+    Attributes:
+        directory: Where the schema and column files live (absolute, so
+            plot code running in another working directory finds them).
+        tables: Table name -> {"rows": int, "columns": [column info]}.
+        rest: Parts of raw_data that are not tabular (kept inline).
+    """
+
+    def __init__(self, directory: Path, tables: dict[str, dict], rest: dict):
+        self.directory = directory
+        self.tables = tables
+        self.rest = rest
+        self._description: Optional[str] = None
+
+    @classmethod
+    def write(
+        cls,
+        raw_data: dict,
+        directory: str | Path,
+        max_points: int = 0,
+        downsample: str = "auto",
+    ) -> Optional[PlotData]:
+        """Write the tabular parts of raw_data; None if there are none.
+
+        Args:
+            raw_data: Plot data as passed in ``GenerationInput.raw_data``.
+            directory: Where to write the schema and column files.
+            max_points: Reduce tables with more rows than this (0 keeps
+                every row). Summary statistics still describe the full data.
+            downsample: Reduction method, see
+                :mod:`paperbanana.rendering.downsample`.
+        """
+        tables, rest = split_tables(raw_data)
+        if not tables:
+            return None
+        directory = Path(directory).resolve()
+        directory.mkdir(parents=True, exist_ok=True)
+
+        schema: dict[str, dict] = {}
+        for t, (table, columns) in enumerate(tables.items()):
+            arrays = {name: _column_array(values) for name, values in columns.items()}
+            stats = {name: _column_stats(array) for name, array in arrays.items()}
+            reduction = None
+            if max_points > 0:
+                arrays, reduction = downsample_table(arrays, max_points, downsample)
+            infos = []
+            for c, (name, array) in enumerate(arrays.items()):
+                file_name = f"t{t}_c{c}.npy"
+                np.save(directory / file_name, array)
+                infos.append(
+                    {"name": name, "file": file_name, **(stats.get(name) or _column_stats(array))}
+                )
+            schema[table] = {"rows": len(next(iter(arrays.values()))), "columns": infos}
+            if reduction is not None:
+                schema[table]["reduction"] = {
+                    **reduction.model_dump(),
+                    "ratio": round(reduction.ratio, 6),
+                }
+
+        with open(directory / SCHEMA_FILE, "w", encoding="utf-8") as f:
+            json.dump({"tables": schema}, f, indent=2, ensure_ascii=False)
+        return cls(directory, schema, rest)
+
+    def load(self) -> dict[str, dict[str, np.ndarray]]:
+        """Memory-mapped columns of every table."""
+        return load_plot_data(self.directory)
+
+    @property
+    def rows(self) -> int:
+        """Total rows across all tables."""
+        return sum(info["rows"] for info in self.tables.values())
+
+    @property
+    def reductions(self) -> dict[str, dict]:
+        """Downsampling applied to each reduced table (method, rows, ratio)."""
+        return {
+            table: info["reduction"] for table, info in self.tables.items() if "reduction" in info
+        }
+
+    def describe(self, usage: str = DATA_VARIABLE_HELP) -> str:
+        """Prompt section with schema, summary statistics and sample rows.
+
+        Args:
+            usage: How the generated code or spec accesses the tables.
+        """
+        if self._description is None:
+            self._description = self._describe()
+        return f"## Data\n{usage}\n{self._description}"
+
+    def _describe(self) -> str:
+        data = self.load()
+        lines = []
+        for table, info in list(self.tables.items())[:_MAX_TABLES]:
+            columns = info["columns"]
+            lines.append(f'\n### Table "{table}": {info["rows"]} rows, {len(columns)} columns')
+            if "reduction" in info:
+                lines.append(_reduction_note(info["reduction"]))
+            lines.append("| column | dtype | summary |")
+            lines.append("|---|---|---|")
+            for column in columns[:_MAX_COLUMNS]:
+                lines.append(f"| {column['name']} | {column['dtype']} | {column['summary']} |")
+            if len(columns) > _MAX_COLUMNS:
+                lines.append(f"| ... {len(columns) - _MAX_COLUMNS} more columns | | |")
+
+            shown = [c["name"] for c in columns[:_MAX_COLUMNS]]
+            sample = min(_SAMPLE_ROWS, info["rows"])
+            lines.append(f"\nFirst {sample} rows:")
+            lines.append(",".join(shown))
+            for row in range(sample):
+                lines.append(",".join(_short(data[table][name][row]) for name in shown))
+        if len(self.tables) > _MAX_TABLES:
+            lines.append(f"\n({len(self.tables) - _MAX_TABLES} more tables not shown)")
+        if self.rest:
+            lines.append(f"\n### Other data\n```json\n{json.dumps(self.rest, indent=2)}\n```")
+        return "\n".join(lines)
+
+
+_REDUCTION_NOTES = {
+    "lttb": "rows are a shape-preserving subset of the original line(s); draw them as lines.",
+    "bin": (
+        "each row is one grid cell: numeric columns are means of the points in it "
+        "and `{count}` is how many points it holds; size or shade markers by it."
+    ),
+    "quantile": (
+        "rows are evenly spaced quantiles of each numeric column (per series); use "
+        "them like raw samples for histograms, box plots or ECDFs."
+    ),
+}
+
+
+def _reduction_note(reduction: dict) -> str:
+    series = f" per {reduction['series']}" if reduction.get("series") else ""
+    note = _REDUCTION_NOTES[reduction["method"]].format(count=reduction.get("count"))
+    return (
+        f"Downsampled from {reduction['source_rows']} rows by {reduction['method']}{series}: "
+        f"{note} Column summaries describe the full data."
+    )
+
+
+def _short(value: Any) -> str:
+    text = value.item() if isinstance(value, np.generic) else value
+    text = f"{text:.6g}" if isinstance(text, float) else str(text)
+    return text if len(text) <= _MAX_VALUE_CHARS else text[: _MAX_VALUE_CHARS - 3] + "..."
+
+
+def _column_stats(array: np.ndarray) -> dict[str, str]:
+    """dtype and a one-line summary of a column."""
+    if array.dtype.kind in "iuf":
+        finite = array[np.isfinite(array)] if array.dtype.kind == "f" else array
+        missing = len(array) - len(finite)
+        if len(finite) == 0:
+            summary = "all missing"
+        else:
+            summary = (
+                f"min {_short(finite.min())}, max {_short(finite.max())}, "
+                f"mean {_short(float(finite.mean()))}, std {_short(float(finite.std()))}"
+            )
+            if missing:
+                summary += f", {missing} missing"
+        return {"dtype": "int" if array.dtype.kind in "iu" else "float", "summary": summary}
+    if array.dtype.kind == "b":
+        return {"dtype": "bool", "summary": f"{int(array.sum())} true of {len(array)}"}
+
+    values, counts = np.unique(array, return_counts=True)
+    top = np.argsort(-counts, kind="stable")[:_TOP_VALUES]
+    common = ", ".join(f"{_short(values[i])} ({counts[i]})" for i in top)
+    return {"dtype": "str", "summary": f"{len(values)} distinct; most common: {common}"}
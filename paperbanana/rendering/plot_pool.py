@@ -0,0 +1,367 @@
+"""Pool of warm worker processes for executing generated matplotlib code.
+
+Spawning a fresh interpreter for every plot pays start-up plus the
+matplotlib/numpy import on each refinement iteration. Workers in this pool
+import matplotlib once (Agg backend), then execute plot code sent over a
+pipe and return the PNG bytes. Generated code stays isolated from the
+pipeline process, but not from earlier jobs on the same worker: each job
+gets a fresh global namespace inside a per-worker scratch directory, and
+open figures and rcParams are reset afterwards, but all jobs share one
+interpreter, so imported modules (and any changes a job makes to them,
+such as monkeypatches or module globals) carry over until the worker is
+recycled.
+
+A worker is retired and replaced after ``max_jobs`` jobs, when its resident
+memory grows by more than ``max_memory_growth_mb`` over its warm baseline,
+when a job exceeds the timeout (the worker is killed), or if it crashes.
+
+Workers are started with the "spawn" method, which re-imports the main
+module in each worker: a script that uses the pool must keep its
+top-level code under ``if __name__ == "__main__":``, or the workers fail
+to start.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+import time
+import traceback
+from typing import Any, Optional
+
+import structlog
+from pydantic import BaseModel
+
+logger = structlog.get_logger()
+
+# Matches the per-plot subprocess timeout used before the pool existed.
+DEFAULT_TIMEOUT = 60.0
+
+_OUTPUT_NAME = "plot.png"
+_MAX_ERROR_CHARS = 2000
+
+
+class PlotResult(BaseModel):
+    """Outcome of executing one piece of plot code."""
+
+    ok: bool
+    image: Optional[bytes] = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+    exports: dict[str, str] = {}
+
+
+def _rss_mb() -> float:
+    """Current resident set size of this process in MB (0 if unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        import sys
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, kilobytes elsewhere
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+    except (ImportError, OSError):
+        return 0.0
+
+
+def _worker_main(conn: Any, workdir: str) -> None:
+    """Worker loop: warm up matplotlib, then execute jobs until told to stop."""
+    import contextlib
+    import io
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import numpy  # noqa: F401  (warm import for generated code)
+
+    from paperbanana.rendering.export import SavefigCapture
+    from paperbanana.rendering.plot_data import load_plot_data
+
+    os.chdir(workdir)
+    output_path = os.path.join(workdir, _OUTPUT_NAME)
+    capture = SavefigCapture(output_path)
+    conn.send({"ready": True, "rss_mb": _rss_mb()})
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+
+        code, data, data_dir, exports = job
+        capture.reset()
+        namespace = {"__name__": "__main__", "OUTPUT_PATH": output_path, "RAW_DATA": data}
+        reply: dict[str, Any] = {"ok": False}
+        stderr = io.StringIO()
+        try:
+            if data_dir is not None:
+                namespace["DATA"] = load_plot_data(data_dir)
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(stderr):
+                exec(compile(code, "<plot>", "exec"), namespace)
+            if os.path.exists(output_path) and exports:
+                # Same figure object, every format, before it is closed
+                reply = {"ok": True, "exports": capture.export(exports)}
+            elif os.path.exists(output_path):
+                with open(output_path, "rb") as f:
+                    reply = {"ok": True, "image": f.read()}
+            else:
+                reply["error"] = "Plot code did not save a figure to OUTPUT_PATH"
+        except BaseException:  # includes SystemExit raised by generated code
+            reply["error"] = (stderr.getvalue() + traceback.format_exc())[-_MAX_ERROR_CHARS:]
+        finally:
+            plt.close("all")
+            matplotlib.rcdefaults()
+            if os.path.exists(output_path):
+                os.remove(output_path)
+
+        reply["rss_mb"] = _rss_mb()
+        conn.send(reply)
+
+
+class _Worker:
+    """Parent-side handle for one worker process."""
+
+    def __init__(self, ctx: Any):
+        self.workdir = tempfile.mkdtemp(prefix="paperbanana_plot_")
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main, args=(child_conn, self.workdir), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+        self.baseline_mb = 0.0
+        self.rss_mb = 0.0
+
+    def wait_ready(self, timeout: float) -> bool:
+        if not self.conn.poll(timeout):
+            return False
+        try:
+            message = self.conn.recv()
+        except EOFError:
+            return False
+        self.baseline_mb = self.rss_mb = message.get("rss_mb", 0.0)
+        return True
+
+    def stop(self, kill: bool = False) -> None:
+        if not kill and self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+            self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=2)
+        self.conn.close()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+class PlotWorkerPool:
+    """Bounded pool of pre-warmed plot execution processes.
+
+    Workers are started lazily on first use (or eagerly with ``warm()``)
+    and shared by concurrent callers; at most ``size`` plots execute at
+    once and further callers wait for a free worker.
+
+    Args:
+        size: Number of worker processes.
+        max_jobs: Recycle a worker after this many jobs.
+        max_memory_growth_mb: Recycle a worker whose resident memory has
+            grown by more than this over its warm baseline.
+        timeout: Per-job timeout in seconds; the worker is killed on expiry.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_jobs: int = 50,
+        max_memory_growth_mb: float = 512.0,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        if size < 1:
+            raise ValueError("Plot worker pool size must be at least 1")
+        self.size = size
+        self.max_jobs = max_jobs
+        self.max_memory_growth_mb = max_memory_growth_mb
+        self.timeout = timeout
+        self._ctx = multiprocessing.get_context("spawn")
+        # Each slot holds an idle worker, or None if one must be started
+        self._slots: queue.Queue[Optional[_Worker]] = queue.Queue()
+        for _ in range(size):
+            self._slots.put(None)
+        self._closed = False
+
+    def warm(self) -> None:
+        """Start all workers now instead of on first use."""
+        workers = [self._acquire() for _ in range(self.size)]
+        for worker in workers:
+            self._slots.put(worker)
+
+    def execute(
+        self,
+        code: str,
+        data: Any = None,
+        timeout: Optional[float] = None,
+        data_dir: Optional[str] = None,
+        exports: Optional[dict[str, dict]] = None,
+    ) -> PlotResult:
+        """Execute plot code on a worker and return the saved PNG bytes.
+
+        The code must save its figure to ``OUTPUT_PATH``, which is defined in
+        its namespace along with ``RAW_DATA`` (the ``data`` argument) and,
+        when ``data_dir`` is given, ``DATA``: the columnar tables written
+        there by :class:`~paperbanana.rendering.plot_data.PlotData`,
+        memory-mapped by the worker rather than sent over the pipe.
+
+        With ``exports`` (see :func:`~paperbanana.rendering.export.plot_exports`)
+        the worker also writes the figure saved to ``OUTPUT_PATH`` to each
+        export target, in the same execution; ``PlotResult.exports`` lists
+        the files written and no image bytes are returned.
+
+        Relative ``data_dir`` and export paths are resolved against the
+        caller's working directory; workers run in their own.
+
+        Raises:
+            RuntimeError: If the pool is closed or a worker fails to start.
+        """
+        if self._closed:
+            raise RuntimeError("Plot worker pool is closed")
+        timeout = self.timeout if timeout is None else timeout
+        if data_dir is not None:
+            data_dir = os.path.abspath(data_dir)
+        if exports:
+            exports = {
+                name: {**target, "path": os.path.abspath(target["path"])}
+                for name, target in exports.items()
+            }
+        start = time.perf_counter()
+        worker: Optional[_Worker] = self._acquire()
+        try:
+            worker.conn.send((code, data, data_dir, exports))
+            if not worker.conn.poll(timeout):
+                logger.error("Plot code timed out", timeout=timeout)
+                worker.stop(kill=True)
+                worker = None
+                return PlotResult(ok=False, error="Plot code timed out", seconds=timeout)
+            reply = worker.conn.recv()
+            # Count the job and decide on recycling before the worker is
+            # returned, so no other caller can run on it uncounted
+            worker.jobs += 1
+            worker.rss_mb = reply.get("rss_mb", 0.0)
+            if self._worn_out(worker):
+                self._retire(worker)
+                worker = None
+        except (EOFError, OSError) as e:
+            logger.error("Plot worker exited unexpectedly", error=repr(e))
+            worker.stop(kill=True)
+            worker = None
+            return PlotResult(
+                ok=False,
+                error="Plot worker exited unexpectedly",
+                seconds=time.perf_counter() - start,
+            )
+        finally:
+            self._slots.put(worker)
+
+        return PlotResult(
+            ok=reply["ok"],
+            image=reply.get("image"),
+            error=reply.get("error"),
+            seconds=time.perf_counter() - start,
+            exports=reply.get("exports", {}),
+        )
+
+    async def run(
+        self,
+        code: str,
+        data: Any = None,
+        timeout: Optional[float] = None,
+        data_dir: Optional[str] = None,
+        exports: Optional[dict[str, dict]] = None,
+    ) -> PlotResult:
+        """Async wrapper around ``execute`` that keeps the event loop free."""
+        return await asyncio.to_thread(self.execute, code, data, timeout, data_dir, exports)
+
+    def close(self) -> None:
+        """Stop all idle workers. Safe to call more than once."""
+        self._closed = True
+        while True:
+            try:
+                worker = self._slots.get_nowait()
+            except queue.Empty:
+                break
+            if worker is not None:
+                worker.stop()
+
+    def _acquire(self) -> _Worker:
+        """Take an idle worker, replacing it first if it is dead or worn out."""
+        worker = self._slots.get()
+        if worker is not None and worker.process.is_alive() and not self._worn_out(worker):
+            return worker
+        if worker is not None:
+            self._retire(worker)
+        try:
+            worker = _Worker(self._ctx)
+            if not worker.wait_ready(self.timeout):
+                worker.stop(kill=True)
+                raise RuntimeError("Plot worker failed to start")
+        except BaseException:
+            self._slots.put(None)
+            raise
+        logger.debug("Plot worker started", pid=worker.process.pid, rss_mb=worker.baseline_mb)
+        return worker
+
+    def _retire(self, worker: _Worker) -> None:
+        logger.debug(
+            "Recycling plot worker",
+            pid=worker.process.pid,
+            jobs=worker.jobs,
+            rss_mb=round(worker.rss_mb, 1),
+        )
+        worker.stop()
+
+    def _worn_out(self, worker: _Worker) -> bool:
+        return (
+            worker.jobs >= self.max_jobs
+            or worker.rss_mb - worker.baseline_mb > self.max_memory_growth_mb
+        )
+
+
+_shared_pools: dict[tuple, PlotWorkerPool] = {}
+
+
+def get_plot_pool(
+    size: int = 2,
+    max_jobs: int = 50,
+    max_memory_growth_mb: float = 512.0,
+) -> PlotWorkerPool:
+    """Return a process-wide pool so warm workers are reused across pipelines."""
+    key = (size, max_jobs, max_memory_growth_mb)
+    pool = _shared_pools.get(key)
+    if pool is None or pool._closed:
+        pool = PlotWorkerPool(
+            size=size, max_jobs=max_jobs, max_memory_growth_mb=max_memory_growth_mb
+        )
+        _shared_pools[key] = pool
+    return pool
+
+
+@atexit.register
+def _close_shared_pools() -> None:
+    for pool in _shared_pools.values():
+        pool.close()
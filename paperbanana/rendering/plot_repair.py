@@ -0,0 +1,230 @@
+"""Classify plot code failures and repair common ones without a VLM call.
+
+When generated plot code fails, the visualizer feeds the traceback back to
+the VLM for a fix. Many failures are mechanical, though: a misspelled
+column, a keyword argument the installed matplotlib does not accept, a
+renamed style sheet, a forgotten ``savefig``. :class:`PlotRepairer` tries
+rewrite rules for those first.
+
+Failures are reduced to a signature (failure kind plus the offending
+name). When a VLM fix succeeds, the small token-level edits it made are
+remembered under that signature, in memory and optionally in the shared
+SQLite cache. The next time the same failure shows up, in a later
+iteration or another run, those edits are replayed locally first.
+"""
+
+from __future__ import annotations
+
+import difflib
+import re
+from typing import Callable, Optional
+
+import structlog
+from pydantic import BaseModel
+
+from paperbanana.core.cache import SQLiteCache, cache_key
+
+logger = structlog.get_logger()
+
+# Learned fixes larger than this many edits are too specific to replay.
+_MAX_LEARNED_EDITS = 4
+_MAX_EDIT_TOKENS = 8
+
+_EXCEPTION_LINE = re.compile(r"^(\w+(?:\.\w+)*(?:Error|Exception|Warning)):\s*(.*)$", re.M)
+_TOKEN = re.compile(r"'[^'\n]*'|\"[^\"\n]*\"|\w+|[^\w\s]")
+
+# A simple keyword-argument value: a literal, a bracketed expression
+# without nesting, or a bare name/number.
+_VALUE = r"(?:'[^']*'|\"[^\"]*\"|\([^()]*\)|\[[^\[\]]*\]|\{[^{}]*\}|[^,()\[\]{}\s]+)"
+
+
+class PlotFailure(BaseModel):
+    """A plot code failure reduced to a reusable class."""
+
+    kind: str
+    detail: str = ""
+    message: str
+
+    @property
+    def signature(self) -> str:
+        return f"{self.kind}:{self.detail}"
+
+
+def classify_failure(error: str) -> PlotFailure:
+    """Classify a traceback or error message from plot execution."""
+    if "timed out" in error:
+        return PlotFailure(kind="timeout", message=error.strip()[-200:])
+    if "did not save a figure" in error:
+        return PlotFailure(kind="no_figure", message=error.strip())
+
+    matches = _EXCEPTION_LINE.findall(error)
+    if not matches:
+        return PlotFailure(kind="other", message=error.strip()[-300:])
+    exc_type, message = matches[-1]
+    exc_type = exc_type.rsplit(".", 1)[-1]
+    quoted = re.search(r"'([^']+)'", message)
+    name = quoted.group(1) if quoted else ""
+
+    if exc_type == "KeyError" and name:
+        return PlotFailure(kind="missing_column", detail=name, message=message)
+    if exc_type == "TypeError" and "unexpected keyword argument" in message:
+        return PlotFailure(kind="unexpected_kwarg", detail=name, message=message)
+    if exc_type == "AttributeError" and "has no attribute" in message:
+        names = re.findall(r"'([^']+)'", message)
+        detail = names[-1] if names else ""
+        return PlotFailure(kind="missing_attribute", detail=detail, message=message)
+    if "not a valid package style" in message or "not found in the style library" in message:
+        return PlotFailure(kind="unknown_style", detail=name, message=message)
+    if exc_type in ("ModuleNotFoundError", "ImportError"):
+        return PlotFailure(kind="missing_module", detail=name, message=message)
+    if exc_type == "NameError":
+        return PlotFailure(kind="undefined_name", detail=name, message=message)
+    # Generic class: exception type plus the message without numbers
+    return PlotFailure(kind=exc_type, detail=re.sub(r"\d+", "N", message)[:120], message=message)
+
+
+class PlotRepairer:
+    """Local repairs for failed plot code, learning from successful VLM fixes.
+
+    Args:
+        cache: Optional shared cache persisting learned fixes across runs.
+    """
+
+    def __init__(self, cache: Optional[SQLiteCache] = None):
+        self.cache = cache
+        self._learned: dict[str, list[list[str]]] = {}
+        self._rules: dict[str, Callable[[str, PlotFailure, list[str]], Optional[str]]] = {
+            "missing_column": _fix_missing_column,
+            "unexpected_kwarg": _fix_unexpected_kwarg,
+            "unknown_style": _fix_unknown_style,
+            "no_figure": _fix_no_figure,
+        }
+
+    def local_fix(
+        self, code: str, failure: PlotFailure, columns: list[str]
+    ) -> Optional[tuple[str, str]]:
+        """Rewrite code for a known failure without calling the VLM.
+
+        Args:
+            code: The failing plot code.
+            failure: Its classified failure.
+            columns: Column names available in the plot data.
+
+        Returns:
+            (rewritten code, name of the fix applied), or None if no local
+            fix applies or it would leave the code unchanged.
+        """
+        edits = self._edits_for(failure.signature)
+        if edits:
+            fixed = code
+            for old, new in edits:
+                fixed = _replace_tokens(fixed, old, new)
+            if fixed != code:
+                return fixed, "learned"
+        rule = self._rules.get(failure.kind)
+        if rule is not None:
+            fixed = rule(code, failure, columns)
+            if fixed is not None and fixed != code:
+                return fixed, failure.kind
+        return None
+
+    def learn(self, failure: PlotFailure, before: str, after: str) -> None:
+        """Remember the edits of a successful VLM fix for this failure class.
+
+        Only small, targeted fixes are kept; a rewrite of the whole snippet
+        says nothing reusable about the failure.
+        """
+        edits = _token_edits(before, after)
+        if not edits or len(edits) > _MAX_LEARNED_EDITS:
+            return
+        self._learned[failure.signature] = edits
+        if self.cache is not None:
+            self.cache.set(cache_key("plot_repair", failure.signature), edits)
+        logger.debug("Learned plot repair", signature=failure.signature, edits=len(edits))
+
+    def _edits_for(self, signature: str) -> Optional[list[list[str]]]:
+        edits = self._learned.get(signature)
+        if edits is None and self.cache is not None:
+            edits = self.cache.get(cache_key("plot_repair", signature))
+            if edits is not None:
+                self._learned[signature] = edits
+        return edits
+
+
+def _token_edits(before: str, after: str) -> list[list[str]]:
+    """Small (old text, new text) replacements that turn before into after."""
+    old_tokens = list(_TOKEN.finditer(before))
+    new_tokens = list(_TOKEN.finditer(after))
+    matcher = difflib.SequenceMatcher(
+        a=[t.group() for t in old_tokens], b=[t.group() for t in new_tokens], autojunk=False
+    )
+    edits = []
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == "equal":
+            continue
+        if op == "insert" or i2 - i1 > _MAX_EDIT_TOKENS or j2 - j1 > _MAX_EDIT_TOKENS:
+            # Pure insertions have no anchor to replay against
+            return []
+        old = before[old_tokens[i1].start() : old_tokens[i2 - 1].end()]
+        new = after[new_tokens[j1].start() : new_tokens[j2 - 1].end()] if j2 > j1 else ""
+        if op == "delete" and not old.startswith(","):
+            # Deletions are only safe to replay for whole ", arg=value" items
+            return []
+        edits.append([old, new])
+    return edits
+
+
+def _replace_tokens(code: str, old: str, new: str) -> str:
+    """Replace old with new where it starts and ends on token boundaries."""
+    pattern = re.escape(old)
+    if re.match(r"\w", old):
+        pattern = r"(?<!\w)" + pattern
+    if re.search(r"\w$", old):
+        pattern += r"(?!\w)"
+    return re.sub(pattern, lambda _: new, code)
+
+
+def _fix_missing_column(code: str, failure: PlotFailure, columns: list[str]) -> Optional[str]:
+    """Replace a quoted unknown column name with the closest real column."""
+    lowered = {c.lower(): c for c in columns}
+    match = lowered.get(failure.detail.lower())
+    if match is None:
+        close = difflib.get_close_matches(failure.detail, columns, n=1, cutoff=0.6)
+        match = close[0] if close else None
+    if match is None:
+        return None
+    pattern = re.compile(r"(['\"])" + re.escape(failure.detail) + r"\1")
+    return pattern.sub(lambda m: m.group(1) + match + m.group(1), code)
+
+
+def _fix_unexpected_kwarg(code: str, failure: PlotFailure, columns: list[str]) -> Optional[str]:
+    """Drop every use of a keyword argument the callee does not accept."""
+    name = re.escape(failure.detail)
+    if not name:
+        return None
+    # "f(a, name=v, b)" and "f(name=v, b)": remove the item and its comma
+    code = re.sub(rf"([(,]\s*){name}\s*=\s*{_VALUE}\s*,\s*", r"\1", code)
+    # "f(a, name=v)"
+    code = re.sub(rf",\s*{name}\s*=\s*{_VALUE}(\s*\))", r"\1", code)
+    # "f(name=v)"
+    return re.sub(rf"\(\s*{name}\s*=\s*{_VALUE}\s*\)", "()", code)
+
+
+def _fix_unknown_style(code: str, failure: PlotFailure, columns: list[str]) -> Optional[str]:
+    """Map pre-3.6 seaborn style names to their new names, or drop the call."""
+    import matplotlib.style
+
+    available = set(matplotlib.style.available)
+    renamed = failure.detail.replace("seaborn", "seaborn-v0_8", 1)
+    quoted = re.compile(r"(['\"])" + re.escape(failure.detail) + r"\1")
+    if failure.detail.startswith("seaborn") and renamed in available:
+        return quoted.sub(lambda m: m.group(1) + renamed + m.group(1), code)
+    return re.sub(r"\b(?:plt|matplotlib)\.style\.use\([^()]*\)", "None", code)
+
+
+def _fix_no_figure(code: str, failure: PlotFailure, columns: list[str]) -> Optional[str]:
+    """Save the current figure when the code forgot to."""
+    return (
+        f"{code}\n\nimport matplotlib.pyplot as plt\n"
+        "plt.savefig(OUTPUT_PATH, dpi=300, bbox_inches='tight')\n"
+    )
@@ -0,0 +1,493 @@
+"""Declarative statistical plot specs rendered in-process with matplotlib.
+
+Instead of free-form Python, the VLM can describe a plot as a small JSON
+spec in the spirit of Vega-Lite: panels of layers, each layer a mark
+(line, scatter, bar, ...) whose encodings name columns of the run's plot
+data tables. The spec is validated against the tables before anything is
+drawn, so a typo in a column name is a clear error instead of a failed
+subprocess.
+
+:class:`PlotRenderer` keeps the data-bound work of each layer (series
+grouping, sorting, bar aggregation, histogram bins, box statistics) cached
+by the layer's data fields. When a refinement iteration only changes
+titles, labels, scales or styling, re-rendering just redraws the figure.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Literal, Optional
+
+import numpy as np
+from matplotlib import cbook
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from pydantic import BaseModel, Field, model_validator
+
+# Okabe-Ito colorblind-safe palette.
+PALETTE = ["#0072B2", "#E69F00", "#009E73", "#D55E00", "#CC79A7", "#56B4E9", "#F0E442", "#000000"]
+
+# Layer fields that determine the prepared data; everything else is styling.
+DATA_FIELDS = ("mark", "data", "x", "y", "color", "size", "yerr", "bins")
+
+_MAX_CACHED_LAYERS = 256
+_MARKER_SIZE = (12.0, 160.0)
+
+
+class PlotLayer(BaseModel):
+    """One mark drawn from one table, split into series by ``color``."""
+
+    mark: Literal["line", "scatter", "bar", "area", "hist", "box"]
+    data: str = Field(default="data", description="Table name")
+    x: Optional[str] = None
+    y: Optional[str] = None
+    color: Optional[str] = Field(default=None, description="Column that splits series")
+    size: Optional[str] = Field(default=None, description="Column scaling scatter markers")
+    yerr: Optional[str] = Field(default=None, description="Column of error half-widths")
+    bins: int = Field(default=30, ge=1, le=500)
+    label: Optional[str] = None
+    linestyle: str = "-"
+    marker: Optional[str] = None
+    alpha: float = Field(default=1.0, ge=0.0, le=1.0)
+    linewidth: float = Field(default=1.8, gt=0.0)
+
+    @model_validator(mode="after")
+    def _check_encodings(self) -> PlotLayer:
+        required = {
+            "line": ("x", "y"),
+            "scatter": ("x", "y"),
+            "area": ("x", "y"),
+            "bar": ("x", "y"),
+            "hist": ("x",),
+            "box": ("y",),
+        }[self.mark]
+        missing = [name for name in required if getattr(self, name) is None]
+        if missing:
+            raise ValueError(f"{self.mark} layer needs {' and '.join(missing)}")
+        return self
+
+
+class PlotAxis(BaseModel):
+    """Axis label, scale and limits."""
+
+    label: str = ""
+    scale: Literal["linear", "log", "symlog"] = "linear"
+    min: Optional[float] = None
+    max: Optional[float] = None
+    tick_rotation: float = 0.0
+
+
+class PlotPanel(BaseModel):
+    """One set of axes."""
+
+    title: str = ""
+    x: PlotAxis = Field(default_factory=PlotAxis)
+    y: PlotAxis = Field(default_factory=PlotAxis)
+    layers: list[PlotLayer] = Field(min_length=1)
+    legend: Literal["best", "outside", "none"] = "best"
+    grid: bool = True
+
+
+class PlotSpec(BaseModel):
+    """Declarative description of a statistical figure."""
+
+    title: str = ""
+    panels: list[PlotPanel] = Field(min_length=1)
+    columns: int = Field(default=0, ge=0, description="Panels per row; 0 puts all in one row")
+    width: float = Field(default=6.4, gt=0.0, le=30.0, description="Figure width in inches")
+    height: float = Field(default=4.0, gt=0.0, le=30.0, description="Figure height in inches")
+    font_size: float = Field(default=10.0, gt=0.0)
+    palette: list[str] = Field(default_factory=lambda: list(PALETTE))
+
+    def check_columns(self, tables: dict[str, dict[str, np.ndarray]]) -> None:
+        """Check that every layer references an existing table and columns.
+
+        Raises:
+            ValueError: On an unknown table or column.
+        """
+        for panel in self.panels:
+            for layer in panel.layers:
+                if layer.data not in tables:
+                    raise ValueError(f"Unknown table: {layer.data}. Available: {', '.join(tables)}")
+                columns = tables[layer.data]
+                for field in ("x", "y", "color", "size", "yerr"):
+                    name = getattr(layer, field)
+                    if name is not None and name not in columns:
+                        raise ValueError(
+                            f"Unknown column in table {layer.data}: {name}. "
+                            f"Available: {', '.join(columns)}"
+                        )
+
+
+def parse_plot_spec(response: str) -> PlotSpec:
+    """Parse a VLM response (raw JSON or a fenced JSON block) into a PlotSpec.
+
+    Raises:
+        ValueError: If the response is not valid JSON or fails validation.
+    """
+    match = re.search(r"```(?:json)?\s*(.*?)```", response, flags=re.DOTALL)
+    text = match.group(1) if match else response
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Plot spec is not valid JSON: {e}") from e
+    return PlotSpec.model_validate(data)
+
+
+class _Series(BaseModel, arbitrary_types_allowed=True):
+    """Prepared data for one series of a layer."""
+
+    label: str
+    x: Optional[np.ndarray] = None
+    y: Optional[np.ndarray] = None
+    size: Optional[np.ndarray] = None
+    err: Optional[np.ndarray] = None
+    stats: Optional[list[dict]] = None
+
+
+class _Prepared(BaseModel, arbitrary_types_allowed=True):
+    """Data-bound result of a layer: its series plus shared categories/bins."""
+
+    series: list[_Series]
+    categories: Optional[list[str]] = None
+    edges: Optional[np.ndarray] = None
+
+
+class PlotRenderer:
+    """Renders plot specs against fixed tables, caching per-layer data work.
+
+    Args:
+        tables: Table name -> column name -> array, e.g. from
+            :meth:`~paperbanana.rendering.plot_data.PlotData.load`.
+    """
+
+    def __init__(self, tables: dict[str, dict[str, np.ndarray]]):
+        self.tables = tables
+        self._prepared: dict[str, _Prepared] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def render(
+        self,
+        spec: PlotSpec,
+        output_path: str | Path,
+        formats: tuple[str, ...] = ("png",),
+        dpi: int = 300,
+    ) -> dict[str, str]:
+        """Render a spec to image files.
+
+        Args:
+            spec: Validated plot spec.
+            output_path: Target path; each format is written with its own suffix.
+            formats: File formats to write (any matplotlib savefig format).
+            dpi: Resolution for raster formats.
+
+        Returns:
+            Mapping of format to written file path.
+
+        Raises:
+            ValueError: If the spec references unknown tables or columns.
+        """
+        spec.check_columns(self.tables)
+        fig = self.figure(spec)
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        written = {}
+        for fmt in formats:
+            path = output_path.with_suffix(f".{fmt}")
+            fig.savefig(path, format=fmt, dpi=dpi, facecolor="white", bbox_inches="tight")
+            written[fmt] = str(path)
+        return written
+
+    def figure(self, spec: PlotSpec) -> Figure:
+        """Draw a spec onto a new matplotlib Figure."""
+        n = len(spec.panels)
+        columns = min(spec.columns or n, n)
+        rows = -(-n // columns)
+        fig = Figure(figsize=(spec.width, spec.height), layout="constrained")
+        FigureCanvasAgg(fig)
+        axes = fig.subplots(rows, columns, squeeze=False).ravel()
+        for ax in axes[n:]:
+            ax.set_visible(False)
+        if spec.title:
+            fig.suptitle(spec.title, fontsize=spec.font_size * 1.2)
+        for ax, panel in zip(axes, spec.panels):
+            self._draw_panel(ax, panel, spec)
+        return fig
+
+    def _draw_panel(self, ax, panel: PlotPanel, spec: PlotSpec) -> None:
+        # Scales first: setting them later would reset categorical tick labels
+        ax.set_xscale(panel.x.scale)
+        ax.set_yscale(panel.y.scale)
+        color_index = 0
+        for layer in panel.layers:
+            prepared = self._prepare(layer)
+            colors = [
+                spec.palette[(color_index + i) % len(spec.palette)]
+                for i in range(len(prepared.series))
+            ]
+            color_index += len(prepared.series)
+            _DRAW[layer.mark](ax, layer, prepared, colors)
+
+        ax.set_title(panel.title, fontsize=spec.font_size * 1.1)
+        ax.set_xlabel(panel.x.label, fontsize=spec.font_size)
+        ax.set_ylabel(panel.y.label, fontsize=spec.font_size)
+        ax.set_xlim(panel.x.min, panel.x.max)
+        ax.set_ylim(panel.y.min, panel.y.max)
+        ax.tick_params(labelsize=spec.font_size * 0.9)
+        if panel.x.tick_rotation:
+            ax.tick_params(axis="x", labelrotation=panel.x.tick_rotation)
+        if panel.grid:
+            ax.grid(True, alpha=0.3, linewidth=0.6)
+            ax.set_axisbelow(True)
+        ax.spines[["top", "right"]].set_visible(False)
+        if panel.legend != "none" and ax.get_legend_handles_labels()[0]:
+            if panel.legend == "outside":
+                ax.legend(
+                    loc="upper left",
+                    bbox_to_anchor=(1.02, 1.0),
+                    frameon=False,
+                    fontsize=spec.font_size * 0.9,
+                )
+            else:
+                ax.legend(loc="best", frameon=False, fontsize=spec.font_size * 0.9)
+
+    def _prepare(self, layer: PlotLayer) -> _Prepared:
+        key = json.dumps(layer.model_dump(include=set(DATA_FIELDS)), sort_keys=True)
+        prepared = self._prepared.get(key)
+        if prepared is not None:
+            self.hits += 1
+            return prepared
+        self.misses += 1
+        prepared = _PREPARE[layer.mark](self.tables[layer.data], layer)
+        if len(self._prepared) >= _MAX_CACHED_LAYERS:
+            self._prepared.pop(next(iter(self._prepared)))
+        self._prepared[key] = prepared
+        return prepared
+
+
+def _split(table: dict[str, np.ndarray], layer: PlotLayer) -> list[tuple[str, np.ndarray]]:
+    """(label, row indices) of each series, in order of first appearance.
+
+    A single unlabelled series gets an empty label and stays out of the legend.
+    """
+    rows = len(next(iter(table.values())))
+    if layer.color is None:
+        return [(layer.label or "", np.arange(rows))]
+    values = np.asarray(table[layer.color])
+    unique, first, inverse = np.unique(values, return_index=True, return_inverse=True)
+    groups = []
+    for u in np.argsort(first):
+        groups.append((str(unique[u]), np.flatnonzero(inverse == u)))
+    return groups
+
+
+def _column(table: dict[str, np.ndarray], name: Optional[str], rows: np.ndarray):
+    return None if name is None else np.asarray(table[name][rows])
+
+
+def _prepare_xy(table, layer: PlotLayer) -> _Prepared:
+    series = []
+    for label, rows in _split(table, layer):
+        x = _column(table, layer.x, rows)
+        if layer.mark != "scatter" and x.dtype.kind in "iuf":
+            rows = rows[np.argsort(x, kind="stable")]
+            x = _column(table, layer.x, rows)
+        series.append(
+            _Series(
+                label=label,
+                x=x,
+                y=_column(table, layer.y, rows),
+                size=_marker_sizes(_column(table, layer.size, rows)),
+                err=_column(table, layer.yerr, rows),
+            )
+        )
+    return _Prepared(series=series)
+
+
+def _marker_sizes(values: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    if values is None:
+        return None
+    values = values.astype(np.float64)
+    low, high = np.nanmin(values), np.nanmax(values)
+    scaled = (values - low) / (high - low) if high > low else np.full(len(values), 0.5)
+    return _MARKER_SIZE[0] + scaled * (_MARKER_SIZE[1] - _MARKER_SIZE[0])
+
+
+def _categories(values: np.ndarray) -> tuple[list[str], np.ndarray]:
+    """Category labels (first-appearance order) and each row's category index."""
+    unique, first, inverse = np.unique(values, return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return [str(unique[u]) for u in order], rank[inverse]
+
+
+def _prepare_bar(table, layer: PlotLayer) -> _Prepared:
+    categories, codes = _categories(np.asarray(table[layer.x]))
+    series = []
+    for label, rows in _split(table, layer):
+        y = table[layer.y][rows].astype(np.float64)
+        counts = np.bincount(codes[rows], minlength=len(categories))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.bincount(codes[rows], weights=y, minlength=len(categories)) / counts
+            err = None
+            if layer.yerr is not None:
+                weights = table[layer.yerr][rows].astype(np.float64)
+                err = np.bincount(codes[rows], weights=weights, minlength=len(categories)) / counts
+        series.append(_Series(label=label, y=means, err=err))
+    return _Prepared(series=series, categories=categories)
+
+
+def _prepare_hist(table, layer: PlotLayer) -> _Prepared:
+    values = table[layer.x].astype(np.float64)
+    edges = np.histogram_bin_edges(values[np.isfinite(values)], bins=layer.bins)
+    series = []
+    for label, rows in _split(table, layer):
+        v = values[rows]
+        counts, _ = np.histogram(v[np.isfinite(v)], bins=edges)
+        series.append(_Series(label=label, y=counts))
+    return _Prepared(series=series, edges=edges)
+
+
+def _prepare_box(table, layer: PlotLayer) -> _Prepared:
+    y = table[layer.y].astype(np.float64)
+    if layer.x is None:
+        categories, codes = [""], np.zeros(len(y), dtype=np.int64)
+    else:
+        categories, codes = _categories(np.asarray(table[layer.x]))
+    series = []
+    for label, rows in _split(table, layer):
+        stats = []
+        for c in range(len(categories)):
+            values = y[rows[codes[rows] == c]]
+            values = values[np.isfinite(values)]
+            stats.append(cbook.boxplot_stats(values)[0] if len(values) else None)
+        series.append(_Series(label=label, stats=stats))
+    return _Prepared(series=series, categories=categories)
+
+
+def _draw_line(ax, layer: PlotLayer, prepared: _Prepared, colors: list[str]) -> None:
+    for series, color in zip(prepared.series, colors):
+        ax.plot(
+            series.x,
+            series.y,
+            label=series.label,
+            color=color,
+            linestyle=layer.linestyle,
+            marker=layer.marker,
+            markersize=4,
+            alpha=layer.alpha,
+            linewidth=layer.linewidth,
+        )
+        if series.err is not None:
+            ax.fill_between(
+                series.x,
+                series.y - series.err,
+                series.y + series.err,
+                color=color,
+                alpha=0.2 * layer.alpha,
+                linewidth=0,
+            )
+
+
+def _draw_area(ax, layer: PlotLayer, prepared: _Prepared, colors: list[str]) -> None:
+    for series, color in zip(prepared.series, colors):
+        ax.fill_between(
+            series.x, series.y, color=color, alpha=0.35 * layer.alpha, label=series.label
+        )
+        ax.plot(series.x, series.y, color=color, linewidth=layer.linewidth, alpha=layer.alpha)
+
+
+def _draw_scatter(ax, layer: PlotLayer, prepared: _Prepared, colors: list[str]) -> None:
+    for series, color in zip(prepared.series, colors):
+        ax.scatter(
+            series.x,
+            series.y,
+            s=series.size if series.size is not None else 18.0,
+            color=color,
+            marker=layer.marker or "o",
+            alpha=layer.alpha,
+            label=series.label if series.size is None else None,
+            linewidths=0,
+        )
+        if series.size is not None and series.label:
+            # Fixed-size legend entry; data-scaled markers can be tiny
+            ax.scatter([], [], s=40.0, color=color, marker=layer.marker or "o", label=series.label)
+        if series.err is not None:
+            ax.errorbar(
+                series.x, series.y, yerr=series.err, fmt="none", ecolor=color, alpha=layer.alpha
+            )
+
+
+def _draw_bar(ax, layer: PlotLayer, prepared: _Prepared, colors: list[str]) -> None:
+    n = len(prepared.series)
+    width = 0.8 / n
+    positions = np.arange(len(prepared.categories))
+    for i, (series, color) in enumerate(zip(prepared.series, colors)):
+        ax.bar(
+            positions + (i - (n - 1) / 2) * width,
+            series.y,
+            width=width,
+            yerr=series.err,
+            color=color,
+            alpha=layer.alpha,
+            label=series.label,
+            capsize=3 if series.err is not None else 0,
+        )
+    ax.set_xticks(positions, prepared.categories)
+
+
+def _draw_hist(ax, layer: PlotLayer, prepared: _Prepared, colors: list[str]) -> None:
+    for series, color in zip(prepared.series, colors):
+        ax.stairs(
+            series.y,
+            prepared.edges,
+            fill=True,
+            color=color,
+            alpha=0.6 * layer.alpha,
+            label=series.label,
+        )
+
+
+def _draw_box(ax, layer: PlotLayer, prepared: _Prepared, colors: list[str]) -> None:
+    n = len(prepared.series)
+    width = 0.7 / n
+    positions = np.arange(len(prepared.categories))
+    for i, (series, color) in enumerate(zip(prepared.series, colors)):
+        kept = [(p, s) for p, s in zip(positions, series.stats) if s is not None]
+        if not kept:
+            continue
+        artists = ax.bxp(
+            [s for _, s in kept],
+            positions=[p + (i - (n - 1) / 2) * width for p, _ in kept],
+            widths=width * 0.9,
+            patch_artist=True,
+            showfliers=False,
+            medianprops={"color": "black"},
+        )
+        for box in artists["boxes"]:
+            box.set(facecolor=color, alpha=layer.alpha)
+        if n > 1:
+            artists["boxes"][0].set_label(series.label)
+    ax.set_xticks(positions, prepared.categories)
+
+
+_PREPARE = {
+    "line": _prepare_xy,
+    "area": _prepare_xy,
+    "scatter": _prepare_xy,
+    "bar": _prepare_bar,
+    "hist": _prepare_hist,
+    "box": _prepare_box,
+}
+_DRAW = {
+    "line": _draw_line,
+    "area": _draw_area,
+    "scatter": _draw_scatter,
+    "bar": _draw_bar,
+    "hist": _draw_hist,
+    "box": _draw_box,
+}
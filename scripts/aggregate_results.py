@@ -0,0 +1,63 @@
+"""Aggregate evaluation results into win rates with bootstrap confidence intervals.
+
+Reads the results JSONL written by scripts/evaluate_batch.py or
+scripts/benchmark_e2e.py (any number of files) and reports, per group and
+per dimension, win/tie/loss rates and the 0-100 score with bootstrap
+intervals. The overall verdict is recomputed from the dimension verdicts
+with the judge's hierarchical aggregation.
+
+Group by any scalar field of the records: manifest fields such as
+category, the benchmark's model and config (a settings snapshot id), or
+source (the results file name).
+
+Usage:
+    python scripts/aggregate_results.py outputs/bench/results.jsonl
+
+    python scripts/aggregate_results.py eval/run_a.jsonl eval/run_b.jsonl \
+        --by source category --bootstrap 2000 --confidence 0.9
+
+    python scripts/aggregate_results.py outputs/*/results.jsonl --by model config \
+        --csv summary.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate evaluation results")
+    parser.add_argument("results", nargs="+", help="Results JSONL file(s)")
+    parser.add_argument("--by", nargs="*", default=[], help="Fields to group by")
+    parser.add_argument("--bootstrap", type=int, default=1000, help="Bootstrap replicates")
+    parser.add_argument("--confidence", type=float, default=0.95, help="Interval level")
+    parser.add_argument("--seed", type=int, default=0, help="Bootstrap random seed")
+    parser.add_argument("--csv", default=None, help="Also write the table to this CSV file")
+    args = parser.parse_args()
+
+    from paperbanana.evaluation.aggregate import format_table, load_results, win_rates
+
+    start = time.perf_counter()
+    frame = load_results(args.results)
+    if frame.empty:
+        print("No judged results found.")
+        return
+    try:
+        table = win_rates(
+            frame, by=args.by, n_boot=args.bootstrap, confidence=args.confidence, seed=args.seed
+        )
+    except KeyError as e:
+        print(f"{e.args[0]}. Available: {', '.join(c for c in frame.columns)}")
+        return
+    elapsed = time.perf_counter() - start
+
+    print(format_table(table))
+    print(f"\n{len(frame)} judgment(s) aggregated in {elapsed:.2f}s")
+    if args.csv:
+        table.to_csv(args.csv)
+        print(f"Table: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
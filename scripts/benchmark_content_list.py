@@ -0,0 +1,149 @@
+"""Benchmark streaming content_list.json extraction against json.load.
+
+Writes a synthetic corpus of MinerU-style content lists (numbered sections,
+subsections, equations, lists, tables and captioned figures, followed by a
+long appendix), then extracts title, methodology text and figures from
+every file twice: once by ``json.load``-ing the whole array first, and once
+by streaming it with ``iter_json_array``. Reports throughput and peak
+Python heap usage (tracemalloc) for each, and checks both produce the
+same result.
+
+Usage:
+    python scripts/benchmark_content_list.py
+
+    python scripts/benchmark_content_list.py --papers 200 --items 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from paperbanana.reference.content_list import (
+    ContentListExtractor,
+    extract_content_list,
+)
+
+WORDS = (
+    "model attention layer encoder decoder token graph agent policy reward latent "
+    "diffusion sample loss gradient feature embedding module retrieval planner"
+).split()
+
+SECTIONS = ["Introduction", "Related Work", "Method", "Experiments", "Conclusion"]
+
+
+def _sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize() + "."
+
+
+def make_content_list(items: int, rng: random.Random) -> list[dict]:
+    """Synthetic content list with roughly the given number of items."""
+    content: list[dict] = [{"type": "text", "text": "A Synthetic Paper Title", "text_level": 1}]
+    per_section = max(items // (2 * len(SECTIONS)), 1)
+    for num, name in enumerate(SECTIONS, start=1):
+        content.append({"type": "text", "text": f"{num} {name}", "text_level": 1})
+        for i in range(per_section):
+            if i % 25 == 0:
+                content.append(
+                    {"type": "text", "text": f"{num}.{i // 25 + 1} Details", "text_level": 2}
+                )
+            kind = rng.random()
+            if kind < 0.7:
+                content.append({"type": "text", "text": _sentence(rng, rng.randint(20, 80))})
+            elif kind < 0.8:
+                content.append({"type": "equation", "text": "x = \\sum_i w_i h_i"})
+            elif kind < 0.9:
+                content.append({"type": "list", "list_items": [_sentence(rng, 8)] * 3})
+            elif kind < 0.97:
+                content.append(
+                    {"type": "table", "table_body": "<table>" + "<tr><td>1</td></tr>" * 40}
+                )
+            else:
+                content.append(
+                    {
+                        "type": "image",
+                        "img_path": f"images/{num}_{i}.jpg",
+                        "image_caption": [f"Figure {i}: Overview of the framework."],
+                        "bbox": [0, 0, 400, 200],
+                    }
+                )
+    # Appendix: everything after References is discarded by the extractor
+    content.append({"type": "text", "text": "References", "text_level": 1})
+    content.append({"type": "text", "text": "A Additional results", "text_level": 1})
+    while len(content) < items:
+        content.append({"type": "text", "text": _sentence(rng, rng.randint(20, 80))})
+    return content
+
+
+def extract_loaded(path: Path) -> tuple:
+    """Baseline: parse the whole array, then extract."""
+    with open(path, encoding="utf-8") as f:
+        items = json.load(f)
+    extractor = ContentListExtractor(path.parent)
+    for item in items:
+        extractor.feed(item)
+    return _result(extractor.finish())
+
+
+def extract_streamed(path: Path) -> tuple:
+    return _result(extract_content_list(path))
+
+
+def _result(summary) -> tuple:
+    return summary.title, summary.methodology_text(), len(summary.figures)
+
+
+def measure(fn, paths: list[Path]) -> tuple[float, float, list]:
+    """(seconds, peak MB of one file, results) for running fn over paths."""
+    start = time.perf_counter()
+    results = [fn(p) for p in paths]
+    seconds = time.perf_counter() - start
+
+    # Peak heap measured separately: tracemalloc slows allocation
+    tracemalloc.start()
+    fn(max(paths, key=lambda p: p.stat().st_size))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 1e6, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark content_list.json extraction")
+    parser.add_argument("--papers", type=int, default=50, help="Content lists in the corpus")
+    parser.add_argument("--items", type=int, default=5000, help="Items per content list")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.papers):
+            path = Path(tmp) / f"paper{i}_content_list.json"
+            path.write_text(json.dumps(make_content_list(args.items, rng)), encoding="utf-8")
+            paths.append(path)
+        total_mb = sum(p.stat().st_size for p in paths) / 1e6
+        print(f"Corpus: {args.papers} files, {args.items} items each, {total_mb:.1f} MB")
+
+        header = f"{'Method':<12s} {'Seconds':>8s} {'MB/s':>8s} {'Papers/s':>9s} {'Peak MB':>8s}"
+        print(header)
+        print("-" * len(header))
+        baseline = None
+        for name, fn in [("json.load", extract_loaded), ("streaming", extract_streamed)]:
+            seconds, peak, results = measure(fn, paths)
+            if baseline is None:
+                baseline = results
+            elif results != baseline:
+                raise SystemExit("Streaming extraction differs from json.load extraction")
+            print(
+                f"{name:<12s} {seconds:8.2f} {total_mb / seconds:8.1f} "
+                f"{args.papers / seconds:9.1f} {peak:8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
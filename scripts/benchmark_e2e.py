@@ -0,0 +1,161 @@
+"""End-to-end benchmark: generate and judge a diagram for every reference example.
+
+For each example in a reference store, runs the full pipeline on its
+source context and caption, judges the result against its human-drawn
+image, and reports per-stage latency, VLM calls and estimated tokens per
+agent, and win rates. Per-example records go to results.jsonl and the
+aggregate to report.json in the output directory.
+
+Providers:
+    live    the configured VLM and image providers
+    record  live providers, with every response recorded to --cassette
+    replay  responses from --cassette only (fully offline; a request
+            without a recording fails that example)
+    fake    deterministic offline fakes, optionally with --latency per call
+
+Each run uses a fresh cache directory inside the output directory, so
+cross-run caches do not skew pipeline latency. Judge verdicts are the
+exception: they are cached in the configured cache directory, so a
+repeated benchmark only judges image pairs it has not seen (pass
+--no-judge-cache to judge everything).
+
+Usage:
+    python scripts/benchmark_e2e.py --providers fake --latency 0.2 --limit 20
+
+    python scripts/benchmark_e2e.py --providers record --cassette bench.sqlite --limit 10
+    python scripts/benchmark_e2e.py --providers replay --cassette bench.sqlite --limit 10
+
+    python scripts/benchmark_e2e.py --store data/reference_sets --category vision_perception \
+        --parallelism 4 --judge-mode single --output outputs/bench
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def make_providers(args, settings):
+    """(pipeline VLM, image provider, judge VLM) for the chosen provider mode."""
+    from paperbanana.core.cache import SQLiteCache
+    from paperbanana.providers.offline import (
+        FakeImageGen,
+        FakeVLM,
+        RecordedImageGen,
+        RecordedVLM,
+    )
+    from paperbanana.providers.registry import ProviderRegistry
+
+    if args.providers == "fake":
+        vlm = FakeVLM(latency=args.latency, revision_rate=args.revision_rate)
+        return vlm, FakeImageGen(latency=args.latency), vlm
+    if args.providers == "live":
+        vlm = ProviderRegistry.create_vlm(settings)
+        return vlm, ProviderRegistry.create_image_gen(settings), vlm
+
+    live = args.providers == "record"
+    vlm = RecordedVLM(
+        SQLiteCache(args.cassette, "vlm"),
+        ProviderRegistry.create_vlm(settings) if live else None,
+    )
+    image_gen = RecordedImageGen(
+        SQLiteCache(args.cassette, "image"),
+        ProviderRegistry.create_image_gen(settings) if live else None,
+    )
+    return vlm, image_gen, vlm
+
+
+async def run(args) -> None:
+    from paperbanana.core.config import Settings
+    from paperbanana.evaluation.benchmark import BenchmarkRunner, format_report
+    from paperbanana.evaluation.judge import open_judge_cache
+    from paperbanana.reference.store import ReferenceStore
+
+    output = Path(
+        args.output or f"outputs/benchmark_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    )
+    overrides = {}
+    if args.iterations is not None:
+        overrides["refinement_iterations"] = args.iterations
+    settings = Settings.from_yaml(args.config, **overrides)
+    judge_cache = None if args.no_judge_cache else open_judge_cache(settings)
+    settings = settings.model_copy(update={"cache_dir": str(output / "cache")})
+
+    store = ReferenceStore(args.store or settings.reference_set_path)
+    examples = (store.get_by_category(args.category) if args.category else store.get_all())[
+        : args.limit
+    ]
+    if not examples:
+        print("No reference examples to benchmark.")
+        return
+
+    vlm, image_gen, judge_vlm = make_providers(args, settings)
+    runner = BenchmarkRunner(
+        settings,
+        vlm,
+        image_gen,
+        judge_vlm=judge_vlm,
+        parallelism=args.parallelism,
+        judge_mode=args.judge_mode,
+        judge_cache=judge_cache,
+    )
+
+    def progress(record: dict) -> None:
+        outcome = record["scores"]["overall_winner"] if "scores" in record else record["error"]
+        print(f"  {record['id']}: {outcome}")
+
+    print(f"Benchmarking {len(examples)} example(s) with {args.providers} providers...")
+    report = await runner.run(examples, output, on_result=progress)
+
+    print(f"\n{'=' * 50}")
+    print(format_report(report))
+    print(f"\nReport: {output / 'report.json'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end generate-and-judge benchmark")
+    parser.add_argument("--store", default=None, help="Reference store (default: config)")
+    parser.add_argument("--category", default=None, help="Only examples of this category")
+    parser.add_argument("--limit", type=int, default=None, help="Benchmark at most N examples")
+    parser.add_argument("--output", default=None, help="Output directory")
+    parser.add_argument("--config", default="configs/config.yaml", help="Pipeline config")
+    parser.add_argument("--iterations", type=int, default=None, help="Refinement iterations")
+    parser.add_argument("--parallelism", type=int, default=2, help="Examples in flight at once")
+    parser.add_argument(
+        "--judge-mode",
+        choices=["parallel", "single"],
+        default="parallel",
+        help="One judge call per dimension (concurrently) or one for all dimensions",
+    )
+    parser.add_argument(
+        "--providers",
+        choices=["live", "record", "replay", "fake"],
+        default="live",
+        help="Where model responses come from",
+    )
+    parser.add_argument(
+        "--cassette", default="benchmark_cassette.sqlite", help="Recorded responses database"
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake per-call latency (s)")
+    parser.add_argument(
+        "--revision-rate", type=float, default=0.5, help="Fake critiques requesting a revision"
+    )
+    parser.add_argument(
+        "--no-judge-cache", action="store_true", help="Judge every pair, ignoring cached verdicts"
+    )
+    args = parser.parse_args()
+
+    if args.providers == "replay" and not Path(args.cassette).exists():
+        print(f"Cassette not found: {args.cassette}")
+        return
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
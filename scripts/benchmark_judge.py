@@ -0,0 +1,207 @@
+"""Compare latency and agreement of the VLMJudge evaluation modes.
+
+Evaluates the same (generated, reference) pairs with:
+
+- ``sequential``: one call per dimension, one at a time (the old behaviour),
+- ``parallel``: one call per dimension, all dimensions concurrently,
+- ``single``: one call judging every dimension (per-dimension calls only
+  for dimensions the response does not answer),
+
+and reports wall time and VLM calls per evaluation, plus how often each
+mode's per-dimension and overall verdicts agree with ``sequential``.
+
+``--simulate`` replaces the VLM with a stand-in that sleeps for the given
+latency and answers deterministically per image pair and dimension, with
+``--noise`` of its verdicts flipped at random, to check the speedup offline.
+
+Usage:
+    python scripts/benchmark_judge.py \
+        --generated outputs/run_*/final_output.png \
+        --reference data/reference_sets/images/paper.jpg \
+        --context method.txt \
+        --caption "Overview of the proposed framework" \
+        --repeats 3
+
+    python scripts/benchmark_judge.py --simulate 1.5 --noise 0.1 \
+        --generated a.png b.png --reference ref.png --context method.txt --caption "..."
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import glob
+import hashlib
+import json
+import random
+import re
+import statistics
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from paperbanana.evaluation.judge import DIMENSIONS, VLMJudge
+
+load_dotenv()
+
+WINNERS = ["Model", "Human", "Both are good", "Both are bad"]
+MODES = {
+    "sequential": {"mode": "parallel", "max_concurrency": 1},
+    "parallel": {"mode": "parallel", "max_concurrency": len(DIMENSIONS)},
+    "single": {"mode": "single"},
+}
+
+
+class CountingVLM:
+    """Wraps a VLM provider and counts its calls."""
+
+    def __init__(self, vlm):
+        self.vlm = vlm
+        self.calls = 0
+        self.name = getattr(vlm, "name", "custom")
+        self.model_name = getattr(vlm, "model_name", "custom")
+
+    async def generate(self, prompt, images=None, **kwargs):
+        self.calls += 1
+        return await self.vlm.generate(prompt, images=images, **kwargs)
+
+
+class SimulatedJudgeVLM:
+    """Offline stand-in: fixed latency, deterministic verdicts with optional noise."""
+
+    name = "simulated"
+    model_name = "simulated-judge"
+
+    def __init__(self, latency: float, noise: float, seed: int = 0):
+        self.latency = latency
+        self.noise = noise
+        self.rng = random.Random(seed)
+
+    def _winner(self, images, dimension: str) -> str:
+        digest = hashlib.sha256(dimension.encode())
+        for image in images or []:
+            digest.update(image.tobytes()[:4096])
+        winner = WINNERS[digest.digest()[0] % len(WINNERS)]
+        if self.rng.random() < self.noise:
+            winner = self.rng.choice([w for w in WINNERS if w != winner])
+        return winner
+
+    async def generate(self, prompt, images=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        if "## Dimension:" in prompt:
+            return json.dumps(
+                {
+                    dim: {"comparison_reasoning": "simulated", "winner": self._winner(images, dim)}
+                    for dim in DIMENSIONS
+                }
+            )
+        dimension = re.search(r"evaluate the \*\*(\w+)\*\*", prompt).group(1).lower()
+        return json.dumps(
+            {"comparison_reasoning": "simulated", "winner": self._winner(images, dimension)}
+        )
+
+
+async def run_mode(vlm, mode: str, pairs, context: str, caption: str, repeats: int):
+    """Evaluate every pair repeats times; return timings, call counts and scores."""
+    counting = CountingVLM(vlm)
+    judge = VLMJudge(counting, **MODES[mode])
+    seconds, calls, scores = [], [], []
+    for _ in range(repeats):
+        for generated, reference in pairs:
+            before = counting.calls
+            start = time.perf_counter()
+            scores.append(
+                await judge.evaluate(
+                    image_path=generated,
+                    source_context=context,
+                    caption=caption,
+                    reference_path=reference,
+                )
+            )
+            seconds.append(time.perf_counter() - start)
+            calls.append(counting.calls - before)
+    return seconds, calls, scores
+
+
+def agreement(scores, baseline) -> dict[str, float]:
+    """Fraction of evaluations whose verdicts match the baseline's."""
+    rates = {
+        dim: sum(getattr(a, dim).winner == getattr(b, dim).winner for a, b in zip(scores, baseline))
+        / len(baseline)
+        for dim in DIMENSIONS
+    }
+    rates["overall"] = sum(
+        a.overall_winner == b.overall_winner for a, b in zip(scores, baseline)
+    ) / len(baseline)
+    return rates
+
+
+async def run(args, pairs, context: str) -> None:
+    vlm = None
+    if args.simulate is None:
+        from paperbanana.core.config import Settings
+        from paperbanana.providers.registry import ProviderRegistry
+
+        settings = Settings(vlm_provider=args.vlm_provider) if args.vlm_provider else Settings()
+        vlm = ProviderRegistry.create_vlm(settings)
+
+    results = {}
+    for i, mode in enumerate(args.modes):
+        # Independent noise per mode, like separate samples from a real judge
+        mode_vlm = vlm or SimulatedJudgeVLM(args.simulate, args.noise, args.seed + i)
+        results[mode] = await run_mode(mode_vlm, mode, pairs, context, args.caption, args.repeats)
+
+    baseline_mode = "sequential" if "sequential" in results else args.modes[0]
+    baseline = results[baseline_mode][2]
+    print(f"\n{len(pairs)} pair(s) x {args.repeats} repeat(s)")
+    print(
+        f"{'mode':<12}{'mean s':>9}{'p50 s':>9}{'calls':>7}{'overall':>9}"
+        + "".join(f"{dim[:11]:>12}" for dim in DIMENSIONS)
+    )
+    for mode, (seconds, calls, scores) in results.items():
+        rates = agreement(scores, baseline)
+        print(
+            f"{mode:<12}{statistics.mean(seconds):>9.2f}{statistics.median(seconds):>9.2f}"
+            f"{statistics.mean(calls):>7.1f}{rates['overall']:>9.0%}"
+            + "".join(f"{rates[dim]:>12.0%}" for dim in DIMENSIONS)
+        )
+    print(f"\nAgreement columns compare each mode's verdicts with {baseline_mode}.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark VLMJudge evaluation modes")
+    parser.add_argument("--generated", required=True, nargs="+", help="Generated images (globs)")
+    parser.add_argument("--reference", required=True, help="Human-drawn reference image")
+    parser.add_argument("--context", required=True, help="Path to source context text file")
+    parser.add_argument("--caption", required=True, help="Figure caption")
+    parser.add_argument(
+        "--modes", nargs="+", choices=list(MODES), default=list(MODES), help="Modes to compare"
+    )
+    parser.add_argument("--repeats", type=int, default=1, help="Evaluations per pair and mode")
+    parser.add_argument("--vlm-provider", default=None, help="VLM provider (default: config)")
+    parser.add_argument(
+        "--simulate",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Use an offline simulated judge with this per-call latency",
+    )
+    parser.add_argument("--noise", type=float, default=0.0, help="Simulated verdict flip rate")
+    parser.add_argument("--seed", type=int, default=0, help="Simulated noise seed")
+    args = parser.parse_args()
+
+    if not Path(args.reference).exists():
+        print(f"Reference image not found: {args.reference}")
+        return
+    generated = [path for pattern in args.generated for path in glob.glob(pattern)]
+    if not generated:
+        print("No images found matching the provided paths.")
+        return
+    context = Path(args.context).read_text(encoding="utf-8")
+    pairs = [(path, args.reference) for path in generated]
+    asyncio.run(run(args, pairs, context))
+
+
+if __name__ == "__main__":
+    main()
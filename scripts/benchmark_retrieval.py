@@ -0,0 +1,115 @@
+"""Benchmark the local BM25 prefilter against sending every candidate to the VLM.
+
+Generates synthetic reference sets of increasing size, builds the BM25
+index, and reports index build time, shortlist latency, and the size of
+the retriever prompt with and without the prefilter. Token counts are
+estimated as characters / 4; no VLM calls are made.
+
+Usage:
+    python scripts/benchmark_retrieval.py
+
+    python scripts/benchmark_retrieval.py --sizes 100 10000 100000 --shortlist 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+import numpy as np
+
+from paperbanana.agents.retriever import RetrieverAgent
+from paperbanana.core.types import ReferenceExample
+from paperbanana.reference.index import ReferenceIndex
+
+CATEGORIES = ["agent_reasoning", "vision_perception", "generative_learning", "science_applications"]
+PROMPT_DIR = Path(__file__).resolve().parent.parent / "prompts"
+
+
+def make_vocabulary(size: int, rng: np.random.Generator) -> list[str]:
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    lengths = rng.integers(4, 11, size=size)
+    return ["".join(rng.choice(letters, n)) for n in lengths]
+
+
+def make_examples(n: int, vocab: list[str], rng: np.random.Generator) -> list[ReferenceExample]:
+    """Synthetic references with Zipf-distributed words (~200-word methodology)."""
+    words = np.array(vocab)
+    ranks = np.minimum(rng.zipf(1.3, size=(n, 212)), len(vocab)) - 1
+    examples = []
+    for i in range(n):
+        doc = words[ranks[i]]
+        examples.append(
+            ReferenceExample(
+                id=f"ref_{i:06d}",
+                caption=" ".join(doc[:12]),
+                source_context=" ".join(doc[12:]),
+                image_path=f"images/ref_{i:06d}.png",
+                category=CATEGORIES[i % len(CATEGORIES)],
+            )
+        )
+    return examples
+
+
+def prompt_tokens(retriever: RetrieverAgent, template: str, query, candidates) -> int:
+    prompt = retriever.format_prompt(
+        template,
+        source_context=query.source_context,
+        caption=query.caption,
+        candidates=retriever._format_candidates(candidates),
+        num_examples=10,
+    )
+    return len(prompt) // 4
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark BM25 reference prefiltering")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 100_000])
+    parser.add_argument("--shortlist", type=int, default=50, help="Prefilter shortlist size (K)")
+    parser.add_argument("--queries", type=int, default=20, help="Queries per size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    vocab = make_vocabulary(20_000, rng)
+    retriever = RetrieverAgent(None, prompt_dir=str(PROMPT_DIR))
+    template = retriever.load_prompt("diagram")
+
+    header = (
+        f"{'Refs':>8s} {'Build s':>8s} {'Query ms':>9s} {'p95 ms':>8s} "
+        f"{'Full tokens':>12s} {'Shortlist tokens':>17s} {'Ratio':>7s}"
+    )
+    print(header)
+    print("-" * len(header))
+    for n in args.sizes:
+        examples = make_examples(n, vocab, rng)
+        queries = make_examples(args.queries, vocab, rng)
+
+        start = time.perf_counter()
+        index = ReferenceIndex.build(examples)
+        build_seconds = time.perf_counter() - start
+
+        by_id = {e.id: e for e in examples}
+        latencies = []
+        shortlist_tokens = []
+        for q in queries:
+            start = time.perf_counter()
+            hits = index.search(f"{q.caption}\n{q.source_context}", args.shortlist)
+            latencies.append((time.perf_counter() - start) * 1000)
+            shortlist = [by_id[eid] for eid, _ in hits]
+            shortlist_tokens.append(prompt_tokens(retriever, template, q, shortlist))
+
+        full_tokens = prompt_tokens(retriever, template, queries[0], examples)
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+        avg_shortlist = statistics.mean(shortlist_tokens)
+        print(
+            f"{n:8d} {build_seconds:8.2f} {statistics.median(latencies):9.2f} {p95:8.2f} "
+            f"{full_tokens:12,d} {avg_shortlist:17,.0f} {full_tokens / avg_shortlist:7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Compare latency, convergence and estimated image cost across recorded runs.
+
+Reads metadata.json from every run directory under an outputs folder and
+groups runs by a config setting, e.g. to compare draft-resolution refinement
+(progressive_resolution=true) against rendering every iteration at the
+final resolution, or image editing (refinement_mode=edit) against full
+regeneration, or code-rendered diagrams (diagram_backend=code) against the
+image model.
+
+Image cost is estimated from a per-image price table (USD) keyed by
+resolution. The defaults follow the published gemini-3-pro-image-preview
+pricing; pass --price to match your model or billing.
+
+Usage:
+    python scripts/benchmark_runs.py --runs outputs
+
+    python scripts/benchmark_runs.py \
+        --runs outputs \
+        --group-by progressive_resolution \
+        --price 1k=0.134 --price 2k=0.134 --price 4k=0.24
+
+    python scripts/benchmark_runs.py --runs outputs --group-by refinement_mode
+
+    python scripts/benchmark_runs.py --runs outputs --group-by diagram_backend
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections import defaultdict
+from pathlib import Path
+
+DEFAULT_PRICES = {"1k": 0.134, "2k": 0.134, "4k": 0.24}
+
+
+def load_runs(runs_dir: Path) -> list[dict]:
+    """Load metadata.json from each run directory."""
+    runs = []
+    for path in sorted(runs_dir.glob("*/metadata.json")):
+        try:
+            runs.append(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Skipping {path}: {e}")
+    return runs
+
+
+def image_renders(run: dict) -> list[str]:
+    """Return the resolution of every image-model render in a run."""
+    if run.get("diagram_type", "methodology") != "methodology":
+        return []
+
+    timing = run.get("timing", {})
+    iterations = [it for it in timing.get("iterations", []) if it.get("render_mode") != "code"]
+    default_resolution = run.get("config_snapshot", {}).get("output_resolution", "2k")
+    renders = [it.get("resolution", default_resolution) for it in iterations]
+    if timing.get("final_render_seconds"):
+        renders.append(timing.get("final_resolution", default_resolution))
+    return [r.lower() for r in renders]
+
+
+def summarize(runs: list[dict], prices: dict[str, float]) -> dict:
+    """Aggregate latency and cost figures for a group of runs."""
+    n = len(runs)
+    totals = [r.get("timing", {}).get("total_seconds", 0.0) for r in runs]
+    render_seconds = []
+    costs = []
+    render_counts = []
+    iteration_seconds = []
+    for r in runs:
+        timing = r.get("timing", {})
+        iteration_seconds.extend(
+            it.get("visualizer_seconds", 0.0) + it.get("critic_seconds", 0.0)
+            for it in timing.get("iterations", [])
+        )
+        seconds = sum(it.get("visualizer_seconds", 0.0) for it in timing.get("iterations", []))
+        render_seconds.append(seconds + timing.get("final_render_seconds", 0.0))
+        renders = image_renders(r)
+        render_counts.append(len(renders))
+        costs.append(sum(prices.get(res, 0.0) for res in renders))
+
+    return {
+        "runs": n,
+        "avg_total_seconds": sum(totals) / n,
+        "avg_render_seconds": sum(render_seconds) / n,
+        "avg_image_renders": sum(render_counts) / n,
+        "avg_image_cost": sum(costs) / n,
+        "avg_iterations": sum(r.get("refinement_iterations", 0) for r in runs) / n,
+        "avg_iteration_seconds": (
+            sum(iteration_seconds) / len(iteration_seconds) if iteration_seconds else 0.0
+        ),
+        "converged_rate": sum(1 for r in runs if r.get("converged")) / n,
+    }
+
+
+def parse_prices(values: list[str]) -> dict[str, float]:
+    prices = dict(DEFAULT_PRICES)
+    for value in values:
+        resolution, _, price = value.partition("=")
+        prices[resolution.lower()] = float(price)
+    return prices
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare latency and image cost across recorded pipeline runs"
+    )
+    parser.add_argument("--runs", default="outputs", help="Directory containing run_* folders")
+    parser.add_argument(
+        "--group-by",
+        default="progressive_resolution",
+        help="Config snapshot key to group runs by",
+    )
+    parser.add_argument(
+        "--price",
+        action="append",
+        default=[],
+        help="Per-image price as RESOLUTION=USD (repeatable)",
+    )
+    args = parser.parse_args()
+
+    runs = load_runs(Path(args.runs))
+    if not runs:
+        print(f"No recorded runs found under {args.runs}")
+        return
+
+    prices = parse_prices(args.price)
+    groups: dict[str, list[dict]] = defaultdict(list)
+    for run in runs:
+        key = run.get("config_snapshot", {}).get(args.group_by)
+        groups[f"{args.group_by}={key}"].append(run)
+
+    print(f"Compared {len(runs)} run(s) from {args.runs}\n")
+    header = f"{'Group':36s} {'Runs':>5s} {'Iters':>6s} {'Conv %':>7s} {'s/iter':>7s} "
+    header += f"{'Total s':>9s} {'Render s':>9s} {'Renders':>8s} {'Cost $':>8s}"
+    print(header)
+    print("-" * len(header))
+    for name, group in sorted(groups.items()):
+        s = summarize(group, prices)
+        print(
+            f"{name:36s} {s['runs']:5d} {s['avg_iterations']:6.2f} "
+            f"{100 * s['converged_rate']:7.1f} {s['avg_iteration_seconds']:7.1f} "
+            f"{s['avg_total_seconds']:9.1f} {s['avg_render_seconds']:9.1f} "
+            f"{s['avg_image_renders']:8.2f} {s['avg_image_cost']:8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
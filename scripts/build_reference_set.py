@@ -20,79 +20,39 @@ Usage:
         --input data/reference_sets/output \
         --output data/reference_sets \
         --append
+
+Papers are processed in parallel (--workers, default: all cores). A
+manifest (build_manifest.json in the output directory) records a hash of
+each paper's inputs and the examples it produced; papers whose inputs and
+build options are unchanged are not re-parsed or re-copied on later runs.
+Pass --force to rebuild everything.
+
+New figures that nearly duplicate one already in the set (e.g. arXiv v1
+and v2 of a paper) are detected with perceptual hashes and dropped;
+use --dedup flag to only report them.
 """
 
 from __future__ import annotations
 
 import argparse
+import contextlib
+import hashlib
+import io
 import json
+import os
 import re
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-# Section title patterns that indicate methodology content
-METHOD_PATTERNS = [
-    r"^\d*\.?\s*method(ology)?",
-    r"^\d*\.?\s*approach",
-    r"^\d*\.?\s*proposed\s+(method|framework|approach|model|system)",
-    r"^\d*\.?\s*our\s+(method|framework|approach|model)",
-    r"^\d*\.?\s*framework",
-    r"^\d*\.?\s*model(\s+architecture)?$",
-    r"^\d*\.?\s*architecture",
-    r"^\d*\.?\s*technical\s+(approach|details|design)",
-    r"^\d*\.?\s*system\s+(overview|design)",
-]
-
-# Patterns for sections to stop collecting (after methodology ends)
-STOP_PATTERNS = [
-    r"^\d*\.?\s*experiment",
-    r"^\d*\.?\s*evaluation",
-    r"^\d*\.?\s*result",
-    r"^\d*\.?\s*conclusion",
-    r"^\d*\.?\s*discussion",
-    r"^\d*\.?\s*related\s+work",
-    r"^\d*\.?\s*acknowledgment",
-    r"^\d*\.?\s*reference",
-    r"^\d*\.?\s*appendix",
-    r"^\d*\.?\s*limitation",
-    r"^\d*\.?\s*broader\s+impact",
-]
-
-CATEGORIES = [
-    "agent_reasoning",
-    "vision_perception",
-    "generative_learning",
-    "science_applications",
-]
-
-
-def is_method_heading(text: str) -> bool:
-    """Check if heading text indicates a methodology section."""
-    lower = text.lower().strip()
-    return any(re.match(p, lower) for p in METHOD_PATTERNS)
-
-
-def is_stop_heading(text: str) -> bool:
-    """Check if heading text indicates the method section has ended."""
-    lower = text.lower().strip()
-    return any(re.match(p, lower) for p in STOP_PATTERNS)
-
-
-def get_section_number(text: str) -> int | None:
-    """Extract top-level section number from heading (e.g., '3' from '3. Method')."""
-    match = re.match(r"^(\d+)", text.strip())
-    return int(match.group(1)) if match else None
-
-
-def compute_aspect_ratio(bbox: list[float]) -> float:
-    """Compute width/height aspect ratio from [x0, y0, x1, y1] bbox."""
-    if len(bbox) < 4:
-        return 0.0
-    width = bbox[2] - bbox[0]
-    height = bbox[3] - bbox[1]
-    if height <= 0:
-        return 0.0
-    return width / height
+from paperbanana.reference.categories import CATEGORIES, classify
+from paperbanana.reference.content_list import extract_content_list
+from paperbanana.reference.dedup import DEFAULT_MAX_DISTANCE, find_near_duplicates
+
+MANIFEST_FILE = "build_manifest.json"
+
+# Bump when extraction logic changes so every paper is reprocessed.
+BUILDER_VERSION = 1
 
 
 def find_content_list_json(paper_dir: Path) -> Path | None:
@@ -136,219 +96,18 @@ def discover_paper_dirs(input_path: Path) -> list[Path]:
     return dirs
 
 
-def _find_method_sections_by_position(headings: list[dict]) -> list[int]:
-    """Identify method section numbers by position between intro and experiments.
-
-    Many papers name method sections after their system (e.g., "3 HERMES",
-    "4 Just GRPO") rather than using "Methodology". This heuristic finds
-    top-level sections between intro/prelim and experiments/results.
-    """
-    # Patterns for sections that come BEFORE the method
-    pre_patterns = [
-        r"^\d*\.?\s*introduction",
-        r"^\d*\.?\s*preliminar",
-        r"^\d*\.?\s*background",
-        r"^\d*\.?\s*problem\s+(statement|formulation|setup|definition)",
-        r"^\d*\.?\s*notation",
-        r"^\d*\.?\s*setup",
-    ]
-
-    # Find the last pre-method section number and first post-method section
-    last_pre_num = None
-    first_post_num = None
-
-    for h in headings:
-        sec_num = h["sec_num"]
-        if sec_num is None:
-            continue
-        text_lower = h["text"].lower().strip()
-
-        # Check pre-method patterns
-        for p in pre_patterns:
-            if re.match(p, text_lower):
-                if last_pre_num is None or sec_num > last_pre_num:
-                    last_pre_num = sec_num
-                break
-
-        # Check post-method (stop) patterns
-        if is_stop_heading(h["text"]):
-            if first_post_num is None or sec_num < first_post_num:
-                first_post_num = sec_num
-
-    if last_pre_num is None or first_post_num is None:
-        return []
-
-    # Method sections are between last_pre and first_post
-    return list(range(last_pre_num + 1, first_post_num))
-
-
 def parse_content_list(content_list_path: Path) -> dict:
     """Parse a MinerU content_list.json and extract title, methodology, figures.
 
-    The content_list.json is a flat array of items with types:
-    - text (with optional text_level for headings)
-    - image (with img_path and image_caption)
-    - equation, table, list, header, etc.
+    The file is streamed and processed in a single pass; see
+    ``paperbanana.reference.content_list``.
     """
-    base_dir = content_list_path.parent
-
-    with open(content_list_path) as f:
-        items = json.load(f)
-
-    # 1. Extract paper title
-    skip_titles = {
-        "abstract",
-        "contents",
-        "table of contents",
-        "references",
-        "acknowledgment",
-        "acknowledgments",
-        "acknowledgement",
-        "appendix",
-        "supplementary material",
-        "supplementary",
-        "introduction",
-        "conclusion",
-        "conclusions",
-        "related work",
-        "limitations",
-        "broader impact",
-    }
-    paper_title = ""
-
-    # First try: text items with text_level that aren't numbered sections
-    for item in items:
-        if item.get("type") == "text" and item.get("text_level") == 1:
-            text = item.get("text", "").strip()
-            # Skip numbered sections ("1.", "1 ", "A.", "A.1") and common headings
-            lower = text.lower()
-            is_section = re.match(r"^(\d+|[A-Z]\.?\d*)[\.\s]", text)
-            is_skip = any(lower.startswith(s) for s in skip_titles)
-            if not is_section and not is_skip:
-                paper_title = text
-                break
-
-    # Fallback: check header items for the paper title (some parsers put it there)
-    if not paper_title:
-        for item in items:
-            if item.get("type") == "header":
-                text = item.get("text", "").strip()
-                # Paper titles are typically >20 chars and not just logos/dates
-                if len(text) > 20 and not re.match(r"^\d+\.", text):
-                    paper_title = text
-                    break
-
-    # 2. Collect all top-level headings for positional analysis
-    headings = []
-    for item in items:
-        if item.get("text_level") and item.get("text", "").strip():
-            text = item["text"].strip()
-            sec_num = get_section_number(text)
-            headings.append({"text": text, "sec_num": sec_num})
-
-    # 3. Determine which sections are methodology
-    # First try explicit METHOD_PATTERNS, then fall back to positional
-    explicit_method_nums = set()
-    for h in headings:
-        if h["sec_num"] is not None and is_method_heading(h["text"]):
-            explicit_method_nums.add(h["sec_num"])
-
-    if explicit_method_nums:
-        method_section_nums = explicit_method_nums
-    else:
-        # Positional fallback: sections between intro and experiments
-        method_section_nums = set(_find_method_sections_by_position(headings))
-
-    # 4. Extract methodology section text
-    in_method = False
-    methodology_parts = []
-
-    for item in items:
-        item_type = item.get("type", "")
-        text = item.get("text", "").strip()
-        text_level = item.get("text_level")
-
-        # Headings in content_list.json are text items with text_level
-        if text_level and text:
-            sec_num = get_section_number(text)
-
-            if sec_num is not None and sec_num in method_section_nums:
-                in_method = True
-                methodology_parts.append(text)
-                continue
-
-            # Sub-section: check if parent section is a method section
-            if sec_num is not None and in_method:
-                # "4.1" → parent is 4; check via string prefix
-                parent_nums = {
-                    int(str(sec_num)[0])
-                    for s in method_section_nums
-                    if str(sec_num).startswith(str(s))
-                }
-                if parent_nums:
-                    methodology_parts.append(text)
-                    continue
-                else:
-                    in_method = False
-                    continue
-
-            if in_method and is_stop_heading(text):
-                in_method = False
-                continue
-
-            if in_method:
-                methodology_parts.append(text)
-                continue
-
-        if in_method:
-            if item_type == "text" and text:
-                methodology_parts.append(text)
-            elif item_type == "equation" and text:
-                methodology_parts.append(f"[Equation: {text}]")
-            elif item_type == "list":
-                list_items = item.get("list_items", [])
-                for li in list_items:
-                    if isinstance(li, str):
-                        methodology_parts.append(f"- {li.strip()}")
-
-    methodology_text = "\n\n".join(methodology_parts)
-
-    # 4. Extract all figures with captions and aspect ratios
-    figures = []
-    for item in items:
-        if item.get("type") != "image":
-            continue
-
-        img_path = item.get("img_path", "")
-        captions = item.get("image_caption", [])
-        caption = captions[0].strip() if captions else ""
-        bbox = item.get("bbox", [])
-
-        if not img_path:
-            continue
-
-        # Resolve to absolute path
-        abs_img_path = base_dir / img_path
-        if not abs_img_path.exists():
-            continue
-
-        ratio = compute_aspect_ratio(bbox)
-
-        figures.append(
-            {
-                "caption": caption,
-                "local_path": abs_img_path,
-                "img_path": img_path,
-                "aspect_ratio": ratio,
-                "bbox": bbox,
-            }
-        )
-
+    summary = extract_content_list(content_list_path)
     return {
-        "title": paper_title,
-        "methodology_text": methodology_text,
-        "figures": figures,
-        "source_dir": str(base_dir),
+        "title": summary.title,
+        "methodology_text": summary.methodology_text(),
+        "figures": [f.model_dump() for f in summary.figures],
+        "source_dir": str(content_list_path.parent),
     }
 
 
@@ -420,9 +179,7 @@ def identify_methodology_figures(
         candidates.append({**fig, "is_method_figure": is_method})
 
     # Sort: methodology figures first, then by aspect ratio closeness to 2.0
-    candidates.sort(
-        key=lambda x: (not x["is_method_figure"], abs(x["aspect_ratio"] - 2.0))
-    )
+    candidates.sort(key=lambda x: (not x["is_method_figure"], abs(x["aspect_ratio"] - 2.0)))
 
     return candidates
 
@@ -440,78 +197,7 @@ def generate_paper_id(title: str, dir_name: str) -> str:
 
 def guess_category(title: str, methodology_text: str) -> str:
     """Guess the paper category based on title and methodology keywords."""
-    combined = (title + " " + methodology_text).lower()
-
-    category_keywords = {
-        "agent_reasoning": [
-            "agent",
-            "llm",
-            "language model",
-            "retrieval",
-            "reasoning",
-            "reinforcement learning",
-            "planning",
-            "rag",
-            "multi-agent",
-            "dialogue",
-            "chatbot",
-            "instruction",
-            "chain-of-thought",
-            "code generation",
-            "tool use",
-        ],
-        "vision_perception": [
-            "vision",
-            "image",
-            "object detection",
-            "segmentation",
-            "visual",
-            "point cloud",
-            "3d",
-            "video",
-            "camera",
-            "optical",
-            "lidar",
-            "depth",
-            "perception",
-            "reconstruction",
-        ],
-        "generative_learning": [
-            "diffusion",
-            "generative",
-            "vae",
-            "autoencoder",
-            "gan",
-            "generation",
-            "synthesis",
-            "denoising",
-            "latent",
-            "flow matching",
-            "score-based",
-        ],
-        "science_applications": [
-            "graph",
-            "molecule",
-            "protein",
-            "drug",
-            "chemical",
-            "physics",
-            "material",
-            "biology",
-            "genome",
-            "gnn",
-            "scientific",
-            "neural network",
-        ],
-    }
-
-    scores = {
-        cat: sum(1 for kw in kws if kw in combined)
-        for cat, kws in category_keywords.items()
-    }
-
-    best = max(scores, key=scores.get)
-    return best if scores[best] > 0 else "science_applications"
+    return classify(f"{title} {methodology_text}").category
 
 
 def process_paper(
@@ -587,9 +273,11 @@ def process_paper(
 
     print(f"  Selected: {fig['caption'][:70]}...")
     print(f"    Aspect ratio: {fig['aspect_ratio']:.2f}")
-    print(f"    Copying: {src_path.name} → {image_filename}")
-
-    shutil.copy2(str(src_path), str(dst_path))
+    if _same_file(src_path, dst_path):
+        print(f"    Up to date: {image_filename}")
+    else:
+        print(f"    Copying: {src_path.name} → {image_filename}")
+        shutil.copy2(str(src_path), str(dst_path))
 
     example = {
         "id": fig_id,
@@ -606,6 +294,69 @@ def process_paper(
     return examples
 
 
+def _same_file(src: Path, dst: Path) -> bool:
+    """Whether dst is already a copy2 of src (same size and mtime)."""
+    if not dst.exists():
+        return False
+    a, b = src.stat(), dst.stat()
+    return a.st_size == b.st_size and int(a.st_mtime) == int(b.st_mtime)
+
+
+def input_hash(paper_dir: Path, options: dict) -> str | None:
+    """Hash of everything a paper's examples depend on.
+
+    Covers the content_list.json bytes, the name, size and mtime of every
+    file in the paper's images directory, and the build options. Returns
+    None if the directory has no content_list.json.
+    """
+    content_list = find_content_list_json(paper_dir)
+    if content_list is None:
+        return None
+    digest = hashlib.sha256()
+    digest.update(json.dumps([BUILDER_VERSION, options], sort_keys=True).encode())
+    digest.update(content_list.read_bytes())
+    images_dir = content_list.parent / "images"
+    if images_dir.is_dir():
+        for image in sorted(images_dir.iterdir()):
+            stat = image.stat()
+            digest.update(f"{image.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def load_manifest(output_dir: Path) -> dict:
+    """Per-paper input hashes and examples from the previous build."""
+    path = output_dir / MANIFEST_FILE
+    if not path.exists():
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f).get("papers", {})
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable manifest {path}: {e}")
+        return {}
+
+
+def save_manifest(output_dir: Path, papers: dict) -> None:
+    path = output_dir / MANIFEST_FILE
+    tmp = path.with_name(f"{MANIFEST_FILE}.tmp")
+    with open(tmp, "w") as f:
+        json.dump({"version": BUILDER_VERSION, "papers": papers}, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _process_task(task: tuple[Path, Path, float, float]) -> tuple[list[dict], str, bool]:
+    """Run process_paper in a worker, returning its examples, printed log and success."""
+    log = io.StringIO()
+    ok = True
+    with contextlib.redirect_stdout(log):
+        try:
+            examples = process_paper(*task)
+        except Exception as e:  # one bad paper must not abort the whole build
+            print(f"\n  ERROR: {task[0]}: {e}")
+            examples, ok = [], False
+    return examples, log.getvalue(), ok
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Build PaperBanana reference set from MinerU local output"
@@ -637,6 +388,30 @@ def main():
         action="store_true",
         help="Append to existing index.json instead of overwriting",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Parallel worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reprocess every paper, ignoring the build manifest",
+    )
+    parser.add_argument(
+        "--dedup",
+        choices=["drop", "flag", "off"],
+        default="drop",
+        help="What to do with near-duplicate figures (default: drop)",
+    )
+    parser.add_argument(
+        "--dedup-distance",
+        type=int,
+        default=DEFAULT_MAX_DISTANCE,
+        help=f"Max perceptual-hash distance (of 64 bits) for a near-duplicate "
+        f"(default: {DEFAULT_MAX_DISTANCE})",
+    )
     args = parser.parse_args()
 
     input_path = Path(args.input)
@@ -667,18 +442,63 @@ def main():
         existing_ids = {e["id"] for e in existing_examples}
         print(f"Appending to {len(existing_examples)} existing examples")
 
-    # Process each paper
+    # Split papers into unchanged (served from the manifest) and to-process
+    options = {"min_ratio": args.min_ratio, "max_ratio": args.max_ratio}
+    manifest = {} if args.force else load_manifest(output_dir)
+    hashes = {}
+    todo = []
+    for paper_dir in paper_dirs:
+        key = str(paper_dir.resolve())
+        hashes[key] = input_hash(paper_dir, options)
+        entry = manifest.get(key)
+        if entry is None or hashes[key] is None or entry.get("hash") != hashes[key]:
+            todo.append(paper_dir)
+    print(f"Unchanged: {len(paper_dirs) - len(todo)}, to process: {len(todo)}")
+
+    tasks = [(d, output_dir, args.min_ratio, args.max_ratio) for d in todo]
+    if args.workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            outputs = list(pool.map(_process_task, tasks, chunksize=4))
+    else:
+        outputs = [_process_task(task) for task in tasks]
+
+    processed = {}
+    failed = set()
+    for paper_dir, (examples, log, ok) in zip(todo, outputs):
+        print(log, end="")
+        processed[str(paper_dir.resolve())] = examples
+        if not ok:
+            failed.add(str(paper_dir.resolve()))
+
+    # Merge in discovery order so IDs are deduplicated deterministically
     all_new_examples = []
+    new_manifest = {}
     for paper_dir in paper_dirs:
-        examples = process_paper(paper_dir, output_dir, args.min_ratio, args.max_ratio)
+        key = str(paper_dir.resolve())
+        fresh = key in processed
+        examples = processed[key] if fresh else manifest[key]["examples"]
+        # Failed papers stay out of the manifest so the next run retries them
+        if hashes[key] is not None and key not in failed:
+            new_manifest[key] = {"hash": hashes[key], "examples": examples}
         for ex in examples:
             if ex["id"] in existing_ids:
-                print(f"  Skipping duplicate: {ex['id']}")
+                if fresh:
+                    print(f"  Skipping duplicate: {ex['id']}")
                 continue
             all_new_examples.append(ex)
             existing_ids.add(ex["id"])
 
     # Write index.json
+    if args.dedup != "off" and all_new_examples:
+        duplicates = find_near_duplicates(
+            output_dir, existing_examples, all_new_examples, args.dedup_distance
+        )
+        for ex_id, (match_id, distance) in duplicates.items():
+            print(f"  Near-duplicate: {ex_id} ~ {match_id} (distance {distance})")
+        if args.dedup == "drop" and duplicates:
+            all_new_examples = [e for e in all_new_examples if e["id"] not in duplicates]
+            print(f"Dropped {len(duplicates)} near-duplicate(s)")
+
     all_examples = existing_examples + all_new_examples
 
     index_data = {
@@ -696,8 +516,12 @@ def main():
 
     with open(index_path, "w") as f:
         json.dump(index_data, f, indent=2, ensure_ascii=False)
+    papers = {key: entry for key, entry in manifest.items() if key not in failed}
+    save_manifest(output_dir, {**papers, **new_manifest})
 
-    print(f"\n{'='*60}")
+    print(f"\n{'=' * 60}")
+    if failed:
+        print(f"Failed: {len(failed)} paper(s), retried on the next run")
     print(f"Done! {len(all_new_examples)} new examples added.")
     print(f"Total examples: {len(all_examples)}")
     print(f"Index written to: {index_path}")
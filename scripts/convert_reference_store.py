@@ -0,0 +1,54 @@
+"""Convert a reference set's index.json into the indexed store layout.
+
+Writes examples.jsonl (one example per line) and examples.idx.json (ids,
+byte offsets and categories) next to index.json, which is left untouched.
+ReferenceStore then memory-maps the examples and parses them on access,
+so very large sets open in milliseconds. Optionally prebuilds the BM25
+prefilter index.
+
+Usage:
+    python scripts/convert_reference_store.py --path data/reference_sets
+
+    python scripts/convert_reference_store.py --path data/reference_sets --build-index
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from paperbanana.reference.store import ReferenceStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert index.json to the indexed store layout")
+    parser.add_argument("--path", default="data/reference_sets", help="Reference set directory")
+    parser.add_argument(
+        "--build-index",
+        action="store_true",
+        help="Also build and cache the BM25 prefilter index",
+    )
+    args = parser.parse_args()
+
+    path = Path(args.path)
+    if not (path / "index.json").exists():
+        print(f"No index.json found in {path}")
+        return
+
+    start = time.perf_counter()
+    count = ReferenceStore.convert(path)
+    print(f"Converted {count} examples in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    store = ReferenceStore(path)
+    print(f"Opened indexed store ({store.count} examples) in {time.perf_counter() - start:.3f}s")
+
+    if args.build_index:
+        start = time.perf_counter()
+        store.index()
+        print(f"Built BM25 index in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
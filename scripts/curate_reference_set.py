@@ -11,10 +11,12 @@ Usage:
 from __future__ import annotations
 
 import json
-import re
 import shutil
 from pathlib import Path
 
+from paperbanana.reference.content_list import extract_content_list
+from paperbanana.reference.dedup import find_near_duplicates
+
 # Base directories
 REPO_ROOT = Path(__file__).resolve().parent.parent
 INPUT_DIR = REPO_ROOT / "data" / "reference_sets" / "output"
@@ -287,83 +289,6 @@ PAPER_SELECTIONS = {
 }
 
 
-def get_section_number(text: str) -> int | None:
-    """Extract top-level section number from heading text."""
-    match = re.match(r"^(\d+)", text.strip())
-    return int(match.group(1)) if match else None
-
-
-def extract_methodology_text(content_list: list[dict], section_nums: list[int]) -> str:
-    """Extract text from specified section numbers."""
-    section_set = set(section_nums)
-    in_method = False
-    parts: list[str] = []
-
-    for item in content_list:
-        item_type = item.get("type", "")
-        text = item.get("text", "").strip()
-        text_level = item.get("text_level")
-
-        # Check headings
-        if text_level and text:
-            sec_num = get_section_number(text)
-
-            if sec_num is not None:
-                if sec_num in section_set:
-                    in_method = True
-                    parts.append(text)
-                    continue
-                # Check if it's a subsection (e.g., 3.1 when 3 is in section_set)
-                parent_match = any(str(sec_num).startswith(str(s)) for s in section_set)
-                if parent_match and in_method:
-                    parts.append(text)
-                    continue
-                # Different top-level section
-                in_method = False
-                continue
-
-            # Heading without section number while in method
-            if in_method:
-                parts.append(text)
-                continue
-
-        if in_method:
-            if item_type == "text" and text:
-                parts.append(text)
-            elif item_type == "equation" and text:
-                parts.append(f"[Equation: {text}]")
-            elif item_type == "list":
-                for li in item.get("list_items", []):
-                    if isinstance(li, str):
-                        parts.append(f"- {li.strip()}")
-
-    return "\n\n".join(parts)
-
-
-def extract_title(content_list: list[dict]) -> str:
-    """Extract paper title from content list."""
-    skip_titles = {
-        "abstract",
-        "contents",
-        "table of contents",
-        "references",
-        "acknowledgment",
-        "acknowledgments",
-        "introduction",
-        "conclusion",
-        "related work",
-    }
-    for item in content_list:
-        if item.get("type") == "text" and item.get("text_level") == 1:
-            text = item.get("text", "").strip()
-            lower = text.lower()
-            is_section = re.match(r"^(\d+|[A-Z]\.?\d*)[\.\s]", text)
-            is_skip = any(lower.startswith(s) for s in skip_titles)
-            if not is_section and not is_skip:
-                return text
-    return ""
-
-
 def main():
     print(f"Curating reference set from {len(PAPER_SELECTIONS)} verified papers")
     print(f"Input:  {INPUT_DIR}")
@@ -386,11 +311,8 @@ def main():
             print(f"  ERROR: Content list not found: {content_path}")
             continue
 
-        with open(content_path) as f:
-            content_list = json.load(f)
-
         # Extract methodology text
-        method_text = extract_methodology_text(content_list, sel["method_sections"])
+        method_text = extract_content_list(content_path).methodology_text(sel["method_sections"])
         if not method_text:
             print(
                 f"  WARNING: No methodology text extracted for sections {sel['method_sections']}"
@@ -437,6 +359,10 @@ def main():
         )
         print(f"  Added: {paper_id} (ratio={aspect_ratio})")
 
+    # Selections are hand-verified, so near-duplicates are reported, not dropped
+    for ex_id, (match_id, distance) in find_near_duplicates(OUTPUT_DIR, [], examples).items():
+        print(f"WARNING: {ex_id} looks like a near-duplicate of {match_id} (distance {distance})")
+
     # Write index.json
     index_data = {
         "metadata": {
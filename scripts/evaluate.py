@@ -10,6 +10,8 @@ Usage:
         --reference data/reference_sets/images/paper.jpg \
         --context method.txt \
         --caption "Overview of the proposed framework"
+
+For many images with different references, use scripts/evaluate_batch.py.
 """
 
 from __future__ import annotations
@@ -25,20 +27,14 @@ load_dotenv()
 
 
 async def evaluate_single(
+    judge,
     image_path: str,
     reference_path: str,
     context: str,
     caption: str,
 ):
     """Evaluate a single generated image against a human reference."""
-    from paperbanana.core.config import Settings
-    from paperbanana.evaluation.judge import VLMJudge
     from paperbanana.evaluation.metrics import format_scores
-    from paperbanana.providers.registry import ProviderRegistry
-
-    settings = Settings()
-    vlm = ProviderRegistry.create_vlm(settings)
-    judge = VLMJudge(vlm)
 
     scores = await judge.evaluate(
         image_path=image_path,
@@ -79,6 +75,12 @@ def main():
         required=True,
         help="Figure caption",
     )
+    parser.add_argument(
+        "--judge-mode",
+        choices=["parallel", "single"],
+        default="parallel",
+        help="One call per dimension (concurrently) or one call for all dimensions",
+    )
     args = parser.parse_args()
 
     context = Path(args.context).read_text(encoding="utf-8")
@@ -100,26 +102,32 @@ def main():
     print(f"Evaluating {len(image_paths)} image(s) against reference...")
 
     async def run_all():
+        from paperbanana.core.config import Settings
+        from paperbanana.evaluation.judge import VLMJudge, open_judge_cache
+        from paperbanana.providers.registry import ProviderRegistry
+
+        # One provider and judge for every image
+        settings = Settings()
+        judge = VLMJudge(
+            ProviderRegistry.create_vlm(settings),
+            mode=args.judge_mode,
+            cache=open_judge_cache(settings),
+        )
         results = []
         for path in image_paths:
-            scores = await evaluate_single(path, reference_path, context, args.caption)
+            scores = await evaluate_single(judge, path, reference_path, context, args.caption)
             results.append((path, scores))
         return results
 
     results = asyncio.run(run_all())
 
     if len(results) > 1:
-        model_wins = sum(1 for _, s in results if s.overall_winner == "Model")
-        human_wins = sum(1 for _, s in results if s.overall_winner == "Human")
-        ties = len(results) - model_wins - human_wins
-        avg_score = sum(s.overall_score for _, s in results) / len(results)
+        from paperbanana.evaluation.aggregate import format_table, from_records, win_rates
 
+        frame = from_records({"scores": s.model_dump()} for _, s in results)
         print(f"\n{'=' * 50}")
         print(f"Summary across {len(results)} images:")
-        print(f"  Model wins:   {model_wins}")
-        print(f"  Human wins:   {human_wins}")
-        print(f"  Ties:         {ties}")
-        print(f"  Avg score:    {avg_score:.0f}/100")
+        print(format_table(win_rates(frame)))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,85 @@
+"""Evaluate many generated diagrams from a manifest, concurrently and resumably.
+
+Every task is judged against its human-drawn reference on the four
+comparative dimensions, sharing one VLM provider and judge. Results are
+appended to a JSONL file as each task finishes; rerunning the same command
+after a crash or interruption skips tasks that already have a result and
+retries failed ones. Verdicts are also cached across runs (see the cache
+section of the config), so re-judging an unchanged image pair is free.
+
+Manifest (JSON Lines), paths relative to the manifest file:
+    {"id": "p1", "generated": "out/p1.png", "reference": "refs/p1.jpg",
+     "context_file": "ctx/p1.txt", "caption": "Overview of ..."}
+
+Usage:
+    python scripts/evaluate_batch.py --manifest eval/manifest.jsonl \
+        --output eval/results.jsonl --concurrency 8
+
+    python scripts/evaluate_batch.py --manifest eval/manifest.jsonl \
+        --output eval/results.jsonl --judge-mode single --no-resume
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+async def run(args) -> None:
+    from paperbanana.core.config import Settings
+    from paperbanana.evaluation.batch import BatchEvaluator, load_manifest
+    from paperbanana.evaluation.judge import VLMJudge, open_judge_cache
+    from paperbanana.providers.registry import ProviderRegistry
+
+    tasks = load_manifest(args.manifest)
+    settings = Settings(vlm_provider=args.vlm_provider) if args.vlm_provider else Settings()
+    cache = None if args.no_cache else open_judge_cache(settings)
+    judge = VLMJudge(ProviderRegistry.create_vlm(settings), mode=args.judge_mode, cache=cache)
+    evaluator = BatchEvaluator(judge, max_concurrency=args.concurrency)
+
+    finished = 0
+
+    def report(record: dict) -> None:
+        nonlocal finished
+        finished += 1
+        outcome = record["scores"]["overall_winner"] if "scores" in record else record["error"]
+        print(f"[{finished}] {record['id']}: {outcome}")
+
+    print(f"Evaluating {len(tasks)} task(s) from {args.manifest}...")
+    stats = await evaluator.run(tasks, args.output, resume=not args.no_resume, on_result=report)
+
+    print(f"\n{'=' * 50}")
+    print(stats.summary())
+    print(f"Results:     {args.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Batch comparative VLM-as-Judge evaluation from a manifest"
+    )
+    parser.add_argument("--manifest", required=True, help="JSONL manifest of evaluation tasks")
+    parser.add_argument("--output", required=True, help="JSONL file to append results to")
+    parser.add_argument("--concurrency", type=int, default=4, help="Tasks judged at once")
+    parser.add_argument(
+        "--judge-mode",
+        choices=["parallel", "single"],
+        default="parallel",
+        help="One call per dimension (concurrently) or one call for all dimensions",
+    )
+    parser.add_argument("--vlm-provider", default=None, help="VLM provider (default: config)")
+    parser.add_argument(
+        "--no-resume", action="store_true", help="Overwrite the output instead of resuming"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Re-judge image pairs with cached verdicts"
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
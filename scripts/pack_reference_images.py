@@ -0,0 +1,65 @@
+"""Pack reference images into one pre-resized, pre-encoded file for fast upload.
+
+Writes images.pack and images.pack.json into the reference set directory.
+The planner then sends packed bytes straight to the VLM instead of
+decoding and re-encoding every reference image on each run. Re-run after
+rebuilding the reference set; packs older than the index are ignored.
+
+Usage:
+    python scripts/pack_reference_images.py --path data/reference_sets
+
+    python scripts/pack_reference_images.py --path data/reference_sets \
+        --max-side 768 --format JPEG --quality 85
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from paperbanana.reference.image_pack import DEFAULT_MAX_SIDE, PACK_FILE, build_image_pack
+from paperbanana.reference.store import ReferenceStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack reference images for fast VLM upload")
+    parser.add_argument("--path", default="data/reference_sets", help="Reference set directory")
+    parser.add_argument(
+        "--max-side",
+        type=int,
+        default=DEFAULT_MAX_SIDE,
+        help=f"Longest side of packed images (default: {DEFAULT_MAX_SIDE})",
+    )
+    parser.add_argument(
+        "--format",
+        default="auto",
+        choices=["auto", "PNG", "JPEG", "WEBP"],
+        help="Upload encoding (default: auto, keeps each source file's format)",
+    )
+    parser.add_argument("--quality", type=int, default=90, help="Quality for JPEG/WEBP")
+    args = parser.parse_args()
+
+    store = ReferenceStore(args.path)
+    examples = store.get_all()
+    if not examples:
+        print(f"No reference examples found in {args.path}")
+        return
+
+    start = time.perf_counter()
+    count = build_image_pack(
+        args.path,
+        examples,
+        max_side=args.max_side,
+        format=args.format,
+        quality=args.quality,
+    )
+    size_mb = (Path(args.path) / PACK_FILE).stat().st_size / 2**20
+    print(
+        f"Packed {count}/{len(examples)} images ({size_mb:.1f} MB) "
+        f"in {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import re
 
 import pytest
 
 from paperbanana.agents.retriever import RetrieverAgent
+from paperbanana.core.cache import SQLiteCache
 from paperbanana.core.types import ReferenceExample
 
 
@@ -18,6 +21,7 @@ class MockVLM:
 
     def __init__(self, response: str = ""):
         self._response = response
+        self.calls = 0
 
     async def generate(
         self,
@@ -28,6 +32,7 @@ class MockVLM:
         max_tokens=4096,
         response_format=None,
     ):
+        self.calls += 1
         return self._response
 
     def is_available(self):
@@ -125,3 +130,75 @@ async def test_retriever_handles_malformed_json():
 
     # Should fall back to candidates, truncated to num_examples
     assert len(result) == 3
+
+
+@pytest.mark.asyncio
+async def test_retriever_cache_reuses_selection_until_version_changes(tmp_path):
+    """Cached selections are reused across agents and invalidated by the store version."""
+    response = json.dumps({"selected_ids": ["ref_002", "ref_004"]})
+    candidates = _make_examples(5)
+    kwargs = dict(source_context="test", caption="test", candidates=candidates, num_examples=2)
+
+    vlm = MockVLM(response=response)
+    first = RetrieverAgent(vlm, cache=SQLiteCache(tmp_path / "cache.sqlite", "retrieval"))
+    await first.run(**kwargs, reference_version="v1")
+
+    second = RetrieverAgent(vlm, cache=SQLiteCache(tmp_path / "cache.sqlite", "retrieval"))
+    result = await second.run(**kwargs, reference_version="v1")
+    assert [e.id for e in result] == ["ref_002", "ref_004"]
+    assert vlm.calls == 1
+
+    await second.run(**kwargs, reference_version="v2")
+    assert vlm.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_retriever_does_not_cache_fallback(tmp_path):
+    vlm = MockVLM(response="this is not json")
+    agent = RetrieverAgent(vlm, cache=SQLiteCache(tmp_path / "cache.sqlite", "retrieval"))
+    kwargs = dict(
+        source_context="test", caption="test", candidates=_make_examples(5), num_examples=2
+    )
+
+    await agent.run(**kwargs, reference_version="v1")
+    await agent.run(**kwargs, reference_version="v1")
+
+    assert vlm.calls == 2
+    assert len(agent.cache) == 0
+
+
+class TournamentVLM:
+    """Picks the highest-numbered candidates in each prompt and tracks concurrency."""
+
+    def __init__(self):
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(self, prompt, response_format=None, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        ids = sorted(re.findall(r"Paper ID:\*\* (ref_\d+)", prompt), reverse=True)
+        return json.dumps({"selected_ids": ids[:2]})
+
+
+@pytest.mark.asyncio
+async def test_retriever_tournament_over_large_pool():
+    """Large pools are scored in concurrent batches and the winners reranked."""
+    vlm = TournamentVLM()
+    agent = RetrieverAgent(vlm, batch_size=10, max_concurrency=3)
+
+    result = await agent.run(
+        source_context="test",
+        caption="test",
+        candidates=_make_examples(100),
+        num_examples=2,
+    )
+
+    assert [e.id for e in result] == ["ref_099", "ref_098"]
+    # 10 first-round batches, 2 second-round batches, 1 final rerank
+    assert vlm.calls == 13
+    assert vlm.max_in_flight == 3
@@ -0,0 +1,358 @@
+"""Tests for the Visualizer agent."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from PIL import Image
+
+from paperbanana.agents.visualizer import VisualizerAgent, resolution_to_size
+from paperbanana.core.types import DiagramType
+from paperbanana.rendering import PlotData, PlotWorkerPool
+
+
+class MockImageGen:
+    """Mock image generation provider that records requested sizes."""
+
+    name = "mock"
+    model_name = "mock-image"
+
+    def __init__(self):
+        self.calls: list[tuple[int, int]] = []
+
+    async def generate(self, prompt, negative_prompt=None, width=1024, height=1024, seed=None):
+        self.calls.append((width, height))
+        return Image.new("RGB", (64, 36), color=(200, 200, 200))
+
+
+def test_resolution_to_size():
+    assert resolution_to_size("1k") == (1024, 576)
+    assert resolution_to_size("2K") == (1792, 1024)
+    assert max(resolution_to_size("4k")) > 2048
+    with pytest.raises(ValueError, match="Unknown resolution"):
+        resolution_to_size("8k")
+
+
+@pytest.mark.asyncio
+async def test_diagram_uses_configured_resolution(tmp_path):
+    image_gen = MockImageGen()
+    agent = VisualizerAgent(image_gen, None, output_dir=str(tmp_path), resolution="4k")
+
+    await agent.run(description="A box", diagram_type=DiagramType.METHODOLOGY, iteration=1)
+    await agent.run(
+        description="A box",
+        diagram_type=DiagramType.METHODOLOGY,
+        iteration=2,
+        resolution="1k",
+    )
+
+    assert image_gen.calls == [resolution_to_size("4k"), resolution_to_size("1k")]
+
+
+class MockSpecVLM:
+    """Mock VLM that answers with a fixed diagram spec response."""
+
+    def __init__(self, response: str):
+        self.response = response
+        self.prompts: list[str] = []
+
+    async def generate(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return self.response
+
+
+@pytest.mark.asyncio
+async def test_code_backend_renders_png_and_svg(tmp_path):
+    spec = {
+        "nodes": [{"id": "enc", "label": "Encoder"}, {"id": "dec", "label": "Decoder"}],
+        "edges": [{"source": "enc", "target": "dec"}],
+    }
+    image_gen = MockImageGen()
+    agent = VisualizerAgent(
+        image_gen,
+        MockSpecVLM(json.dumps(spec)),
+        output_dir=str(tmp_path),
+        resolution="1k",
+        diagram_backend="code",
+    )
+
+    path = await agent.run(description="Encoder to decoder", iteration=1)
+
+    assert path == str(tmp_path / "diagram_iter_1.png")
+    assert (tmp_path / "diagram_iter_1.svg").exists()
+    assert json.loads((tmp_path / "diagram_iter_1.json").read_text())["nodes"][0]["id"] == "enc"
+    assert image_gen.calls == []
+
+
+@pytest.mark.asyncio
+async def test_code_backend_falls_back_to_image_model(tmp_path):
+    image_gen = MockImageGen()
+    agent = VisualizerAgent(
+        image_gen,
+        MockSpecVLM("I cannot draw that."),
+        output_dir=str(tmp_path),
+        resolution="1k",
+        diagram_backend="code",
+    )
+
+    await agent.run(description="Encoder to decoder", iteration=1)
+
+    assert image_gen.calls == [resolution_to_size("1k")]
+    assert not (tmp_path / "diagram_iter_1.svg").exists()
+
+
+@pytest.mark.asyncio
+async def test_code_backend_falls_back_when_spec_fails_to_render(tmp_path):
+    spec = {"nodes": [{"id": "loss", "label": r"$\frac{$"}], "edges": []}
+    image_gen = MockImageGen()
+    agent = VisualizerAgent(
+        image_gen,
+        MockSpecVLM(json.dumps(spec)),
+        output_dir=str(tmp_path),
+        resolution="1k",
+        diagram_backend="code",
+    )
+
+    path = await agent.run(description="Loss", iteration=1)
+
+    assert image_gen.calls == [resolution_to_size("1k")]
+    assert Image.open(path).size == (64, 36)
+    assert not (tmp_path / "diagram_iter_1.svg").exists()
+
+
+@pytest.mark.asyncio
+async def test_plot_runs_on_worker_pool(tmp_path):
+    code = "import matplotlib.pyplot as plt\nplt.plot([1, 2])\nplt.savefig(OUTPUT_PATH)"
+    pool = PlotWorkerPool(size=1)
+    agent = VisualizerAgent(
+        MockImageGen(),
+        MockSpecVLM(f"```python\nOUTPUT_PATH = 'elsewhere.png'\n{code}\n```"),
+        output_dir=str(tmp_path),
+        plot_pool=pool,
+    )
+    try:
+        path = await agent.run(
+            description="A line", diagram_type=DiagramType.STATISTICAL_PLOT, iteration=1
+        )
+    finally:
+        pool.close()
+
+    with Image.open(path) as image:
+        assert image.size != (1024, 768)
+
+
+@pytest.mark.asyncio
+async def test_plot_falls_back_to_subprocess_when_pool_unavailable(tmp_path):
+    code = "import matplotlib.pyplot as plt\nplt.plot([1, 2])\nplt.savefig(OUTPUT_PATH)"
+    pool = PlotWorkerPool(size=1)
+    pool.close()
+    agent = VisualizerAgent(
+        MockImageGen(),
+        MockSpecVLM(f"```python\n{code}\n```"),
+        output_dir=str(tmp_path),
+        plot_pool=pool,
+    )
+
+    path = await agent.run(
+        description="A line", diagram_type=DiagramType.STATISTICAL_PLOT, iteration=1
+    )
+
+    assert agent.plot_pool is None
+    with Image.open(path) as image:
+        assert image.size != (1024, 768)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pooled", [True, False])
+async def test_plot_reads_columnar_data(tmp_path, pooled):
+    plot_data = PlotData.write(
+        {"data": {"x": list(range(1000)), "y": [i * i for i in range(1000)]}, "title": "Squares"},
+        tmp_path / "data",
+    )
+    code = (
+        "import matplotlib.pyplot as plt\n"
+        "assert len(DATA['data']['x']) == 1000 and RAW_DATA['title'] == 'Squares'\n"
+        "plt.plot(DATA['data']['x'], DATA['data']['y'])\n"
+        "plt.savefig(OUTPUT_PATH)"
+    )
+    vlm = MockSpecVLM(f"```python\n{code}\n```")
+    pool = PlotWorkerPool(size=1) if pooled else None
+    agent = VisualizerAgent(MockImageGen(), vlm, output_dir=str(tmp_path), plot_pool=pool)
+    try:
+        path = await agent.run(
+            description="Squares",
+            diagram_type=DiagramType.STATISTICAL_PLOT,
+            iteration=1,
+            plot_data=plot_data,
+        )
+    finally:
+        if pool is not None:
+            pool.close()
+
+    # The prompt describes the table instead of inlining a thousand rows
+    assert "1000 rows" in vlm.prompts[0] and "250000" not in vlm.prompts[0]
+    with Image.open(path) as image:
+        assert image.size != (1024, 768)
+
+
+@pytest.mark.asyncio
+async def test_spec_backend_renders_plot_in_process(tmp_path):
+    plot_data = PlotData.write(
+        {"data": {"step": [1, 2, 3], "acc": [0.5, 0.7, 0.8]}}, tmp_path / "data"
+    )
+    spec = {"panels": [{"layers": [{"mark": "line", "x": "step", "y": "acc"}]}]}
+    vlm = MockSpecVLM(json.dumps(spec))
+    agent = VisualizerAgent(MockImageGen(), vlm, output_dir=str(tmp_path), plot_backend="spec")
+
+    path = await agent.run(
+        description="Accuracy", diagram_type=DiagramType.STATISTICAL_PLOT, plot_data=plot_data
+    )
+
+    assert path == str(tmp_path / "plot_iter_0.png")
+    assert json.loads((tmp_path / "plot_iter_0.json").read_text())["panels"]
+    assert 'Table "data": 3 rows' in vlm.prompts[0] and "DATA" not in vlm.prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_spec_backend_falls_back_to_plot_code(tmp_path):
+    plot_data = PlotData.write({"data": {"x": [1, 2]}}, tmp_path / "data")
+    code = "import matplotlib.pyplot as plt\nplt.plot(DATA['data']['x'])\nplt.savefig(OUTPUT_PATH)"
+    vlm = MockSpecVLM(f"```python\n{code}\n```")
+    agent = VisualizerAgent(MockImageGen(), vlm, output_dir=str(tmp_path), plot_backend="spec")
+
+    path = await agent.run(
+        description="Line", diagram_type=DiagramType.STATISTICAL_PLOT, plot_data=plot_data
+    )
+
+    assert len(vlm.prompts) == 2
+    assert not (tmp_path / "plot_iter_0.json").exists()
+    with Image.open(path) as image:
+        assert image.size != (1024, 768)
+
+
+@pytest.mark.asyncio
+async def test_spec_over_non_numeric_columns_falls_back_to_plot_code(tmp_path):
+    table = {"name": ["a", "b", "c"], "acc": [0.5, 0.7, 0.8], "err": ["x", "y", "z"]}
+    plot_data = PlotData.write({"data": table}, tmp_path / "data")
+    spec = {"panels": [{"layers": [{"mark": "line", "x": "name", "y": "acc", "yerr": "err"}]}]}
+    code = (
+        "import matplotlib.pyplot as plt\nplt.plot(DATA['data']['acc'])\nplt.savefig(OUTPUT_PATH)"
+    )
+    vlm = ScriptedVLM([json.dumps(spec), f"```python\n{code}\n```"])
+    agent = VisualizerAgent(MockImageGen(), vlm, output_dir=str(tmp_path), plot_backend="spec")
+
+    path = await agent.run(
+        description="Accuracy", diagram_type=DiagramType.STATISTICAL_PLOT, plot_data=plot_data
+    )
+
+    assert len(vlm.prompts) == 2
+    assert not (tmp_path / "plot_iter_0.json").exists()
+    with Image.open(path) as image:
+        assert image.format == "PNG"
+
+
+class ScriptedVLM:
+    """Mock VLM returning scripted responses in order."""
+
+    def __init__(self, responses: list[str]):
+        self.responses = list(responses)
+        self.prompts: list[str] = []
+
+    async def generate(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        return self.responses.pop(0)
+
+
+PLOT_SAVE = "import matplotlib.pyplot as plt\nplt.plot(x)\nplt.savefig(OUTPUT_PATH)"
+
+
+@pytest.mark.asyncio
+async def test_failing_plot_code_is_repaired(tmp_path):
+    plot_data = PlotData.write({"data": {"step": [1, 2, 3]}}, tmp_path / "data")
+    vlm = ScriptedVLM(
+        [
+            # Wrong column case (fixed locally), then an undefined name (fixed by the VLM)
+            f"```python\nx = DATA['data']['Step'] + offset\n{PLOT_SAVE}\n```",
+            f"```python\nx = DATA['data']['step'] + 1\n{PLOT_SAVE}\n```",
+        ]
+    )
+    agent = VisualizerAgent(MockImageGen(), vlm, output_dir=str(tmp_path))
+
+    path = await agent.run(
+        description="Steps", diagram_type=DiagramType.STATISTICAL_PLOT, plot_data=plot_data
+    )
+
+    assert [(r["failure"], r["fix"], r["ok"]) for r in agent.last_plot_repairs] == [
+        ("missing_column", "missing_column", False),
+        ("undefined_name", "vlm", True),
+    ]
+    assert "name 'offset' is not defined" in vlm.prompts[1]
+    with Image.open(path) as image:
+        assert image.size != (1024, 768)
+
+
+@pytest.mark.asyncio
+async def test_plot_repair_budget_falls_back_to_placeholder(tmp_path):
+    broken = "```python\nraise RuntimeError('boom')\n```"
+    vlm = ScriptedVLM([broken, broken])
+    agent = VisualizerAgent(MockImageGen(), vlm, output_dir=str(tmp_path), plot_repair_attempts=1)
+
+    path = await agent.run(description="Boom", diagram_type=DiagramType.STATISTICAL_PLOT)
+
+    assert len(vlm.prompts) == 2 and len(agent.last_plot_repairs) == 1
+    with Image.open(path) as image:
+        assert image.size == (1024, 768)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pooled", [True, False])
+async def test_plot_exports_preview_print_and_vectors(tmp_path, pooled):
+    code = (
+        "import matplotlib.pyplot as plt\n"
+        "plt.figure(figsize=(4, 3))\nplt.plot([1, 3, 2])\n"
+        "plt.savefig(OUTPUT_PATH, dpi=300)"
+    )
+    pool = PlotWorkerPool(size=1) if pooled else None
+    agent = VisualizerAgent(
+        MockImageGen(),
+        MockSpecVLM(f"```python\n{code}\n```"),
+        output_dir=str(tmp_path),
+        plot_pool=pool,
+        plot_preview_dpi=50,
+        plot_print_dpi=200,
+    )
+    try:
+        path = await agent.run(
+            description="A line", diagram_type=DiagramType.STATISTICAL_PLOT, iteration=1
+        )
+    finally:
+        if pool is not None:
+            pool.close()
+
+    # The critic gets the cheap preview; the print PNG and vectors sit beside it
+    assert path == agent.last_exports["preview"] == str(tmp_path / "plot_iter_1.png")
+    with Image.open(path) as preview, Image.open(agent.last_exports["png"]) as png:
+        assert preview.size == (200, 150) and png.size == (800, 600)
+    assert (tmp_path / "plot_iter_1.svg").exists() and (tmp_path / "plot_iter_1.pdf").exists()
+
+
+@pytest.mark.asyncio
+async def test_spec_backend_writes_exports(tmp_path):
+    plot_data = PlotData.write({"data": {"step": [1, 2, 3], "acc": [0.5, 0.7, 0.8]}}, tmp_path)
+    spec = {"panels": [{"layers": [{"mark": "line", "x": "step", "y": "acc"}]}]}
+    agent = VisualizerAgent(
+        MockImageGen(),
+        MockSpecVLM(json.dumps(spec)),
+        output_dir=str(tmp_path),
+        plot_backend="spec",
+        plot_preview_dpi=50,
+        plot_export_formats=("pdf",),
+    )
+
+    path = await agent.run(
+        description="Accuracy", diagram_type=DiagramType.STATISTICAL_PLOT, plot_data=plot_data
+    )
+
+    assert set(agent.last_exports) == {"preview", "png", "pdf"}
+    assert path == agent.last_exports["preview"]
@@ -0,0 +1,91 @@
+"""Tests for columnar aggregation of evaluation results."""
+
+from __future__ import annotations
+
+import itertools
+import json
+
+import numpy as np
+import pytest
+
+from paperbanana.core.types import DimensionResult
+from paperbanana.evaluation.aggregate import (
+    config_id,
+    from_records,
+    hierarchical_sides,
+    load_results,
+    win_rates,
+)
+from paperbanana.evaluation.judge import DIMENSIONS, VLMJudge
+
+WINNERS = ["Model", "Human", "Both are good", "Both are bad"]
+
+
+def _record(category: str, *winners: str) -> dict:
+    return {
+        "id": f"{category}-{'-'.join(winners)}",
+        "category": category,
+        "seconds": 1.0,
+        "scores": {dim: {"winner": w} for dim, w in zip(DIMENSIONS, winners)},
+    }
+
+
+def test_hierarchy_matches_judge():
+    combos = list(itertools.product(WINNERS, repeat=4))
+    frame = from_records(_record("c", *combo) for combo in combos)
+
+    judge = VLMJudge(None)
+    expected = []
+    for combo in combos:
+        results = {dim: DimensionResult(winner=w, score=0) for dim, w in zip(DIMENSIONS, combo)}
+        overall = judge._hierarchical_aggregate(results)
+        expected.append({"Model": 1, "Human": -1}.get(overall, 0))
+
+    assert frame["overall"].tolist() == expected
+    assert hierarchical_sides({dim: frame[dim].to_numpy() for dim in DIMENSIONS}).tolist() == (
+        expected
+    )
+
+
+def test_win_rates_by_group():
+    records = [_record("a", "Model", "Human", "Model", "Both are bad")] * 3 + [
+        _record("b", "Human", "Model", "Both are good", "Model")
+    ]
+    frame = from_records(records + [{"id": "failed", "error": "boom"}])
+
+    table = win_rates(frame, by=["category"], n_boot=200)
+
+    assert "seconds" not in frame.columns and len(frame) == 4
+    a = table.loc[("a", "overall")]
+    assert a["n"] == 3 and a["win"] == 1.0 and a["score"] == 100.0
+    b = table.loc[("b", "readability")]
+    assert b["tie"] == 1.0 and b["score"] == 50.0
+    assert table.loc[("b", "overall"), "loss"] == 1.0
+    assert (table["score_low"] <= table["score"]).all()
+    assert (table["score"] <= table["score_high"]).all()
+    with pytest.raises(KeyError, match="model"):
+        win_rates(frame, by=["model"])
+
+
+def test_bootstrap_interval_covers_mean(tmp_path):
+    rng = np.random.default_rng(1)
+    path = tmp_path / "results.jsonl"
+    with open(path, "w", encoding="utf-8") as f:
+        for winners in rng.choice(WINNERS, size=(2000, 4)):
+            f.write(json.dumps(_record("c", *winners)) + "\n")
+        f.write('{"id": "cut", "sco')
+
+    frame = load_results([path])
+    table = win_rates(frame, n_boot=500, confidence=0.95)
+
+    assert set(frame["source"]) == {"results.jsonl"} and len(frame) == 2000
+    row = table.loc["faithfulness"]
+    assert row["win_low"] < 0.25 < row["win_high"]
+    assert row["win_high"] - row["win_low"] < 0.06
+
+
+def test_config_id_ignores_run_paths():
+    a = {"vlm_model": "m", "output_dir": "outputs/a", "cache_dir": "x"}
+    b = {"vlm_model": "m", "output_dir": "outputs/b", "cache_dir": "y"}
+
+    assert config_id(a) == config_id(b) != config_id({"vlm_model": "n"})
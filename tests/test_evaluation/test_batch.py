@@ -0,0 +1,116 @@
+"""Tests for the batch evaluation harness."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+from PIL import Image
+
+from paperbanana.evaluation.batch import BatchEvaluator, load_manifest, read_results
+from paperbanana.evaluation.judge import VLMJudge
+
+
+class CountingVLM:
+    """Mock VLM that always answers "Model", tracking concurrent calls."""
+
+    name = "mock"
+    model_name = "mock-model"
+
+    def __init__(self, fail_prompts: str | None = None):
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.fail_prompts = fail_prompts
+
+    async def generate(self, prompt, images=None, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if self.fail_prompts and self.fail_prompts in prompt:
+            raise RuntimeError("provider unavailable")
+        return json.dumps({"comparison_reasoning": "ok", "winner": "Model"})
+
+
+def _manifest(tmp_path, n: int) -> str:
+    Image.new("RGB", (16, 16), (255, 255, 255)).save(tmp_path / "ref.png")
+    (tmp_path / "ctx.txt").write_text("Shared method text.", encoding="utf-8")
+    lines = []
+    for i in range(n):
+        Image.new("RGB", (16, 16), (i, 0, 0)).save(tmp_path / f"gen{i}.png")
+        lines.append(
+            {
+                "id": f"t{i}",
+                "generated": f"gen{i}.png",
+                "reference": "ref.png",
+                "context_file": "ctx.txt",
+                "caption": f"Caption {i}",
+                "category": "vision_perception",
+            }
+        )
+    path = tmp_path / "manifest.jsonl"
+    path.write_text("\n".join(json.dumps(line) for line in lines), encoding="utf-8")
+    return str(path)
+
+
+def test_load_manifest(tmp_path):
+    tasks = load_manifest(_manifest(tmp_path, 2))
+
+    assert [t.id for t in tasks] == ["t0", "t1"]
+    assert tasks[0].generated == str(tmp_path / "gen0.png")
+    assert tasks[0].context == "Shared method text."
+    assert tasks[0].metadata == {"category": "vision_perception"}
+
+    (tmp_path / "bad.jsonl").write_text(json.dumps({"generated": "a.png"}), encoding="utf-8")
+    with pytest.raises(ValueError, match="caption, context, reference"):
+        load_manifest(tmp_path / "bad.jsonl")
+
+
+async def test_batch_runs_concurrently_on_one_judge(tmp_path):
+    vlm = CountingVLM()
+    evaluator = BatchEvaluator(VLMJudge(vlm, max_concurrency=1), max_concurrency=3)
+    seen = []
+
+    stats = await evaluator.run(
+        load_manifest(_manifest(tmp_path, 6)), tmp_path / "out.jsonl", on_result=seen.append
+    )
+
+    assert vlm.peak == 3 and vlm.calls == 24
+    assert stats.completed == 6 and stats.failed == 0 and len(stats.latencies) == 6
+    records = read_results(tmp_path / "out.jsonl")
+    assert sorted(records) == [f"t{i}" for i in range(6)] and len(seen) == 6
+    assert records["t0"]["scores"]["overall_winner"] == "Model"
+    assert records["t0"]["category"] == "vision_perception"
+    assert "Throughput" in stats.summary()
+
+
+async def test_batch_resumes_after_crash(tmp_path):
+    tasks = load_manifest(_manifest(tmp_path, 4))
+    output = tmp_path / "out.jsonl"
+    await BatchEvaluator(VLMJudge(CountingVLM()), max_concurrency=2).run(tasks[:2], output)
+    # A failed task and a line cut short mid-write by a crash
+    with open(output, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"id": "t2", "error": "RuntimeError: boom"}) + "\n")
+        f.write('{"id": "t3", "sco')
+
+    vlm = CountingVLM()
+    stats = await BatchEvaluator(VLMJudge(vlm)).run(tasks, output)
+
+    assert stats.skipped == 2 and stats.completed == 2
+    assert vlm.calls == 8
+    assert sorted(read_results(output)) == ["t0", "t1", "t2", "t3"]
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert all(json.loads(line) for line in lines)
+
+
+async def test_failed_tasks_are_recorded(tmp_path):
+    tasks = load_manifest(_manifest(tmp_path, 2))
+    vlm = CountingVLM(fail_prompts="Caption 1")
+
+    stats = await BatchEvaluator(VLMJudge(vlm)).run(tasks, tmp_path / "out.jsonl")
+
+    assert stats.completed == 1 and stats.failed == 1
+    assert list(read_results(tmp_path / "out.jsonl")) == ["t0"]
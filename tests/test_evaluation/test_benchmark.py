@@ -0,0 +1,91 @@
+"""Tests for the end-to-end benchmark."""
+
+from __future__ import annotations
+
+import json
+
+from PIL import Image
+
+from paperbanana.core.config import Settings
+from paperbanana.core.types import ReferenceExample
+from paperbanana.evaluation.benchmark import BenchmarkRunner, format_report, summarize
+from paperbanana.providers.offline import FakeImageGen, FakeVLM
+
+
+def _examples(tmp_path, n: int) -> list[ReferenceExample]:
+    examples = []
+    for i in range(n):
+        path = tmp_path / f"ref{i}.png"
+        Image.new("RGB", (64, 64), (255, 255, 255)).save(path)
+        examples.append(
+            ReferenceExample(
+                id=f"ex{i}",
+                source_context=f"Method {i}: an encoder feeds a decoder.",
+                caption=f"Overview of model {i}.",
+                image_path=str(path),
+                category="vision_perception",
+            )
+        )
+    return examples
+
+
+async def test_benchmark_runs_offline(tmp_path):
+    settings = Settings(
+        reference_set_path=str(tmp_path / "refs"),
+        cache_dir=str(tmp_path / "cache"),
+        refinement_iterations=1,
+    )
+    runner = BenchmarkRunner(settings, FakeVLM(), FakeImageGen(), parallelism=2)
+    seen = []
+
+    report = await runner.run(_examples(tmp_path, 3), tmp_path / "bench", on_result=seen.append)
+
+    records = [
+        json.loads(line) for line in (tmp_path / "bench" / "results.jsonl").read_text().splitlines()
+    ]
+    assert len(records) == len(seen) == 3 and all("scores" in r for r in records)
+    assert records[0]["usage"]["judge"]["calls"] == 4
+    assert records[0]["usage"]["image"]["calls"] >= 1
+    assert list(records[0]["latency"]) == [
+        "retrieval",
+        "planning",
+        "styling",
+        "visualizer",
+        "critic",
+        "total",
+        "judge",
+    ]
+
+    assert report == json.loads((tmp_path / "bench" / "report.json").read_text())
+    assert report["succeeded"] == 3 and report["failed"] == 0
+    assert report["usage"]["planner"]["calls"] == 3
+    assert set(report["win_rate"]) == {
+        "overall",
+        "faithfulness",
+        "conciseness",
+        "readability",
+        "aesthetics",
+    }
+    assert "win rate" in format_report(report)
+
+
+def test_summarize_counts_failures_and_win_rates():
+    scores = {
+        "overall_winner": "Model",
+        **{
+            dim: {"winner": "Human"}
+            for dim in ("faithfulness", "conciseness", "readability", "aesthetics")
+        },
+    }
+    records = [
+        {"id": "a", "latency": {"total": 2.0}, "scores": scores, "usage": {}},
+        {"id": "b", "latency": {"total": 4.0}, "scores": scores, "usage": {}},
+        {"id": "c", "error": "RuntimeError: boom", "usage": {}},
+    ]
+
+    report = summarize(records, wall_seconds=6.0)
+
+    assert report["failed"] == 1 and report["examples_per_minute"] == 20.0
+    assert report["latency"]["total"]["mean"] == 3.0
+    assert report["win_rate"]["overall"] == {"win": 1.0, "loss": 0.0, "tie": 0.0}
+    assert report["win_rate"]["faithfulness"]["loss"] == 1.0
@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import shutil
 
+import pytest
+from PIL import Image
+
+from paperbanana.core.cache import SQLiteCache
+from paperbanana.core.config import Settings
 from paperbanana.core.types import DimensionResult
-from paperbanana.evaluation.judge import VLMJudge
+from paperbanana.evaluation.judge import VLMJudge, open_judge_cache
 
 
 class MockVLM:
@@ -210,3 +217,185 @@ def test_aggregate_complete_split():
         "aesthetics": _dim("Model"),
     }
     assert judge._hierarchical_aggregate(results) == "Both are good"
+
+
+# --- Concurrent and single-call evaluation ---
+
+
+class DimensionVLM:
+    """Mock VLM answering per-dimension prompts by dimension, tracking concurrency."""
+
+    name = "mock"
+    model_name = "mock-model"
+
+    def __init__(self, winners: dict[str, str], combined: str | None = None):
+        self.winners = winners
+        self.combined = combined
+        self.prompts: list[str] = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate(self, prompt, images=None, **kwargs):
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if "## Dimension:" in prompt:
+            return self.combined
+        dim = next(d for d in self.winners if f"**{d.capitalize()}**" in prompt)
+        return json.dumps({"comparison_reasoning": dim, "winner": self.winners[dim]})
+
+
+WINNERS = {
+    "faithfulness": "Model",
+    "conciseness": "Human",
+    "readability": "Both are good",
+    "aesthetics": "Both are bad",
+}
+
+
+async def _evaluate(tmp_path, vlm, **judge_kwargs):
+    for name in ("generated.png", "reference.png"):
+        Image.new("RGB", (32, 32), (255, 255, 255)).save(tmp_path / name)
+    judge = VLMJudge(vlm, prompt_dir="prompts", **judge_kwargs)
+    return await judge.evaluate(
+        image_path=str(tmp_path / "generated.png"),
+        source_context="An encoder feeds a decoder.",
+        caption="Overview",
+        reference_path=str(tmp_path / "reference.png"),
+    )
+
+
+async def test_dimensions_evaluated_concurrently_with_bound(tmp_path):
+    vlm = DimensionVLM(WINNERS)
+    scores = await _evaluate(tmp_path, vlm, max_concurrency=2)
+
+    assert vlm.peak == 2
+    assert {dim: getattr(scores, dim).winner for dim in WINNERS} == WINNERS
+    assert scores.faithfulness.reasoning == "faithfulness"
+    assert scores.overall_winner == "Model"
+
+
+async def test_single_call_mode(tmp_path):
+    combined = {dim: {"comparison_reasoning": "all", "winner": w} for dim, w in WINNERS.items()}
+    vlm = DimensionVLM(WINNERS, combined=json.dumps(combined))
+    scores = await _evaluate(tmp_path, vlm, mode="single")
+
+    assert len(vlm.prompts) == 1
+    prompt = vlm.prompts[0]
+    # The context and output format appear once; each dimension's criteria once
+    assert prompt.count("An encoder feeds a decoder.") == 1
+    assert prompt.count("## Output Format") == 1
+    assert prompt.count("### Veto Rules") == 4
+    assert {dim: getattr(scores, dim).winner for dim in WINNERS} == WINNERS
+
+
+async def test_single_call_falls_back_per_dimension(tmp_path):
+    combined = {
+        "faithfulness": {"winner": "Model"},
+        "conciseness": {"winner": "Nobody"},
+        "aesthetics": "Both are bad",
+    }
+    vlm = DimensionVLM(WINNERS, combined=json.dumps(combined))
+    scores = await _evaluate(tmp_path, vlm, mode="single")
+
+    # Invalid or missing dimensions are judged with their own prompts
+    assert len(vlm.prompts) == 4
+    assert {dim: getattr(scores, dim).winner for dim in WINNERS} == WINNERS
+
+    vlm = DimensionVLM(WINNERS, combined="not json")
+    await _evaluate(tmp_path, vlm, mode="single")
+    assert len(vlm.prompts) == 5
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError, match="Unknown judge mode"):
+        VLMJudge(MockVLM(), mode="batch")
+
+
+# --- Judgment cache ---
+
+
+async def test_cached_verdicts_skip_judge_calls(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache.sqlite", "judge")
+    vlm = DimensionVLM(WINNERS)
+    first = await _evaluate(tmp_path, vlm, cache=cache)
+    assert len(vlm.prompts) == 4 and len(cache) == 4
+
+    again = DimensionVLM(WINNERS)
+    second = await _evaluate(tmp_path, again, cache=cache)
+    assert again.prompts == [] and second == first
+
+    # A different judge model is a different verdict
+    other = DimensionVLM(WINNERS)
+    other.model_name = "other-model"
+    await _evaluate(tmp_path, other, cache=cache)
+    assert len(other.prompts) == 4
+
+    # Single mode judges with another prompt, but reuses per-dimension verdicts
+    single = DimensionVLM(WINNERS, combined="not json")
+    await _evaluate(tmp_path, single, mode="single", cache=cache)
+    assert single.prompts == []
+
+
+async def test_changed_prompt_or_image_misses_cache(tmp_path):
+    prompts = tmp_path / "prompts"
+    shutil.copytree("prompts/evaluation", prompts / "evaluation")
+    cache = SQLiteCache(tmp_path / "cache.sqlite", "judge")
+
+    async def evaluate(vlm):
+        judge = VLMJudge(vlm, prompt_dir=str(prompts), cache=cache)
+        return await judge.evaluate(
+            image_path=str(tmp_path / "generated.png"),
+            source_context="An encoder feeds a decoder.",
+            caption="Overview",
+            reference_path=str(tmp_path / "reference.png"),
+        )
+
+    for name in ("generated.png", "reference.png"):
+        Image.new("RGB", (32, 32), (255, 255, 255)).save(tmp_path / name)
+    await evaluate(DimensionVLM(WINNERS))
+
+    template = prompts / "evaluation" / "aesthetics.txt"
+    template.write_text(template.read_text(encoding="utf-8") + "\nBe strict.", encoding="utf-8")
+    vlm = DimensionVLM(WINNERS)
+    await evaluate(vlm)
+    assert len(vlm.prompts) == 1 and "Be strict." in vlm.prompts[0]
+
+    Image.new("RGB", (32, 32), (0, 0, 0)).save(tmp_path / "generated.png")
+    vlm = DimensionVLM(WINNERS)
+    await evaluate(vlm)
+    assert len(vlm.prompts) == 4
+
+
+async def test_unparsed_verdicts_are_not_cached(tmp_path):
+    class BrokenVLM(DimensionVLM):
+        async def generate(self, prompt, images=None, **kwargs):
+            self.prompts.append(prompt)
+            return "not json"
+
+    cache = SQLiteCache(tmp_path / "cache.sqlite", "judge")
+    await _evaluate(tmp_path, BrokenVLM(WINNERS), cache=cache)
+
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache.sqlite", "judge", max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None and cache.get("a") == 1
+    assert cache.evict(1) == 1 and len(cache) == 1
+
+
+def test_open_judge_cache_follows_settings(tmp_path):
+    settings = Settings(cache_dir=str(tmp_path), judge_cache_max_entries=7)
+
+    cache = open_judge_cache(settings)
+    assert cache.namespace == "judge" and cache.max_entries == 7
+    assert open_judge_cache(settings.model_copy(update={"judge_cache": False})) is None
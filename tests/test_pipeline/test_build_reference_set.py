@@ -0,0 +1,112 @@
+"""Tests for incremental builds in scripts/build_reference_set.py."""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parents[2] / "scripts" / "build_reference_set.py"
+
+
+class Builder:
+    """The build script loaded as a module, recording the papers it processes."""
+
+    def __init__(self, monkeypatch):
+        spec = importlib.util.spec_from_file_location("build_reference_set", SCRIPT)
+        self.module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(self.module)
+        self.monkeypatch = monkeypatch
+        self.fail: set[str] = set()
+        process_paper = self.module.process_paper
+
+        def tracking(paper_dir, *args):
+            name = paper_dir.parent.name
+            self.processed.append(name)
+            if name in self.fail:
+                raise OSError("transient read error")
+            return process_paper(paper_dir, *args)
+
+        monkeypatch.setattr(self.module, "process_paper", tracking)
+
+    def build(self, source: Path, output: Path) -> list[str]:
+        """Run the builder in-process; return the papers it (re)processed."""
+        self.processed: list[str] = []
+        argv = ["build", "--input", str(source), "--output", str(output), "--workers", "1"]
+        self.monkeypatch.setattr(sys, "argv", [*argv, "--dedup", "off"])
+        self.module.main()
+        return sorted(self.processed)
+
+
+@pytest.fixture
+def builder(monkeypatch):
+    return Builder(monkeypatch)
+
+
+def _paper(root: Path, name: str, method: str = "We cache keys.") -> Path:
+    paper_dir = root / name / "hybrid_auto"
+    (paper_dir / "images").mkdir(parents=True)
+    (paper_dir / "images" / "fig.jpg").write_bytes(f"jpeg {name}".encode())
+    items = [
+        {"type": "text", "text": f"Paper {name}", "text_level": 1},
+        {"type": "text", "text": "2 Method", "text_level": 1},
+        {"type": "text", "text": method},
+        {
+            "type": "image",
+            "img_path": "images/fig.jpg",
+            "image_caption": [f"Overview of {name}."],
+            "bbox": [0, 0, 300, 100],
+        },
+    ]
+    (paper_dir / f"{name}_content_list.json").write_text(json.dumps(items))
+    return paper_dir
+
+
+def _index_ids(output: Path) -> list[str]:
+    return sorted(
+        e["source_paper"] for e in json.loads((output / "index.json").read_text())["examples"]
+    )
+
+
+def test_unchanged_papers_are_not_reprocessed(builder, tmp_path):
+    _paper(tmp_path / "in", "a")
+    _paper(tmp_path / "in", "b")
+    out = tmp_path / "out"
+
+    assert builder.build(tmp_path / "in", out) == ["a", "b"]
+    assert builder.build(tmp_path / "in", out) == []
+    assert _index_ids(out) == ["a", "b"]
+    assert len(list((out / "images").iterdir())) == 2
+
+
+def test_changed_paper_is_reprocessed(builder, tmp_path):
+    _paper(tmp_path / "in", "a")
+    b = _paper(tmp_path / "in", "b")
+    out = tmp_path / "out"
+    builder.build(tmp_path / "in", out)
+
+    content = b / "b_content_list.json"
+    content.write_text(content.read_text().replace("We cache keys.", "We shard keys."))
+
+    assert builder.build(tmp_path / "in", out) == ["b"]
+    examples = json.loads((out / "index.json").read_text())["examples"]
+    (context,) = [e["source_context"] for e in examples if e["source_paper"] == "b"]
+    assert "We shard keys." in context
+
+
+def test_failed_paper_is_retried(builder, tmp_path):
+    _paper(tmp_path / "in", "a")
+    _paper(tmp_path / "in", "b")
+    out = tmp_path / "out"
+    builder.fail = {"b"}
+    assert builder.build(tmp_path / "in", out) == ["a", "b"]
+    assert _index_ids(out) == ["a"]
+    manifest = json.loads((out / builder.module.MANIFEST_FILE).read_text())["papers"]
+    assert [Path(key).parent.name for key in manifest] == ["a"]
+
+    builder.fail = set()
+    assert builder.build(tmp_path / "in", out) == ["b"]
+    assert _index_ids(out) == ["a", "b"]
@@ -0,0 +1,40 @@
+"""Tests for local category classification and exemplar ranking."""
+
+from __future__ import annotations
+
+from paperbanana.core.types import ReferenceExample
+from paperbanana.reference.categories import DEFAULT_CATEGORY, classify, rank_exemplars
+
+
+def test_classify_confidence_reflects_evidence():
+    clear = classify("An LLM agent performs planning, reasoning, retrieval and tool use.")
+    assert clear.category == "agent_reasoning"
+    assert clear.confidence >= 0.75
+
+    mixed = classify("A diffusion model for video generation.")
+    assert mixed.confidence < 0.75
+
+    none = classify("Nothing recognisable here.")
+    assert none.category == DEFAULT_CATEGORY
+    assert none.confidence == 0.0
+
+
+def test_rank_exemplars_prefers_diverse_examples():
+    def example(i: int, text: str) -> ReferenceExample:
+        return ReferenceExample(id=f"r{i}", source_context=text, caption=text, image_path="")
+
+    examples = [
+        example(0, "encoder decoder attention transformer"),
+        example(1, "encoder decoder attention transformer"),
+        example(2, "encoder decoder attention transformer layers"),
+        example(3, "graph message passing molecules"),
+        example(4, "reward policy rollout environment"),
+    ]
+
+    ranked = rank_exemplars(examples, 3)
+    assert len(ranked) == len(set(ranked)) == 3
+    # The most typical example first, then no second copy of the same text
+    assert ranked[0] in (0, 1, 2)
+    assert len({0, 1, 2} & set(ranked)) == 1
+    assert rank_exemplars(examples, 10) and len(rank_exemplars(examples, 10)) == 5
+    assert rank_exemplars([], 3) == []
@@ -0,0 +1,92 @@
+"""Tests for streaming MinerU content list extraction."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from paperbanana.reference.content_list import extract_content_list, iter_json_array
+
+ITEMS = [
+    {"type": "text", "text": "Streaming Figures for Papers", "text_level": 1},
+    {"type": "text", "text": "1 Introduction", "text_level": 1},
+    {"type": "text", "text": "Intro text."},
+    {"type": "text", "text": "2 HERMES", "text_level": 1},
+    {"type": "text", "text": "We cache keys."},
+    {"type": "equation", "text": "y = f(x)"},
+    {"type": "text", "text": "2.1 Memory", "text_level": 2},
+    {"type": "list", "list_items": [" tiers ", 3]},
+    {
+        "type": "image",
+        "img_path": "images/fig.jpg",
+        "image_caption": ["Overview of HERMES. "],
+        "bbox": [0, 0, 300, 100],
+    },
+    {"type": "image", "img_path": "images/missing.jpg", "image_caption": ["Gone"]},
+    {"type": "text", "text": "3 Experiments", "text_level": 1},
+    {"type": "text", "text": "Results text."},
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_iter_json_array_matches_json_load(tmp_path, chunk_size):
+    path = tmp_path / "items.json"
+    data = ITEMS + [12345, "tail", [], {}, None, 1.5e3]
+    path.write_text(json.dumps(data, indent=1))
+
+    assert list(iter_json_array(path, chunk_size=chunk_size)) == data
+
+
+@pytest.mark.parametrize("text", ["[]", " [ ] "])
+def test_iter_json_array_empty(tmp_path, text):
+    path = tmp_path / "empty.json"
+    path.write_text(text)
+    assert list(iter_json_array(path)) == []
+
+
+@pytest.mark.parametrize("text", ["", "{}", "[1, 2", "[1 2]", "[1,]"])
+def test_iter_json_array_rejects_malformed(tmp_path, text):
+    path = tmp_path / "bad.json"
+    path.write_text(text)
+    with pytest.raises(ValueError):
+        list(iter_json_array(path, chunk_size=2))
+
+
+def test_extract_content_list_single_pass(tmp_path):
+    (tmp_path / "images").mkdir()
+    (tmp_path / "images" / "fig.jpg").write_bytes(b"jpeg")
+    path = tmp_path / "paper_content_list.json"
+    path.write_text(json.dumps(ITEMS))
+
+    summary = extract_content_list(path, chunk_size=16)
+
+    assert summary.title == "Streaming Figures for Papers"
+    assert [h.number for h in summary.headings] == [None, 1, 2, 2, 3]
+    # No explicit method heading: falls back to sections between intro and experiments
+    assert summary.method_sections() == {2}
+    assert summary.methodology_text() == "\n\n".join(
+        ["2 HERMES", "We cache keys.", "[Equation: y = f(x)]", "2.1 Memory", "- tiers"]
+    )
+    assert summary.methodology_text([3]) == "3 Experiments\n\nResults text."
+    assert len(summary.figures) == 1
+    figure = summary.figures[0]
+    assert figure.caption == "Overview of HERMES."
+    assert figure.aspect_ratio == 3.0
+    assert figure.local_path == tmp_path / "images" / "fig.jpg"
+
+
+def test_unnumbered_stop_heading_ends_section(tmp_path):
+    items = [
+        {"type": "text", "text": "3 Method", "text_level": 1},
+        {"type": "text", "text": "Body."},
+        {"type": "text", "text": "References", "text_level": 1},
+        {"type": "text", "text": "[1] Someone et al."},
+        {"type": "text", "text": "A.1 Extra", "text_level": 2},
+    ]
+    path = tmp_path / "content_list.json"
+    path.write_text(json.dumps(items))
+
+    summary = extract_content_list(path)
+    assert summary.title == ""
+    assert summary.methodology_text() == "3 Method\n\nBody."
@@ -0,0 +1,84 @@
+"""Tests for perceptual-hash near-duplicate detection."""
+
+from __future__ import annotations
+
+import random
+
+from PIL import Image, ImageDraw
+
+from paperbanana.reference.dedup import (
+    HASH_FILE,
+    MultiIndexHash,
+    find_near_duplicates,
+    hamming_distance,
+    phash_files,
+)
+
+
+def _diagram(path, seed: int, size=(400, 200)) -> None:
+    rng = random.Random(seed)
+    image = Image.new("RGB", (400, 200), "white")
+    draw = ImageDraw.Draw(image)
+    for _ in range(8):
+        x, y = rng.randint(0, 340), rng.randint(0, 150)
+        draw.rectangle([x, y, x + rng.randint(20, 60), y + rng.randint(15, 45)], fill="black")
+    image.resize(size).save(path)
+
+
+def test_multi_index_search_matches_brute_force():
+    rng = random.Random(0)
+    values = [rng.getrandbits(64) for _ in range(500)]
+    # Add some close neighbours so small radii have hits
+    values += [v ^ (1 << rng.randrange(64)) for v in values[:50]]
+    index = MultiIndexHash(max_distance=12)
+    for i, value in enumerate(values):
+        index.add(value, f"k{i}")
+    assert len(index) == len(values)
+
+    for query in values[:20] + [rng.getrandbits(64) for _ in range(5)]:
+        for radius in (0, 3, 12):
+            expected = sorted(
+                (f"k{i}", hamming_distance(query, v))
+                for i, v in enumerate(values)
+                if hamming_distance(query, v) <= radius
+            )
+            assert sorted(index.search(query, radius)) == expected
+
+
+def test_phash_separates_rescaled_copy_from_other_diagram(tmp_path):
+    _diagram(tmp_path / "a.png", seed=1)
+    _diagram(tmp_path / "a_small.jpg", seed=1, size=(200, 100))
+    _diagram(tmp_path / "b.png", seed=2)
+    (tmp_path / "broken.png").write_bytes(b"not an image")
+
+    a, a_small, b, broken = phash_files(
+        [tmp_path / name for name in ["a.png", "a_small.jpg", "b.png", "broken.png"]]
+    )
+    assert broken is None
+    assert hamming_distance(a, a_small) <= 4
+    assert hamming_distance(a, b) > 12
+
+
+def test_find_near_duplicates_keeps_first_and_caches_hashes(tmp_path):
+    (tmp_path / "images").mkdir()
+    _diagram(tmp_path / "images/old.png", seed=1)
+    _diagram(tmp_path / "images/v2.jpg", seed=1, size=(300, 150))
+    _diagram(tmp_path / "images/new.png", seed=3)
+    _diagram(tmp_path / "images/new_copy.png", seed=3)
+
+    existing = [{"id": "old", "image_path": "images/old.png"}]
+    candidates = [
+        {"id": "v2", "image_path": "images/v2.jpg"},
+        {"id": "new", "image_path": "images/new.png"},
+        {"id": "new_copy", "image_path": "images/new_copy.png"},
+        {"id": "missing", "image_path": "images/missing.png"},
+    ]
+
+    duplicates = find_near_duplicates(tmp_path, existing, candidates)
+    assert set(duplicates) == {"v2", "new_copy"}
+    assert duplicates["v2"][0] == "old"
+    assert duplicates["new_copy"] == ("new", 0)
+    assert (tmp_path / HASH_FILE).exists()
+
+    # Cached hashes give the same answer
+    assert find_near_duplicates(tmp_path, existing, candidates) == duplicates
@@ -0,0 +1,72 @@
+"""Tests for the local pre-critic image quality gate."""
+
+from __future__ import annotations
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from paperbanana.core.image_gate import check_image_quality
+
+
+def _diagram(width: int = 1024, height: int = 768) -> Image.Image:
+    image = Image.new("RGB", (width, height), color=(255, 255, 255))
+    draw = ImageDraw.Draw(image)
+    for i in range(4):
+        x0 = 60 + i * 240
+        draw.rounded_rectangle([x0, 300, x0 + 180, 420], radius=12, fill=(200, 220, 240))
+        draw.line([x0 + 180, 360, x0 + 240, 360], fill=(60, 60, 60), width=4)
+        draw.text((x0 + 20, 350), f"Module {i}", fill=(0, 0, 0))
+    return image
+
+
+def test_blank_placeholder_rejected(tmp_path):
+    """The white placeholder written on plot failure is rejected as blank."""
+    path = tmp_path / "blank.png"
+    Image.new("RGB", (1024, 768), color=(255, 255, 255)).save(path)
+
+    result = check_image_quality(path)
+    assert not result.passed
+    assert result.reason == "blank"
+
+
+def test_near_blank_rejected(tmp_path):
+    """A thin sliver of ink on an empty canvas is rejected as low entropy."""
+    pixels = np.full((768, 1024), 255, dtype=np.uint8)
+    pixels[:, :4] = 0
+    path = tmp_path / "speck.png"
+    Image.fromarray(pixels).save(path)
+
+    result = check_image_quality(path)
+    assert not result.passed
+    assert result.reason == "low_entropy"
+
+
+def test_undersized_rejected(tmp_path):
+    path = tmp_path / "tiny.png"
+    _diagram(200, 120).save(path)
+
+    result = check_image_quality(path)
+    assert not result.passed
+    assert result.reason == "undersized"
+
+
+def test_truncated_file_rejected(tmp_path):
+    path = tmp_path / "truncated.png"
+    _diagram().save(path)
+    data = path.read_bytes()
+    path.write_bytes(data[: len(data) // 2])
+
+    result = check_image_quality(path)
+    assert not result.passed
+    assert result.reason == "unreadable"
+
+
+def test_diagram_passes(tmp_path):
+    path = tmp_path / "diagram.png"
+    _diagram().save(path)
+
+    result = check_image_quality(path)
+    assert result.passed
+    assert result.reason is None
+    assert (result.width, result.height) == (1024, 768)
+    assert result.entropy > 0.08
@@ -0,0 +1,89 @@
+"""Tests for the packed reference image bundle."""
+
+from __future__ import annotations
+
+import io
+import os
+
+from PIL import Image
+
+from paperbanana.agents.planner import PlannerAgent
+from paperbanana.core.types import EncodedImage, ReferenceExample
+from paperbanana.providers.offline import FakeVLM
+from paperbanana.reference.image_pack import ImagePack, build_image_pack
+from paperbanana.reference.store import ReferenceStore
+
+
+class MockVLM:
+    """VLM provider that only accepts PIL images."""
+
+    name = "mock"
+    model_name = "mock-model"
+
+    async def generate(self, prompt, images=None, **kwargs):
+        return ""
+
+
+def _store(tmp_path) -> ReferenceStore:
+    images = tmp_path / "images"
+    images.mkdir()
+    Image.new("RGB", (400, 200), color=(10, 120, 200)).save(images / "small.jpg")
+    Image.new("RGB", (3000, 1500), color=(200, 50, 50)).save(images / "large.png")
+    examples = [
+        ReferenceExample(
+            id=name,
+            source_context="context",
+            caption="caption",
+            image_path=f"images/{file}",
+        )
+        for name, file in [("small", "small.jpg"), ("large", "large.png"), ("gone", "x.png")]
+    ]
+    ReferenceStore.create(tmp_path, examples)
+    return ReferenceStore(tmp_path)
+
+
+def test_pack_keeps_small_files_and_resizes_large(tmp_path):
+    store = _store(tmp_path)
+    assert build_image_pack(tmp_path, store.get_all(), max_side=1024) == 2
+
+    pack = ImagePack.open(tmp_path)
+    small = pack.get("small")
+    assert small.mime_type == "image/jpeg"
+    assert small.data == (tmp_path / "images/small.jpg").read_bytes()
+
+    large = pack.get("large")
+    assert large.mime_type == "image/png"
+    assert Image.open(io.BytesIO(large.data)).size == (1024, 512)
+    assert pack.get("gone") is None
+
+
+def test_planner_uses_packed_bytes(tmp_path):
+    store = _store(tmp_path)
+    build_image_pack(tmp_path, store.get_all())
+
+    planner = PlannerAgent(FakeVLM(), image_pack=store.image_pack())
+    images = planner._load_example_images(store.get_all())
+
+    assert len(images) == 2
+    assert all(isinstance(image, EncodedImage) for image in images)
+
+
+def test_planner_decodes_packed_images_for_pil_providers(tmp_path):
+    store = _store(tmp_path)
+    build_image_pack(tmp_path, store.get_all(), max_side=1024)
+
+    planner = PlannerAgent(MockVLM(), image_pack=store.image_pack())
+    images = planner._load_example_images(store.get_all())
+
+    assert all(isinstance(image, Image.Image) for image in images)
+    assert sorted(image.size for image in images) == [(400, 200), (1024, 512)]
+
+
+def test_stale_pack_is_ignored(tmp_path):
+    store = _store(tmp_path)
+    build_image_pack(tmp_path, store.get_all())
+    table = tmp_path / "images.pack.json"
+    stat = table.stat()
+    os.utime(table, (stat.st_atime, stat.st_mtime - 10))
+
+    assert store.image_pack() is None
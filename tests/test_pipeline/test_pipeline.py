@@ -0,0 +1,374 @@
+"""Tests for pipeline orchestration with mock providers."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+from PIL import Image, ImageDraw
+
+from paperbanana.agents.visualizer import resolution_to_size
+from paperbanana.core.config import Settings
+from paperbanana.core.pipeline import PaperBananaPipeline
+from paperbanana.core.types import DiagramType, GenerationInput, ReferenceExample
+from paperbanana.reference.store import ReferenceStore
+from paperbanana.rendering import PlotWorkerPool
+
+
+class MockVLM:
+    """Mock VLM: plain text for planning, scripted JSON critiques for the critic."""
+
+    name = "mock"
+    model_name = "mock-model"
+
+    def __init__(self, critiques: list[dict] | None = None):
+        self._critiques = list(critiques or [])
+        self.critic_calls = 0
+
+    async def generate(
+        self,
+        prompt,
+        images=None,
+        system_prompt=None,
+        temperature=1.0,
+        max_tokens=4096,
+        response_format=None,
+    ):
+        if response_format == "json":
+            self.critic_calls += 1
+            critique = self._critiques.pop(0) if self._critiques else {}
+            return json.dumps(critique)
+        return "A diagram with an encoder box feeding a decoder box."
+
+
+class MockImageGen:
+    """Mock image generator returning scripted images and recording sizes."""
+
+    name = "mock"
+    model_name = "mock-image"
+
+    def __init__(self, blank_calls: int = 0):
+        self._blank_calls = blank_calls
+        self.calls: list[tuple[int, int]] = []
+
+    async def generate(self, prompt, negative_prompt=None, width=1024, height=1024, seed=None):
+        self.calls.append((width, height))
+        image = Image.new("RGB", (width, height), color=(255, 255, 255))
+        if len(self.calls) > self._blank_calls:
+            draw = ImageDraw.Draw(image)
+            draw.rectangle(
+                [width // 8, height // 3, width // 2, 2 * height // 3], fill=(90, 140, 200)
+            )
+            draw.text((width // 6, height // 2), "Encoder", fill=(0, 0, 0))
+        return image
+
+
+def _pipeline(tmp_path, vlm, image_gen, **settings) -> PaperBananaPipeline:
+    settings = Settings(
+        output_dir=str(tmp_path / "outputs"),
+        reference_set_path=str(tmp_path / "refs"),
+        cache_dir=str(tmp_path / "cache"),
+        **settings,
+    )
+    return PaperBananaPipeline(settings=settings, vlm_client=vlm, image_gen_fn=image_gen)
+
+
+def _input() -> GenerationInput:
+    return GenerationInput(
+        source_context="An encoder feeds a decoder.",
+        communicative_intent="Overview of the encoder-decoder model.",
+    )
+
+
+@pytest.mark.asyncio
+async def test_quality_gate_skips_critic_on_blank_image(tmp_path):
+    vlm = MockVLM()
+    image_gen = MockImageGen(blank_calls=1)
+    pipeline = _pipeline(tmp_path, vlm, image_gen, refinement_iterations=3)
+
+    result = await pipeline.generate(_input())
+
+    assert len(result.iterations) == 2
+    assert not result.iterations[0].quality_gate.passed
+    assert result.iterations[1].quality_gate.passed
+    # Only the second (non-blank) image reached the critic
+    assert vlm.critic_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_progressive_resolution_renders_final_once(tmp_path):
+    vlm = MockVLM(
+        critiques=[{"critic_suggestions": ["Bigger labels"], "revised_description": "v2"}]
+    )
+    image_gen = MockImageGen()
+    pipeline = _pipeline(
+        tmp_path,
+        vlm,
+        image_gen,
+        refinement_iterations=3,
+        progressive_resolution=True,
+        draft_resolution="1k",
+        output_resolution="4k",
+    )
+
+    result = await pipeline.generate(_input())
+
+    draft, final = resolution_to_size("1k"), resolution_to_size("4k")
+    assert image_gen.calls == [draft, draft, final]
+    assert Image.open(result.image_path).size == final
+    assert result.metadata["timing"]["final_render_seconds"] > 0
+
+
+class MockEditingImageGen(MockImageGen):
+    """Mock image generator that also supports image editing."""
+
+    def __init__(self):
+        super().__init__()
+        self.edits: list[str] = []
+
+    def supports_editing(self):
+        return True
+
+    async def edit(self, image, prompt, width=1024, height=1024, seed=None):
+        self.edits.append(prompt)
+        return await self.generate(prompt, width=width, height=height)
+
+
+@pytest.mark.asyncio
+async def test_edit_mode_applies_suggestions_to_previous_image(tmp_path):
+    vlm = MockVLM(
+        critiques=[{"critic_suggestions": ["Rename box to Encoder"], "revised_description": "v2"}]
+    )
+    image_gen = MockEditingImageGen()
+    pipeline = _pipeline(tmp_path, vlm, image_gen, refinement_mode="edit")
+
+    result = await pipeline.generate(_input())
+
+    assert len(result.iterations) == 2
+    assert len(image_gen.edits) == 1
+    assert "Rename box to Encoder" in image_gen.edits[0]
+    modes = [it["render_mode"] for it in result.metadata["timing"]["iterations"]]
+    assert modes == ["generate", "edit"]
+    assert result.metadata["converged"]
+
+
+@pytest.mark.asyncio
+async def test_edit_mode_falls_back_without_provider_support(tmp_path):
+    vlm = MockVLM(critiques=[{"critic_suggestions": ["Fix arrow"], "revised_description": "v2"}])
+    pipeline = _pipeline(tmp_path, vlm, MockImageGen(), refinement_mode="edit")
+
+    result = await pipeline.generate(_input())
+
+    modes = [it["render_mode"] for it in result.metadata["timing"]["iterations"]]
+    assert modes == ["generate", "generate"]
+
+
+@pytest.mark.asyncio
+async def test_retrieval_shortcut_skips_vlm_retriever(tmp_path):
+    ReferenceStore.create(
+        tmp_path / "refs",
+        [
+            ReferenceExample(
+                id=f"{category}_{i}",
+                source_context=f"{category} method {i}",
+                caption=f"Figure {i}",
+                image_path="",
+                category=category,
+            )
+            for category in ["agent_reasoning", "vision_perception"]
+            for i in range(4)
+        ],
+    )
+    pipeline = _pipeline(
+        tmp_path,
+        MockVLM(),
+        MockImageGen(),
+        retrieval_shortcut=True,
+        num_retrieval_examples=3,
+        refinement_iterations=1,
+    )
+
+    async def fail(**kwargs):
+        raise AssertionError("VLM retriever should be skipped")
+
+    pipeline.retriever.run = fail
+    result = await pipeline.generate(
+        GenerationInput(
+            source_context="An LLM agent does planning and reasoning with retrieval and tool use.",
+            communicative_intent="Overview of the multi-agent framework.",
+        )
+    )
+
+    retrieval = result.metadata["retrieval"]
+    assert retrieval["mode"] == "shortcut"
+    assert retrieval["category"] == "agent_reasoning"
+    planning = json.loads((tmp_path / "outputs" / pipeline.run_id / "planning.json").read_text())
+    assert len(planning["retrieved_examples"]) == 3
+    assert all(eid.startswith("agent_reasoning") for eid in planning["retrieved_examples"])
+
+
+@pytest.mark.asyncio
+async def test_plot_downsampling_recorded_per_iteration(tmp_path):
+    pipeline = _pipeline(
+        tmp_path,
+        MockVLM(),
+        MockImageGen(),
+        refinement_iterations=1,
+        plot_workers=0,
+        plot_downsample="auto",
+        plot_downsample_max_points=100,
+    )
+    result = await pipeline.generate(
+        GenerationInput(
+            source_context="Training curve.",
+            communicative_intent="Loss over training steps.",
+            diagram_type=DiagramType.STATISTICAL_PLOT,
+            raw_data={"data": [{"step": i, "loss": 1 / (i + 1)} for i in range(5000)]},
+        )
+    )
+
+    reduction = result.metadata["timing"]["iterations"][0]["data_reduction"]["data"]
+    assert reduction["method"] == "lttb"
+    assert reduction["source_rows"] == 5000
+    assert reduction["ratio"] == reduction["rows"] / 5000
+
+
+class PlotCodeVLM(MockVLM):
+    """Mock VLM answering every text prompt with working plot code."""
+
+    def __init__(self, figsize: tuple[float, float] = (6.4, 4.8)):
+        super().__init__()
+        self.figsize = figsize
+
+    async def generate(self, prompt, images=None, response_format=None, **kwargs):
+        if response_format == "json":
+            return await super().generate(prompt, images, response_format=response_format)
+        return (
+            "```python\nimport matplotlib.pyplot as plt\n"
+            f"plt.figure(figsize={self.figsize})\n"
+            "plt.plot([1, 3, 2])\nplt.savefig(OUTPUT_PATH)\n```"
+        )
+
+
+@pytest.mark.asyncio
+async def test_small_plot_preview_passes_quality_gate(tmp_path):
+    # A single-column figure previews at ~350x240 px, below the gate minimum
+    vlm = PlotCodeVLM(figsize=(3.5, 2.4))
+    pipeline = _pipeline(tmp_path, vlm, MockImageGen(), refinement_iterations=1, plot_workers=0)
+    result = await pipeline.generate(
+        GenerationInput(
+            source_context="Accuracy per epoch.",
+            communicative_intent="Accuracy rises then dips.",
+            diagram_type=DiagramType.STATISTICAL_PLOT,
+            raw_data={"epoch": [1, 2, 3], "acc": [0.1, 0.3, 0.2]},
+        )
+    )
+
+    with Image.open(result.iterations[0].image_path) as preview:
+        assert min(preview.size) < 256
+    assert result.iterations[0].quality_gate.passed
+    assert vlm.critic_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_plot_final_output_includes_all_exports(tmp_path):
+    pipeline = _pipeline(
+        tmp_path, PlotCodeVLM(), MockImageGen(), refinement_iterations=1, plot_workers=0
+    )
+    result = await pipeline.generate(
+        GenerationInput(
+            source_context="Accuracy per epoch.",
+            communicative_intent="Accuracy rises then dips.",
+            diagram_type=DiagramType.STATISTICAL_PLOT,
+            raw_data={"epoch": [1, 2, 3], "acc": [0.1, 0.3, 0.2]},
+        )
+    )
+
+    run_dir = pipeline._run_dir
+    assert result.exports == {
+        "png": str(run_dir / "final_output.png"),
+        "preview": str(run_dir / "final_output_preview.png"),
+        "svg": str(run_dir / "final_output.svg"),
+        "pdf": str(run_dir / "final_output.pdf"),
+    }
+    assert result.iterations[0].image_path == result.iterations[0].exports["preview"]
+    with (
+        Image.open(result.exports["png"]) as final,
+        Image.open(result.exports["preview"]) as preview,
+    ):
+        assert final.width == 3 * preview.width
+
+
+@pytest.mark.asyncio
+async def test_pooled_plot_with_relative_output_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pipeline = _pipeline(Path(), PlotCodeVLM(), MockImageGen(), refinement_iterations=1)
+    pipeline.visualizer.plot_pool = PlotWorkerPool(size=1)
+    try:
+        result = await pipeline.generate(
+            GenerationInput(
+                source_context="Accuracy per epoch.",
+                communicative_intent="Accuracy rises then dips.",
+                diagram_type=DiagramType.STATISTICAL_PLOT,
+            )
+        )
+    finally:
+        pipeline.visualizer.plot_pool.close()
+
+    assert result.iterations[0].quality_gate.passed
+    assert all(Path(path).exists() for path in result.exports.values())
+
+
+class DataPlotVLM(MockVLM):
+    """Mock VLM answering every text prompt with plot code that reads DATA."""
+
+    async def generate(self, prompt, images=None, response_format=None, **kwargs):
+        if response_format == "json":
+            return await super().generate(prompt, images, response_format=response_format)
+        return (
+            "```python\nimport matplotlib.pyplot as plt\n"
+            "table = next(iter(DATA.values()))\n"
+            "plt.plot(table['epoch'], table['acc'])\nplt.savefig(OUTPUT_PATH)\n```"
+        )
+
+
+@pytest.mark.asyncio
+async def test_pooled_data_plot_with_relative_output_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    vlm = DataPlotVLM()
+    pipeline = _pipeline(Path(), vlm, MockImageGen(), refinement_iterations=1)
+    pipeline.visualizer.plot_pool = PlotWorkerPool(size=1)
+    try:
+        result = await pipeline.generate(
+            GenerationInput(
+                source_context="Accuracy per epoch.",
+                communicative_intent="Accuracy rises then dips.",
+                diagram_type=DiagramType.STATISTICAL_PLOT,
+                raw_data={"epoch": [1, 2, 3], "acc": [0.1, 0.3, 0.2]},
+            )
+        )
+    finally:
+        pipeline.visualizer.plot_pool.close()
+
+    assert pipeline.visualizer.last_plot_repairs == []
+    assert result.iterations[0].quality_gate.passed
+
+
+def test_new_pipeline_sees_reference_edits_without_hot_reload(tmp_path):
+    examples = [
+        ReferenceExample(id=f"r{i}", source_context="c", caption="c", image_path=f"i{i}.png")
+        for i in range(3)
+    ]
+    ReferenceStore.create(tmp_path / "refs", examples[:1])
+    first = _pipeline(tmp_path, MockVLM(), MockImageGen(), reference_hot_reload=False)
+    assert first.reference_store.count == 1
+
+    ReferenceStore.create(tmp_path / "refs", examples)
+    index = tmp_path / "refs" / "index.json"
+    stat = index.stat()
+    os.utime(index, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    second = _pipeline(tmp_path, MockVLM(), MockImageGen(), reference_hot_reload=False)
+
+    assert second.reference_store.count == 3
@@ -0,0 +1,63 @@
+"""Tests for the BM25 reference prefilter index."""
+
+from __future__ import annotations
+
+from paperbanana.core.types import ReferenceExample
+from paperbanana.reference.index import ReferenceIndex, tokenize
+from paperbanana.reference.store import ReferenceStore
+
+
+def _example(eid: str, caption: str, context: str, category: str = "vision") -> ReferenceExample:
+    return ReferenceExample(
+        id=eid,
+        source_context=context,
+        caption=caption,
+        image_path=f"images/{eid}.png",
+        category=category,
+    )
+
+
+EXAMPLES = [
+    _example("gnn", "Graph masked autoencoder", "We mask graph nodes and reconstruct features."),
+    _example("diff", "Latent diffusion pipeline", "A denoising diffusion model in latent space."),
+    _example(
+        "agent", "Tool-using agent loop", "The agent plans, calls tools and reflects.", "agent"
+    ),
+    _example("vit", "Vision transformer", "Image patches are embedded and fed to a transformer."),
+]
+
+
+def test_tokenize_drops_stopwords_and_punctuation():
+    assert tokenize("The Graph-based encoder, and a decoder.") == [
+        "graph",
+        "based",
+        "encoder",
+        "decoder",
+    ]
+
+
+def test_search_ranks_matching_example_first():
+    index = ReferenceIndex.build(EXAMPLES)
+
+    hits = index.search("masked graph autoencoder that reconstructs node features", k=2)
+
+    assert hits[0][0] == "gnn"
+    assert len(hits) == 2
+    assert hits[0][1] > hits[1][1]
+
+
+def test_search_respects_category_and_k():
+    index = ReferenceIndex.build(EXAMPLES)
+
+    hits = index.search("agent tools transformer", k=10, category="agent")
+    assert [eid for eid, _ in hits] == ["agent"]
+
+    assert index.search("anything", k=0) == []
+
+
+def test_store_shortlist(tmp_path):
+    store = ReferenceStore.create(tmp_path, EXAMPLES)
+
+    shortlist = store.shortlist("denoising diffusion in latent space", k=1)
+
+    assert [e.id for e in shortlist] == ["diff"]
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import os
 import tempfile
 from pathlib import Path
 
@@ -115,3 +116,115 @@ def test_create_store():
 
         # Verify file was created
         assert Path(tmpdir, "index.json").exists()
+
+
+def _examples() -> list[ReferenceExample]:
+    return [
+        ReferenceExample(
+            id=f"r{i}",
+            source_context=f"Context {i} with unicode — text",
+            caption=f"Caption {name}",
+            image_path=f"images/r{i}.png",
+            category="agent" if i % 2 else "vision",
+        )
+        for i, name in enumerate(["alpha", "beta", "gamma", "delta", "epsilon"])
+    ]
+
+
+def test_convert_to_indexed_layout(tmp_path):
+    """Converted stores load lazily and match the index.json contents."""
+    ReferenceStore.create(tmp_path, _examples())
+    legacy = ReferenceStore(tmp_path).get_all()
+
+    assert ReferenceStore.convert(tmp_path) == 5
+    assert Path(tmp_path, "index.json").exists()
+
+    store = ReferenceStore(tmp_path)
+    assert store.count == 5
+    assert store.snapshot()._offsets is not None
+    assert store.get_by_id("r3") == legacy[3]
+    assert store.get_by_id("r3").image_path == str(tmp_path / "images/r3.png")
+    assert [e.id for e in store.get_by_category("agent")] == ["r1", "r3"]
+    assert store.get_all() == legacy
+    assert store.get_by_id("missing") is None
+
+
+def test_stale_indexed_layout_falls_back_to_index_json(tmp_path):
+    ReferenceStore.create(tmp_path, _examples(), indexed=True)
+    index = {"examples": [_examples()[0].model_dump()]}
+    Path(tmp_path, "index.json").write_text(json.dumps(index))
+    sidecar = Path(tmp_path, "examples.idx.json")
+    stat = sidecar.stat()
+    os.utime(sidecar, (stat.st_atime, stat.st_mtime - 10))
+
+    assert ReferenceStore(tmp_path).count == 1
+
+
+def test_bm25_index_cached_for_indexed_layout(tmp_path):
+    ReferenceStore.create(tmp_path, _examples(), indexed=True)
+
+    first = ReferenceStore(tmp_path)
+    assert [e.id for e in first.shortlist("gamma caption", k=1)] == ["r2"]
+    assert Path(tmp_path, "examples.bm25.npz").exists()
+
+    second = ReferenceStore(tmp_path)
+    assert [e.id for e in second.shortlist("epsilon", k=1)] == ["r4"]
+
+
+def test_fingerprint_changes_when_index_rewritten(tmp_path):
+    ReferenceStore.create(tmp_path, _examples()[:2])
+    before = ReferenceStore(tmp_path).fingerprint
+
+    ReferenceStore.create(tmp_path, _examples())
+    assert ReferenceStore(tmp_path).fingerprint != before
+    assert ReferenceStore(tmp_path / "missing").fingerprint == "empty"
+
+
+def _bump_mtime(path: Path) -> None:
+    # Ensure the rewrite is visible even on filesystems with coarse mtimes
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+async def test_refresh_swaps_snapshot_and_keeps_old_one_consistent(tmp_path):
+    ReferenceStore.create(tmp_path, _examples()[:2], indexed=True)
+    store = ReferenceStore(tmp_path)
+    old = store.snapshot()
+    assert [e.id for e in old.shortlist("alpha", k=1)] == ["r0"]
+    assert store.version == 1
+    assert not store.changed()
+    assert await store.refresh() is False
+
+    ReferenceStore.create(tmp_path, _examples(), indexed=True)
+    _bump_mtime(tmp_path / "examples.idx.json")
+    assert store.changed()
+    assert await store.refresh() is True
+
+    assert store.version == 2
+    assert store.count == 5
+    # The BM25 index was rebuilt before the swap
+    assert store.snapshot().has_index
+    assert [e.id for e in store.shortlist("epsilon", k=1)] == ["r4"]
+    # Readers holding the previous snapshot still see the old set
+    assert old.count == 2
+    assert [e.id for e in old.get_all()] == ["r0", "r1"]
+
+
+def test_reload_keeps_previous_snapshot_when_store_is_mid_rewrite(tmp_path):
+    ReferenceStore.create(tmp_path, _examples(), indexed=True)
+    store = ReferenceStore(tmp_path)
+    assert store.count == 5
+
+    # Examples rewritten but sidecar not yet: sizes disagree
+    with open(tmp_path / "examples.jsonl", "ab") as f:
+        f.write(b"{}\n")
+    _bump_mtime(tmp_path / "examples.idx.json")
+
+    assert store.reload() is False
+    assert store.count == 5
+    assert store.version == 1
+
+
+def test_shared_store_is_reused_per_path(tmp_path):
+    assert ReferenceStore.shared(tmp_path) is ReferenceStore.shared(str(tmp_path))
+    assert ReferenceStore.shared(tmp_path) is not ReferenceStore.shared(tmp_path / "other")
@@ -0,0 +1,42 @@
+"""Tests for the offline (fake and recorded) providers."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from paperbanana.core.cache import SQLiteCache
+from paperbanana.providers.offline import FakeImageGen, FakeVLM, RecordedImageGen, RecordedVLM
+
+
+async def test_fake_vlm_is_deterministic():
+    vlm = FakeVLM(revision_rate=1.0)
+
+    first = json.loads(await vlm.generate("Critique this.", response_format="json"))
+    second = json.loads(await vlm.generate("Critique this.", response_format="json"))
+
+    assert first == second
+    assert first["critic_suggestions"] and first["revised_description"]
+    assert first["faithfulness"]["winner"] in {"Model", "Human", "Both are good", "Both are bad"}
+    assert json.loads(
+        await vlm.generate("**Paper ID:** p1\n**Paper ID:** p2", response_format="json")
+    )["selected_ids"] == ["p1", "p2"]
+
+
+async def test_record_then_replay(tmp_path):
+    db = tmp_path / "cassette.sqlite"
+    recorder = RecordedVLM(SQLiteCache(db, "vlm"), live=FakeVLM())
+    image_recorder = RecordedImageGen(SQLiteCache(db, "image"), live=FakeImageGen())
+    response = await recorder.generate("Describe.", response_format="json")
+    image = await image_recorder.generate("Draw.", width=64, height=64)
+
+    replay = RecordedVLM(SQLiteCache(db, "vlm"))
+    image_replay = RecordedImageGen(SQLiteCache(db, "image"))
+
+    assert await replay.generate("Describe.", response_format="json") == response
+    replayed = await image_replay.generate("Draw.", width=64, height=64)
+    assert replayed.tobytes() == image.tobytes()
+    assert replay.hits == 1 and recorder.misses == 1
+    with pytest.raises(KeyError):
+        await replay.generate("Never recorded.")
@@ -0,0 +1,73 @@
+"""Tests for code-rendered block diagrams."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from PIL import Image
+
+from paperbanana.rendering import DiagramSpec, parse_diagram_spec, render_diagram
+from paperbanana.rendering.diagram import layout_diagram
+
+
+def _spec(**overrides) -> DiagramSpec:
+    data = {
+        "direction": "LR",
+        "groups": [{"id": "mask", "label": "Masking Module"}],
+        "nodes": [
+            {"id": "input", "label": "Input Graph"},
+            {"id": "score", "label": "Structure-based Scoring", "group": "mask"},
+            {"id": "masking", "label": "Structure-guided Masking", "group": "mask"},
+            {"id": "encoder", "label": "Encoder"},
+            {"id": "loss", "label": "Loss", "shape": "round"},
+        ],
+        "edges": [
+            {"source": "input", "target": "score"},
+            {"source": "score", "target": "masking"},
+            {"source": "masking", "target": "encoder"},
+            {"source": "encoder", "target": "loss", "label": "MSE"},
+            {"source": "loss", "target": "score", "label": "update", "style": "dashed"},
+        ],
+    }
+    data.update(overrides)
+    return DiagramSpec.model_validate(data)
+
+
+def test_parse_fenced_json():
+    response = "Here is the spec:\n```json\n" + json.dumps(_spec().model_dump()) + "\n```"
+    spec = parse_diagram_spec(response)
+    assert [n.id for n in spec.nodes][:2] == ["input", "score"]
+
+
+def test_parse_rejects_invalid_specs():
+    with pytest.raises(ValueError, match="not valid JSON"):
+        parse_diagram_spec("not json")
+    with pytest.raises(ValueError, match="unknown node"):
+        parse_diagram_spec(
+            json.dumps(
+                {"nodes": [{"id": "a", "label": "A"}], "edges": [{"source": "a", "target": "b"}]}
+            )
+        )
+    with pytest.raises(ValueError, match="duplicate"):
+        parse_diagram_spec(
+            json.dumps({"nodes": [{"id": "a", "label": "A"}, {"id": "a", "label": "B"}]})
+        )
+
+
+def test_layout_ranks_follow_flow_and_ignore_back_edges():
+    positions = layout_diagram(_spec())
+    ranks = {node: rank for node, (rank, _) in positions.items()}
+    assert ranks == {"input": 0, "score": 1, "masking": 2, "encoder": 3, "loss": 4}
+
+
+@pytest.mark.parametrize("direction", ["LR", "TB"])
+def test_render_writes_png_and_svg(tmp_path, direction):
+    written = render_diagram(_spec(direction=direction), tmp_path / "diagram.png", dpi=50)
+
+    assert set(written) == {"png", "svg"}
+    with Image.open(written["png"]) as image:
+        width, height = image.size
+    assert (width > height) == (direction == "LR")
+    svg = (tmp_path / "diagram.svg").read_text()
+    assert "<svg" in svg
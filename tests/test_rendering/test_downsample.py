@@ -0,0 +1,118 @@
+"""Tests for plot data downsampling."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from paperbanana.rendering.downsample import downsample_table, lttb
+from paperbanana.rendering.plot_data import PlotData
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    x = np.arange(100_000, dtype=float)
+    y = np.zeros_like(x)
+    y[31_337] = 50.0
+    y[77_777] = -20.0
+
+    keep = lttb(x, y, 500)
+
+    assert len(keep) == 500 and np.all(np.diff(keep) > 0)
+    assert keep[0] == 0 and keep[-1] == len(x) - 1
+    assert {31_337, 77_777} <= set(keep.tolist())
+    assert np.array_equal(lttb(x[:10], y[:10], 50), np.arange(10))
+
+
+def test_auto_uses_lttb_per_series_for_sorted_x():
+    steps = np.tile(np.arange(50_000), 2)
+    columns = {
+        "step": steps,
+        "loss": np.exp(-steps / 10_000.0),
+        "model": np.repeat(np.array(["small", "large"]), 50_000),
+    }
+
+    reduced, reduction = downsample_table(columns, 2000)
+
+    assert reduction.method == "lttb" and reduction.x == "step" and reduction.series == "model"
+    assert reduction.rows <= 2000 and reduction.ratio == reduction.rows / 100_000
+    for model in ("small", "large"):
+        series = reduced["step"][reduced["model"] == model]
+        assert series[0] == 0 and series[-1] == 49_999
+
+
+def test_auto_bins_unsorted_scatter_with_counts():
+    rng = np.random.default_rng(0)
+    columns = {"a": rng.standard_normal(200_000), "b": rng.standard_normal(200_000)}
+    columns["a"][0] = np.nan
+
+    reduced, reduction = downsample_table(columns, 400)
+
+    assert reduction.method == "bin" and reduction.count == "count"
+    assert reduction.rows <= 400
+    assert reduced["count"].sum() == 199_999
+    # Cell means stay within the data's range
+    assert reduced["a"].min() >= np.nanmin(columns["a"])
+
+
+def test_auto_summarizes_single_column_by_quantiles():
+    values = np.random.default_rng(1).exponential(size=100_000)
+
+    reduced, reduction = downsample_table({"latency": values}, 1001)
+
+    assert reduction.method == "quantile" and reduction.rows == 1001
+    assert reduced["latency"][0] == values.min() and reduced["latency"][-1] == values.max()
+    assert reduced["latency"][500] == pytest.approx(np.median(values))
+
+
+def test_auto_traces_value_against_text_x_in_row_order():
+    dates = np.array([f"2024-{i // 1000:02d}-{i % 1000:03d}" for i in range(20_000)])
+    values = np.sin(np.arange(20_000) / 500.0)
+    values[12_345] = 5.0
+
+    reduced, reduction = downsample_table({"date": dates, "value": values}, 500)
+
+    assert reduction.method == "lttb" and reduction.x == "date" and reduction.y == ["value"]
+    assert reduction.rows <= 500
+    assert reduced["date"][0] == dates[0] and reduced["date"][-1] == dates[-1]
+    assert np.all(reduced["date"][:-1] < reduced["date"][1:])
+    assert 5.0 in reduced["value"]
+
+
+def test_lttb_on_sorted_column_alone_falls_back_to_quantile():
+    columns = {"step": np.arange(10_000), "run": np.array(["a"] * 10_000)}
+
+    reduced, reduction = downsample_table(columns, 100, "lttb")
+
+    assert reduction.method == "quantile" and reduction.rows == 100
+    assert reduced["step"][0] == 0 and reduced["step"][-1] == 9_999
+
+
+def test_lttb_keeps_x_endpoints_when_y_is_all_nan():
+    columns = {"step": np.arange(10_000), "loss": np.full(10_000, np.nan)}
+
+    reduced, reduction = downsample_table(columns, 100, "lttb")
+
+    assert reduction.method == "lttb" and reduction.rows == 2
+    assert reduced["step"].tolist() == [0, 9_999]
+
+
+def test_small_or_non_numeric_tables_are_unchanged():
+    small = {"x": np.arange(10)}
+    assert downsample_table(small, 100) == (small, None)
+    text = {"name": np.array(["a"] * 1000)}
+    assert downsample_table(text, 100)[1] is None
+    with pytest.raises(ValueError, match="Unknown downsampling method"):
+        downsample_table(small, 5, "wavelet")
+
+
+def test_plot_data_records_reduction_and_full_statistics(tmp_path):
+    raw = {"data": {"t": list(range(20_000)), "v": [float(i % 100) for i in range(20_000)]}}
+
+    plot_data = PlotData.write(raw, tmp_path / "data", max_points=500, downsample="lttb")
+
+    reduction = plot_data.reductions["data"]
+    assert reduction["source_rows"] == 20_000 and reduction["rows"] == plot_data.rows <= 500
+    description = plot_data.describe()
+    assert "Downsampled from 20000 rows by lttb" in description
+    assert "max 19999" in description
+    assert len(plot_data.load()["data"]["t"]) == plot_data.rows
@@ -0,0 +1,55 @@
+"""Tests for multi-format plot export."""
+
+from __future__ import annotations
+
+import matplotlib.pyplot as plt
+import pytest
+from matplotlib.figure import Figure
+from PIL import Image
+
+from paperbanana.rendering.export import SavefigCapture, plot_exports
+
+
+def test_plot_exports_paths(tmp_path):
+    exports = plot_exports(tmp_path / "plot_iter_1.png", ("svg", "png"), 80, 240)
+
+    assert exports["preview"] == {
+        "path": str(tmp_path / "plot_iter_1.png"),
+        "format": "png",
+        "dpi": 80,
+    }
+    assert exports["png"]["path"] == str(tmp_path / "plot_iter_1_print.png")
+    assert exports["svg"]["path"] == str(tmp_path / "plot_iter_1.svg")
+    assert list(exports) == ["preview", "png", "svg"]
+
+
+def test_capture_reuses_saved_figure_and_options(tmp_path):
+    output = tmp_path / "plot.png"
+    capture = SavefigCapture(str(output))
+    try:
+        plt.figure(figsize=(4, 3))
+        plt.plot([1, 2, 3])
+        plt.savefig(tmp_path / "other.png")
+        assert capture.figure is None
+
+        plt.savefig(output, dpi=300, facecolor="black")
+        plt.close("all")
+        written = capture.export(plot_exports(output, ("svg",), preview_dpi=50, print_dpi=100))
+    finally:
+        capture.uninstall()
+
+    assert Figure.savefig is capture._original
+    with Image.open(written["preview"]) as preview, Image.open(written["png"]) as png:
+        # Resolution is per export; the code's savefig options carry over
+        assert preview.size == (200, 150) and png.size == (400, 300)
+        assert preview.convert("RGB").getpixel((0, 0)) == (0, 0, 0)
+    assert "<svg" in (tmp_path / "plot.svg").read_text()
+
+
+def test_capture_without_save_raises(tmp_path):
+    capture = SavefigCapture(str(tmp_path / "plot.png"))
+    try:
+        with pytest.raises(RuntimeError, match="did not save"):
+            capture.export(plot_exports(tmp_path / "plot.png"))
+    finally:
+        capture.uninstall()
@@ -0,0 +1,62 @@
+"""Tests for columnar plot data transport."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from paperbanana.rendering.plot_data import PlotData, load_plot_data, split_tables
+
+
+def _records(n: int) -> list[dict]:
+    return [
+        {"step": i, "loss": 1.0 / (i + 1), "model": "a" if i % 3 else "b", "ok": i % 2 == 0}
+        for i in range(n)
+    ]
+
+
+def test_split_tables_accepts_records_and_columns():
+    tables, rest = split_tables(
+        {
+            "runs": _records(3),
+            "curve": {"x": [1, 2], "y": [3.0, 4.0]},
+            "title": "Loss",
+            "ragged": {"x": [1, 2], "y": [3]},
+        }
+    )
+    assert set(tables) == {"runs", "curve"}
+    assert tables["runs"]["model"] == ["b", "a", "a"]
+    assert rest == {"title": "Loss", "ragged": {"x": [1, 2], "y": [3]}}
+
+    # A dict of equal-length columns at the top level is a single table
+    tables, rest = split_tables({"x": [1, 2], "y": ["u", "v"]})
+    assert tables == {"data": {"x": [1, 2], "y": ["u", "v"]}} and rest == {}
+
+    assert split_tables({"note": "no table here"}) == ({}, {"note": "no table here"})
+
+
+def test_write_and_memory_map(tmp_path):
+    raw = {"data": _records(10) + [{"step": 10, "loss": None, "model": None, "ok": True}]}
+    plot_data = PlotData.write(raw, tmp_path / "data")
+    assert plot_data is not None and plot_data.rows == 11
+
+    table = load_plot_data(tmp_path / "data")["data"]
+    assert isinstance(table["step"], np.memmap)
+    assert table["step"].dtype == np.int64
+    assert table["loss"].dtype == np.float64 and np.isnan(table["loss"][-1])
+    assert table["model"][-1] == "" and table["model"][0] == "b"
+    assert table["ok"].dtype == bool
+
+    columns = {c["name"]: c for c in plot_data.tables["data"]["columns"]}
+    assert columns["loss"]["dtype"] == "float" and "1 missing" in columns["loss"]["summary"]
+    assert columns["model"]["summary"].startswith("3 distinct")
+
+    assert PlotData.write({"title": "x"}, tmp_path / "none") is None
+
+
+def test_description_size_does_not_grow_with_rows(tmp_path):
+    small = PlotData.write({"data": _records(20)}, tmp_path / "small").describe()
+    large = PlotData.write({"data": _records(20_000)}, tmp_path / "large").describe()
+
+    assert 'Table "data": 20000 rows' in large
+    assert "step,loss,model,ok" in large
+    assert abs(len(large) - len(small)) < 100
@@ -0,0 +1,96 @@
+"""Tests for the warm plot worker pool."""
+
+from __future__ import annotations
+
+import io
+
+import pytest
+from PIL import Image
+
+from paperbanana.rendering import PlotWorkerPool
+
+PLOT_CODE = """
+import matplotlib.pyplot as plt
+plt.bar(list(RAW_DATA), list(RAW_DATA.values()))
+plt.savefig(OUTPUT_PATH)
+"""
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = PlotWorkerPool(size=1, max_jobs=2)
+    yield pool
+    pool.close()
+
+
+def test_returns_png_bytes(pool):
+    result = pool.execute(PLOT_CODE, {"a": 1, "b": 3})
+
+    assert result.ok, result.error
+    with Image.open(io.BytesIO(result.image)) as image:
+        assert image.format == "PNG"
+
+
+def test_error_is_reported_and_worker_survives(pool):
+    result = pool.execute("raise ValueError('bad column')")
+    assert not result.ok
+    assert "ValueError: bad column" in result.error
+
+    missing = pool.execute("x = 1")
+    assert not missing.ok
+    assert "OUTPUT_PATH" in missing.error
+
+    assert pool.execute(PLOT_CODE, {"a": 1}).ok
+
+
+def test_recycles_after_max_jobs():
+    pool = PlotWorkerPool(size=1, max_jobs=2)
+    try:
+        pool.execute(PLOT_CODE, {"a": 1})
+        first = pool._slots.queue[0]
+        assert first.jobs == 1
+        pool.execute(PLOT_CODE, {"a": 1})
+
+        # Retired before it was returned: no caller can run a third job on it
+        assert pool._slots.queue[0] is None
+        assert not first.process.is_alive()
+        assert pool.execute(PLOT_CODE, {"a": 1}).ok
+        assert pool._slots.queue[0].jobs == 1
+    finally:
+        pool.close()
+
+
+def test_timeout_kills_worker(pool):
+    result = pool.execute("import time\ntime.sleep(10)", timeout=0.5)
+    assert not result.ok
+    assert "timed out" in result.error
+
+    assert pool.execute(PLOT_CODE, {"a": 1}).ok
+
+
+def test_exports_every_format_from_one_execution(pool, tmp_path):
+    from paperbanana.rendering.export import plot_exports
+
+    exports = plot_exports(tmp_path / "plot.png", ("svg", "pdf"), preview_dpi=50, print_dpi=150)
+    result = pool.execute(PLOT_CODE, {"a": 1, "b": 3}, exports=exports)
+
+    assert result.ok, result.error
+    assert result.image is None
+    assert set(result.exports) == {"preview", "png", "svg", "pdf"}
+    with Image.open(result.exports["preview"]) as preview, Image.open(result.exports["png"]) as png:
+        assert png.width == 3 * preview.width
+    assert (tmp_path / "plot.pdf").read_bytes().startswith(b"%PDF")
+
+
+def test_relative_paths_resolve_against_caller(pool, tmp_path, monkeypatch):
+    from paperbanana.rendering import PlotData
+    from paperbanana.rendering.export import plot_exports
+
+    monkeypatch.chdir(tmp_path)
+    PlotData.write({"x": [1, 2, 3]}, tmp_path / "data")
+    code = "import matplotlib.pyplot as plt\nplt.plot(DATA['data']['x'])\nplt.savefig(OUTPUT_PATH)"
+    result = pool.execute(code, data_dir="data", exports=plot_exports("out/plot.png", ()))
+
+    assert result.ok, result.error
+    assert (tmp_path / "out" / "plot.png").exists()
+    assert (tmp_path / "out" / "plot_print.png").exists()
@@ -0,0 +1,101 @@
+"""Tests for plot code failure classification and local repairs."""
+
+from __future__ import annotations
+
+import pytest
+
+from paperbanana.core.cache import SQLiteCache
+from paperbanana.rendering.plot_repair import PlotRepairer, classify_failure
+
+TRACEBACK = """Traceback (most recent call last):
+  File "<plot>", line 4, in <module>
+  File "pandas/core/frame.py", line 3761, in __getitem__
+KeyError: '{name}'
+"""
+
+
+@pytest.mark.parametrize(
+    ("error", "kind", "detail"),
+    [
+        (TRACEBACK.format(name="Accuracy"), "missing_column", "Accuracy"),
+        (
+            "TypeError: Axes.bar() got an unexpected keyword argument 'colour'",
+            "unexpected_kwarg",
+            "colour",
+        ),
+        (
+            "OSError: 'seaborn-whitegrid' is not a valid package style, path of style file",
+            "unknown_style",
+            "seaborn-whitegrid",
+        ),
+        (
+            "AttributeError: 'Axes' object has no attribute 'set_xticklabel'",
+            "missing_attribute",
+            "set_xticklabel",
+        ),
+        ("ModuleNotFoundError: No module named 'plotly'", "missing_module", "plotly"),
+        ("Plot code did not save a figure to OUTPUT_PATH", "no_figure", ""),
+        ("Plot code timed out", "timeout", ""),
+        (
+            "ValueError: x and y must have same first dimension, but have shapes (3,) and (4,)",
+            "ValueError",
+            "x and y must have same first dimension, but have shapes (N,) and (N,)",
+        ),
+    ],
+)
+def test_classify_failure(error, kind, detail):
+    failure = classify_failure(error)
+    assert (failure.kind, failure.detail) == (kind, detail)
+
+
+def test_local_rules():
+    repairer = PlotRepairer()
+
+    code, how = repairer.local_fix(
+        "plt.plot(df['Accuracy'])\nplt.ylabel('Accuracy')",
+        classify_failure(TRACEBACK.format(name="Accuracy")),
+        ["step", "accuracy"],
+    )
+    assert how == "missing_column"
+    assert code == "plt.plot(df['accuracy'])\nplt.ylabel('accuracy')"
+    # No similar column: nothing to rewrite locally
+    assert repairer.local_fix("df['zzz']", classify_failure("KeyError: 'zzz'"), ["step"]) is None
+
+    code, _ = repairer.local_fix(
+        "ax.bar(x, y, colour='red', width=0.5)\nax.plot(x, colour=(1, 0, 0))\nf(colour=1)",
+        classify_failure("TypeError: bar() got an unexpected keyword argument 'colour'"),
+        [],
+    )
+    assert code == "ax.bar(x, y, width=0.5)\nax.plot(x)\nf()"
+
+    code, _ = repairer.local_fix(
+        "plt.style.use('seaborn-whitegrid')",
+        classify_failure("OSError: 'seaborn-whitegrid' is not a valid package style"),
+        [],
+    )
+    assert code == "plt.style.use('seaborn-v0_8-whitegrid')"
+
+    code, _ = repairer.local_fix(
+        "plt.plot([1, 2])", classify_failure("Plot code did not save a figure to OUTPUT_PATH"), []
+    )
+    assert code.endswith("plt.savefig(OUTPUT_PATH, dpi=300, bbox_inches='tight')\n")
+
+
+def test_learned_fix_replays_on_token_boundaries(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache.sqlite", "plot_repair")
+    failure = classify_failure("AttributeError: 'Axes' object has no attribute 'set_xticklabel'")
+    PlotRepairer(cache).learn(
+        failure, "ax.set_xticklabel(names)\nax.bar(x, y)", "ax.set_xticklabels(names)\nax.bar(x, y)"
+    )
+
+    # A new repairer (e.g. the next run) finds the fix in the shared cache
+    code, how = PlotRepairer(cache).local_fix(
+        "ax.set_xticklabels(a)\nax.set_xticklabel(b)", failure, []
+    )
+    assert how == "learned"
+    assert code == "ax.set_xticklabels(a)\nax.set_xticklabels(b)"
+
+    # Whole rewrites are not learned
+    other = classify_failure("NameError: name 'np' is not defined")
+    PlotRepairer(cache).learn(other, "x = np.arange(3)", "import numpy as np\nx = np.arange(3)")
+    assert PlotRepairer(cache).local_fix("y = np.ones(2)", other, []) is None
@@ -0,0 +1,88 @@
+"""Tests for declarative plot specs."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from paperbanana.rendering.plot_spec import PlotRenderer, PlotSpec, parse_plot_spec
+
+TABLES = {
+    "data": {
+        "step": np.tile(np.arange(50), 2),
+        "loss": np.linspace(1.0, 0.1, 100),
+        "model": np.repeat(np.array(["small", "large"]), 50),
+        "std": np.full(100, 0.05),
+    }
+}
+
+
+def _spec(*layers: dict, **panel) -> PlotSpec:
+    return PlotSpec.model_validate({"panels": [{"layers": list(layers), **panel}]})
+
+
+def test_parse_plot_spec_accepts_fenced_json():
+    spec = parse_plot_spec(
+        '```json\n{"panels": [{"layers": [{"mark": "hist", "x": "loss"}]}]}\n```'
+    )
+    assert spec.panels[0].layers[0].bins == 30
+
+    with pytest.raises(ValueError, match="not valid JSON"):
+        parse_plot_spec("plt.plot(x)")
+    with pytest.raises(ValueError, match="line layer needs y"):
+        parse_plot_spec('{"panels": [{"layers": [{"mark": "line", "x": "step"}]}]}')
+    with pytest.raises(ValueError):
+        parse_plot_spec('{"panels": []}')
+
+
+def test_unknown_columns_are_rejected_before_drawing(tmp_path):
+    renderer = PlotRenderer(TABLES)
+    with pytest.raises(ValueError, match="Unknown column in table data: acc"):
+        renderer.render(_spec({"mark": "line", "x": "step", "y": "acc"}), tmp_path / "p.png")
+    with pytest.raises(ValueError, match="Unknown table: runs"):
+        renderer.render(_spec({"mark": "hist", "data": "runs", "x": "loss"}), tmp_path / "p.png")
+    assert not (tmp_path / "p.png").exists()
+
+
+@pytest.mark.parametrize(
+    "layer",
+    [
+        {"mark": "line", "x": "step", "y": "loss", "color": "model", "yerr": "std"},
+        {"mark": "scatter", "x": "step", "y": "loss", "size": "std", "color": "model"},
+        {"mark": "area", "x": "step", "y": "loss"},
+        {"mark": "bar", "x": "model", "y": "loss", "yerr": "std"},
+        {"mark": "hist", "x": "loss", "color": "model", "bins": 10},
+        {"mark": "box", "x": "model", "y": "loss"},
+    ],
+)
+def test_renders_each_mark(tmp_path, layer):
+    written = PlotRenderer(TABLES).render(
+        _spec(layer, legend="outside", y={"label": "Loss", "scale": "log"}),
+        tmp_path / "plot.png",
+        formats=("png", "svg"),
+        dpi=50,
+    )
+    assert set(written) == {"png", "svg"}
+    with Image.open(written["png"]) as image:
+        assert image.getextrema() != ((255, 255), (255, 255), (255, 255))
+
+
+def test_style_changes_reuse_prepared_layer_data(tmp_path):
+    renderer = PlotRenderer(TABLES)
+    layer = {"mark": "bar", "x": "model", "y": "loss"}
+    renderer.render(_spec(layer, title="Loss"), tmp_path / "a.png", dpi=50)
+    renderer.render(_spec({**layer, "alpha": 0.5}, title="Final loss"), tmp_path / "b.png", dpi=50)
+    assert (renderer.hits, renderer.misses) == (1, 1)
+
+    renderer.render(_spec({**layer, "y": "std"}), tmp_path / "c.png", dpi=50)
+    assert renderer.misses == 2
+
+
+def test_bar_averages_per_category():
+    fig = PlotRenderer(TABLES).figure(_spec({"mark": "bar", "x": "model", "y": "loss"}))
+    ax = fig.axes[0]
+    heights = [patch.get_height() for patch in ax.patches]
+    loss = TABLES["data"]["loss"]
+    assert heights == pytest.approx([loss[:50].mean(), loss[50:].mean()])
+    assert [t.get_text() for t in ax.get_xticklabels()] == ["small", "large"]